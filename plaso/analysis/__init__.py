@@ -4,6 +4,7 @@
 from plaso.analysis import browser_search
 from plaso.analysis import chrome_extension
 from plaso.analysis import file_hashes
+from plaso.analysis import nsrl
 from plaso.analysis import nsrlsvr
 from plaso.analysis import sessionize
 from plaso.analysis import tagging
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""Persistent cache of the results of hash analyzers."""
+
+import json
+import sqlite3
+import time
+
+from plaso.analysis import logger
+
+
+class HashAnalysisCache(object):
+  """Persistent cache of the results of hash analyzers.
+
+  The cache is a SQLite database that stores the hash information, as
+  returned by the analyzer, per analyzer, hash source, lookup hash and digest.
+  The hash source identifies the source the analyzer looks up hashes in, such
+  as the host and port of a nsrlsvr instance, so that results of another
+  source are not used. Results
+  that indicate the hash is not known to the hash source, such as a hash not
+  present in nsrlsvr, are cached for a shorter time than other results, since
+  the hash source can learn about the hash later. Hash information of None,
+  which analyzers use to indicate that the look up failed, is not cached.
+
+  Note that the cache should be opened in the thread that uses it, since
+  a SQLite connection cannot be shared between threads.
+  """
+
+  _CREATE_TABLE_QUERY = (
+      'CREATE TABLE IF NOT EXISTS hash_analysis ('
+      'analyzer_name TEXT NOT NULL, '
+      'hash_source TEXT NOT NULL, '
+      'lookup_hash TEXT NOT NULL, '
+      'digest TEXT NOT NULL, '
+      'hash_information TEXT NOT NULL, '
+      'negative INTEGER NOT NULL, '
+      'time_stored INTEGER NOT NULL, '
+      'PRIMARY KEY (analyzer_name, hash_source, lookup_hash, digest))')
+
+  # Maximum number of digests per SELECT query, which must be smaller than
+  # the maximum number of SQLite host parameters of older versions of SQLite.
+  _MAXIMUM_NUMBER_OF_DIGESTS_PER_QUERY = 500
+
+  # Number of seconds to wait for a lock held by another process, such as
+  # another analysis process that stores results in the same cache.
+  _LOCK_TIMEOUT = 60.0
+
+  DEFAULT_NEGATIVE_TIME_TO_LIVE = 24 * 60 * 60
+
+  DEFAULT_TIME_TO_LIVE = 30 * 24 * 60 * 60
+
+  def __init__(
+      self, path, negative_time_to_live=DEFAULT_NEGATIVE_TIME_TO_LIVE,
+      time_to_live=DEFAULT_TIME_TO_LIVE):
+    """Initializes a hash analysis cache.
+
+    Args:
+      path (str): path of the cache file.
+      negative_time_to_live (Optional[int]): number of seconds results that
+          indicate the hash is not known to the hash source remain valid,
+          where 0 represents that these results are not cached.
+      time_to_live (Optional[int]): number of seconds other results remain
+          valid, where 0 represents that these results are not cached.
+    """
+    super(HashAnalysisCache, self).__init__()
+    self._connection = None
+    self.negative_time_to_live = negative_time_to_live
+    self.path = path
+    self.time_to_live = time_to_live
+
+  def Close(self):
+    """Closes the cache."""
+    if self._connection:
+      self._connection.close()
+      self._connection = None
+
+  def GetHashAnalyses(self, analyzer_name, hash_source, lookup_hash, hashes):
+    """Retrieves cached hash information.
+
+    Args:
+      analyzer_name (str): name of the analyzer.
+      hash_source (str): identifier of the source the analyzer looks up
+          hashes in.
+      lookup_hash (str): name of the hash attribute, such as "md5".
+      hashes (list[str]): hashes to look up.
+
+    Returns:
+      dict[str, object]: hash information per hash, that contains only the
+          hashes with valid cached hash information.
+
+    Raises:
+      IOError: if the cache is not open or cannot be read.
+    """
+    if not self._connection:
+      raise IOError('Cache not open.')
+
+    digests = {}
+    for digest in hashes:
+      digests.setdefault(digest.lower(), []).append(digest)
+
+    current_time = int(time.time())
+    minimum_time_stored = current_time - self.time_to_live
+    minimum_negative_time_stored = current_time - self.negative_time_to_live
+
+    cached_hash_information = {}
+    lower_case_digests = list(digests.keys())
+
+    for digest_index in range(
+        0, len(lower_case_digests), self._MAXIMUM_NUMBER_OF_DIGESTS_PER_QUERY):
+      query_digests = lower_case_digests[
+          digest_index:digest_index + self._MAXIMUM_NUMBER_OF_DIGESTS_PER_QUERY]
+
+      query = (
+          'SELECT digest, hash_information, negative, time_stored '
+          'FROM hash_analysis WHERE analyzer_name = ? AND hash_source = ? '
+          'AND lookup_hash = ? AND digest IN ({0:s})').format(
+              ', '.join(['?'] * len(query_digests)))
+
+      try:
+        cursor = self._connection.execute(
+            query, [analyzer_name, hash_source, lookup_hash] + query_digests)
+        rows = cursor.fetchall()
+
+      except sqlite3.Error as exception:
+        raise IOError('Unable to read cache with error: {0!s}'.format(
+            exception))
+
+      for digest, hash_information, negative, time_stored in rows:
+        if negative:
+          if time_stored < minimum_negative_time_stored:
+            continue
+        elif time_stored < minimum_time_stored:
+          continue
+
+        hash_information = json.loads(hash_information)
+        for original_digest in digests[digest]:
+          cached_hash_information[original_digest] = hash_information
+
+    return cached_hash_information
+
+  def Open(self):
+    """Opens the cache.
+
+    Raises:
+      IOError: if the cache is already opened or cannot be opened.
+    """
+    if self._connection:
+      raise IOError('Cache already opened.')
+
+    try:
+      connection = sqlite3.connect(self.path, timeout=self._LOCK_TIMEOUT)
+      connection.execute(self._CREATE_TABLE_QUERY)
+      connection.commit()
+
+    except sqlite3.Error as exception:
+      raise IOError('Unable to open cache: {0:s} with error: {1!s}'.format(
+          self.path, exception))
+
+    self._connection = connection
+
+  def StoreHashAnalyses(
+      self, analyzer_name, hash_source, lookup_hash, hash_analyses):
+    """Stores hash information in the cache.
+
+    Args:
+      analyzer_name (str): name of the analyzer.
+      hash_source (str): identifier of the source the analyzer looks up
+          hashes in.
+      lookup_hash (str): name of the hash attribute, such as "md5".
+      hash_analyses (list[tuple[HashAnalysis, bool]]): hash analyses and
+          per hash analysis, True if the hash information indicates the hash
+          is not known to the hash source.
+
+    Raises:
+      IOError: if the cache is not open or cannot be written.
+    """
+    if not self._connection:
+      raise IOError('Cache not open.')
+
+    time_stored = int(time.time())
+
+    rows = []
+    for hash_analysis, negative in hash_analyses:
+      if hash_analysis.hash_information is None:
+        continue
+
+      if negative and not self.negative_time_to_live:
+        continue
+
+      if not negative and not self.time_to_live:
+        continue
+
+      try:
+        hash_information = json.dumps(hash_analysis.hash_information)
+      except (TypeError, ValueError) as exception:
+        logger.debug((
+            'Unable to serialize hash information of: {0:s} with error: '
+            '{1!s}').format(hash_analysis.subject_hash, exception))
+        continue
+
+      rows.append((
+          analyzer_name, hash_source, lookup_hash,
+          hash_analysis.subject_hash.lower(), hash_information, int(negative),
+          time_stored))
+
+    if not rows:
+      return
+
+    try:
+      with self._connection:
+        self._connection.executemany(
+            'INSERT OR REPLACE INTO hash_analysis VALUES (?, ?, ?, ?, ?, ?, ?)',
+            rows)
+
+    except sqlite3.Error as exception:
+      raise IOError('Unable to write cache with error: {0!s}'.format(
+          exception))
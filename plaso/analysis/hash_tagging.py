@@ -267,6 +267,14 @@ class HashTaggingAnalysisPlugin(interface.AnalysisPlugin):
       list[str]: list of labels to apply to events.
     """
 
+  def SetHashAnalysisCache(self, cache):
+    """Sets the hash analysis cache.
+
+    Args:
+      cache (HashAnalysisCache): hash analysis cache.
+    """
+    self._analyzer.SetHashAnalysisCache(cache, self.NAME)
+
   def SetLookupHash(self, lookup_hash):
     """Sets the hash to query.
 
@@ -281,9 +289,21 @@ class HashAnalyzer(threading.Thread):
 
   This interface should be implemented once for each hash analysis plugin.
 
+  The analyzer retrieves the queued hashes in batches of at most
+  hashes_per_batch hashes, hence an analyzer that can look up multiple hashes
+  per request to its hash source should look up a batch in as few requests as
+  possible.
+
+  If a hash analysis cache is set, the analyzer only analyzes the hashes
+  that have no valid results in the cache and stores the new results in
+  the cache. The results are cached per hash source, as identified by
+  GetHashSourceIdentifier().
+
   Attributes:
     analyses_performed (int): number of analysis batches completed by this
         analyzer.
+    hashes_from_cache (int): number of hashes of which the results were
+        retrieved from the hash analysis cache.
     hashes_per_batch (int): maximum number of hashes to analyze at once.
     lookup_hash (str): name of the hash attribute to look up.
     seconds_spent_analyzing (int): number of seconds this analyzer has spent
@@ -313,17 +333,84 @@ class HashAnalyzer(threading.Thread):
     """
     super(HashAnalyzer, self).__init__()
     self._abort = False
+    self._cache = None
+    self._cache_hash_source = None
+    self._cache_name = None
     self._hash_queue = hash_queue
     self._hash_analysis_queue = hash_analysis_queue
     self.analyses_performed = 0
+    self.hashes_from_cache = 0
     self.hashes_per_batch = hashes_per_batch
     self.lookup_hash = lookup_hash
     self.seconds_spent_analyzing = 0
     self.wait_after_analysis = wait_after_analysis
 
+  def _AnalyzeHashes(self, hashes):
+    """Analyzes hashes that are not in the hash analysis cache.
+
+    Args:
+      hashes (list[str]): hashes to look up.
+
+    Returns:
+      tuple: containing:
+
+        list[HashAnalysis]: results of analyzing the hashes, including
+            the results from the hash analysis cache.
+        bool: True if the Analyze() method was called for hashes that were
+            not in the cache.
+    """
+    cached_hash_analyses = []
+    if self._cache:
+      try:
+        cached_hash_information = self._cache.GetHashAnalyses(
+            self._cache_name, self._cache_hash_source, self.lookup_hash,
+            hashes)
+      except IOError as exception:
+        logger.error(
+            'Unable to read hash analysis cache with error: {0!s}'.format(
+                exception))
+        cached_hash_information = {}
+
+      for digest, hash_information in cached_hash_information.items():
+        hash_analysis = HashAnalysis(digest, hash_information)
+        cached_hash_analyses.append(hash_analysis)
+
+      self.hashes_from_cache += len(cached_hash_analyses)
+
+      hashes = [
+          digest for digest in hashes if digest not in cached_hash_information]
+
+    if not hashes:
+      return cached_hash_analyses, False
+
+    time_before_analysis = time.time()
+    hash_analyses = self.Analyze(hashes)
+    current_time = time.time()
+    self.seconds_spent_analyzing += current_time - time_before_analysis
+    self.analyses_performed += 1
+
+    if self._cache and hash_analyses:
+      try:
+        self._cache.StoreHashAnalyses(
+            self._cache_name, self._cache_hash_source, self.lookup_hash, [
+                (hash_analysis, self.IsNegativeHashInformation(
+                    hash_analysis.hash_information))
+                for hash_analysis in hash_analyses])
+      except IOError as exception:
+        logger.error(
+            'Unable to write hash analysis cache with error: {0!s}'.format(
+                exception))
+
+    return cached_hash_analyses + hash_analyses, True
+
   def _GetHashes(self, target_queue, max_hashes):
     """Retrieves a list of items from a queue.
 
+    The first item is waited for, for at most EMPTY_QUEUE_WAIT_TIME seconds,
+    after which the items that are already in the queue are retrieved without
+    waiting, hence hashes that were queued while the previous batch was
+    analyzed are analyzed as a single batch.
+
     Args:
       target_queue (queue.Queue): queue to retrieve hashes from.
       max_hashes (int): maximum number of items to retrieve from the
@@ -333,12 +420,17 @@ class HashAnalyzer(threading.Thread):
       list[object]: list of at most max_hashes elements from the target_queue.
           The list may have no elements if the target_queue is empty.
     """
-    hashes = []
-    for _ in range(0, max_hashes):
+    try:
+      item = target_queue.get(timeout=self.EMPTY_QUEUE_WAIT_TIME)
+    except queue.Empty:
+      return []
+
+    hashes = [item]
+    while len(hashes) < max_hashes:
       try:
         item = target_queue.get_nowait()
       except queue.Empty:
-        continue
+        break
       hashes.append(item)
     return hashes
 
@@ -351,28 +443,86 @@ class HashAnalyzer(threading.Thread):
       hashes (list[str]): list of hashes to look up.
 
     Returns:
-      list[HashAnalysis]: list of results of analyzing the hashes.
+      list[HashAnalysis]: list of results of analyzing the hashes, where
+          hashes that could not be analyzed can be omitted.
     """
 
   # This method is part of the threading.Thread interface, hence its name does
   # not follow the style guide.
   def run(self):
     """The method called by the threading library to start the thread."""
-    while not self._abort:
-      hashes = self._GetHashes(self._hash_queue, self.hashes_per_batch)
-      if hashes:
-        time_before_analysis = time.time()
-        hash_analyses = self.Analyze(hashes)
-        current_time = time.time()
-        self.seconds_spent_analyzing += current_time - time_before_analysis
-        self.analyses_performed += 1
-        for hash_analysis in hash_analyses:
-          self._hash_analysis_queue.put(hash_analysis)
-          self._hash_queue.task_done()
-        time.sleep(self.wait_after_analysis)
-      else:
-        # Wait for some more hashes to be added to the queue.
-        time.sleep(self.EMPTY_QUEUE_WAIT_TIME)
+    if self._cache:
+      try:
+        self._cache.Open()
+      except IOError as exception:
+        logger.error(
+            'Unable to open hash analysis cache with error: {0!s}'.format(
+                exception))
+        self._cache = None
+
+      # The hash source is configured before the analyzer thread is started.
+      self._cache_hash_source = self.GetHashSourceIdentifier()
+
+    try:
+      while not self._abort:
+        hashes = self._GetHashes(self._hash_queue, self.hashes_per_batch)
+        if hashes:
+          hash_analyses, analyzed = self._AnalyzeHashes(hashes)
+          for hash_analysis in hash_analyses:
+            self._hash_analysis_queue.put(hash_analysis)
+
+          # Hashes for which the analysis failed are not retried, hence all
+          # the hashes of the batch are marked as done.
+          for _ in hashes:
+            self._hash_queue.task_done()
+
+          if analyzed and self.wait_after_analysis:
+            time.sleep(self.wait_after_analysis)
+
+    finally:
+      if self._cache:
+        self._cache.Close()
+
+  def GetHashSourceIdentifier(self):
+    """Retrieves an identifier of the source the analyzer looks up hashes in.
+
+    The identifier is used to cache results per hash source, such that
+    changing the configuration of the analyzer to use another hash source
+    does not return results of the previous hash source from the cache.
+
+    Returns:
+      str: identifier of the hash source, such as the host and port of
+          a server.
+    """
+    return ''
+
+  def IsNegativeHashInformation(self, hash_information):
+    """Determines if hash information indicates the hash is not known.
+
+    Hash information that indicates the hash is not known to the hash source
+    is cached for a shorter time than other hash information.
+
+    Args:
+      hash_information (object): hash information, as returned by
+          the Analyze() method.
+
+    Returns:
+      bool: True if the hash information indicates the hash is not known to
+          the hash source.
+    """
+    return not hash_information
+
+  def SetHashAnalysisCache(self, cache, analyzer_name):
+    """Sets the hash analysis cache.
+
+    Args:
+      cache (HashAnalysisCache): hash analysis cache, that is opened by
+          the analyzer thread.
+      analyzer_name (str): name that identifies the results of the analyzer
+          in the cache.
+    """
+    self._cache = cache
+    self._cache_name = analyzer_name
 
   def SetLookupHash(self, lookup_hash):
     """Sets the hash to query.
@@ -21,6 +21,13 @@ class AnalysisPlugin(object):
   # explains the nature of the plugin easily. It also needs to be unique.
   NAME = 'analysis_plugin'
 
+  # Flag to indicate the analysis plugin can be run in multiple processes
+  # that each analyze part of the events. This only applies to plugins that
+  # examine every event independently of other events and of which the report
+  # consists of the analysis counter only, since the reports of the individual
+  # processes are combined by adding up their analysis counters.
+  SHARDABLE = False
+
   # Flag to indicate the analysis is for testing purposes only.
   TEST_PLUGIN = False
 
@@ -23,7 +23,9 @@ class AnalysisMediator(object):
     number_of_produced_event_tags (int): number of produced event tags.
   """
 
-  def __init__(self, storage_writer, knowledge_base, data_location=None):
+  def __init__(
+      self, storage_writer, knowledge_base, data_location=None,
+      retain_event_tags=False):
     """Initializes an analysis plugin mediator.
 
     Args:
@@ -32,6 +34,9 @@ class AnalysisMediator(object):
           data needed for analysis.
       data_location (Optional[str]): location of data files used during
           analysis.
+      retain_event_tags (Optional[bool]): True if produced event tags should
+          be retained, so that they can be retrieved with
+          PopProducedEventTags().
     """
     super(AnalysisMediator, self).__init__()
     self._abort = False
@@ -39,6 +44,8 @@ class AnalysisMediator(object):
     self._event_filter_expression = None
     self._knowledge_base = knowledge_base
     self._number_of_warnings = 0
+    self._produced_event_tags = []
+    self._retain_event_tags = retain_event_tags
     self._storage_writer = storage_writer
 
     self.last_activity_timestamp = 0.0
@@ -89,6 +96,17 @@ class AnalysisMediator(object):
     """
     return self._knowledge_base.GetUsernameForPath(path)
 
+  def PopProducedEventTags(self):
+    """Pops the event tags produced since the previous call.
+
+    Returns:
+      list[EventTag]: event tags produced since the previous call, which is
+          empty if produced event tags are not retained.
+    """
+    produced_event_tags = self._produced_event_tags
+    self._produced_event_tags = []
+    return produced_event_tags
+
   def ProduceAnalysisReport(self, plugin):
     """Produces an analysis report.
 
@@ -132,6 +150,9 @@ class AnalysisMediator(object):
     """
     self._storage_writer.AddEventTag(event_tag)
 
+    if self._retain_event_tags:
+      self._produced_event_tags.append(event_tag)
+
     self.number_of_produced_event_tags += 1
 
     self.last_activity_timestamp = time.time()
@@ -0,0 +1,650 @@
+# -*- coding: utf-8 -*-
+"""Analysis plugin to look up files in a local NSRL hash set and tag events.
+
+The hash set is a file that contains the sorted and unique digests of one type
+of hash, for example MD5, of the NSRL Reference Data Set (RDS). It is built
+once from the RDS and memory-mapped when looking up hashes, hence a look up is
+a binary search on the mapped file, that does not require a server such as
+nsrlsvr.
+"""
+
+import binascii
+import csv
+import heapq
+import io
+import mmap
+import os
+import sqlite3
+import struct
+import tempfile
+
+from plaso.analysis import hash_tagging
+from plaso.analysis import logger
+from plaso.analysis import manager
+
+
+class NsrlHashSetFile(object):
+  """Memory-mapped NSRL hash set file.
+
+  The hash set file consists of a 32-byte header followed by the sorted and
+  unique binary digests. The header consists of:
+  * signature, 8 bytes, "PLSOHSET";
+  * format version, 32-bit little-endian integer;
+  * hash type, 8 bytes, name of the hash type, padded with 0-bytes;
+  * number of digests, 64-bit little-endian integer;
+  * reserved, 4 bytes.
+
+  Attributes:
+    hash_type (str): name of the hash type, such as "md5".
+    number_of_digests (int): number of digests in the hash set.
+  """
+
+  DIGEST_SIZES = {
+      'md5': 16,
+      'sha1': 20,
+      'sha256': 32}
+
+  FORMAT_VERSION = 1
+
+  SIGNATURE = b'PLSOHSET'
+
+  _HEADER = struct.Struct('<8sI8sQ4x')
+
+  def __init__(self):
+    """Initializes a NSRL hash set file."""
+    super(NsrlHashSetFile, self).__init__()
+    self._digest_size = 0
+    self._file_object = None
+    self._mapped_file = None
+    self.hash_type = None
+    self.number_of_digests = 0
+
+  @classmethod
+  def ReadHeader(cls, file_object):
+    """Reads the header of a hash set file.
+
+    Args:
+      file_object (file): file-like object of the hash set file.
+
+    Returns:
+      tuple[str, int]: name of the hash type and number of digests.
+
+    Raises:
+      IOError: if the header is not supported.
+    """
+    header_data = file_object.read(cls._HEADER.size)
+    if len(header_data) != cls._HEADER.size:
+      raise IOError('Unable to read hash set file header.')
+
+    signature, format_version, hash_type, number_of_digests = (
+        cls._HEADER.unpack(header_data))
+
+    if signature != cls.SIGNATURE:
+      raise IOError('Unsupported hash set file signature.')
+
+    if format_version != cls.FORMAT_VERSION:
+      raise IOError('Unsupported hash set file format version: {0:d}.'.format(
+          format_version))
+
+    hash_type = hash_type.rstrip(b'\x00').decode('ascii', errors='replace')
+    if hash_type not in cls.DIGEST_SIZES:
+      raise IOError('Unsupported hash set file hash type: {0:s}.'.format(
+          hash_type))
+
+    return hash_type, number_of_digests
+
+  @classmethod
+  def WriteHeader(cls, file_object, hash_type, number_of_digests):
+    """Writes the header of a hash set file.
+
+    Args:
+      file_object (file): file-like object of the hash set file.
+      hash_type (str): name of the hash type, such as "md5".
+      number_of_digests (int): number of digests in the hash set.
+    """
+    header_data = cls._HEADER.pack(
+        cls.SIGNATURE, cls.FORMAT_VERSION, hash_type.encode('ascii'),
+        number_of_digests)
+    file_object.write(header_data)
+
+  def Close(self):
+    """Closes the hash set file."""
+    if self._mapped_file:
+      self._mapped_file.close()
+      self._mapped_file = None
+
+    if self._file_object:
+      self._file_object.close()
+      self._file_object = None
+
+  def HasDigest(self, digest):
+    """Determines if the hash set contains a digest.
+
+    Args:
+      digest (str): hexadecimal representation of the digest.
+
+    Returns:
+      bool: True if the hash set contains the digest, False otherwise.
+
+    Raises:
+      IOError: if the hash set file is not open.
+    """
+    if not self._file_object:
+      raise IOError('Hash set file not open.')
+
+    if not self._mapped_file or len(digest) != self._digest_size * 2:
+      return False
+
+    try:
+      digest = binascii.unhexlify(digest)
+    except (TypeError, binascii.Error):
+      return False
+
+    header_size = self._HEADER.size
+    digest_size = self._digest_size
+    mapped_file = self._mapped_file
+
+    lower_index = 0
+    upper_index = self.number_of_digests
+    while lower_index < upper_index:
+      middle_index = (lower_index + upper_index) // 2
+      offset = header_size + (middle_index * digest_size)
+      middle_digest = mapped_file[offset:offset + digest_size]
+
+      if middle_digest == digest:
+        return True
+
+      if middle_digest < digest:
+        lower_index = middle_index + 1
+      else:
+        upper_index = middle_index
+
+    return False
+
+  def Open(self, path):
+    """Opens the hash set file.
+
+    Args:
+      path (str): path of the hash set file.
+
+    Raises:
+      IOError: if the hash set file is already opened or cannot be opened.
+    """
+    if self._file_object:
+      raise IOError('Hash set file already opened.')
+
+    file_object = open(path, 'rb')  # pylint: disable=consider-using-with
+
+    try:
+      hash_type, number_of_digests = self.ReadHeader(file_object)
+
+      digest_size = self.DIGEST_SIZES[hash_type]
+      expected_file_size = self._HEADER.size + (number_of_digests * digest_size)
+
+      file_object.seek(0, os.SEEK_END)
+      file_size = file_object.tell()
+      if file_size != expected_file_size:
+        raise IOError((
+            'Hash set file size: {0:d} does not match the expected size: '
+            '{1:d}.').format(file_size, expected_file_size))
+
+      mapped_file = None
+      if number_of_digests:
+        mapped_file = mmap.mmap(
+            file_object.fileno(), 0, access=mmap.ACCESS_READ)
+
+    except (IOError, OSError, ValueError):
+      file_object.close()
+      raise
+
+    self._digest_size = digest_size
+    self._file_object = file_object
+    self._mapped_file = mapped_file
+    self.hash_type = hash_type
+    self.number_of_digests = number_of_digests
+
+
+class NsrlHashSetFileBuilder(object):
+  """Builds a NSRL hash set file from NSRL Reference Data Set (RDS) files.
+
+  Supported RDS files are:
+  * RDS version 2 NSRLFile.txt, a CSV file with a header that contains
+    the "SHA-1" and "MD5" columns;
+  * RDS version 3 SQLite database, with a FILE table that contains the
+    "sha256", "sha1" and "md5" columns;
+  * a text file with one hexadecimal digest per line, for example
+    a hash set used by nsrlsvr.
+
+  The digests are sorted in bounded runs that are stored in temporary files
+  and merged into the hash set file, hence building a hash set from the full
+  RDS does not require the RDS to fit in memory.
+  """
+
+  _CSV_COLUMN_NAMES = {
+      'md5': 'md5',
+      'sha1': 'sha-1',
+      'sha256': 'sha-256'}
+
+  _MAXIMUM_NUMBER_OF_DIGESTS_PER_RUN = 1024 * 1024
+
+  _READ_BUFFER_SIZE = 1024 * 1024
+
+  _SQLITE_SIGNATURE = b'SQLite format 3\x00'
+
+  def __init__(self, hash_type):
+    """Initializes a NSRL hash set file builder.
+
+    Args:
+      hash_type (str): name of the hash type, such as "md5".
+
+    Raises:
+      ValueError: if the hash type is not supported.
+    """
+    digest_size = NsrlHashSetFile.DIGEST_SIZES.get(hash_type, None)
+    if not digest_size:
+      raise ValueError('Unsupported hash type: {0!s}'.format(hash_type))
+
+    super(NsrlHashSetFileBuilder, self).__init__()
+    self._digest_size = digest_size
+    self._hash_type = hash_type
+    self.number_of_invalid_digests = 0
+
+  def _GetDigest(self, value):
+    """Converts a hexadecimal representation of a digest into bytes.
+
+    Args:
+      value (str): hexadecimal representation of the digest.
+
+    Returns:
+      bytes: digest or None if the value is not a valid digest.
+    """
+    value = value.strip().strip('"')
+    if len(value) != self._digest_size * 2:
+      return None
+
+    try:
+      return binascii.unhexlify(value)
+    except (TypeError, binascii.Error):
+      return None
+
+  def _ReadDigests(self, path):
+    """Reads digests from a RDS file.
+
+    Args:
+      path (str): path of the RDS file.
+
+    Yields:
+      str: hexadecimal representation of a digest.
+
+    Raises:
+      IOError: if the digests cannot be read.
+    """
+    with open(path, 'rb') as file_object:
+      signature = file_object.read(len(self._SQLITE_SIGNATURE))
+
+    if signature == self._SQLITE_SIGNATURE:
+      digests = self._ReadDigestsFromSQLiteFile(path)
+    else:
+      digests = self._ReadDigestsFromTextFile(path)
+
+    for digest in digests:
+      yield digest
+
+  def _ReadDigestsFromSQLiteFile(self, path):
+    """Reads digests from a RDS version 3 SQLite database.
+
+    Args:
+      path (str): path of the SQLite database.
+
+    Yields:
+      str: hexadecimal representation of a digest.
+
+    Raises:
+      IOError: if the digests cannot be read.
+    """
+    # The hash type is one of the supported hash types, hence it is safe to
+    # use as column name.
+    query = 'SELECT {0:s} FROM FILE'.format(self._hash_type)
+
+    try:
+      connection = sqlite3.connect(
+          'file:{0:s}?mode=ro'.format(path), uri=True)
+    except sqlite3.Error as exception:
+      raise IOError('Unable to open SQLite database with error: {0!s}'.format(
+          exception))
+
+    try:
+      cursor = connection.execute(query)
+      for row in cursor:
+        if row[0]:
+          yield row[0]
+
+    except sqlite3.Error as exception:
+      raise IOError('Unable to read digests with error: {0!s}'.format(
+          exception))
+
+    finally:
+      connection.close()
+
+  def _ReadDigestsFromTextFile(self, path):
+    """Reads digests from a RDS version 2 CSV file or a text file.
+
+    Args:
+      path (str): path of the CSV or text file.
+
+    Yields:
+      str: hexadecimal representation of a digest.
+
+    Raises:
+      IOError: if the digests cannot be read.
+    """
+    # Note that the RDS can contain file names that are not UTF-8 encoded.
+    with io.open(
+        path, 'rt', encoding='utf-8-sig', errors='replace', newline='') as (
+            file_object):
+      first_line = file_object.readline()
+
+      column_names = next(csv.reader([first_line]), [])
+      column_names = [name.strip().lower() for name in column_names]
+
+      column_name = self._CSV_COLUMN_NAMES[self._hash_type]
+      if column_name in column_names:
+        column_index = column_names.index(column_name)
+        for row in csv.reader(file_object):
+          if len(row) > column_index:
+            yield row[column_index]
+
+      elif len(column_names) > 1:
+        raise IOError('Missing column: {0:s} in CSV file: {1:s}'.format(
+            column_name, path))
+
+      else:
+        yield first_line
+        for line in file_object:
+          yield line
+
+  def _ReadRun(self, file_object):
+    """Reads the digests of a sorted run.
+
+    Args:
+      file_object (file): file-like object of the sorted run.
+
+    Yields:
+      bytes: digest.
+    """
+    digest_size = self._digest_size
+    buffer_size = self._READ_BUFFER_SIZE - (
+        self._READ_BUFFER_SIZE % digest_size)
+
+    file_object.seek(0, os.SEEK_SET)
+    data = file_object.read(buffer_size)
+    while data:
+      for data_offset in range(0, len(data), digest_size):
+        yield data[data_offset:data_offset + digest_size]
+
+      data = file_object.read(buffer_size)
+
+  def _WriteRun(self, digests, temporary_directory):
+    """Writes a sorted run of digests to a temporary file.
+
+    Args:
+      digests (list[bytes]): digests.
+      temporary_directory (str): path of the directory for temporary files.
+
+    Returns:
+      file: file-like object of the sorted run.
+    """
+    file_object = tempfile.TemporaryFile(dir=temporary_directory)
+    file_object.write(b''.join(sorted(set(digests))))
+    return file_object
+
+  def Build(self, rds_paths, path, temporary_directory=None):
+    """Builds a hash set file.
+
+    Args:
+      rds_paths (list[str]): paths of the RDS files.
+      path (str): path of the hash set file.
+      temporary_directory (Optional[str]): path of the directory for temporary
+          files, where None represents the directory of the hash set file.
+
+    Returns:
+      int: number of digests in the hash set file.
+
+    Raises:
+      IOError: if the hash set file cannot be built.
+    """
+    if not temporary_directory:
+      temporary_directory = os.path.dirname(os.path.abspath(path))
+
+    self.number_of_invalid_digests = 0
+
+    run_file_objects = []
+    try:
+      digests = []
+      for rds_path in rds_paths:
+        logger.info('Reading digests from: {0:s}'.format(rds_path))
+
+        for value in self._ReadDigests(rds_path):
+          digest = self._GetDigest(value)
+          if not digest:
+            self.number_of_invalid_digests += 1
+            continue
+
+          digests.append(digest)
+          if len(digests) >= self._MAXIMUM_NUMBER_OF_DIGESTS_PER_RUN:
+            run_file_objects.append(
+                self._WriteRun(digests, temporary_directory))
+            digests = []
+
+      if digests or not run_file_objects:
+        run_file_objects.append(self._WriteRun(digests, temporary_directory))
+        digests = []
+
+      number_of_digests = 0
+      with open(path, 'wb') as file_object:
+        NsrlHashSetFile.WriteHeader(file_object, self._hash_type, 0)
+
+        last_digest = None
+        for digest in heapq.merge(*[
+            self._ReadRun(run_file_object)
+            for run_file_object in run_file_objects]):
+          if digest != last_digest:
+            file_object.write(digest)
+            last_digest = digest
+            number_of_digests += 1
+
+        file_object.seek(0, os.SEEK_SET)
+        NsrlHashSetFile.WriteHeader(
+            file_object, self._hash_type, number_of_digests)
+
+    except (IOError, OSError) as exception:
+      if os.path.exists(path):
+        os.remove(path)
+
+      raise IOError('Unable to build hash set file with error: {0!s}'.format(
+          exception))
+
+    finally:
+      for run_file_object in run_file_objects:
+        run_file_object.close()
+
+    if self.number_of_invalid_digests:
+      logger.warning('Ignored {0:d} invalid {1:s} digests.'.format(
+          self.number_of_invalid_digests, self._hash_type))
+
+    return number_of_digests
+
+
+class NsrlAnalyzer(hash_tagging.HashAnalyzer):
+  """Analyzes file hashes by looking them up in a local NSRL hash set file.
+
+  Attributes:
+    analyses_performed (int): number of analysis batches completed by this
+        analyzer.
+    hashes_per_batch (int): maximum number of hashes to analyze at once.
+    seconds_spent_analyzing (int): number of seconds this analyzer has spent
+        performing analysis (as opposed to waiting on queues, etc.)
+    wait_after_analysis (int): number of seconds the analyzer will sleep for
+        after analyzing a batch of hashes.
+  """
+
+  SUPPORTED_HASHES = ['md5', 'sha1', 'sha256']
+
+  def __init__(self, hash_queue, hash_analysis_queue, **kwargs):
+    """Initializes a NSRL analyzer thread.
+
+    Args:
+      hash_queue (Queue.queue): contains hashes to be analyzed.
+      hash_analysis_queue (Queue.queue): that the analyzer will append
+          HashAnalysis objects this queue.
+    """
+    super(NsrlAnalyzer, self).__init__(
+        hash_queue, hash_analysis_queue, **kwargs)
+    self._hash_set_file = None
+    self._hash_set_path = None
+    self.hashes_per_batch = 10000
+
+  def _OpenHashSetFile(self):
+    """Opens the hash set file.
+
+    Returns:
+      NsrlHashSetFile: hash set file.
+
+    Raises:
+      IOError: if the hash set file cannot be opened or does not contain
+          digests of the lookup hash.
+    """
+    if not self._hash_set_path:
+      raise IOError('Missing hash set file.')
+
+    hash_set_file = NsrlHashSetFile()
+    hash_set_file.Open(self._hash_set_path)
+
+    if hash_set_file.hash_type != self.lookup_hash:
+      hash_set_file.Close()
+      raise IOError((
+          'Hash set file contains {0:s} digests instead of {1:s} '
+          'digests.').format(hash_set_file.hash_type, self.lookup_hash))
+
+    return hash_set_file
+
+  def Analyze(self, hashes):
+    """Looks up hashes in the NSRL hash set file.
+
+    Args:
+      hashes (list[str]): hash values to look up.
+
+    Returns:
+      list[HashAnalysis]: analysis results, or an empty list on error.
+    """
+    if not self._hash_set_file:
+      try:
+        self._hash_set_file = self._OpenHashSetFile()
+      except (IOError, OSError, ValueError) as exception:
+        logger.error('Unable to open hash set file with error: {0!s}'.format(
+            exception))
+        self.SignalAbort()
+        return []
+
+    return [
+        hash_tagging.HashAnalysis(
+            digest, self._hash_set_file.HasDigest(digest.lower()))
+        for digest in hashes]
+
+  # This method is part of the threading.Thread interface, hence its name does
+  # not follow the style guide.
+  def run(self):
+    """The method called by the threading library to start the thread."""
+    try:
+      super(NsrlAnalyzer, self).run()
+
+    finally:
+      if self._hash_set_file:
+        self._hash_set_file.Close()
+        self._hash_set_file = None
+
+  # pylint: disable=unused-argument
+  def SetHashAnalysisCache(self, cache, analyzer_name):
+    """Sets the hash analysis cache.
+
+    The NSRL analyzer does not use the hash analysis cache, since looking up
+    hashes in the hash set file is faster than looking them up in the cache,
+    and a cached result does not reflect a hash set file that was replaced.
+
+    Args:
+      cache (HashAnalysisCache): hash analysis cache, that is opened by
+          the analyzer thread.
+      analyzer_name (str): name that identifies the results of the analyzer
+          in the cache.
+    """
+
+  def SetHashSetPath(self, path):
+    """Sets the path of the hash set file.
+
+    Args:
+      path (str): path of the hash set file.
+
+    Raises:
+      IOError: if the hash set file cannot be opened or does not contain
+          digests of the lookup hash.
+    """
+    self._hash_set_path = path
+
+    # The hash set file is opened by the analyzer thread, here it is only
+    # opened to check that it can be used.
+    hash_set_file = self._OpenHashSetFile()
+    hash_set_file.Close()
+
+
+class NsrlAnalysisPlugin(hash_tagging.HashTaggingAnalysisPlugin):
+  """Analysis plugin for looking up hashes in a local NSRL hash set file."""
+
+  # The NSRL contains files of all different types and look ups in the local
+  # hash set file are cheap, so look up all files.
+  DATA_TYPES = ['fs:stat', 'fs:stat:ntfs']
+
+  NAME = 'nsrl'
+
+  def __init__(self):
+    """Initializes a NSRL analysis plugin."""
+    super(NsrlAnalysisPlugin, self).__init__(NsrlAnalyzer)
+    self._label = None
+
+  def GenerateLabels(self, hash_information):
+    """Generates a list of strings that will be used in the event tag.
+
+    Args:
+      hash_information (bool): whether the hash was present in the NSRL hash
+          set file.
+
+    Returns:
+      list[str]: strings describing the results from the NSRL hash set file.
+    """
+    if hash_information:
+      return [self._label]
+
+    return []
+
+  def SetHashSetPath(self, path):
+    """Sets the path of the hash set file.
+
+    Args:
+      path (str): path of the hash set file.
+
+    Raises:
+      IOError: if the hash set file cannot be opened or does not contain
+          digests of the lookup hash.
+    """
+    self._analyzer.SetHashSetPath(path)
+
+  def SetLabel(self, label):
+    """Sets the tagging label.
+
+    Args:
+      label (str): label to apply to events extracted from files that are
+          present in the NSRL hash set file.
+    """
+    self._label = label
+
+
+manager.AnalysisPluginManager.RegisterPlugin(NsrlAnalysisPlugin)
@@ -11,6 +11,10 @@ from plaso.analysis import manager
 class NsrlsvrAnalyzer(hash_tagging.HashAnalyzer):
   """Analyzes file hashes by consulting an nsrlsvr instance.
 
+  A batch of hashes is looked up in multiple queries of at most
+  _HASHES_PER_QUERY hashes, that are sent to nsrlsvr before their responses
+  are read, using a connection that is kept open between batches.
+
   Attributes:
     analyses_performed (int): number of analysis batches completed by this
         analyzer.
@@ -20,6 +24,7 @@ class NsrlsvrAnalyzer(hash_tagging.HashAnalyzer):
     wait_after_analysis (int): number of seconds the analyzer will sleep for
         after analyzing a batch of hashes.
   """
+  _HASHES_PER_QUERY = 100
   _RECEIVE_BUFFER_SIZE = 4096
   _SOCKET_TIMEOUT = 3
 
@@ -37,7 +42,17 @@ class NsrlsvrAnalyzer(hash_tagging.HashAnalyzer):
         hash_queue, hash_analysis_queue, **kwargs)
     self._host = None
     self._port = None
-    self.hashes_per_batch = 100
+    self._socket = None
+    self.hashes_per_batch = 1000
+
+  def _CloseSocket(self):
+    """Closes the connection to the nsrlsvr instance."""
+    if self._socket:
+      self._socket.close()
+      self._socket = None
+
+      logger.debug('Closed connection to {0:s}:{1:d}'.format(
+          self._host, self._port))
 
   def _GetSocket(self):
     """Establishes a connection to an nsrlsvr instance.
@@ -54,40 +69,72 @@ class NsrlsvrAnalyzer(hash_tagging.HashAnalyzer):
       logger.error('Unable to connect to nsrlsvr with error: {0!s}.'.format(
           exception))
 
-  def _QueryHash(self, nsrl_socket, digest):
-    """Queries nsrlsvr for a specific hash.
+  def _QueryHashes(self, nsrl_socket, hashes):
+    """Queries nsrlsvr for hashes.
+
+    The hashes are sent in multiple queries, of at most _HASHES_PER_QUERY
+    hashes each, before the responses are read.
 
     Args:
       nsrl_socket (socket._socketobject): socket of connection to nsrlsvr.
-      digest (str): hash to look up.
+      hashes (list[str]): hashes to look up.
 
     Returns:
-      bool: True if the hash was found, False if not or None on error.
+      list[bool]: per hash True if the hash was found, False if not or None
+          on error.
     """
-    try:
-      query = 'QUERY {0:s}\n'.format(digest).encode('ascii')
-    except UnicodeDecodeError:
-      logger.error('Unable to encode digest: {0!s} to ASCII.'.format(digest))
-      return False
+    queries = []
+    for hash_index in range(0, len(hashes), self._HASHES_PER_QUERY):
+      query_hashes = hashes[hash_index:hash_index + self._HASHES_PER_QUERY]
+      try:
+        query = 'QUERY {0:s}\n'.format(' '.join(query_hashes)).encode('ascii')
+      except UnicodeEncodeError:
+        logger.error('Unable to encode digests: {0!s} to ASCII.'.format(
+            query_hashes))
+        return None
 
-    response = None
+      queries.append(query)
+
+    responses = []
 
     try:
-      nsrl_socket.sendall(query)
-      response = nsrl_socket.recv(self._RECEIVE_BUFFER_SIZE)
+      nsrl_socket.sendall(b''.join(queries))
+
+      data = b''
+      while data.count(b'\n') < len(queries):
+        received_data = nsrl_socket.recv(self._RECEIVE_BUFFER_SIZE)
+        if not received_data:
+          break
+        data = b''.join([data, received_data])
+
+      responses = data.split(b'\n')[:len(queries)]
 
     except socket.error as exception:
       logger.error('Unable to query nsrlsvr with error: {0!s}.'.format(
           exception))
 
-    if not response:
-      return False
+    if len(responses) != len(queries):
+      return None
+
+    results = []
+    for response in responses:
+      # Strip end-of-line characters since they can differ per platform on
+      # which nsrlsvr is running.
+      response = response.strip()
 
-    # Strip end-of-line characters since they can differ per platform on which
-    # nsrlsvr is running.
-    response = response.strip()
-    # nsrlsvr returns "OK 1" if the has was found or "OK 0" if not.
-    return response == b'OK 1'
+      # nsrlsvr returns "OK " followed by "1" per hash that was found and "0"
+      # per hash that was not.
+      if not response.startswith(b'OK '):
+        logger.error('Unsupported nsrlsvr response: {0!s}.'.format(response))
+        return None
+
+      results.extend(value == ord('1') for value in response[3:])
+
+    if len(results) != len(hashes):
+      logger.error('Number of results in nsrlsvr responses does not match.')
+      return None
+
+    return results
 
   def Analyze(self, hashes):
     """Looks up hashes in nsrlsvr.
@@ -98,29 +145,43 @@ class NsrlsvrAnalyzer(hash_tagging.HashAnalyzer):
     Returns:
       list[HashAnalysis]: analysis results, or an empty list on error.
     """
-    logger.debug('Opening connection to {0:s}:{1:d}'.format(
-        self._host, self._port))
-
-    nsrl_socket = self._GetSocket()
-    if not nsrl_socket:
-      self.SignalAbort()
+    if not self._socket:
+      logger.debug('Opening connection to {0:s}:{1:d}'.format(
+          self._host, self._port))
+
+      self._socket = self._GetSocket()
+      if not self._socket:
+        self.SignalAbort()
+        return []
+
+    results = self._QueryHashes(self._socket, hashes)
+    if results is None:
+      # Reconnect on the next batch, since the state of the connection is
+      # unknown.
+      self._CloseSocket()
       return []
 
-    hash_analyses = []
-    for digest in hashes:
-      response = self._QueryHash(nsrl_socket, digest)
-      if response is None:
-        continue
+    return [
+        hash_tagging.HashAnalysis(digest, result)
+        for digest, result in zip(hashes, results)]
 
-      hash_analysis = hash_tagging.HashAnalysis(digest, response)
-      hash_analyses.append(hash_analysis)
+  def GetHashSourceIdentifier(self):
+    """Retrieves an identifier of the source the analyzer looks up hashes in.
 
-    nsrl_socket.close()
+    Returns:
+      str: host and port of the nsrlsvr instance.
+    """
+    return '{0!s}:{1!s}'.format(self._host, self._port)
 
-    logger.debug('Closed connection to {0:s}:{1:d}'.format(
-        self._host, self._port))
+  # This method is part of the threading.Thread interface, hence its name does
+  # not follow the style guide.
+  def run(self):
+    """The method called by the threading library to start the thread."""
+    try:
+      super(NsrlsvrAnalyzer, self).run()
 
-    return hash_analyses
+    finally:
+      self._CloseSocket()
 
   def SetHost(self, host):
     """Sets the address or hostname of the server running nsrlsvr.
@@ -148,14 +209,14 @@ class NsrlsvrAnalyzer(hash_tagging.HashAnalyzer):
     Returns:
       bool: True if nsrlsvr instance is reachable.
     """
-    response = None
+    results = None
     nsrl_socket = self._GetSocket()
     if nsrl_socket:
-      response = self._QueryHash(
-          nsrl_socket, 'd41d8cd98f00b204e9800998ecf8427e')
+      results = self._QueryHashes(
+          nsrl_socket, ['d41d8cd98f00b204e9800998ecf8427e'])
       nsrl_socket.close()
 
-    return response is not None
+    return results is not None
 
 
 class NsrlsvrAnalysisPlugin(hash_tagging.HashTaggingAnalysisPlugin):
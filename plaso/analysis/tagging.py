@@ -11,10 +11,12 @@ class TaggingAnalysisPlugin(interface.AnalysisPlugin):
 
   NAME = 'tagging'
 
+  SHARDABLE = True
+
   def __init__(self):
     """Initializes a tagging analysis plugin."""
     super(TaggingAnalysisPlugin, self).__init__()
-    self._tagging_rules = None
+    self._tagging_rule_index = None
 
   def ExamineEvent(self, mediator, event, event_data, event_data_stream):
     """Labels events according to the rules in a tagging file.
@@ -26,14 +28,10 @@ class TaggingAnalysisPlugin(interface.AnalysisPlugin):
       event_data (EventData): event data.
       event_data_stream (EventDataStream): event data stream.
     """
-    matched_label_names = []
-    for label_name, filter_objects in self._tagging_rules.items():
-      for filter_object in filter_objects:
-        # Note that tagging events based on existing labels is currently
-        # not supported.
-        if filter_object.Match(event, event_data, event_data_stream, None):
-          matched_label_names.append(label_name)
-          break
+    # Note that tagging events based on existing labels is currently
+    # not supported.
+    matched_label_names = self._tagging_rule_index.GetMatchingLabels(
+        event, event_data, event_data_stream, None)
 
     if matched_label_names:
       event_tag = self._CreateEventTag(event, matched_label_names)
@@ -45,14 +43,17 @@ class TaggingAnalysisPlugin(interface.AnalysisPlugin):
 
       self._analysis_counter['event_tags'] += 1
 
-  def SetAndLoadTagFile(self, tagging_file_path):
+  def SetAndLoadTagFile(self, tagging_file_path, cache=None):
     """Sets the tagging file to be used by the plugin.
 
     Args:
       tagging_file_path (str): path of the tagging file.
+      cache (Optional[CompiledFilterCache]): cache of compiled filters, where
+          None represents the tagging rules are always compiled.
     """
-    tagging_file_object = tagging_file.TaggingFile(tagging_file_path)
-    self._tagging_rules = tagging_file_object.GetEventTaggingRules()
+    tagging_file_object = tagging_file.TaggingFile(
+        tagging_file_path, cache=cache)
+    self._tagging_rule_index = tagging_file_object.GetEventTaggingRuleIndex()
 
 
 manager.AnalysisPluginManager.RegisterPlugin(TaggingAnalysisPlugin)
@@ -17,6 +17,8 @@ class UniqueDomainsVisitedPlugin(interface.AnalysisPlugin):
 
   NAME = 'unique_domains_visited'
 
+  SHARDABLE = True
+
   _SUPPORTED_EVENT_DATA_TYPES = frozenset([
       'chrome:history:file_downloaded',
       'chrome:history:page_visited',
@@ -80,6 +80,27 @@ class ViperAnalyzer(hash_tagging.HTTPHashAnalyzer):
 
     return hash_analyses
 
+  def GetHashSourceIdentifier(self):
+    """Retrieves an identifier of the source the analyzer looks up hashes in.
+
+    Returns:
+      str: protocol, host and port of the Viper server.
+    """
+    return '{0!s}://{1!s}:{2!s}'.format(self._protocol, self._host, self._port)
+
+  def IsNegativeHashInformation(self, hash_information):
+    """Determines if hash information indicates the hash is not known.
+
+    Args:
+      hash_information (dict[str, object]): JSON decoded contents of the result
+          of a Viper lookup.
+
+    Returns:
+      bool: True if the hash information indicates the hash is not known to
+          Viper.
+    """
+    return not hash_information or not any(hash_information.values())
+
   def SetHost(self, host):
     """Sets the address or hostname of the server running Viper server.
 
@@ -31,6 +31,10 @@ class VirusTotalAnalyzer(hash_tagging.HTTPHashAnalyzer):
     self._api_key = None
     self._checked_for_old_python_version = False
 
+    # The VirusTotal API supports looking up at most 25 hashes per request
+    # with a private API key.
+    self.hashes_per_batch = 25
+
   def _QueryHashes(self, digests):
     """Queries VirusTotal for a specfic hashes.
 
@@ -86,6 +90,27 @@ class VirusTotalAnalyzer(hash_tagging.HTTPHashAnalyzer):
 
     return hash_analyses
 
+  def GetHashSourceIdentifier(self):
+    """Retrieves an identifier of the source the analyzer looks up hashes in.
+
+    Returns:
+      str: URL of the VirusTotal API.
+    """
+    return self._VIRUSTOTAL_API_REPORT_URL
+
+  def IsNegativeHashInformation(self, hash_information):
+    """Determines if hash information indicates the hash is not known.
+
+    Args:
+      hash_information (dict[str, object]): JSON decoded contents of the result
+          of a VirusTotal lookup.
+
+    Returns:
+      bool: True if the hash information indicates the hash is not known to
+          VirusTotal or its analysis is pending.
+    """
+    return hash_information.get('response_code', None) != 1
+
   def SetAPIKey(self, api_key):
     """Sets the VirusTotal API key to use in queries.
 
@@ -61,6 +61,7 @@ class ExtractionTool(
         input_reader=input_reader, output_writer=output_writer)
     self._artifacts_registry = None
     self._buffer_size = 0
+    self._filter_cache_path = None
     self._parser_filter_expression = None
     self._preferred_time_zone = None
     self._preferred_year = None
@@ -74,6 +75,7 @@ class ExtractionTool(
     self._single_process_mode = False
     self._storage_file_path = None
     self._storage_format = definitions.STORAGE_FORMAT_SQLITE
+    self._tagging_file_path = None
     self._task_storage_format = definitions.STORAGE_FORMAT_SQLITE
     self._temporary_directory = None
     self._text_prepend = None
@@ -154,6 +156,7 @@ class ExtractionTool(
     configuration.extraction.process_compressed_streams = (
         self._process_compressed_streams)
     configuration.extraction.yara_rules_string = self._yara_rules_string
+    configuration.filter_cache_path = self._filter_cache_path
     configuration.filter_file = self._filter_file
     configuration.log_filename = self._log_file
     configuration.parser_filter_expression = parser_filter_expression
@@ -161,6 +164,7 @@ class ExtractionTool(
     configuration.profiling.directory = self._profiling_directory
     configuration.profiling.sample_rate = self._profiling_sample_rate
     configuration.profiling.profilers = self._profilers
+    configuration.tagging_file = self._tagging_file_path
     configuration.task_storage_format = self._task_storage_format
     configuration.temporary_directory = self._temporary_directory
 
@@ -11,9 +11,13 @@ from plaso.cli.helpers import elastic_output
 from plaso.cli.helpers import elastic_ts_output
 from plaso.cli.helpers import event_filters
 from plaso.cli.helpers import extraction
+from plaso.cli.helpers import filter_cache
 from plaso.cli.helpers import filter_file
+from plaso.cli.helpers import hash_analysis_cache
 from plaso.cli.helpers import hashers
+from plaso.cli.helpers import json_line_raw_output
 from plaso.cli.helpers import language
+from plaso.cli.helpers import nsrl_analysis
 from plaso.cli.helpers import nsrlsvr_analysis
 from plaso.cli.helpers import output_modules
 from plaso.cli.helpers import parsers
@@ -24,6 +28,7 @@ from plaso.cli.helpers import status_view
 from plaso.cli.helpers import storage_file
 from plaso.cli.helpers import storage_format
 from plaso.cli.helpers import tagging_analysis
+from plaso.cli.helpers import tagging_file
 from plaso.cli.helpers import temporary_directory
 from plaso.cli.helpers import text_prepend
 from plaso.cli.helpers import timesketch_output
@@ -33,6 +33,22 @@ class AnalysisPluginsArgumentsHelper(interface.ArgumentsHelper):
             'A comma separated list of analysis plugin names to be loaded '
             'or "--analysis list" to see a list of available plugins.'))
 
+    argument_group.add_argument(
+        '--analysis_shards', '--analysis-shards', metavar='NUMBER',
+        dest='analysis_shards', default=1, action='store', type=int, help=(
+            'Number of analysis processes to run per loaded analysis plugin '
+            'that supports it, such as "tagging", where every process '
+            'analyzes part of the events. The default is 1.'))
+
+    argument_group.add_argument(
+        '--inline_analysis', '--inline-analysis', metavar='PLUGIN_LIST',
+        dest='inline_analysis_plugins', default='', action='store', type=str,
+        help=(
+            'A comma separated list of names of the loaded analysis plugins '
+            'that should be run inline, in the main process, instead of in '
+            'a separate analysis process. This is intended for analysis '
+            'plugins that do little work per event, such as "tagging".'))
+
     arguments = sys.argv[1:]
     argument_index = 0
 
@@ -45,8 +61,11 @@ class AnalysisPluginsArgumentsHelper(interface.ArgumentsHelper):
       names = None
 
     if names and names != ['list']:
+      # The hash analysis cache arguments apply to all the hash tagging
+      # analysis plugins.
       manager.ArgumentHelperManager.AddCommandLineArguments(
-          argument_group, category='analysis', names=names)
+          argument_group, category='analysis',
+          names=names + ['hash_analysis_cache'])
 
   @classmethod
   def ParseOptions(cls, options, configuration_object):
@@ -59,7 +78,8 @@ class AnalysisPluginsArgumentsHelper(interface.ArgumentsHelper):
 
     Raises:
       BadConfigObject: when the configuration object is of the wrong type.
-      BadConfigOption: when non-existing analysis plugins are specified.
+      BadConfigOption: when non-existing analysis plugins are specified or
+          the number of analysis shards is invalid.
     """
     if not isinstance(configuration_object, tools.CLITool):
       raise errors.BadConfigObject(
@@ -77,7 +97,36 @@ class AnalysisPluginsArgumentsHelper(interface.ArgumentsHelper):
             'Non-existent analysis plugins specified: {0:s}'.format(
                 ' '.join(difference)))
 
+    inline_analysis_plugins = cls._ParseStringOption(
+        options, 'inline_analysis_plugins')
+
+    if inline_analysis_plugins:
+      inline_analysis_plugins = [
+          name.strip() for name in inline_analysis_plugins.split(',')]
+
+      if not isinstance(analysis_plugins, list):
+        difference = set(inline_analysis_plugins)
+      else:
+        difference = set(inline_analysis_plugins).difference(analysis_plugins)
+
+      if difference:
+        raise errors.BadConfigOption(
+            'Inline analysis plugins specified that are not loaded: '
+            '{0:s}'.format(' '.join(difference)))
+
+    number_of_analysis_shards = cls._ParseNumericOption(
+        options, 'analysis_shards', default_value=1)
+    if number_of_analysis_shards < 1:
+      raise errors.BadConfigOption(
+          'Invalid number of analysis shards value out of bounds.')
+
     setattr(configuration_object, '_analysis_plugins', analysis_plugins)
+    setattr(
+        configuration_object, '_inline_analysis_plugins',
+        inline_analysis_plugins or [])
+    setattr(
+        configuration_object, '_number_of_analysis_shards',
+        number_of_analysis_shards)
 
 
 manager.ArgumentHelperManager.RegisterHelper(AnalysisPluginsArgumentsHelper)
@@ -32,6 +32,8 @@ class ElasticSearchOutputArgumentsHelper(interface.ArgumentsHelper):
 
   _DEFAULT_INDEX_NAME = uuid4().hex
   _DEFAULT_FLUSH_INTERVAL = 1000
+  _DEFAULT_BULK_REQUESTS = 2
+  _DEFAULT_BULK_SIZE = 10 * 1024 * 1024
   _DEFAULT_RAW_FIELDS = False
 
   _DEFAULT_FIELDS = [
@@ -59,6 +61,21 @@ class ElasticSearchOutputArgumentsHelper(interface.ArgumentsHelper):
         action='store', default=cls._DEFAULT_FLUSH_INTERVAL, metavar='INTERVAL',
         help='Events to queue up before bulk insert to ElasticSearch.')
 
+    argument_group.add_argument(
+        '--bulk_requests', '--bulk-requests', dest='bulk_requests', type=int,
+        action='store', default=cls._DEFAULT_BULK_REQUESTS, metavar='NUMBER',
+        help=(
+            'Maximum number of bulk inserts to ElasticSearch that run '
+            'concurrently, the default is {0:d}.').format(
+                cls._DEFAULT_BULK_REQUESTS))
+
+    argument_group.add_argument(
+        '--bulk_size', '--bulk-size', dest='bulk_size', type=int,
+        action='store', default=cls._DEFAULT_BULK_SIZE, metavar='SIZE', help=(
+            'Maximum size in bytes of the events in a bulk insert to '
+            'ElasticSearch, the default is {0:d}.').format(
+                cls._DEFAULT_BULK_SIZE))
+
     argument_group.add_argument(
         '--raw_fields', '--raw-fields', dest='raw_fields', action='store_true',
         default=cls._DEFAULT_RAW_FIELDS, help=(
@@ -128,6 +145,18 @@ class ElasticSearchOutputArgumentsHelper(interface.ArgumentsHelper):
         options, 'index_name', default_value=cls._DEFAULT_INDEX_NAME)
     flush_interval = cls._ParseNumericOption(
         options, 'flush_interval', default_value=cls._DEFAULT_FLUSH_INTERVAL)
+    bulk_requests = cls._ParseNumericOption(
+        options, 'bulk_requests', default_value=cls._DEFAULT_BULK_REQUESTS)
+    bulk_size = cls._ParseNumericOption(
+        options, 'bulk_size', default_value=cls._DEFAULT_BULK_SIZE)
+
+    if bulk_requests < 1:
+      raise errors.BadConfigOption(
+          'Invalid number of bulk requests: {0:d}.'.format(bulk_requests))
+
+    if bulk_size < 1:
+      raise errors.BadConfigOption(
+          'Invalid bulk size: {0:d}.'.format(bulk_size))
 
     fields = ','.join(cls._DEFAULT_FIELDS)
     additional_fields = cls._ParseStringOption(options, 'additional_fields')
@@ -160,6 +189,7 @@ class ElasticSearchOutputArgumentsHelper(interface.ArgumentsHelper):
 
     output_module.SetIndexName(index_name)
     output_module.SetFlushInterval(flush_interval)
+    output_module.SetBulkRequestOptions(bulk_requests, bulk_size)
     output_module.SetFields([
         field_name.strip() for field_name in fields.split(',')])
 
@@ -7,6 +7,7 @@ from plaso.cli import time_slices
 from plaso.cli import tools
 from plaso.cli.helpers import interface
 from plaso.cli.helpers import manager
+from plaso.filters import compiled_cache
 from plaso.filters import event_filter
 from plaso.lib import errors
 
@@ -87,10 +88,15 @@ class EventFiltersArgumentsHelper(interface.ArgumentsHelper):
 
     filter_object = None
     if filter_expression:
+      filter_cache = None
+      filter_cache_path = cls._ParseStringOption(options, 'filter_cache')
+      if filter_cache_path:
+        filter_cache = compiled_cache.CompiledFilterCache(filter_cache_path)
+
       filter_object = event_filter.EventObjectFilter()
 
       try:
-        filter_object.CompileFilter(filter_expression)
+        filter_object.CompileFilter(filter_expression, cache=filter_cache)
       except errors.ParseError as exception:
         raise errors.BadConfigOption((
             'Unable to compile filter expression with error: '
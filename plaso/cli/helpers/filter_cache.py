@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""The compiled filter cache CLI arguments helper."""
+
+import os
+
+from plaso.cli import tools
+from plaso.cli.helpers import interface
+from plaso.cli.helpers import manager
+from plaso.lib import errors
+
+
+class FilterCacheArgumentsHelper(interface.ArgumentsHelper):
+  """Compiled filter cache CLI arguments helper."""
+
+  NAME = 'filter_cache'
+  DESCRIPTION = 'Compiled filter cache command line arguments.'
+
+  @classmethod
+  def AddArguments(cls, argument_group):
+    """Adds command line arguments to an argument group.
+
+    This function takes an argument parser or an argument group object and adds
+    to it all the command line arguments this helper supports.
+
+    Args:
+      argument_group (argparse._ArgumentGroup|argparse.ArgumentParser):
+          argparse group.
+    """
+    argument_group.add_argument(
+        '--filter_cache', '--filter-cache', dest='filter_cache', type=str,
+        metavar='DIRECTORY', action='store', default=None, help=(
+            'Path of a directory to cache compiled event filters and tagging '
+            'rules in, so that later runs and other processes do not need '
+            'to compile them again. Compiled filters are only used for '
+            'the same filter expression or tagging file contents and the '
+            'same version of plaso.'))
+
+  @classmethod
+  def ParseOptions(cls, options, configuration_object):
+    """Parses and validates options.
+
+    Args:
+      options (argparse.Namespace): parser options.
+      configuration_object (CLITool): object to be configured by the argument
+          helper.
+
+    Raises:
+      BadConfigObject: when the configuration object is of the wrong type.
+      BadConfigOption: when the filter cache path is not a directory.
+    """
+    if not isinstance(configuration_object, tools.CLITool):
+      raise errors.BadConfigObject(
+          'Configuration object is not an instance of CLITool')
+
+    filter_cache_path = cls._ParseStringOption(options, 'filter_cache')
+
+    if filter_cache_path and os.path.exists(filter_cache_path) and (
+        not os.path.isdir(filter_cache_path)):
+      raise errors.BadConfigOption(
+          'Filter cache: {0:s} is not a directory.'.format(filter_cache_path))
+
+    setattr(configuration_object, '_filter_cache_path', filter_cache_path)
+
+
+manager.ArgumentHelperManager.RegisterHelper(FilterCacheArgumentsHelper)
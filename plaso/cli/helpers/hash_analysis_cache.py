@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""The hash analysis cache CLI arguments helper."""
+
+from plaso.analysis import hash_cache
+from plaso.analysis import hash_tagging
+from plaso.cli.helpers import interface
+from plaso.cli.helpers import manager
+from plaso.lib import errors
+
+
+class HashAnalysisCacheArgumentsHelper(interface.ArgumentsHelper):
+  """Hash analysis cache CLI arguments helper."""
+
+  NAME = 'hash_analysis_cache'
+  CATEGORY = 'analysis'
+  DESCRIPTION = (
+      'Argument helper for the cache of the hash tagging analysis plugins.')
+
+  _DEFAULT_NEGATIVE_TIME_TO_LIVE = 1
+  _DEFAULT_TIME_TO_LIVE = 30
+
+  _SECONDS_PER_DAY = 24 * 60 * 60
+
+  @classmethod
+  def AddArguments(cls, argument_group):
+    """Adds command line arguments the helper supports to an argument group.
+
+    This function takes an argument parser or an argument group object and adds
+    to it all the command line arguments this helper supports.
+
+    Args:
+      argument_group (argparse._ArgumentGroup|argparse.ArgumentParser): group
+          to append arguments to.
+    """
+    argument_group.add_argument(
+        '--hash-cache', '--hash_cache', dest='hash_cache', type=str,
+        action='store', default=None, metavar='PATH', help=(
+            'Path of a file to cache the results of hash look ups of '
+            'the hash tagging analysis plugins, such as nsrlsvr and '
+            'virustotal, in. The cache is shared between runs and can be '
+            'shared between cases.'))
+
+    argument_group.add_argument(
+        '--hash-cache-negative-ttl', '--hash_cache_negative_ttl',
+        dest='hash_cache_negative_ttl', type=int, action='store',
+        default=cls._DEFAULT_NEGATIVE_TIME_TO_LIVE, metavar='DAYS', help=(
+            'Number of days cached results that indicate a hash is not known '
+            'remain valid, where 0 represents that these results are not '
+            'cached. The default is: {0:d}.').format(
+                cls._DEFAULT_NEGATIVE_TIME_TO_LIVE))
+
+    argument_group.add_argument(
+        '--hash-cache-ttl', '--hash_cache_ttl', dest='hash_cache_ttl',
+        type=int, action='store', default=cls._DEFAULT_TIME_TO_LIVE,
+        metavar='DAYS', help=(
+            'Number of days other cached results remain valid, where 0 '
+            'represents that these results are not cached. The default '
+            'is: {0:d}.').format(cls._DEFAULT_TIME_TO_LIVE))
+
+  # pylint: disable=arguments-differ
+  @classmethod
+  def ParseOptions(cls, options, analysis_plugin):
+    """Parses and validates options.
+
+    Args:
+      options (argparse.Namespace): parser options object.
+      analysis_plugin (HashTaggingAnalysisPlugin): analysis plugin to
+          configure.
+
+    Raises:
+      BadConfigObject: when the analysis plugin is the wrong type.
+      BadConfigOption: when the cache cannot be opened or the time to live
+          is invalid.
+    """
+    if not isinstance(
+        analysis_plugin, hash_tagging.HashTaggingAnalysisPlugin):
+      raise errors.BadConfigObject(
+          'Analysis plugin is not an instance of HashTaggingAnalysisPlugin')
+
+    path = cls._ParseStringOption(options, 'hash_cache')
+    if not path:
+      return
+
+    negative_time_to_live = cls._ParseNumericOption(
+        options, 'hash_cache_negative_ttl',
+        default_value=cls._DEFAULT_NEGATIVE_TIME_TO_LIVE)
+    time_to_live = cls._ParseNumericOption(
+        options, 'hash_cache_ttl', default_value=cls._DEFAULT_TIME_TO_LIVE)
+
+    if negative_time_to_live < 0 or time_to_live < 0:
+      raise errors.BadConfigOption(
+          'Invalid hash cache time to live value out of bounds.')
+
+    cache = hash_cache.HashAnalysisCache(
+        path, negative_time_to_live=(
+            negative_time_to_live * cls._SECONDS_PER_DAY),
+        time_to_live=time_to_live * cls._SECONDS_PER_DAY)
+
+    # The cache is opened here only to check that it can be used, since it is
+    # opened by the analyzer thread.
+    try:
+      cache.Open()
+    except IOError as exception:
+      raise errors.BadConfigOption(
+          'Unable to open hash cache: {0:s} with error: {1!s}'.format(
+              path, exception))
+
+    cache.Close()
+
+    analysis_plugin.SetHashAnalysisCache(cache)
+
+
+manager.ArgumentHelperManager.RegisterHelper(HashAnalysisCacheArgumentsHelper)
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""The raw JSON line output module CLI arguments helper."""
+
+from plaso.lib import errors
+from plaso.cli.helpers import interface
+from plaso.cli.helpers import manager
+from plaso.output import json_line_raw
+
+
+class JSONLineRawOutputArgumentsHelper(interface.ArgumentsHelper):
+  """Raw JSON line output module CLI arguments helper."""
+
+  NAME = 'json_line_raw'
+  CATEGORY = 'output'
+  DESCRIPTION = 'Argument helper for the raw JSON line output module.'
+
+  @classmethod
+  def AddArguments(cls, argument_group):
+    """Adds command line arguments the helper supports to an argument group.
+
+    This function takes an argument parser or an argument group object and adds
+    to it all the command line arguments this helper supports.
+
+    Args:
+      argument_group (argparse._ArgumentGroup|argparse.ArgumentParser):
+          argparse group.
+    """
+    argument_group.add_argument(
+        '--computed_fields', '--computed-fields', dest='computed_fields',
+        type=str, action='store', default='', help=(
+            'Defines computed fields, such as message, to be included in the '
+            'output, in addition to the events as stored. By default no '
+            'computed fields are included.'))
+
+  # pylint: disable=arguments-differ
+  @classmethod
+  def ParseOptions(cls, options, output_module):
+    """Parses and validates options.
+
+    Args:
+      options (argparse.Namespace): parser options.
+      output_module (OutputModule): output module to configure.
+
+    Raises:
+      BadConfigObject: when the output module object is of the wrong type.
+    """
+    if not isinstance(output_module, json_line_raw.JSONLineRawOutputModule):
+      raise errors.BadConfigObject(
+          'Output module is not an instance of JSONLineRawOutputModule')
+
+    computed_fields = cls._ParseStringOption(options, 'computed_fields')
+
+    field_names = []
+    if computed_fields:
+      field_names = [
+          field_name.strip() for field_name in computed_fields.split(',')]
+
+    output_module.SetFields(field_names)
+
+
+manager.ArgumentHelperManager.RegisterHelper(JSONLineRawOutputArgumentsHelper)
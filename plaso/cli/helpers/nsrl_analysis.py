@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""The NSRL analysis plugin CLI arguments helper."""
+
+import os
+
+from plaso.analysis import nsrl
+from plaso.cli import logger
+from plaso.cli.helpers import interface
+from plaso.cli.helpers import manager
+from plaso.lib import errors
+
+
+class NsrlAnalysisArgumentsHelper(interface.ArgumentsHelper):
+  """NSRL analysis plugin CLI arguments helper."""
+
+  NAME = 'nsrl'
+  CATEGORY = 'analysis'
+  DESCRIPTION = 'Argument helper for the NSRL analysis plugin.'
+
+  _DEFAULT_HASH = 'md5'
+  _DEFAULT_LABEL = 'nsrl_present'
+
+  @classmethod
+  def AddArguments(cls, argument_group):
+    """Adds command line arguments the helper supports to an argument group.
+
+    This function takes an argument parser or an argument group object and adds
+    to it all the command line arguments this helper supports.
+
+    Args:
+      argument_group (argparse._ArgumentGroup|argparse.ArgumentParser): group
+          to append arguments to.
+    """
+    argument_group.add_argument(
+        '--nsrl-hash', '--nsrl_hash', dest='nsrl_hash', type=str,
+        action='store', choices=nsrl.NsrlAnalyzer.SUPPORTED_HASHES,
+        default=cls._DEFAULT_HASH, metavar='HASH', help=(
+            'Type of hash to look up in the NSRL hash set file, the default '
+            'is: {0:s}. Supported options: {1:s}'.format(
+                cls._DEFAULT_HASH, ', '.join(
+                    nsrl.NsrlAnalyzer.SUPPORTED_HASHES))))
+
+    argument_group.add_argument(
+        '--nsrl-hash-set', '--nsrl_hash_set', dest='nsrl_hash_set', type=str,
+        action='store', default=None, metavar='PATH', help=(
+            'Path of the NSRL hash set file to look up hashes in. If the file '
+            'does not exist it is built from the NSRL RDS files specified by '
+            '--nsrl-rds.'))
+
+    argument_group.add_argument(
+        '--nsrl-label', '--nsrl_label', dest='nsrl_label', type=str,
+        action='store', default=cls._DEFAULT_LABEL, metavar='LABEL', help=(
+            'Label to apply to events, the default is: '
+            '{0:s}.').format(cls._DEFAULT_LABEL))
+
+    argument_group.add_argument(
+        '--nsrl-rds', '--nsrl_rds', dest='nsrl_rds', type=str,
+        action='append', default=None, metavar='PATH', help=(
+            'Path of a NSRL Reference Data Set (RDS) file to build the NSRL '
+            'hash set file from, such as NSRLFile.txt or a RDS version 3 '
+            'SQLite database. This option can be used multiple times.'))
+
+  # pylint: disable=arguments-differ
+  @classmethod
+  def ParseOptions(cls, options, analysis_plugin):
+    """Parses and validates options.
+
+    Args:
+      options (argparse.Namespace): parser options object.
+      analysis_plugin (NsrlAnalysisPlugin): analysis plugin to configure.
+
+    Raises:
+      BadConfigObject: when the analysis plugin is the wrong type.
+      BadConfigOption: when the NSRL hash set file is missing or cannot be
+          built or opened.
+    """
+    if not isinstance(analysis_plugin, nsrl.NsrlAnalysisPlugin):
+      raise errors.BadConfigObject(
+          'Analysis plugin is not an instance of NsrlAnalysisPlugin')
+
+    label = cls._ParseStringOption(
+        options, 'nsrl_label', default_value=cls._DEFAULT_LABEL)
+    analysis_plugin.SetLabel(label)
+
+    lookup_hash = cls._ParseStringOption(
+        options, 'nsrl_hash', default_value=cls._DEFAULT_HASH)
+    analysis_plugin.SetLookupHash(lookup_hash)
+
+    hash_set_path = cls._ParseStringOption(options, 'nsrl_hash_set')
+    if not hash_set_path:
+      raise errors.BadConfigOption('Missing NSRL hash set file.')
+
+    if not os.path.exists(hash_set_path):
+      rds_paths = getattr(options, 'nsrl_rds', None)
+      if not rds_paths:
+        raise errors.BadConfigOption((
+            'No such NSRL hash set file: {0:s} and no NSRL RDS files to build '
+            'it from.').format(hash_set_path))
+
+      for rds_path in rds_paths:
+        if not os.path.isfile(rds_path):
+          raise errors.BadConfigOption('No such NSRL RDS file: {0:s}'.format(
+              rds_path))
+
+      logger.info('Building NSRL hash set file: {0:s}'.format(hash_set_path))
+
+      builder = nsrl.NsrlHashSetFileBuilder(lookup_hash)
+      try:
+        number_of_digests = builder.Build(rds_paths, hash_set_path)
+      except IOError as exception:
+        raise errors.BadConfigOption((
+            'Unable to build NSRL hash set file: {0:s} with error: '
+            '{1!s}').format(hash_set_path, exception))
+
+      logger.info('Built NSRL hash set file with {0:d} {1:s} digests.'.format(
+          number_of_digests, lookup_hash))
+
+    try:
+      analysis_plugin.SetHashSetPath(hash_set_path)
+    except (IOError, OSError) as exception:
+      raise errors.BadConfigOption(
+          'Unable to open NSRL hash set file: {0:s} with error: {1!s}'.format(
+              hash_set_path, exception))
+
+
+manager.ArgumentHelperManager.RegisterHelper(NsrlAnalysisArgumentsHelper)
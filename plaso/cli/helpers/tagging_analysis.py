@@ -7,6 +7,7 @@ from plaso.lib import errors
 from plaso.cli.helpers import interface
 from plaso.cli.helpers import manager
 from plaso.analysis import tagging
+from plaso.filters import compiled_cache
 
 
 class TaggingAnalysisArgumentsHelper(interface.ArgumentsHelper):
@@ -64,8 +65,13 @@ class TaggingAnalysisArgumentsHelper(interface.ArgumentsHelper):
       raise errors.BadConfigOption(
           'No such tagging file: {0:s}.'.format(tagging_file))
 
+    filter_cache = None
+    filter_cache_path = cls._ParseStringOption(options, 'filter_cache')
+    if filter_cache_path:
+      filter_cache = compiled_cache.CompiledFilterCache(filter_cache_path)
+
     try:
-      analysis_plugin.SetAndLoadTagFile(tagging_file_path)
+      analysis_plugin.SetAndLoadTagFile(tagging_file_path, cache=filter_cache)
 
     except UnicodeDecodeError:
       raise errors.BadConfigOption(
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""The tagging file CLI arguments helper."""
+
+import os
+
+from plaso.cli import tools
+from plaso.cli.helpers import interface
+from plaso.cli.helpers import manager
+from plaso.engine import tagging_file as engine_tagging_file
+from plaso.filters import compiled_cache
+from plaso.lib import errors
+
+
+class TaggingFileArgumentsHelper(interface.ArgumentsHelper):
+  """Tagging file CLI arguments helper."""
+
+  NAME = 'tagging_file'
+  DESCRIPTION = 'Tagging file command line arguments.'
+
+  @classmethod
+  def AddArguments(cls, argument_group):
+    """Adds command line arguments to an argument group.
+
+    This function takes an argument parser or an argument group object and adds
+    to it all the command line arguments this helper supports.
+
+    Args:
+      argument_group (argparse._ArgumentGroup|argparse.ArgumentParser):
+          argparse group.
+    """
+    argument_group.add_argument(
+        '--tagging_file', '--tagging-file', dest='tagging_file', type=str,
+        metavar='PATH', action='store', help=(
+            'Path to a file containing tagging rules, with which the events '
+            'are tagged during extraction.'))
+
+  @classmethod
+  def ParseOptions(cls, options, configuration_object):
+    """Parses and validates options.
+
+    Args:
+      options (argparse.Namespace): parser options.
+      configuration_object (CLITool): object to be configured by the argument
+          helper.
+
+    Raises:
+      BadConfigObject: when the configuration object is of the wrong type.
+      BadConfigOption: when the tagging file cannot be read or parsed.
+    """
+    if not isinstance(configuration_object, tools.CLITool):
+      raise errors.BadConfigObject(
+          'Configuration object is not an instance of CLITool')
+
+    tagging_file = cls._ParseStringOption(options, 'tagging_file')
+
+    # Search the data location for the tagging file.
+    if tagging_file and not os.path.isfile(tagging_file):
+      data_location = getattr(configuration_object, '_data_location', None)
+      if data_location:
+        tagging_file_basename = os.path.basename(tagging_file)
+        tagging_file_path = os.path.join(data_location, tagging_file_basename)
+        if os.path.isfile(tagging_file_path):
+          tagging_file = tagging_file_path
+
+    if tagging_file:
+      if not os.path.isfile(tagging_file):
+        raise errors.BadConfigOption(
+            'No such tagging file: {0:s}.'.format(tagging_file))
+
+      filter_cache = None
+      filter_cache_path = cls._ParseStringOption(options, 'filter_cache')
+      if filter_cache_path:
+        filter_cache = compiled_cache.CompiledFilterCache(filter_cache_path)
+
+      # The tagging rules are compiled here, to check that they are valid. The
+      # path of the tagging file is passed along to the workers, that compile
+      # the tagging rules themselves or read them from the filter cache, which
+      # contains the tagging rules compiled here.
+      tagging_file_object = engine_tagging_file.TaggingFile(
+          tagging_file, cache=filter_cache)
+
+      try:
+        tagging_file_object.GetEventTaggingRuleIndex()
+
+      except UnicodeDecodeError:
+        raise errors.BadConfigOption(
+            'Invalid tagging file: {0:s} encoding must be UTF-8.'.format(
+                tagging_file))
+
+      except errors.TaggingFileError as exception:
+        raise errors.BadConfigOption(
+            'Unable to read tagging file: {0:s} with error: {1!s}'.format(
+                tagging_file, exception))
+
+    setattr(configuration_object, '_tagging_file_path', tagging_file)
+
+
+manager.ArgumentHelperManager.RegisterHelper(TaggingFileArgumentsHelper)
@@ -159,8 +159,8 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
         'extraction arguments')
 
     argument_helper_names = [
-        'artifact_filters', 'extraction', 'filter_file', 'hashers',
-        'parsers', 'yara_rules']
+        'artifact_filters', 'extraction', 'filter_cache', 'filter_file',
+        'hashers', 'parsers', 'tagging_file', 'yara_rules']
     helpers_manager.ArgumentHelperManager.AddCommandLineArguments(
         extraction_group, names=argument_helper_names)
 
@@ -315,11 +315,19 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
 
     argument_helper_names = [
         'artifact_definitions', 'artifact_filters', 'extraction',
-        'filter_file', 'status_view', 'storage_file', 'storage_format',
-        'text_prepend', 'yara_rules']
+        'filter_cache', 'filter_file', 'status_view', 'storage_file',
+        'storage_format', 'tagging_file', 'text_prepend', 'yara_rules']
     helpers_manager.ArgumentHelperManager.ParseOptions(
         options, self, names=argument_helper_names)
 
+    # Event tags in a Redis task storage do not preserve the identifier of
+    # their event and hence cannot be merged.
+    if (self._tagging_file_path and
+        self._task_storage_format == definitions.STORAGE_FORMAT_REDIS):
+      raise errors.BadConfigOption(
+          'Tagging events during extraction is not supported with the Redis '
+          'task storage format.')
+
     self._ParseLogFileOptions(options)
 
     self._ParseStorageMediaOptions(options)
@@ -3,6 +3,7 @@
 
 import argparse
 import collections
+import functools
 import os
 import time
 
@@ -23,12 +24,14 @@ from plaso.cli import tool_options
 from plaso.cli import tools
 from plaso.cli import views
 from plaso.cli.helpers import manager as helpers_manager
+from plaso.containers import exports
 from plaso.engine import configurations
 from plaso.engine import engine
 from plaso.engine import knowledge_base
 from plaso.lib import errors
 from plaso.lib import loggers
 from plaso.multi_processing import psort
+from plaso.output import dynamic
 from plaso.storage import factory as storage_factory
 
 
@@ -74,17 +77,25 @@ class PsortTool(
     self._deduplicate_events = True
     self._event_filter_expression = None
     self._event_filter = None
+    self._filter_cache_path = None
+    self._incremental = False
+    self._inline_analysis_plugins = []
     self._knowledge_base = knowledge_base.KnowledgeBase()
+    self._merge_storage_file_paths = []
     self._number_of_analysis_reports = 0
+    self._number_of_analysis_shards = 1
     self._output_time_zone = None
     self._preferred_language = 'en-US'
     self._process_memory_limit = None
+    self._single_pass = False
     self._status_view_mode = status_view.StatusView.MODE_WINDOW
     self._status_view = status_view.StatusView(self._output_writer, self.NAME)
     self._stdout_output_writer = isinstance(
         self._output_writer, tools.StdoutOutputWriter)
     self._storage_file_path = None
     self._temporary_directory = None
+    self._text_index = False
+    self._text_index_attribute_names = None
     self._time_slice = None
     self._use_time_slicer = False
     self._worker_memory_limit = None
@@ -128,6 +139,54 @@ class PsortTool(
           'Format of storage file: {0:s} not supported'.format(
               storage_file_path))
 
+  def _CheckMergeStorageFiles(self):
+    """Checks if the paths of the storage files to merge are valid.
+
+    Raises:
+      BadConfigOption: if a storage file path is invalid or if merging storage
+          files is combined with options that are not supported when merging.
+    """
+    if not self._merge_storage_file_paths:
+      return
+
+    if self._analysis_plugins:
+      raise errors.BadConfigOption(
+          'Analysis plugins not supported when merging storage files.')
+
+    if self._incremental:
+      raise errors.BadConfigOption(
+          'Incremental export not supported when merging storage files.')
+
+    for storage_file_path in self._merge_storage_file_paths:
+      if not os.path.isfile(storage_file_path):
+        raise errors.BadConfigOption(
+            'No such storage file: {0:s}.'.format(storage_file_path))
+
+      if not storage_factory.StorageFactory.CheckStorageFileHasSupportedFormat(
+          storage_file_path, check_readable_only=True):
+        raise errors.BadConfigOption(
+            'Format of storage file: {0:s} not supported'.format(
+                storage_file_path))
+
+  def _FormatTextIndexMessage(
+      self, field_formatting_helper, event_data, event_data_stream):
+    """Formats the message of event data to store in the text index.
+
+    Args:
+      field_formatting_helper (DynamicFieldFormattingHelper): field formatting
+          helper.
+      event_data (EventData): event data.
+      event_data_stream (EventDataStream): event data stream.
+
+    Returns:
+      str: message or None if not available.
+    """
+    try:
+      return field_formatting_helper.GetFormattedField(
+          'message', None, event_data, event_data_stream, None)
+    except (errors.NoFormatterFound, errors.WrongFormatter):
+      return None
+
   def _GetAnalysisPlugins(self, analysis_plugins_string):
     """Retrieves analysis plugins.
 
@@ -334,6 +393,103 @@ class PsortTool(
             '15.0 minutes. If a worker process exceeds this timeout it is '
             'killed by the main (foreman) process.'))
 
+  def _ReadExportWatermark(self, storage_reader):
+    """Reads the export watermark of the previous incremental export.
+
+    Args:
+      storage_reader (StorageReader): storage reader.
+
+    Returns:
+      tuple[ExportWatermark, int]: export watermark of the previous export to
+          the same output format, or None if not available, and the number of
+          events in the storage file.
+    """
+    export_watermark = None
+    for stored_export_watermark in storage_reader.GetExportWatermarks():
+      if stored_export_watermark.output_format == self._output_format:
+        export_watermark = stored_export_watermark
+
+    # The number of events is determined before the export, so that
+    # events added during the export are exported by the next run.
+    number_of_events = storage_reader.GetNumberOfEvents()
+
+    return export_watermark, number_of_events
+
+  def _WriteExportWatermark(self, session, number_of_events):
+    """Writes an export watermark to the storage file.
+
+    Args:
+      session (Session): session.
+      number_of_events (int): number of events in the storage file at the time
+          of the export.
+
+    Raises:
+      RuntimeError: if the storage writer cannot be created.
+    """
+    storage_writer = storage_factory.StorageFactory.CreateStorageWriterForFile(
+        session, self._storage_file_path)
+    if not storage_writer:
+      raise RuntimeError('Unable to create storage writer.')
+
+    export_watermark = exports.ExportWatermark(
+        event_row_identifier=number_of_events,
+        output_format=self._output_format,
+        timestamp=int(time.time() * 1000000))
+
+    storage_writer.Open()
+    try:
+      storage_writer.AddExportWatermark(export_watermark)
+    finally:
+      storage_writer.Close()
+
+  def _WriteTextIndex(self, session):
+    """Writes a text index of the event data to the storage file.
+
+    Storage files that do not support a text index, such as those created
+    with an older format version, are exported without a text index.
+
+    Args:
+      session (Session): session.
+
+    Raises:
+      BadConfigOption: if the text index cannot be written.
+      RuntimeError: if the storage writer cannot be created.
+    """
+    storage_writer = storage_factory.StorageFactory.CreateStorageWriterForFile(
+        session, self._storage_file_path)
+    if not storage_writer:
+      raise RuntimeError('Unable to create storage writer.')
+
+    storage_writer.Open()
+    try:
+      if not storage_writer.SupportsTextIndex():
+        logger.warning((
+            'Storage file: {0:s} does not support a text index, for example '
+            'since it was created with an older version of plaso. Events are '
+            'exported without a text index.').format(self._storage_file_path))
+        return
+
+      output_mediator = self._CreateOutputMediator()
+      self._ReadMessageFormatters(output_mediator)
+
+      # The message is formatted as in the message field of the dynamic output
+      # module.
+      field_formatting_helper = dynamic.DynamicFieldFormattingHelper(
+          output_mediator)
+      message_callback = functools.partial(
+          self._FormatTextIndexMessage, field_formatting_helper)
+
+      storage_writer.BuildTextIndex(
+          attribute_names=self._text_index_attribute_names,
+          message_callback=message_callback)
+
+    except IOError as exception:
+      raise errors.BadConfigOption(
+          'Unable to write text index with error: {0!s}'.format(exception))
+
+    finally:
+      storage_writer.Close()
+
   def ParseArguments(self, arguments):
     """Parses the command line arguments.
 
@@ -374,13 +530,23 @@ class PsortTool(
     filter_group = argument_parser.add_argument_group('Filter Arguments')
 
     helpers_manager.ArgumentHelperManager.AddCommandLineArguments(
-        filter_group, names=['event_filters'])
+        filter_group, names=['event_filters', 'filter_cache'])
 
     input_group = argument_parser.add_argument_group('Input Arguments')
 
     helpers_manager.ArgumentHelperManager.AddCommandLineArguments(
         input_group, names=['data_location'])
 
+    input_group.add_argument(
+        '--merge_storage_file', '--merge-storage-file', action='append',
+        dest='merge_storage_files', metavar='PATH', type=str, default=None,
+        help=(
+            'Path of an additional storage file of which the events should be '
+            'merged with those of the storage file into a single sorted and '
+            'deduplicated timeline. Every event is annotated with the path of '
+            'its storage file in the "storage_file" attribute. This option '
+            'can be specified multiple times.'))
+
     output_group = argument_parser.add_argument_group('Output Arguments')
 
     output_group.add_argument(
@@ -390,6 +556,41 @@ class PsortTool(
             'output. This parameter changes that behavior so all events '
             'are included.'))
 
+    output_group.add_argument(
+        '--incremental', dest='incremental', action='store_true',
+        default=False, help=(
+            'Only export the events that were added to the storage file, '
+            'for example by subsequent extraction sessions, since the '
+            'previous incremental export to the same output format. The '
+            'storage file records up to which event it was exported.'))
+
+    output_group.add_argument(
+        '--single_pass', '--single-pass', dest='single_pass',
+        action='store_true', default=False, help=(
+            'Analyze and export the events in a single pass over the storage '
+            'file. The analysis plugins are run inline and the event tags '
+            'they produce while examining the events are included in the '
+            'output. Event tags that analysis plugins only produce when '
+            'compiling their report are stored but not included in the '
+            'output.'))
+
+    output_group.add_argument(
+        '--text_index', '--text-index', dest='text_index',
+        action='store_true', default=False, help=(
+            'Write a full-text index of the event data attribute values and '
+            'the formatted event messages to the storage file before '
+            'exporting. The index is used to evaluate "contains" conditions '
+            'of the event filter, including "message contains", and is kept '
+            'until events are added to the storage file.'))
+
+    output_group.add_argument(
+        '--text_index_attributes', '--text-index-attributes',
+        dest='text_index_attributes', action='store', type=str,
+        metavar='ATTRIBUTES', default=None, help=(
+            'Comma separated list of names of the event data attributes to '
+            'include in the full-text index. The formatted event message '
+            'is always included. Implies --text_index.'))
+
     helpers_manager.ArgumentHelperManager.AddCommandLineArguments(
         output_group, names=['language'])
 
@@ -493,9 +694,22 @@ class PsortTool(
     self._ParseProcessingOptions(options)
 
     helpers_manager.ArgumentHelperManager.ParseOptions(
-        options, self, names=['event_filters'])
+        options, self, names=['event_filters', 'filter_cache'])
 
     self._deduplicate_events = getattr(options, 'dedup', True)
+    self._incremental = getattr(options, 'incremental', False)
+    self._single_pass = getattr(options, 'single_pass', False)
+
+    text_index_attributes = getattr(options, 'text_index_attributes', None)
+    if text_index_attributes:
+      self._text_index_attribute_names = [
+          attribute_name.strip()
+          for attribute_name in text_index_attributes.split(',')
+          if attribute_name.strip()]
+
+    self._text_index = bool(
+        getattr(options, 'text_index', False) or
+        self._text_index_attribute_names)
 
     if self._data_location:
       # Update the data location with the calculated value.
@@ -510,9 +724,14 @@ class PsortTool(
 
     self._CheckStorageFile(self._storage_file_path)
 
+    self._merge_storage_file_paths = getattr(
+        options, 'merge_storage_files', None) or []
+
     self._EnforceProcessMemoryLimit(self._process_memory_limit)
 
     self._analysis_plugins = self._CreateAnalysisPlugins(options)
+
+    self._CheckMergeStorageFiles()
     self._output_module = self._CreateOutputModule(output_mediator, options)
 
   def ProcessStorage(self):
@@ -533,25 +752,34 @@ class PsortTool(
         command_line_arguments=self._command_line_arguments,
         preferred_encoding=self.preferred_encoding)
 
-    storage_reader = storage_factory.StorageFactory.CreateStorageReaderForFile(
-        self._storage_file_path)
-    if not storage_reader:
-      raise RuntimeError('Unable to create storage reader.')
+    storage_file_paths = [self._storage_file_path]
+    storage_file_paths.extend(self._merge_storage_file_paths)
 
-    for session in storage_reader.GetSessions():
-      if not session.source_configurations:
-        storage_reader.ReadSystemConfiguration(self._knowledge_base)
-      else:
-        for source_configuration in session.source_configurations:
-          self._knowledge_base.ReadSystemConfigurationArtifact(
-              source_configuration.system_configuration,
-              session_identifier=session.identifier)
+    # The system configuration, such as the hostnames and time zones, is read
+    # from the sessions of all the storage files that are exported.
+    for storage_file_path in storage_file_paths:
+      storage_reader = (
+          storage_factory.StorageFactory.CreateStorageReaderForFile(
+              storage_file_path))
+      if not storage_reader:
+        raise RuntimeError('Unable to create storage reader.')
+
+      for stored_session in storage_reader.GetSessions():
+        if not stored_session.source_configurations:
+          storage_reader.ReadSystemConfiguration(self._knowledge_base)
+        else:
+          for source_configuration in stored_session.source_configurations:
+            self._knowledge_base.ReadSystemConfigurationArtifact(
+                source_configuration.system_configuration,
+                session_identifier=stored_session.identifier)
 
-      self._knowledge_base.SetTextPrepend(session.text_prepend)
+        self._knowledge_base.SetTextPrepend(stored_session.text_prepend)
 
-    self._number_of_analysis_reports = (
-        storage_reader.GetNumberOfAnalysisReports())
-    storage_reader.Close()
+      if storage_file_path == self._storage_file_path:
+        self._number_of_analysis_reports = (
+            storage_reader.GetNumberOfAnalysisReports())
+
+      storage_reader.Close()
 
     configuration = configurations.ProcessingConfiguration()
     configuration.data_location = self._data_location
@@ -561,6 +789,26 @@ class PsortTool(
     configuration.profiling.sample_rate = self._profiling_sample_rate
     configuration.profiling.profilers = self._profilers
 
+    if self._text_index:
+      self._WriteTextIndex(session)
+
+    # A single pass is only used when events are both analyzed and exported.
+    single_pass = bool(
+        self._single_pass and self._analysis_plugins and
+        self._output_format != 'null')
+
+    export_watermark = None
+    number_of_events = 0
+    if self._output_format != 'null' and self._incremental:
+      storage_reader = (
+          storage_factory.StorageFactory.CreateStorageReaderForFile(
+              self._storage_file_path))
+
+      export_watermark, number_of_events = self._ReadExportWatermark(
+          storage_reader)
+
+      storage_reader.Close()
+
     analysis_counter = None
     if self._analysis_plugins:
       storage_writer = (
@@ -574,37 +822,80 @@ class PsortTool(
           worker_memory_limit=self._worker_memory_limit,
           worker_timeout=self._worker_timeout)
 
-      analysis_engine.AnalyzeEvents(
-          self._knowledge_base, storage_writer, self._data_location,
-          self._analysis_plugins, configuration,
-          event_filter=self._event_filter,
-          event_filter_expression=self._event_filter_expression,
-          status_update_callback=status_update_callback)
+      if single_pass:
+        analysis_engine.AnalyzeAndExportEvents(
+            self._knowledge_base, storage_writer, self._data_location,
+            self._analysis_plugins, self._output_module, configuration,
+            deduplicate_events=self._deduplicate_events,
+            event_filter=self._event_filter,
+            event_filter_expression=self._event_filter_expression,
+            export_watermark=export_watermark,
+            status_update_callback=status_update_callback,
+            time_slice=self._time_slice, use_time_slicer=self._use_time_slicer)
+
+        self._output_module.Close()
+        self._output_module = None
+
+        if self._incremental:
+          self._WriteExportWatermark(session, number_of_events)
+
+      else:
+        analysis_engine.AnalyzeEvents(
+            self._knowledge_base, storage_writer, self._data_location,
+            self._analysis_plugins, configuration,
+            event_filter=self._event_filter,
+            event_filter_expression=self._event_filter_expression,
+            inline_analysis_plugins=self._inline_analysis_plugins,
+            number_of_analysis_shards=self._number_of_analysis_shards,
+            status_update_callback=status_update_callback)
 
       analysis_counter = collections.Counter()
       for item, value in session.analysis_reports_counter.items():
         analysis_counter[item] = value
 
-    if self._output_format != 'null':
+    if self._output_format != 'null' and not single_pass:
       storage_reader = (
           storage_factory.StorageFactory.CreateStorageReaderForFile(
               self._storage_file_path))
 
+      merge_storage_readers = None
+      if self._merge_storage_file_paths:
+        merge_storage_readers = {self._storage_file_path: storage_reader}
+        for storage_file_path in self._merge_storage_file_paths:
+          if storage_file_path not in merge_storage_readers:
+            merge_storage_readers[storage_file_path] = (
+                storage_factory.StorageFactory.CreateStorageReaderForFile(
+                    storage_file_path))
+
       # TODO: add single processing support.
       analysis_engine = psort.PsortMultiProcessEngine(
           worker_memory_limit=self._worker_memory_limit,
           worker_timeout=self._worker_timeout)
 
-      analysis_engine.ExportEvents(
-          self._knowledge_base, storage_reader, self._output_module,
-          configuration, deduplicate_events=self._deduplicate_events,
-          event_filter=self._event_filter,
-          status_update_callback=status_update_callback,
-          time_slice=self._time_slice, use_time_slicer=self._use_time_slicer)
+      try:
+        analysis_engine.ExportEvents(
+            self._knowledge_base, storage_reader, self._output_module,
+            configuration, deduplicate_events=self._deduplicate_events,
+            event_filter=self._event_filter,
+            export_watermark=export_watermark,
+            merge_storage_readers=merge_storage_readers,
+            status_update_callback=status_update_callback,
+            time_slice=self._time_slice,
+            use_time_slicer=self._use_time_slicer)
+
+      finally:
+        if merge_storage_readers:
+          for merge_storage_reader in merge_storage_readers.values():
+            merge_storage_reader.Close()
+        else:
+          storage_reader.Close()
 
       self._output_module.Close()
       self._output_module = None
 
+      if self._incremental:
+        self._WriteExportWatermark(session, number_of_events)
+
     if self._quiet_mode:
       return
 
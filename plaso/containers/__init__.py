@@ -5,6 +5,7 @@ from plaso.containers import analyzer_result
 from plaso.containers import artifacts
 from plaso.containers import event_sources
 from plaso.containers import events
+from plaso.containers import exports
 from plaso.containers import reports
 from plaso.containers import sessions
 from plaso.containers import storage_media
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""Export related attribute container definitions."""
+
+from plaso.containers import interface
+from plaso.containers import manager
+
+
+class ExportWatermark(interface.AttributeContainer):
+  """Export watermark attribute container.
+
+  The export watermark records up to which event the events in a store were
+  exported to an output format. It is used to only export the events that
+  were added to the store, for example by subsequent extraction sessions,
+  since the previous export.
+
+  Attributes:
+    event_row_identifier (int): row identifier of the last event in the store
+        at the time of the export.
+    output_format (str): name of the output format the events were exported
+        to.
+    timestamp (int): time that the export was completed. Contains the number
+        of micro seconds since January 1, 1970, 00:00:00 UTC.
+  """
+  CONTAINER_TYPE = 'export_watermark'
+
+  def __init__(
+      self, event_row_identifier=None, output_format=None, timestamp=None):
+    """Initializes an export watermark attribute container.
+
+    Args:
+      event_row_identifier (Optional[int]): row identifier of the last event
+          in the store at the time of the export.
+      output_format (Optional[str]): name of the output format the events were
+          exported to.
+      timestamp (Optional[int]): time that the export was completed. Contains
+          the number of micro seconds since January 1, 1970, 00:00:00 UTC.
+    """
+    super(ExportWatermark, self).__init__()
+    self.event_row_identifier = event_row_identifier
+    self.output_format = output_format
+    self.timestamp = timestamp
+
+
+manager.AttributeContainersManager.RegisterAttributeContainer(ExportWatermark)
@@ -47,6 +47,7 @@ class AttributeContainer(object):
     """Initializes an attribute container."""
     super(AttributeContainer, self).__init__()
     self._identifier = AttributeContainerIdentifier()
+    self._serialized_data = None
     self._session_identifier = None
 
   def CopyFromDict(self, attributes):
@@ -140,6 +141,18 @@ class AttributeContainer(object):
     """
     return self._identifier
 
+  def GetSerializedData(self):
+    """Retrieves the serialized form of the attribute container.
+
+    The serialized form is only available for attribute containers read from
+    a store that retains serialized data. Note that the serialized form is not
+    updated when the attributes of the container are changed.
+
+    Returns:
+      str: serialized form of the attribute container or None if not available.
+    """
+    return self._serialized_data
+
   def GetSessionIdentifier(self):
     """Retrieves the session identifier.
 
@@ -161,6 +174,17 @@ class AttributeContainer(object):
     """
     self._identifier = identifier
 
+  def SetSerializedData(self, serialized_data):
+    """Sets the serialized form of the attribute container.
+
+    The serialized form is a storage specific value that should not be
+    serialized.
+
+    Args:
+      serialized_data (str): serialized form of the attribute container.
+    """
+    self._serialized_data = serialized_data
+
   def SetSessionIdentifier(self, session_identifier):
     """Sets the session identifier.
 
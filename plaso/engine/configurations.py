@@ -180,6 +180,8 @@ class ProcessingConfiguration(interface.AttributeContainer):
     event_extraction (EventExtractionConfiguration): event extraction
         configuration.
     extraction (ExtractionConfiguration): extraction configuration.
+    filter_cache_path (str): path of the directory to cache compiled filters
+        in, such as the tagging rules.
     filter_file (str): path to a file with find specifications.
     log_filename (str): name of the log file.
     parser_filter_expression (str): parser filter expression,
@@ -187,6 +189,8 @@ class ProcessingConfiguration(interface.AttributeContainer):
     preferred_year (int): preferred initial year value for year-less date and
         time values.
     profiling (ProfilingConfiguration): profiling configuration.
+    tagging_file (str): path of a tagging file, that contains the rules to
+        tag the events with during extraction.
     task_storage_format (str): format to use for storing task results.
     temporary_directory (str): path of the directory for temporary files.
   """
@@ -201,10 +205,12 @@ class ProcessingConfiguration(interface.AttributeContainer):
     self.debug_output = False
     self.event_extraction = EventExtractionConfiguration()
     self.extraction = ExtractionConfiguration()
+    self.filter_cache_path = None
     self.filter_file = None
     self.log_filename = None
     self.parser_filter_expression = None
     self.preferred_year = None
     self.profiling = ProfilingConfiguration()
+    self.tagging_file = None
     self.task_storage_format = None
     self.temporary_directory = None
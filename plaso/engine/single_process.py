@@ -14,7 +14,9 @@ from plaso.engine import engine
 from plaso.engine import extractors
 from plaso.engine import logger
 from plaso.engine import process_info
+from plaso.engine import tagging_file
 from plaso.engine import worker
+from plaso.filters import compiled_cache
 from plaso.lib import definitions
 from plaso.parsers import mediator as parsers_mediator
 
@@ -266,11 +268,23 @@ class SingleProcessEngine(engine.BaseEngine):
     """
     self._resolver_context = resolver_context
 
+    tagging_rule_index = None
+    if processing_configuration.tagging_file:
+      filter_cache = None
+      if processing_configuration.filter_cache_path:
+        filter_cache = compiled_cache.CompiledFilterCache(
+            processing_configuration.filter_cache_path)
+
+      tagging_file_object = tagging_file.TaggingFile(
+          processing_configuration.tagging_file, cache=filter_cache)
+      tagging_rule_index = tagging_file_object.GetEventTaggingRuleIndex()
+
     parser_mediator = parsers_mediator.ParserMediator(
         storage_writer, self.knowledge_base,
         collection_filters_helper=self.collection_filters_helper,
         preferred_year=processing_configuration.preferred_year,
         resolver_context=resolver_context,
+        tagging_rule_index=tagging_rule_index,
         temporary_directory=processing_configuration.temporary_directory)
 
     extraction_worker = worker.EventExtractionWorker(
@@ -1,10 +1,10 @@
 # -*- coding: utf-8 -*-
 """Tagging file."""
 
-import io
 import re
 
-from plaso.filters import event_filter
+from plaso.filters import rule_index
+from plaso.filters import shared_filters
 from plaso.lib import errors
 
 
@@ -21,61 +21,132 @@ class TaggingFile(object):
   _OBJECTFILTER_WORDS = re.compile(
       r'\s(is|isnot|equals|notequals|inset|notinset|contains|notcontains)\s')
 
-  def __init__(self, path):
+  _CACHE_OBJECT_TYPE = 'tagging_rule_index'
+
+  def __init__(self, path, cache=None):
     """Initializes a tagging file.
 
     Args:
       path (str): path to a file that contains one or more event tagging rules.
+      cache (Optional[CompiledFilterCache]): cache of compiled filters, where
+          None represents the tagging rules are always compiled.
     """
     super(TaggingFile, self).__init__()
+    self._cache = cache
     self._path = path
 
-  def GetEventTaggingRules(self):
-    """Retrieves the event tagging rules from the tagging file.
+  def _CompileEventTaggingRules(self, data):
+    """Compiles event tagging rules.
+
+    Args:
+      data (bytes): contents of the tagging file.
 
     Returns:
-      dict[str, EventObjectFilter]: tagging rules, that consists of one or more
-          filter objects per label.
+      dict[str, list[EventObjectFilter]]: tagging rules, that consists of one
+          filter object per rule and one or more rules per label.
 
     Raises:
       TaggingFileError: if a filter expression cannot be compiled.
+      UnicodeDecodeError: if the tagging file is not UTF-8 encoded.
     """
     rules_per_label = {}
 
     label_name = None
-    with io.open(self._path, 'r', encoding='utf-8') as tagging_file:
-      for line in tagging_file.readlines():
-        line = line.rstrip()
+    for line in data.decode('utf-8').splitlines():
+      line = line.rstrip()
 
-        stripped_line = line.lstrip()
-        if not stripped_line:
-          label_name = None
-          continue
+      stripped_line = line.lstrip()
+      if not stripped_line:
+        label_name = None
+        continue
 
-        if stripped_line[0] == '#':
-          continue
+      if stripped_line[0] == '#':
+        continue
 
-        if not line[0].isspace():
-          label_name = line
-          rules_per_label[label_name] = []
+      if not line[0].isspace():
+        label_name = line
+        rules_per_label[label_name] = []
 
-        elif label_name:
-          rules_per_label[label_name].append(stripped_line)
+      elif label_name:
+        rules_per_label[label_name].append(stripped_line)
 
     filter_objects_per_label = {}
 
+    # The rules of all labels are compiled by the same compiler so that rules
+    # share the predicates they have in common.
+    compiler = shared_filters.SharedFilterCompiler()
+
     for label_name, rules in rules_per_label.items():
-      filter_object = event_filter.EventObjectFilter()
+      filter_objects = []
+      for rule in rules:
+        try:
+          filter_object = compiler.CompileFilter(rule)
+        except errors.ParseError as exception:
+          raise errors.TaggingFileError((
+              'Unable to compile filter for label: {0:s} with error: '
+              '{1!s}').format(label_name, exception))
 
-      try:
-        filter_rule = ' OR '.join(['({0:s})'.format(rule) for rule in rules])
-        filter_object.CompileFilter(filter_rule)
-      except errors.ParseError as exception:
-        raise errors.TaggingFileError((
-            'Unable to compile filter for label: {0:s} with error: '
-            '{1!s}').format(label_name, exception))
+        filter_objects.append(filter_object)
 
-      # TODO: change other code remove list around filter_object
-      filter_objects_per_label[label_name] = [filter_object]
+      filter_objects_per_label[label_name] = filter_objects
 
     return filter_objects_per_label
+
+  def _ReadData(self):
+    """Reads the contents of the tagging file.
+
+    Returns:
+      bytes: contents of the tagging file.
+    """
+    with open(self._path, 'rb') as file_object:
+      return file_object.read()
+
+  def GetEventTaggingRuleIndex(self):
+    """Retrieves the event tagging rules from the tagging file as an index.
+
+    If the tagging file has a cache, the index is read from the cache if
+    the cache contains the index of the same contents of the tagging file,
+    otherwise the compiled index is stored in the cache.
+
+    Returns:
+      EventFilterRuleIndex: tagging rules, indexed by their guards, such as
+          the data type, so that events are only evaluated against the rules
+          that could match them.
+
+    Raises:
+      TaggingFileError: if a filter expression cannot be compiled.
+      UnicodeDecodeError: if the tagging file is not UTF-8 encoded.
+    """
+    data = self._ReadData()
+
+    if self._cache:
+      tagging_rule_index = self._cache.GetCompiledObject(
+          self._CACHE_OBJECT_TYPE, data)
+      if tagging_rule_index:
+        return tagging_rule_index
+
+    tagging_rule_index = rule_index.EventFilterRuleIndex()
+    for label_name, filter_objects in self._CompileEventTaggingRules(
+        data).items():
+      for filter_object in filter_objects:
+        tagging_rule_index.AddRule(label_name, filter_object)
+
+    if self._cache:
+      self._cache.StoreCompiledObject(
+          self._CACHE_OBJECT_TYPE, data, tagging_rule_index)
+
+    return tagging_rule_index
+
+  def GetEventTaggingRules(self):
+    """Retrieves the event tagging rules from the tagging file.
+
+    Returns:
+      dict[str, list[EventObjectFilter]]: tagging rules, that consists of one
+          filter object per rule and one or more rules per label.
+
+    Raises:
+      TaggingFileError: if a filter expression cannot be compiled.
+      UnicodeDecodeError: if the tagging file is not UTF-8 encoded.
+    """
+    data = self._ReadData()
+    return self._CompileEventTaggingRules(data)
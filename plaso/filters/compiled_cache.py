@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""Persistent cache of compiled filters."""
+
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+
+import plaso
+
+
+class CompiledFilterCache(object):
+  """Persistent cache of compiled filters.
+
+  The cache is a directory that contains a file per compiled object, such as
+  the compiled filter of an event filter expression or the tagging rule index
+  of a tagging file. The compiled objects are identified by a hash of their
+  source, such as the filter expression or the contents of the tagging file,
+  and the version of plaso, so that a changed source or a newer version of
+  plaso does not use an outdated compiled object.
+
+  The files are written atomically, hence the cache can be shared between
+  processes, such as the worker processes of an extraction.
+
+  Note that the compiled objects are stored as pickles, hence the cache
+  directory should only be writable by trusted users.
+  """
+
+  _FILE_EXTENSION = '.pickle'
+
+  def __init__(self, path):
+    """Initializes a compiled filter cache.
+
+    Args:
+      path (str): path of the cache directory.
+    """
+    super(CompiledFilterCache, self).__init__()
+    self.path = path
+
+  def _GetCacheFilePath(self, object_type, source):
+    """Retrieves the path of the cache file of a compiled object.
+
+    Args:
+      object_type (str): type of the compiled object, such as "event_filter".
+      source (bytes|str): source the object is compiled from.
+
+    Returns:
+      str: path of the cache file.
+    """
+    if isinstance(source, str):
+      source = source.encode('utf-8')
+
+    hasher = hashlib.sha256()
+    hasher.update(plaso.__version__.encode('utf-8'))
+    hasher.update(b'\x00')
+    hasher.update(object_type.encode('utf-8'))
+    hasher.update(b'\x00')
+    hasher.update(source)
+
+    filename = '{0:s}-{1:s}{2:s}'.format(
+        object_type, hasher.hexdigest(), self._FILE_EXTENSION)
+    return os.path.join(self.path, filename)
+
+  def GetCompiledObject(self, object_type, source):
+    """Retrieves a compiled object from the cache.
+
+    Args:
+      object_type (str): type of the compiled object, such as "event_filter".
+      source (bytes|str): source the object is compiled from.
+
+    Returns:
+      object: compiled object or None if not available in the cache.
+    """
+    path = self._GetCacheFilePath(object_type, source)
+    if not os.path.isfile(path):
+      return None
+
+    try:
+      with open(path, 'rb') as file_object:
+        return pickle.load(file_object)
+
+    # An outdated or corrupt cache file can raise a wide range of exceptions
+    # while being unpickled.
+    except Exception as exception:  # pylint: disable=broad-except
+      logging.warning(
+          'Unable to read compiled filter cache file: {0:s} with error: '
+          '{1!s}'.format(path, exception))
+
+    return None
+
+  def StoreCompiledObject(self, object_type, source, compiled_object):
+    """Stores a compiled object in the cache.
+
+    Failing to store the compiled object is not considered an error, since
+    the object can be compiled again.
+
+    Args:
+      object_type (str): type of the compiled object, such as "event_filter".
+      source (bytes|str): source the object is compiled from.
+      compiled_object (object): compiled object.
+    """
+    path = self._GetCacheFilePath(object_type, source)
+
+    temporary_path = None
+    try:
+      os.makedirs(self.path, exist_ok=True)
+
+      # The compiled object is written to a temporary file that is renamed
+      # afterwards, so that other processes never read a partial file.
+      file_descriptor, temporary_path = tempfile.mkstemp(
+          dir=self.path, suffix='.tmp')
+      with os.fdopen(file_descriptor, 'wb') as file_object:
+        pickle.dump(
+            compiled_object, file_object, protocol=pickle.HIGHEST_PROTOCOL)
+
+      os.replace(temporary_path, path)
+      temporary_path = None
+
+    except (OSError, pickle.PicklingError, TypeError) as exception:
+      logging.warning(
+          'Unable to write compiled filter cache file: {0:s} with error: '
+          '{1!s}'.format(path, exception))
+
+    finally:
+      if temporary_path and os.path.exists(temporary_path):
+        os.remove(temporary_path)
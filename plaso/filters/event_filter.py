@@ -2,32 +2,48 @@
 """The event filter."""
 
 from plaso.filters import expression_parser
+from plaso.filters import storage_planner
 
 
 class EventObjectFilter(object):
   """Event filter."""
 
+  _CACHE_OBJECT_TYPE = 'event_filter'
+
   def __init__(self):
     """Initializes an event filter."""
     super(EventObjectFilter, self).__init__()
     self._event_filter = None
     self._filter_expression = None
 
-  def CompileFilter(self, filter_expression):
+  def CompileFilter(self, filter_expression, cache=None):
     """Compiles the filter expression.
 
     The filter expression contains an object filter expression.
 
     Args:
       filter_expression (str): filter expression.
+      cache (Optional[CompiledFilterCache]): cache of compiled filters, where
+          None represents the filter expression is always compiled.
 
     Raises:
       ParseError: if the filter expression cannot be parsed.
     """
-    parser = expression_parser.EventFilterExpressionParser()
-    expression = parser.Parse(filter_expression)
+    event_filter = None
+    if cache:
+      event_filter = cache.GetCompiledObject(
+          self._CACHE_OBJECT_TYPE, filter_expression)
+
+    if not event_filter:
+      parser = expression_parser.EventFilterExpressionParser()
+      expression = parser.Parse(filter_expression)
+      event_filter = expression.Compile()
+
+      if cache:
+        cache.StoreCompiledObject(
+            self._CACHE_OBJECT_TYPE, filter_expression, event_filter)
 
-    self._event_filter = expression.Compile()
+    self._event_filter = event_filter
     self._filter_expression = filter_expression
 
   def Match(self, event, event_data, event_data_stream, event_tag):
@@ -47,3 +63,60 @@ class EventObjectFilter(object):
 
     return self._event_filter.Matches(
         event, event_data, event_data_stream, event_tag)
+
+  def MatchBatch(self, batch):
+    """Determines which events of a batch match the filter.
+
+    Evaluating the filter against a batch of events is faster than against
+    the individual events, since every condition is evaluated against all
+    the remaining events in the batch at once.
+
+    Args:
+      batch (list[tuple[EventObject, EventData, EventDataStream, EventTag]]):
+          events, with their event data, event data stream and event tag.
+
+    Returns:
+      list[bool]: match mask, that contains per event in the batch, True if
+          the event matches the filter, False otherwise.
+    """
+    if not self._event_filter:
+      return [True] * len(batch)
+
+    return self._event_filter.MatchesBatch(batch)
+
+  def PlanStorageFilter(self, message_text_index=True):
+    """Splits the filter into a storage filter and a remaining event filter.
+
+    The storage filter contains the conditions that can be evaluated by
+    the storage, such as a timestamp range or data type, without having to
+    deserialize the event. The remaining event filter contains the conditions
+    that need to be evaluated on the deserialized event.
+
+    Args:
+      message_text_index (Optional[bool]): True if message conditions should
+          be evaluated by the storage by means of a text index that contains
+          the formatted messages. If False message conditions remain in
+          the event filter.
+
+    Returns:
+      tuple: containing:
+
+        StorageFilter: storage filter or None if none of the conditions can
+            be evaluated by the storage.
+        EventObjectFilter: event filter with the remaining conditions.
+    """
+    if not self._event_filter:
+      return None, self
+
+    planner = storage_planner.StorageFilterPlanner()
+    storage_filter, remaining_filter = planner.Plan(
+        self._event_filter, message_text_index=message_text_index)
+    if not storage_filter:
+      return None, self
+
+    # pylint: disable=protected-access
+    event_filter = EventObjectFilter()
+    event_filter._event_filter = remaining_filter
+    event_filter._filter_expression = self._filter_expression
+
+    return storage_filter, event_filter
@@ -67,6 +67,20 @@ class Filter(object):
       bool: True if the event, data and tag match the filter, False otherwise.
     """
 
+  def MatchesBatch(self, batch):
+    """Determines which events of a batch match the filter.
+
+    Args:
+      batch (list[tuple[EventObject, EventData, EventDataStream, EventTag]]):
+          events, with their event data, event data stream and event tag, to
+          compare against the filter.
+
+    Returns:
+      list[bool]: match mask, that contains per event in the batch, True if
+          the event matches the filter, False otherwise.
+    """
+    return [self.Matches(*event_values) for event_values in batch]
+
 
 class AndFilter(Filter):
   """A filter that performs a boolean AND on the arguments.
@@ -93,6 +107,36 @@ class AndFilter(Filter):
         return False
     return True
 
+  def MatchesBatch(self, batch):
+    """Determines which events of a batch match the filter.
+
+    Args:
+      batch (list[tuple[EventObject, EventData, EventDataStream, EventTag]]):
+          events, with their event data, event data stream and event tag, to
+          compare against the filter.
+
+    Returns:
+      list[bool]: match mask, that contains per event in the batch, True if
+          the event matches the filter, False otherwise.
+    """
+    # Every sub filter is only evaluated against the events that matched
+    # the preceding sub filters.
+    indexes = list(range(len(batch)))
+    for sub_filter in self.args:
+      if not indexes:
+        break
+
+      sub_batch = [batch[index] for index in indexes]
+      sub_matches = sub_filter.MatchesBatch(sub_batch)
+      indexes = [
+          index for index, match in zip(indexes, sub_matches) if match]
+
+    matches = [False] * len(batch)
+    for index in indexes:
+      matches[index] = True
+
+    return matches
+
 
 class OrFilter(Filter):
   """A filter that performs a boolean OR on the arguments.
@@ -122,6 +166,43 @@ class OrFilter(Filter):
         return True
     return False
 
+  def MatchesBatch(self, batch):
+    """Determines which events of a batch match the filter.
+
+    Args:
+      batch (list[tuple[EventObject, EventData, EventDataStream, EventTag]]):
+          events, with their event data, event data stream and event tag, to
+          compare against the filter.
+
+    Returns:
+      list[bool]: match mask, that contains per event in the batch, True if
+          the event matches the filter, False otherwise.
+    """
+    if not self.args:
+      return [True] * len(batch)
+
+    # Every sub filter is only evaluated against the events that did not
+    # match the preceding sub filters.
+    matches = [False] * len(batch)
+    indexes = list(range(len(batch)))
+    for sub_filter in self.args:
+      if not indexes:
+        break
+
+      sub_batch = [batch[index] for index in indexes]
+      sub_matches = sub_filter.MatchesBatch(sub_batch)
+
+      remaining_indexes = []
+      for index, match in zip(indexes, sub_matches):
+        if match:
+          matches[index] = True
+        else:
+          remaining_indexes.append(index)
+
+      indexes = remaining_indexes
+
+    return matches
+
 
 class Operator(Filter):
   """Interface for filters that represent operators."""
@@ -158,6 +239,20 @@ class IdentityFilter(Operator):
     """
     return True
 
+  def MatchesBatch(self, batch):
+    """Determines which events of a batch match the filter.
+
+    Args:
+      batch (list[tuple[EventObject, EventData, EventDataStream, EventTag]]):
+          events, with their event data, event data stream and event tag, to
+          compare against the filter.
+
+    Returns:
+      list[bool]: match mask, that contains per event in the batch, True if
+          the event matches the filter, False otherwise.
+    """
+    return [True] * len(batch)
+
 
 class BinaryOperator(Operator):
   """Interface for binary operators.
@@ -231,6 +326,22 @@ class GenericBinaryOperator(BinaryOperator):
       bool: True if the values match according to the operator, False otherwise.
     """
 
+  def _CompareValues(self, event_values, filter_value):
+    """Compares values with the operator.
+
+    Args:
+      event_values (list[object]): values retrieved from the events.
+      filter_value (object): value defined by the filter.
+
+    Returns:
+      list[bool]: per event value, True if the values match according to
+          the operator, False otherwise.
+    """
+    compare_function = self._CompareValue
+    return [
+        compare_function(event_value, filter_value)
+        for event_value in event_values]
+
   def _GetValue(
       self, attribute_name, event, event_data, event_data_stream, event_tag):
     """Retrieves the value of a specific event, data or tag attribute.
@@ -272,6 +383,24 @@ class GenericBinaryOperator(BinaryOperator):
 
     return attribute_value
 
+  def _GetValues(self, attribute_name, batch):
+    """Retrieves the values of a specific attribute of a batch of events.
+
+    Args:
+      attribute_name (str): name of the attribute to retrieve the values from.
+      batch (list[tuple[EventObject, EventData, EventDataStream, EventTag]]):
+          events, with their event data, event data stream and event tag, to
+          retrieve the values from.
+
+    Returns:
+      list[object]: attribute value per event, where None represents
+          the value is not available.
+    """
+    get_value_function = self._GetValue
+    return [
+        get_value_function(attribute_name, *event_values)
+        for event_values in batch]
+
   def FlipBool(self):
     """Negates the internal boolean value attribute."""
     logging.debug('Negative matching.')
@@ -296,6 +425,32 @@ class GenericBinaryOperator(BinaryOperator):
       return self._bool_value
     return not self._bool_value
 
+  def MatchesBatch(self, batch):
+    """Determines which events of a batch match the filter.
+
+    Args:
+      batch (list[tuple[EventObject, EventData, EventDataStream, EventTag]]):
+          events, with their event data, event data stream and event tag, to
+          compare against the filter.
+
+    Returns:
+      list[bool]: match mask, that contains per event in the batch, True if
+          the event matches the filter, False otherwise.
+    """
+    values = self._GetValues(self.left_operand, batch)
+
+    # Only the events of which the attribute has a value are compared.
+    indexes = [index for index, value in enumerate(values) if value]
+    comparisons = self._CompareValues(
+        [values[index] for index in indexes], self.right_operand)
+
+    matches = [not self._bool_value] * len(batch)
+    for index, comparison in zip(indexes, comparisons):
+      if comparison:
+        matches[index] = self._bool_value
+
+    return matches
+
 
 class EqualsOperator(GenericBinaryOperator):
   """Equals (==) operator."""
@@ -312,6 +467,19 @@ class EqualsOperator(GenericBinaryOperator):
     """
     return event_value == filter_value
 
+  def _CompareValues(self, event_values, filter_value):
+    """Compares if values are equal.
+
+    Args:
+      event_values (list[object]): values retrieved from the events.
+      filter_value (object): value defined by the filter.
+
+    Returns:
+      list[bool]: per event value, True if the values are equal, False
+          otherwise.
+    """
+    return [event_value == filter_value for event_value in event_values]
+
 
 class NotEqualsOperator(GenericBinaryOperator):
   """Not equals (!=) operator."""
@@ -422,6 +590,34 @@ class Contains(GenericBinaryOperator):
     except (AttributeError, TypeError):
       return False
 
+  def _CompareValues(self, event_values, filter_value):
+    """Compares if the second value is part of the values.
+
+    Args:
+      event_values (list[object]): values retrieved from the events.
+      filter_value (object): value defined by the filter.
+
+    Returns:
+      list[bool]: per event value, True if the second value is part of
+          the event value, False otherwise.
+    """
+    if not isinstance(filter_value, str):
+      return super(Contains, self)._CompareValues(event_values, filter_value)
+
+    # The filter value is converted to lower case once for all the values.
+    lower_case_filter_value = filter_value.lower()
+
+    results = []
+    for event_value in event_values:
+      if isinstance(event_value, str):
+        result = lower_case_filter_value in event_value.lower()
+      else:
+        result = self._CompareValue(event_value, filter_value)
+
+      results.append(result)
+
+    return results
+
 
 # TODO: Change to an N-ary Operator?
 class InSet(GenericBinaryOperator):
@@ -511,6 +707,30 @@ class Regexp(GenericBinaryOperator):
 
     return False
 
+  def _CompareValues(self, event_values, filter_value):
+    """Compares if the values match a regular expression.
+
+    Args:
+      event_values (list[object]): values retrieved from the events.
+      filter_value (object): value defined by the filter.
+
+    Returns:
+      list[bool]: per event value, True if the event value matches
+          the regular expression, False otherwise.
+    """
+    search_function = self.compiled_re.search
+
+    results = []
+    for event_value in event_values:
+      if isinstance(event_value, str):
+        result = search_function(event_value) is not None
+      else:
+        result = self._CompareValue(event_value, filter_value)
+
+      results.append(result)
+
+    return results
+
 
 class RegexpInsensitive(Regexp):
   """Operator to determine if a value matches a regular expression."""
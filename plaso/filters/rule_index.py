@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+"""The event filter rule index."""
+
+import itertools
+
+from plaso.filters import filters
+from plaso.filters import shared_filters
+
+
+class EventFilterRule(object):
+  """Event filter rule.
+
+  Attributes:
+    attribute_names (frozenset[str]): names of the attributes that must have
+        a value for the rule to match.
+    data_types (frozenset[str]): data types of which one must match for
+        the rule to match or None if the rule does not depend on the data type.
+    filter_object (EventObjectFilter): event filter of the rule.
+    label_index (int): index of the label of the rule.
+    parsers (frozenset[str]): parser names of which one must match for
+        the rule to match or None if the rule does not depend on the parser.
+  """
+
+  def __init__(
+      self, filter_object, label_index, attribute_names=None, data_types=None,
+      parsers=None):
+    """Initializes an event filter rule.
+
+    Args:
+      filter_object (EventObjectFilter): event filter of the rule.
+      label_index (int): index of the label of the rule.
+      attribute_names (Optional[frozenset[str]]): names of the attributes that
+          must have a value for the rule to match.
+      data_types (Optional[frozenset[str]]): data types of which one must
+          match for the rule to match.
+      parsers (Optional[frozenset[str]]): parser names of which one must match
+          for the rule to match.
+    """
+    super(EventFilterRule, self).__init__()
+    self.attribute_names = attribute_names or frozenset()
+    self.data_types = data_types
+    self.filter_object = filter_object
+    self.label_index = label_index
+    self.parsers = parsers
+
+
+class EventFilterRuleIndex(object):
+  """Event filter rule index.
+
+  The index determines the guards of a rule when the rule is added, from
+  the conditions of the top-level conjunction (AND) of its filter:
+
+  * the data types and parsers the rule can match, from equality and set
+    membership conditions on "data_type" and "parser";
+  * the attributes that must have a value for the rule to match, since
+    a (non-negated) comparison never matches an attribute without a value.
+
+  An event is only evaluated against the rules of which the guards are met,
+  hence the time needed to determine the labels of an event scales with
+  the number of rules that could match it instead of the total number of
+  rules.
+  """
+
+  _VALUE_GUARD_ATTRIBUTE_NAMES = frozenset(['data_type', 'parser'])
+
+  # Attributes that are not stored in the event data or event data stream
+  # and hence cannot be used as an attribute guard.
+  _UNGUARDED_ATTRIBUTE_NAMES = frozenset([
+      'tag', 'timestamp', 'timestamp_desc'])
+
+  def __init__(self):
+    """Initializes an event filter rule index."""
+    super(EventFilterRuleIndex, self).__init__()
+    self._label_indexes = {}
+    self._label_names = []
+    self._rules_per_data_type = {}
+    self._rules_per_parser = {}
+    self._unguarded_rules = []
+
+    self.number_of_rules = 0
+
+  def _GetConjuncts(self, filter_object):
+    """Retrieves the conditions of a conjunction.
+
+    Args:
+      filter_object (Filter): filter.
+
+    Returns:
+      list[Filter]: filters that all must match.
+    """
+    filter_object = self._GetPredicate(filter_object)
+    if not isinstance(filter_object, filters.AndFilter):
+      return [filter_object]
+
+    conjuncts = []
+    for sub_filter in filter_object.args:
+      conjuncts.extend(self._GetConjuncts(sub_filter))
+
+    return conjuncts
+
+  def _GetPredicate(self, filter_object):
+    """Retrieves the predicate of a filter.
+
+    Args:
+      filter_object (Filter): filter.
+
+    Returns:
+      Filter: predicate of the filter if the filter is a shared predicate,
+          or the filter otherwise.
+    """
+    if isinstance(filter_object, shared_filters.SharedPredicate):
+      return filter_object.predicate
+
+    return filter_object
+
+  def _GetRequiredAttributeName(self, filter_object):
+    """Retrieves the name of the attribute that must have a value to match.
+
+    Args:
+      filter_object (Filter): filter.
+
+    Returns:
+      str: name of the attribute that must have a value for the filter to
+          match or None if not available.
+    """
+    filter_object = self._GetPredicate(filter_object)
+    if not isinstance(filter_object, filters.GenericBinaryOperator):
+      return None
+
+    # A negated comparison matches an attribute without a value.
+    # pylint: disable=protected-access
+    if not filter_object._bool_value:
+      return None
+
+    attribute_name = filter_object.left_operand
+    if (not isinstance(attribute_name, str) or
+        attribute_name in self._UNGUARDED_ATTRIBUTE_NAMES):
+      return None
+
+    return attribute_name
+
+  def _GetValueGuard(self, filter_object):
+    """Retrieves the values a data type or parser condition can match.
+
+    Args:
+      filter_object (Filter): filter.
+
+    Returns:
+      tuple: containing:
+
+        str: name of the attribute, either "data_type" or "parser", or None
+            if the filter is not a data type or parser condition.
+        frozenset[str]: values of the attribute that the filter can match or
+            None if the filter is not a data type or parser condition.
+    """
+    filter_object = self._GetPredicate(filter_object)
+    if isinstance(filter_object, filters.OrFilter):
+      if not filter_object.args:
+        return None, None
+
+      guard_attribute_name = None
+      guard_values = set()
+      for sub_filter in filter_object.args:
+        attribute_name, values = self._GetValueGuard(sub_filter)
+        if not attribute_name or guard_attribute_name not in (
+            None, attribute_name):
+          return None, None
+
+        guard_attribute_name = attribute_name
+        guard_values.update(values)
+
+      return guard_attribute_name, frozenset(guard_values)
+
+    if (self._GetRequiredAttributeName(filter_object) not in
+        self._VALUE_GUARD_ATTRIBUTE_NAMES):
+      return None, None
+
+    value = filter_object.right_operand
+    if isinstance(filter_object, filters.EqualsOperator):
+      values = [value]
+    elif isinstance(filter_object, filters.InSet) and isinstance(
+        value, (frozenset, list, set, tuple)):
+      values = value
+    else:
+      return None, None
+
+    # Note that an empty string never matches in the event filter.
+    if not all(isinstance(value, str) and value for value in values):
+      return None, None
+
+    return filter_object.left_operand, frozenset(values)
+
+  def AddRule(self, label_name, filter_object):
+    """Adds a rule.
+
+    Args:
+      label_name (str): name of the label of the rule.
+      filter_object (EventObjectFilter): event filter of the rule.
+    """
+    label_index = self._label_indexes.get(label_name, None)
+    if label_index is None:
+      label_index = len(self._label_names)
+      self._label_indexes[label_name] = label_index
+      self._label_names.append(label_name)
+
+    attribute_names = set()
+    data_types = None
+    parsers = None
+
+    # pylint: disable=protected-access
+    for conjunct in self._GetConjuncts(filter_object._event_filter):
+      attribute_name, values = self._GetValueGuard(conjunct)
+      if attribute_name == 'data_type':
+        if data_types is None:
+          data_types = values
+        else:
+          data_types = data_types.intersection(values)
+
+      elif attribute_name == 'parser':
+        if parsers is None:
+          parsers = values
+        else:
+          parsers = parsers.intersection(values)
+
+      else:
+        attribute_name = self._GetRequiredAttributeName(conjunct)
+        if attribute_name:
+          attribute_names.add(attribute_name)
+
+    rule = EventFilterRule(
+        filter_object, label_index,
+        attribute_names=frozenset(attribute_names), data_types=data_types,
+        parsers=parsers)
+
+    if data_types is not None:
+      for data_type in data_types:
+        self._rules_per_data_type.setdefault(data_type, []).append(rule)
+
+    elif parsers is not None:
+      for parser in parsers:
+        self._rules_per_parser.setdefault(parser, []).append(rule)
+
+    else:
+      self._unguarded_rules.append(rule)
+
+    self.number_of_rules += 1
+
+  def GetMatchingLabels(self, event, event_data, event_data_stream, event_tag):
+    """Retrieves the labels of the rules that match an event.
+
+    Args:
+      event (EventObject): event.
+      event_data (EventData): event data.
+      event_data_stream (EventDataStream): event data stream.
+      event_tag (EventTag): event tag.
+
+    Returns:
+      list[str]: names of the labels of the rules that match the event, in
+          the order the labels were added.
+    """
+    data_type = getattr(event_data, 'data_type', None)
+    parser = getattr(event_data, 'parser', None)
+
+    rules = itertools.chain(
+        self._rules_per_data_type.get(data_type, []),
+        self._rules_per_parser.get(parser, []), self._unguarded_rules)
+
+    matched_label_indexes = set()
+    for rule in rules:
+      if rule.label_index in matched_label_indexes:
+        continue
+
+      # Rules with a data type guard are indexed by data type hence only
+      # their parser guard needs to be checked.
+      if rule.parsers is not None and parser not in rule.parsers:
+        continue
+
+      if not all(
+          getattr(event_data, attribute_name, None) or
+          getattr(event_data_stream, attribute_name, None)
+          for attribute_name in rule.attribute_names):
+        continue
+
+      if rule.filter_object.Match(
+          event, event_data, event_data_stream, event_tag):
+        matched_label_indexes.add(rule.label_index)
+
+    return [
+        self._label_names[label_index]
+        for label_index in sorted(matched_label_indexes)]
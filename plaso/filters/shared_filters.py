@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""Filters that share predicates across multiple filter expressions."""
+
+from plaso.filters import event_filter
+from plaso.filters import expression_parser
+from plaso.filters import filters
+
+
+class SharedPredicateCache(object):
+  """Cache of the results of shared predicates for the current event.
+
+  The results are cleared when a predicate is evaluated against another
+  event. The cache references the current event so that its identity cannot
+  be reused by another event.
+  """
+
+  def __init__(self):
+    """Initializes a shared predicate cache."""
+    super(SharedPredicateCache, self).__init__()
+    self._event_values = (None, None, None, None)
+    self._results = {}
+
+  def Clear(self):
+    """Clears the cache."""
+    self._event_values = (None, None, None, None)
+    self._results = {}
+
+  def GetResults(self, event, event_data, event_data_stream, event_tag):
+    """Retrieves the results of the shared predicates for an event.
+
+    Args:
+      event (EventObject): event.
+      event_data (EventData): event data.
+      event_data_stream (EventDataStream): event data stream.
+      event_tag (EventTag): event tag.
+
+    Returns:
+      dict[int, bool]: results of the shared predicates evaluated against
+          the event, per predicate index.
+    """
+    cached_event, cached_event_data, cached_event_data_stream, cached_tag = (
+        self._event_values)
+
+    if (event is not cached_event or event_data is not cached_event_data or
+        event_data_stream is not cached_event_data_stream or
+        event_tag is not cached_tag):
+      self._event_values = (event, event_data, event_data_stream, event_tag)
+      self._results = {}
+
+    return self._results
+
+
+class SharedPredicate(filters.Operator):
+  """Predicate that is shared by multiple filters.
+
+  The result of the predicate is evaluated once per event and stored in
+  the shared predicate cache.
+
+  Attributes:
+    predicate (Filter): filter of the predicate.
+    predicate_index (int): index of the predicate in the shared predicate
+        cache.
+  """
+
+  def __init__(self, predicate, predicate_index, cache):
+    """Initializes a shared predicate.
+
+    Args:
+      predicate (Filter): filter of the predicate.
+      predicate_index (int): index of the predicate in the shared predicate
+          cache.
+      cache (SharedPredicateCache): shared predicate cache.
+    """
+    super(SharedPredicate, self).__init__(arguments=[predicate])
+    self._cache = cache
+    self.predicate = predicate
+    self.predicate_index = predicate_index
+
+  def Matches(self, event, event_data, event_data_stream, event_tag):
+    """Determines if the event, data and tag match the filter.
+
+    Args:
+      event (EventObject): event to compare against the filter.
+      event_data (EventData): event data to compare against the filter.
+      event_data_stream (EventDataStream): event data stream.
+      event_tag (EventTag): event tag to compare against the filter.
+
+    Returns:
+      bool: True if the event, data and tag match the filter, False otherwise.
+    """
+    results = self._cache.GetResults(
+        event, event_data, event_data_stream, event_tag)
+
+    result = results.get(self.predicate_index, None)
+    if result is None:
+      result = self.predicate.Matches(
+          event, event_data, event_data_stream, event_tag)
+      results[self.predicate_index] = result
+
+    return result
+
+  def MatchesBatch(self, batch):
+    """Determines which events of a batch match the filter.
+
+    Note that the results of a batch are not cached, since the results are
+    cached per event.
+
+    Args:
+      batch (list[tuple[EventObject, EventData, EventDataStream, EventTag]]):
+          events, with their event data, event data stream and event tag, to
+          compare against the filter.
+
+    Returns:
+      list[bool]: match mask, that contains per event in the batch, True if
+          the event matches the filter, False otherwise.
+    """
+    return self.predicate.MatchesBatch(batch)
+
+
+class SharedFilterCompiler(object):
+  """Compiles filter expressions into filters that share predicates.
+
+  The compiled filters of all the expressions form a single directed acyclic
+  graph, where identical predicates, such as comparisons with the same
+  operator, attribute, value and negation, and conjunctions (AND) and
+  disjunctions (OR) of identical predicates, are represented by a single
+  shared predicate. The result of a shared predicate is evaluated once per
+  event, hence evaluating the filters of a large set of expressions costs
+  roughly as much as evaluating their distinct predicates.
+
+  Note that the results are cached per event, so an event should not be
+  modified while it is evaluated against the compiled filters.
+  """
+
+  def __init__(self):
+    """Initializes a shared filter compiler."""
+    super(SharedFilterCompiler, self).__init__()
+    self._cache = SharedPredicateCache()
+    self._shared_predicates = {}
+
+  @property
+  def number_of_predicates(self):
+    """int: number of distinct shared predicates."""
+    return len(self._shared_predicates)
+
+  def _GetOperandKey(self, operand):
+    """Retrieves a key that identifies an operand.
+
+    Args:
+      operand (object): operand.
+
+    Returns:
+      tuple: key that identifies the operand, where operands that cannot
+          be compared by value are identified by their identity.
+    """
+    if isinstance(operand, list):
+      operand = tuple(operand)
+
+    try:
+      hash(operand)
+    except TypeError:
+      return type(operand), id(operand)
+
+    return type(operand), operand
+
+  def _GetPredicateKey(self, filter_object):
+    """Retrieves a key that identifies a predicate.
+
+    Args:
+      filter_object (Filter): filter of which the arguments have been replaced
+          by shared predicates.
+
+    Returns:
+      tuple: key that identifies the predicate or None if the predicate
+          cannot be shared.
+    """
+    if isinstance(filter_object, (filters.AndFilter, filters.OrFilter)):
+      if not all(isinstance(sub_filter, SharedPredicate)
+                 for sub_filter in filter_object.args):
+        return None
+
+      return filter_object.__class__, tuple(
+          sub_filter.predicate_index for sub_filter in filter_object.args)
+
+    if isinstance(filter_object, filters.GenericBinaryOperator):
+      # pylint: disable=protected-access
+      return (
+          filter_object.__class__, filter_object._bool_value,
+          self._GetOperandKey(filter_object.left_operand),
+          self._GetOperandKey(filter_object.right_operand))
+
+    return None
+
+  def _ShareFilter(self, filter_object):
+    """Replaces a filter by a shared predicate.
+
+    Args:
+      filter_object (Filter): filter.
+
+    Returns:
+      Filter: shared predicate or the filter if it cannot be shared.
+    """
+    if isinstance(filter_object, (filters.AndFilter, filters.OrFilter)):
+      filter_object = filter_object.__class__(arguments=[
+          self._ShareFilter(sub_filter) for sub_filter in filter_object.args])
+
+    predicate_key = self._GetPredicateKey(filter_object)
+    if predicate_key is None:
+      return filter_object
+
+    shared_predicate = self._shared_predicates.get(predicate_key, None)
+    if not shared_predicate:
+      shared_predicate = SharedPredicate(
+          filter_object, len(self._shared_predicates), self._cache)
+      self._shared_predicates[predicate_key] = shared_predicate
+
+    return shared_predicate
+
+  def CompileFilter(self, filter_expression):
+    """Compiles a filter expression.
+
+    Args:
+      filter_expression (str): filter expression.
+
+    Returns:
+      EventObjectFilter: event filter, that shares its predicates with
+          the other event filters compiled by the compiler.
+
+    Raises:
+      ParseError: if the filter expression cannot be parsed.
+    """
+    parser = expression_parser.EventFilterExpressionParser()
+    expression = parser.Parse(filter_expression)
+
+    # pylint: disable=protected-access
+    filter_object = event_filter.EventObjectFilter()
+    filter_object._event_filter = self._ShareFilter(expression.Compile())
+    filter_object._filter_expression = filter_expression
+
+    return filter_object
@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+"""The storage filter planner."""
+
+from dfdatetime import posix_time as dfdatetime_posix_time
+from dfdatetime import time_elements as dfdatetime_time_elements
+
+from plaso.filters import filters
+from plaso.storage import storage_filter
+
+
+class StorageFilterPlanner(object):
+  """Storage filter planner.
+
+  The planner splits a compiled event filter into a storage filter, that
+  contains the conditions that can be evaluated by the storage, and a remaining
+  filter that needs to be evaluated on the deserialized event. Only conditions
+  of the top-level conjunction (AND) of the filter can be evaluated by the
+  storage.
+  """
+
+  # Attributes that are stored in the event data attribute container and can
+  # be evaluated by the storage.
+  _EVENT_DATA_ATTRIBUTE_NAMES = frozenset(['data_type', 'parser'])
+
+  # Attributes that are stored in the event attribute container and hence
+  # cannot be evaluated by means of a text index.
+  _EVENT_ATTRIBUTE_NAMES = frozenset(['timestamp', 'timestamp_desc'])
+
+  _MICROSECONDS_DATE_TIME_VALUE_TYPES = (
+      dfdatetime_posix_time.PosixTimeInMicroseconds,
+      dfdatetime_time_elements.TimeElementsInMicroseconds)
+
+  def _GetConjuncts(self, filter_object):
+    """Retrieves the conditions of a conjunction.
+
+    Args:
+      filter_object (Filter): filter.
+
+    Returns:
+      list[Filter]: filters that all must match.
+    """
+    if not isinstance(filter_object, filters.AndFilter):
+      return [filter_object]
+
+    conjuncts = []
+    for sub_filter in filter_object.args:
+      conjuncts.extend(self._GetConjuncts(sub_filter))
+
+    return conjuncts
+
+  def _PlanEventDataCondition(self, filter_object, storage_filter_object):
+    """Plans an event data condition.
+
+    Args:
+      filter_object (GenericBinaryOperator): filter.
+      storage_filter_object (StorageFilter): storage filter.
+
+    Returns:
+      bool: True if the condition was added to the storage filter.
+    """
+    if not isinstance(filter_object, filters.EqualsOperator):
+      return False
+
+    value = filter_object.right_operand
+    # Note that an empty string never matches in the event filter.
+    if not isinstance(value, str) or not value:
+      return False
+
+    if filter_object.left_operand == 'data_type':
+      storage_filter_object.AddDataTypes([value])
+    else:
+      storage_filter_object.AddParsers([value])
+
+    return True
+
+  def _PlanMessageCondition(self, filter_object, storage_filter_object):
+    """Plans a message condition.
+
+    Args:
+      filter_object (GenericBinaryOperator): filter.
+      storage_filter_object (StorageFilter): storage filter.
+
+    Returns:
+      bool: True if the condition was added to the storage filter.
+    """
+    if not isinstance(filter_object, filters.Contains):
+      return False
+
+    value = filter_object.right_operand
+    if not isinstance(value, str) or not value:
+      return False
+
+    storage_filter_object.AddMessageTerm(value)
+    return True
+
+  def _PlanTagCondition(self, filter_object, storage_filter_object):
+    """Plans an event tag condition.
+
+    Args:
+      filter_object (GenericBinaryOperator): filter.
+      storage_filter_object (StorageFilter): storage filter.
+
+    Returns:
+      bool: True if the condition was added to the storage filter.
+    """
+    if not isinstance(filter_object, filters.Contains):
+      return False
+
+    value = filter_object.right_operand
+    if not isinstance(value, str) or not value:
+      return False
+
+    storage_filter_object.AddLabel(value)
+    return True
+
+  def _PlanTextCondition(self, filter_object, storage_filter_object):
+    """Plans a text condition.
+
+    A text condition is added to the storage filter as a text term, but must
+    still be evaluated on the deserialized event.
+
+    Args:
+      filter_object (GenericBinaryOperator): filter.
+      storage_filter_object (StorageFilter): storage filter.
+    """
+    if not isinstance(filter_object, filters.Contains):
+      return
+
+    attribute_name = filter_object.left_operand
+    if (not isinstance(attribute_name, str) or
+        attribute_name in self._EVENT_ATTRIBUTE_NAMES):
+      return
+
+    value = filter_object.right_operand
+    if isinstance(value, str) and value:
+      storage_filter_object.AddTextTerm(attribute_name, value)
+
+  def _PlanTimestampCondition(self, filter_object, storage_filter_object):
+    """Plans a timestamp condition.
+
+    Args:
+      filter_object (GenericBinaryOperator): filter.
+      storage_filter_object (StorageFilter): storage filter.
+
+    Returns:
+      bool: True if the condition was added to the storage filter.
+    """
+    value = filter_object.right_operand
+    # Only date and time values with a precision of microseconds can be
+    # compared without loss of precision against the timestamp stored in
+    # the event.
+    if not isinstance(value, self._MICROSECONDS_DATE_TIME_VALUE_TYPES):
+      return False
+
+    timestamp = value.GetPlasoTimestamp()
+    if timestamp is None:
+      return False
+
+    if isinstance(filter_object, filters.EqualsOperator):
+      storage_filter_object.SetStartTimestamp(timestamp)
+      storage_filter_object.SetEndTimestamp(timestamp)
+
+    elif isinstance(filter_object, filters.GreaterThanOperator):
+      storage_filter_object.SetStartTimestamp(timestamp + 1)
+
+    elif isinstance(filter_object, filters.GreaterEqualOperator):
+      storage_filter_object.SetStartTimestamp(timestamp)
+
+    elif isinstance(filter_object, filters.LessThanOperator):
+      storage_filter_object.SetEndTimestamp(timestamp - 1)
+
+    elif isinstance(filter_object, filters.LessEqualOperator):
+      storage_filter_object.SetEndTimestamp(timestamp)
+
+    else:
+      return False
+
+    return True
+
+  def _PlanCondition(
+      self, filter_object, storage_filter_object, message_text_index=True):
+    """Plans a condition.
+
+    Args:
+      filter_object (Filter): filter.
+      storage_filter_object (StorageFilter): storage filter.
+      message_text_index (Optional[bool]): True if message conditions should
+          be evaluated by the storage by means of a text index that contains
+          the formatted messages.
+
+    Returns:
+      bool: True if the condition was added to the storage filter.
+    """
+    if not isinstance(filter_object, filters.GenericBinaryOperator):
+      return False
+
+    # pylint: disable=protected-access
+    if not filter_object._bool_value:
+      return False
+
+    attribute_name = filter_object.left_operand
+    if attribute_name == 'timestamp':
+      return self._PlanTimestampCondition(filter_object, storage_filter_object)
+
+    if attribute_name in self._EVENT_DATA_ATTRIBUTE_NAMES:
+      return self._PlanEventDataCondition(filter_object, storage_filter_object)
+
+    if attribute_name == 'tag':
+      return self._PlanTagCondition(filter_object, storage_filter_object)
+
+    if attribute_name == 'message':
+      if not message_text_index:
+        return False
+
+      return self._PlanMessageCondition(filter_object, storage_filter_object)
+
+    self._PlanTextCondition(filter_object, storage_filter_object)
+    return False
+
+  def Plan(self, filter_object, message_text_index=True):
+    """Splits a filter into a storage filter and a remaining filter.
+
+    Args:
+      filter_object (Filter): compiled event filter.
+      message_text_index (Optional[bool]): True if message conditions should
+          be evaluated by the storage by means of a text index that contains
+          the formatted messages. If False message conditions remain in
+          the remaining filter.
+
+    Returns:
+      tuple: containing:
+
+        StorageFilter: storage filter or None if none of the conditions can
+            be evaluated by the storage.
+        Filter: filter with the conditions that cannot be evaluated by
+            the storage or None if there are no remaining conditions.
+    """
+    storage_filter_object = storage_filter.StorageFilter()
+
+    remaining_conjuncts = []
+    for conjunct in self._GetConjuncts(filter_object):
+      if not self._PlanCondition(
+          conjunct, storage_filter_object,
+          message_text_index=message_text_index):
+        remaining_conjuncts.append(conjunct)
+
+    if storage_filter_object.IsEmpty():
+      return None, filter_object
+
+    if not remaining_conjuncts:
+      remaining_filter = None
+    elif len(remaining_conjuncts) == 1:
+      remaining_filter = remaining_conjuncts[0]
+    else:
+      remaining_filter = filters.AndFilter(arguments=remaining_conjuncts)
+
+    return storage_filter_object, remaining_filter
@@ -13,6 +13,7 @@ to the description_long and description_short field.
 
 import abc
 import re
+import string
 
 from plaso.formatters import logger
 
@@ -185,6 +186,102 @@ class FlagsEventFormatterHelper(EventFormatterHelper):
     event_values[self.output_attribute] = ', '.join(output_values)
 
 
+class MessageTemplate(object):
+  """Message template compiled from a message format string.
+
+  The format string is split into literal text and replacement field segments
+  once, hence it does not need to be parsed again for every event. Format
+  strings with replacement fields that are not supported by the segments,
+  such as attribute or index lookups or nested format specifications, are
+  formatted with str.format_map() instead.
+  """
+
+  _CONVERSION_FUNCTIONS = {
+      'a': ascii,
+      'r': repr,
+      's': str}
+
+  def __init__(self, format_string):
+    """Initializes a message template.
+
+    Args:
+      format_string (str): message format string.
+    """
+    super(MessageTemplate, self).__init__()
+    self._format_string = format_string
+    self._segments = self._ParseFormatString(format_string)
+
+  def _ParseFormatString(self, format_string):
+    """Parses a message format string into segments.
+
+    Args:
+      format_string (str): message format string.
+
+    Returns:
+      list[tuple[str, str, str, function]]: literal text, attribute name,
+          format specification and conversion function per segment, where
+          the attribute name is None for literal text, or None if the format
+          string cannot be represented by segments.
+    """
+    formatter = string.Formatter()
+
+    segments = []
+    try:
+      for literal_text, field_name, format_spec, conversion in formatter.parse(
+          format_string):
+        if literal_text:
+          segments.append((literal_text, None, None, None))
+
+        if field_name is None:
+          continue
+
+        if (not field_name.isidentifier() or '{' in format_spec or
+            conversion not in (None, 'a', 'r', 's')):
+          return None
+
+        conversion_function = self._CONVERSION_FUNCTIONS.get(conversion, None)
+        segments.append((None, field_name, format_spec, conversion_function))
+
+    except ValueError:
+      # The format string is invalid, str.format_map() will raise the
+      # corresponding error when the message is formatted.
+      return None
+
+    return segments
+
+  def Format(self, event_values):
+    """Formats the message.
+
+    Args:
+      event_values (dict[str, object]): event values.
+
+    Returns:
+      str: formatted message.
+
+    Raises:
+      KeyError: if an event value required by the format string is missing.
+    """
+    if self._segments is None:
+      # Using format_map() here because, contrary to format(**event_values),
+      # it does not need to copy the event values into keyword arguments.
+      return self._format_string.format_map(event_values)
+
+    message_strings = []
+    for literal_text, attribute_name, format_spec, conversion_function in (
+        self._segments):
+      if attribute_name is None:
+        message_strings.append(literal_text)
+        continue
+
+      value = event_values[attribute_name]
+      if conversion_function:
+        value = conversion_function(value)
+
+      message_strings.append(format(value, format_spec))
+
+    return ''.join(message_strings)
+
+
 class EventFormatter(object):
   """Base class to format event values.
 
@@ -217,18 +314,35 @@ class EventFormatter(object):
     """str: unique identifier for the event data supported by the formatter."""
     return self._data_type.lower()
 
-  def _FormatMessage(self, format_string, event_values):
+  def _CompileMessageTemplate(self, format_string):
+    """Compiles a message format string into a message template.
+
+    Args:
+      format_string (str): message format string.
+
+    Returns:
+      MessageTemplate: message template.
+    """
+    return MessageTemplate(format_string)
+
+  def _FormatMessage(self, format_string, event_values, message_template=None):
     """Determines the formatted message.
 
     Args:
       format_string (str): message format string.
       event_values (dict[str, object]): event values.
+      message_template (Optional[MessageTemplate]): message template compiled
+          from the message format string, where None represents the template
+          should be compiled.
 
     Returns:
       str: formatted message.
     """
+    if not message_template:
+      message_template = self._CompileMessageTemplate(format_string)
+
     try:
-      message_string = format_string.format(**event_values)
+      message_string = message_template.Format(event_values)
 
     except KeyError as exception:
       data_type = event_values.get('data_type', 'N/A')
@@ -361,6 +475,8 @@ class BasicEventFormatter(EventFormatter):
     self._format_string_attribute_names = None
     self._format_string = format_string
     self._format_string_short = format_string_short
+    self._message_short_template = None
+    self._message_template = None
 
   def GetFormatStringAttributeNames(self):
     """Retrieves the attribute names in the format string.
@@ -384,7 +500,13 @@ class BasicEventFormatter(EventFormatter):
     Returns:
       str: message.
     """
-    return self._FormatMessage(self._format_string, event_values)
+    if not self._message_template:
+      self._message_template = self._CompileMessageTemplate(
+          self._format_string)
+
+    return self._FormatMessage(
+        self._format_string, event_values,
+        message_template=self._message_template)
 
   def GetMessageShort(self, event_values):
     """Determines the short message.
@@ -400,7 +522,13 @@ class BasicEventFormatter(EventFormatter):
     else:
       format_string = self._format_string
 
-    short_message_string = self._FormatMessage(format_string, event_values)
+    if not self._message_short_template:
+      self._message_short_template = self._CompileMessageTemplate(
+          format_string)
+
+    short_message_string = self._FormatMessage(
+        format_string, event_values,
+        message_template=self._message_short_template)
 
     # Truncate the short message string if necessary.
     if len(short_message_string) > 80:
@@ -410,7 +538,12 @@ class BasicEventFormatter(EventFormatter):
 
 
 class ConditionalEventFormatter(EventFormatter):
-  """Conditionally format event values using format string pieces."""
+  """Conditionally format event values using format string pieces.
+
+  The format string pieces are compiled into message templates once per
+  combination of attribute names that have a value, hence the pieces do not
+  need to be joined for every event.
+  """
 
   _DEFAULT_FORMAT_STRING_SEPARATOR = ' '
 
@@ -443,6 +576,8 @@ class ConditionalEventFormatter(EventFormatter):
     self._format_string_separator = format_string_separator
     self._format_string_short_pieces = format_string_short_pieces or []
     self._format_string_short_pieces_map = []
+    self._message_short_templates = {}
+    self._message_templates = {}
 
   def _CreateFormatStringMap(
       self, format_string_pieces, format_string_pieces_map):
@@ -496,14 +631,22 @@ class ConditionalEventFormatter(EventFormatter):
     self._CreateFormatStringMap(
         self._format_string_short_pieces, self._format_string_short_pieces_map)
 
+    self._message_short_templates = {}
+    self._message_templates = {}
+
   def _ConditionalFormatMessage(
-      self, format_string_pieces, format_string_pieces_map, event_values):
+      self, format_string_pieces, format_string_pieces_map, event_values,
+      message_templates=None):
     """Determines the conditional formatted message.
 
     Args:
       format_string_pieces (dict[str, str]): format string pieces.
       format_string_pieces_map (list[int, str]): format string pieces map.
       event_values (dict[str, object]): event values.
+      message_templates (Optional[dict[tuple[bool], tuple[str,
+          MessageTemplate]]]): format strings and message templates per
+          combination of format string pieces that apply, where None
+          represents the message templates should not be cached.
 
     Returns:
       str: conditional formatted message.
@@ -511,14 +654,32 @@ class ConditionalEventFormatter(EventFormatter):
     Raises:
       RuntimeError: when an invalid format string piece is encountered.
     """
-    string_pieces = []
-    for map_index, attribute_name in enumerate(format_string_pieces_map):
-      if not attribute_name or event_values.get(
-          attribute_name, None) is not None:
-        string_pieces.append(format_string_pieces[map_index])
+    lookup_key = tuple(
+        not attribute_name or event_values.get(
+            attribute_name, None) is not None
+        for attribute_name in format_string_pieces_map)
+
+    lookup_value = None
+    if message_templates is not None:
+      lookup_value = message_templates.get(lookup_key, None)
+
+    if lookup_value:
+      format_string, message_template = lookup_value
+
+    else:
+      string_pieces = [
+          format_string_pieces[map_index]
+          for map_index, piece_applies in enumerate(lookup_key)
+          if piece_applies]
+
+      format_string = self._format_string_separator.join(string_pieces)
+      message_template = self._CompileMessageTemplate(format_string)
+
+      if message_templates is not None:
+        message_templates[lookup_key] = (format_string, message_template)
 
-    format_string = self._format_string_separator.join(string_pieces)
-    return self._FormatMessage(format_string, event_values)
+    return self._FormatMessage(
+        format_string, event_values, message_template=message_template)
 
   def GetFormatStringAttributeNames(self):
     """Retrieves the attribute names in the format string.
@@ -551,7 +712,7 @@ class ConditionalEventFormatter(EventFormatter):
 
     return self._ConditionalFormatMessage(
         self._format_string_pieces, self._format_string_pieces_map,
-        event_values)
+        event_values, message_templates=self._message_templates)
 
   def GetMessageShort(self, event_values):
     """Determines the short message.
@@ -574,7 +735,8 @@ class ConditionalEventFormatter(EventFormatter):
       format_string_pieces_map = self._format_string_pieces_map
 
     short_message_string = self._ConditionalFormatMessage(
-        format_string_pieces, format_string_pieces_map, event_values)
+        format_string_pieces, format_string_pieces_map, event_values,
+        message_templates=self._message_short_templates)
 
     # Truncate the short message string if necessary.
     if len(short_message_string) > 80:
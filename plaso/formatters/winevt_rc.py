@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 """Windows Event Log resources database reader."""
 
+import collections
 import re
 import sqlite3
 
@@ -157,7 +158,17 @@ class Sqlite3DatabaseReader(object):
 
 
 class WinevtResourcesSqlite3DatabaseReader(Sqlite3DatabaseReader):
-  """Class to represent a sqlite3 Event Log resources database reader."""
+  """Class to represent a sqlite3 Event Log resources database reader.
+
+  Attributes:
+    message_string_cache_hits (int): number of message strings retrieved from
+        the cache.
+    message_string_cache_misses (int): number of message strings retrieved
+        from the database.
+  """
+
+  # The maximum number of message strings to cache.
+  _MAXIMUM_CACHED_MESSAGE_STRINGS = 16 * 1024
 
   # Message string specifiers that are considered white space.
   _WHITE_SPACE_SPECIFIER_RE = re.compile(r'(%[0b]|[\r\n])')
@@ -171,8 +182,13 @@ class WinevtResourcesSqlite3DatabaseReader(Sqlite3DatabaseReader):
   def __init__(self):
     """Initializes the database reader object."""
     super(WinevtResourcesSqlite3DatabaseReader, self).__init__()
+    self._message_file_keys_cache = {}
+    self._message_string_cache = collections.OrderedDict()
     self._string_format = 'wrc'
 
+    self.message_string_cache_hits = 0
+    self.message_string_cache_misses = 0
+
   def _GetEventLogProviderKey(self, log_source):
     """Retrieves the Event Log provider key.
 
@@ -256,6 +272,30 @@ class WinevtResourcesSqlite3DatabaseReader(Sqlite3DatabaseReader):
     for values in generator:
       yield values['message_file_key']
 
+  def _GetMessageFileKeysForLogSource(self, log_source):
+    """Retrieves the message file keys for a specific Event Log source.
+
+    The message file keys are cached per Event Log source.
+
+    Args:
+      log_source (str): Event Log source.
+
+    Returns:
+      list[int]: message file keys.
+    """
+    message_file_keys = self._message_file_keys_cache.get(log_source, None)
+    if message_file_keys is None:
+      event_log_provider_key = self._GetEventLogProviderKey(log_source)
+      if not event_log_provider_key:
+        message_file_keys = []
+      else:
+        message_file_keys = list(self._GetMessageFileKeys(
+            event_log_provider_key))
+
+      self._message_file_keys_cache[log_source] = message_file_keys
+
+    return message_file_keys
+
   def _ReformatMessageString(self, message_string):
     """Reformats the message string.
 
@@ -288,9 +328,18 @@ class WinevtResourcesSqlite3DatabaseReader(Sqlite3DatabaseReader):
     return self._PLACE_HOLDER_SPECIFIER_RE.sub(
         _PlaceHolderSpecifierReplacer, message_string)
 
+  def Close(self):
+    """Closes the database reader object."""
+    super(WinevtResourcesSqlite3DatabaseReader, self).Close()
+    self._message_file_keys_cache = {}
+    self._message_string_cache = collections.OrderedDict()
+
   def GetMessage(self, log_source, lcid, message_identifier):
     """Retrieves a specific message for a specific Event Log source.
 
+    The most recently used message strings, including those that are not
+    available, are cached.
+
     Args:
       log_source (str): Event Log source.
       lcid (int): language code identifier (LCID).
@@ -299,26 +348,30 @@ class WinevtResourcesSqlite3DatabaseReader(Sqlite3DatabaseReader):
     Returns:
       str: message string or None if not available.
     """
-    event_log_provider_key = self._GetEventLogProviderKey(log_source)
-    if not event_log_provider_key:
-      return None
+    lookup_key = (log_source, lcid, message_identifier)
+    if lookup_key in self._message_string_cache:
+      self._message_string_cache.move_to_end(lookup_key)
+      self.message_string_cache_hits += 1
+      return self._message_string_cache[lookup_key]
 
-    generator = self._GetMessageFileKeys(event_log_provider_key)
-    if not generator:
-      return None
+    self.message_string_cache_misses += 1
 
-    # TODO: cache a number of message strings.
     message_string = None
-    for message_file_key in generator:
+    for message_file_key in self._GetMessageFileKeysForLogSource(log_source):
       message_string = self._GetMessage(
           message_file_key, lcid, message_identifier)
 
       if message_string:
         break
 
-    if self._string_format == 'wrc':
+    if message_string and self._string_format == 'wrc':
       message_string = self._ReformatMessageString(message_string)
 
+    if len(self._message_string_cache) >= self._MAXIMUM_CACHED_MESSAGE_STRINGS:
+      self._message_string_cache.popitem(last=False)
+
+    self._message_string_cache[lookup_key] = message_string
+
     return message_string
 
   def GetMetadataAttribute(self, attribute_name):
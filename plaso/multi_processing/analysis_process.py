@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 """The multi-process analysis process."""
 
+import pickle
 import threading
 
 from plaso.analysis import mediator as analysis_mediator
@@ -12,6 +13,47 @@ from plaso.multi_processing import base_process
 from plaso.multi_processing import logger
 
 
+class AnalysisEventBatch(object):
+  """Batch of events to analyze.
+
+  The events are serialized when they are added to the batch, so that a batch
+  that is pushed onto the queues of multiple analysis processes is serialized
+  only once.
+
+  Attributes:
+    number_of_events (int): number of events in the batch.
+  """
+
+  def __init__(self):
+    """Initializes an analysis event batch."""
+    super(AnalysisEventBatch, self).__init__()
+    self._serialized_events = None
+    self.number_of_events = 0
+
+  def GetEvents(self):
+    """Retrieves the events in the batch.
+
+    Returns:
+      list[tuple[EventObject, EventData, EventDataStream]]: events and
+          corresponding event data and event data streams.
+    """
+    if not self._serialized_events:
+      return []
+
+    return pickle.loads(self._serialized_events)
+
+  def SetEvents(self, events):
+    """Sets the events in the batch.
+
+    Args:
+      events (list[tuple[EventObject, EventData, EventDataStream]]): events
+          and corresponding event data and event data streams.
+    """
+    self._serialized_events = pickle.dumps(
+        events, protocol=pickle.HIGHEST_PROTOCOL)
+    self.number_of_events = len(events)
+
+
 class AnalysisProcess(base_process.MultiProcessBaseProcess):
   """Multi-processing analysis process."""
 
@@ -126,7 +168,9 @@ class AnalysisProcess(base_process.MultiProcessBaseProcess):
     task = tasks.Task()
     task.storage_format = definitions.STORAGE_FORMAT_SQLITE
     # TODO: temporary solution.
-    task.identifier = self._analysis_plugin.plugin_name
+    # The process name is used as task identifier since an analysis plugin
+    # can run in multiple analysis shard processes.
+    task.identifier = self._name
 
     self._task = task
 
@@ -166,9 +210,21 @@ class AnalysisProcess(base_process.MultiProcessBaseProcess):
           logger.debug('ConsumeItems exiting, dequeued QueueAbort object.')
           break
 
-        self._ProcessEvent(self._analysis_mediator, *queued_object)
+        if isinstance(queued_object, AnalysisEventBatch):
+          for event, event_data, event_data_stream in (
+              queued_object.GetEvents()):
+            if self._abort:
+              break
+
+            self._ProcessEvent(
+                self._analysis_mediator, event, event_data, event_data_stream)
+
+            self._number_of_consumed_events += 1
+
+        else:
+          self._ProcessEvent(self._analysis_mediator, *queued_object)
 
-        self._number_of_consumed_events += 1
+          self._number_of_consumed_events += 1
 
       logger.debug(
           '{0!s} (PID: {1:d}) stopped monitoring event queue.'.format(
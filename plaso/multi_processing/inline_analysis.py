@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""The inline analysis plugin runner."""
+
+from plaso.analysis import mediator as analysis_mediator
+from plaso.containers import tasks
+from plaso.lib import definitions
+from plaso.multi_processing import logger
+
+
+class InlineAnalysisPluginRunner(object):
+  """Runs an analysis plugin in the process that reads the events.
+
+  Analysis plugins that do little work per event can be run inline, in
+  the psort main process, instead of in a separate analysis process. This
+  saves the analysis process, its event queue and a serialized copy of every
+  event. The events are shared with the other inline analysis plugins and
+  hence should not be modified by the analysis plugin.
+
+  Like an analysis process, the runner writes the event tags and analysis
+  report produced by the analysis plugin to a task storage, that is merged
+  into the session storage after analysis has completed. The event tags
+  produced while processing an event are also returned, so that they can be
+  applied to the event before it is exported.
+
+  Attributes:
+    number_of_consumed_events (int): number of events examined by
+        the analysis plugin.
+  """
+
+  def __init__(
+      self, storage_writer, knowledge_base, analysis_plugin,
+      data_location=None):
+    """Initializes an inline analysis plugin runner.
+
+    Args:
+      storage_writer (StorageWriter): storage writer for a session storage used
+          to create task storage.
+      knowledge_base (KnowledgeBase): contains information from the source
+          data needed for analysis.
+      analysis_plugin (AnalysisPlugin): plugin to run.
+      data_location (Optional[str]): path to the location that data files
+          should be loaded from.
+    """
+    super(InlineAnalysisPluginRunner, self).__init__()
+    self._analysis_mediator = None
+    self._analysis_plugin = analysis_plugin
+    self._data_location = data_location
+    self._knowledge_base = knowledge_base
+    self._storage_writer = storage_writer
+    self._task = None
+    self._task_storage_writer = None
+
+    self.number_of_consumed_events = 0
+
+  def ProcessEvent(self, event, event_data, event_data_stream):
+    """Processes an event.
+
+    Args:
+      event (EventObject): event.
+      event_data (EventData): event data.
+      event_data_stream (EventDataStream): event data stream.
+
+    Returns:
+      list[EventTag]: event tags produced by the analysis plugin while
+          processing the event.
+    """
+    try:
+      self._analysis_plugin.ExamineEvent(
+          self._analysis_mediator, event, event_data, event_data_stream)
+
+    except Exception as exception:  # pylint: disable=broad-except
+      # TODO: write analysis error and change logger to debug only.
+
+      logger.warning('Unhandled exception while processing event object.')
+      logger.exception(exception)
+
+    self.number_of_consumed_events += 1
+
+    return self._analysis_mediator.PopProducedEventTags()
+
+  def Start(self):
+    """Starts the analysis plugin.
+
+    Raises:
+      IOError: if the task storage cannot be created.
+      OSError: if the task storage cannot be created.
+    """
+    task = tasks.Task()
+    task.storage_format = definitions.STORAGE_FORMAT_SQLITE
+    # TODO: temporary solution.
+    task.identifier = self._analysis_plugin.plugin_name
+
+    self._task = task
+
+    self._task_storage_writer = self._storage_writer.CreateTaskStorage(
+        task, definitions.STORAGE_FORMAT_SQLITE)
+    self._task_storage_writer.Open()
+
+    self._analysis_mediator = analysis_mediator.AnalysisMediator(
+        self._task_storage_writer, self._knowledge_base,
+        data_location=self._data_location, retain_event_tags=True)
+
+    self._task_storage_writer.WriteTaskStart()
+
+    logger.info('Started inline analysis plugin: {0:s}.'.format(
+        self._analysis_plugin.plugin_name))
+
+  def Stop(self, abort=False):
+    """Stops the analysis plugin.
+
+    Produces the analysis report, unless aborted, and finalizes the task
+    storage so that it can be merged into the session storage.
+
+    Args:
+      abort (Optional[bool]): True to indicate the stop is issued on abort.
+    """
+    if not self._task_storage_writer:
+      return
+
+    try:
+      if not abort:
+        self._analysis_mediator.ProduceAnalysisReport(self._analysis_plugin)
+
+    # All exceptions need to be caught here to ensure the task storage
+    # is finalized.
+    except Exception as exception:  # pylint: disable=broad-except
+      logger.warning(
+          'Unhandled exception in inline analysis plugin: {0:s}.'.format(
+              self._analysis_plugin.plugin_name))
+      logger.exception(exception)
+
+      abort = True
+
+    finally:
+      self._task_storage_writer.WriteTaskCompletion(aborted=abort)
+      self._task_storage_writer.Close()
+
+    try:
+      self._storage_writer.FinalizeTaskStorage(self._task)
+    except IOError as exception:
+      logger.warning('Unable to finalize task storage with error: {0!s}'.format(
+          exception))
+
+    logger.info('Stopped inline analysis plugin: {0:s}.'.format(
+        self._analysis_plugin.plugin_name))
+
+    self._analysis_mediator = None
+    self._task = None
+    self._task_storage_writer = None
@@ -4,8 +4,11 @@
 import collections
 import heapq
 import os
+import queue
+import threading
 import time
 
+from plaso.containers import events
 from plaso.containers import tasks
 from plaso.engine import plaso_queue
 from plaso.engine import processing_status
@@ -15,17 +18,23 @@ from plaso.lib import definitions
 from plaso.lib import errors
 from plaso.multi_processing import analysis_process
 from plaso.multi_processing import engine as multi_process_engine
+from plaso.multi_processing import inline_analysis
 from plaso.multi_processing import logger
 from plaso.storage import event_tag_index
+from plaso.storage import storage_filter as storage_filters
 from plaso.storage import time_range as storage_time_range
 
 
 class PsortEventHeap(object):
   """Psort event heap."""
 
+  # Note that storage_file is set by the event reader when merging the events
+  # of multiple storage files and is excluded so that events are deduplicated
+  # across storage files.
   _IDENTIFIER_EXCLUDED_ATTRIBUTES = frozenset([
       'data_type',
       'parser',
+      'storage_file',
       'tag',
       'timestamp',
       'timestamp_desc'])
@@ -34,6 +43,7 @@ class PsortEventHeap(object):
     """Initializes a psort events heap."""
     super(PsortEventHeap, self).__init__()
     self._heap = []
+    self._number_of_pushed_events = 0
 
   @property
   def number_of_events(self):
@@ -150,14 +160,15 @@ class PsortEventHeap(object):
         EventObject: event.
         EventData: event data.
         EventDataStream: event data stream.
+        EventTag: event tag.
     """
     try:
-      (macb_group_identifier, content_identifier, event, event_data,
-       event_data_stream) = heapq.heappop(self._heap)
+      (macb_group_identifier, content_identifier, _, event, event_data,
+       event_data_stream, event_tag) = heapq.heappop(self._heap)
       if macb_group_identifier == '':
         macb_group_identifier = None
       return (macb_group_identifier, content_identifier, event, event_data,
-              event_data_stream)
+              event_data_stream, event_tag)
 
     except IndexError:
       return None
@@ -174,34 +185,283 @@ class PsortEventHeap(object):
         EventObject: event.
         EventData: event data.
         EventDataStream: event data stream.
+        EventTag: event tag.
     """
     heap_values = self.PopEvent()
     while heap_values:
       yield heap_values
       heap_values = self.PopEvent()
 
-  def PushEvent(self, event, event_data, event_data_stream):
+  def PushEvent(self, event, event_data, event_data_stream, event_tag=None):
     """Pushes an event onto the heap.
 
     Args:
       event (EventObject): event.
       event_data (EventData): event data.
       event_data_stream (EventDataStream): event data stream.
+      event_tag (Optional[EventTag]): event tag.
     """
     macb_group_identifier, content_identifier = self._GetEventIdentifiers(
         event, event_data, event_data_stream)
 
     # We can ignore the timestamp here because the psort engine only stores
     # events with the same timestamp in the event heap.
+    #
+    # Events with the same identifiers, such as duplicates from different
+    # storage files, are ordered by the sequence in which they were pushed,
+    # so that deduplication consistently keeps the first one. When merging
+    # storage files the events with the same timestamp are pushed in the
+    # order of the storage files and then in the order within the storage
+    # file. This also prevents the heap from comparing the events.
     heap_values = (
-        macb_group_identifier or '', content_identifier, event, event_data,
-        event_data_stream)
+        macb_group_identifier or '', content_identifier,
+        self._number_of_pushed_events, event, event_data, event_data_stream,
+        event_tag)
     heapq.heappush(self._heap, heap_values)
 
+    self._number_of_pushed_events += 1
+
+
+class PsortEventReader(object):
+  """Psort event reader.
+
+  The event reader reads events, and their event data, event data stream and
+  event tag, from storage in a separate thread and passes them in batches to
+  the consumer by means of a bounded queue. This allows reading and
+  deserializing events to overlap with filtering, sorting and formatting
+  them.
+
+  Note that the storage reader should not be used by the consumer while
+  the event reader is running.
+
+  Attributes:
+    consumer_wait_time (float): time in seconds the consumer waited for
+        the reader thread, because the queue was empty.
+    read_time (float): time in seconds the reader thread spent reading events.
+    reader_wait_time (float): time in seconds the reader thread waited for
+        the consumer, because the queue was full.
+  """
+
+  _BATCH_SIZE = 1000
+
+  _MAXIMUM_QUEUE_SIZE = 64
+
+  _QUEUE_TIMEOUT = 1.0
+
+  def __init__(
+      self, storage_reader, event_tag_index, storage_filter=None,
+      time_range=None, merge_storage_readers=None):
+    """Initializes a psort event reader.
+
+    Args:
+      storage_reader (StorageReader): storage reader.
+      event_tag_index (EventTagIndex): event tag index.
+      storage_filter (Optional[StorageFilter]): storage filter used to filter
+          events.
+      time_range (Optional[TimeRange]): time range used to filter events
+          that fall in a specific period.
+      merge_storage_readers (Optional[dict[str, StorageReader]]): storage
+          readers per storage file name, of all the storage files, including
+          that of the storage reader, of which the events should be merged
+          into a single sorted stream of events.
+    """
+    super(PsortEventReader, self).__init__()
+    self._abort = False
+    self._event_tag_index = event_tag_index
+    self._exception = None
+    self._merge_storage_readers = merge_storage_readers
+    self._queue = queue.Queue(maxsize=self._MAXIMUM_QUEUE_SIZE)
+    self._storage_filter = storage_filter
+    self._storage_reader = storage_reader
+    self._thread = None
+    self._time_range = time_range
+
+    self.consumer_wait_time = 0.0
+    self.read_time = 0.0
+    self.reader_wait_time = 0.0
+
+  def _GetEventsFromStorage(
+      self, storage_reader, event_tag_index_object, storage_file_name=None):
+    """Retrieves the sorted events from a storage.
+
+    Args:
+      storage_reader (StorageReader): storage reader.
+      event_tag_index_object (EventTagIndex): event tag index of the storage.
+      storage_file_name (Optional[str]): name of the storage file, that is
+          set as the "storage_file" attribute of the event data, where None
+          represents the event data should not be annotated.
+
+    Yields:
+      tuple: containing:
+
+        EventObject: event.
+        EventData: event data.
+        EventDataStream: event data stream.
+        EventTag: event tag.
+    """
+    event_generator = storage_reader.GetSortedEvents(
+        time_range=self._time_range, storage_filter=self._storage_filter)
+
+    for event in event_generator:
+      event_data_identifier = event.GetEventDataIdentifier()
+      event_data = storage_reader.GetEventDataByIdentifier(
+          event_data_identifier)
+
+      event_data_stream_identifier = event_data.GetEventDataStreamIdentifier()
+      if event_data_stream_identifier:
+        event_data_stream = storage_reader.GetEventDataStreamByIdentifier(
+            event_data_stream_identifier)
+      else:
+        event_data_stream = None
+
+      event_identifier = event.GetIdentifier()
+      event_tag = event_tag_index_object.GetEventTagByIdentifier(
+          storage_reader, event_identifier)
+
+      if storage_file_name:
+        event_data.storage_file = storage_file_name
+
+      yield event, event_data, event_data_stream, event_tag
+
+  def _PutBatch(self, batch):
+    """Puts a batch of events on the queue.
+
+    Args:
+      batch (list[tuple]): batch of events or None to signal the end of
+          the events.
+
+    Returns:
+      bool: True if the batch was put on the queue, False if the reader was
+          stopped.
+    """
+    start_time = time.perf_counter()
+    try:
+      while not self._abort:
+        try:
+          self._queue.put(batch, timeout=self._QUEUE_TIMEOUT)
+          return True
+        except queue.Full:
+          pass
+
+    finally:
+      self.reader_wait_time += time.perf_counter() - start_time
+
+    return False
+
+  def _ReaderThreadMain(self):
+    """Main function of the reader thread."""
+    start_time = time.perf_counter()
+
+    batch = []
+    try:
+      if not self._merge_storage_readers:
+        event_generator = self._GetEventsFromStorage(
+            self._storage_reader, self._event_tag_index)
+
+      else:
+        # The events of the individual storage files are sorted by timestamp
+        # hence a k-way merge results in events sorted by timestamp. Events
+        # with the same timestamp are merged in the order of the storage
+        # files, since heapq.merge() is stable. Event identifiers are specific
+        # to a storage file, hence every storage file has its own event tag
+        # index.
+        event_generators = [
+            self._GetEventsFromStorage(
+                storage_reader, event_tag_index.EventTagIndex(),
+                storage_file_name=storage_file_name)
+            for storage_file_name, storage_reader in (
+                self._merge_storage_readers.items())]
+
+        event_generator = heapq.merge(
+            *event_generators, key=lambda values: values[0].timestamp)
+
+      for values in event_generator:
+        batch.append(values)
+
+        if len(batch) >= self._BATCH_SIZE:
+          if not self._PutBatch(batch):
+            break
+
+          batch = []
+
+      else:
+        if batch:
+          self._PutBatch(batch)
+
+    except Exception as exception:  # pylint: disable=broad-except
+      self._exception = exception
+
+    finally:
+      self._PutBatch(None)
+
+      self.read_time = (
+          time.perf_counter() - start_time - self.reader_wait_time)
+
+  def GetEventBatches(self):
+    """Retrieves the batches of events read by the reader thread.
+
+    Yields:
+      list[tuple[EventObject, EventData, EventDataStream, EventTag]]: batch of
+          events, with their event data, event data stream and event tag.
+
+    Raises:
+      Exception: if the reader thread failed to read the events.
+    """
+    while True:
+      start_time = time.perf_counter()
+      batch = self._queue.get()
+      self.consumer_wait_time += time.perf_counter() - start_time
+
+      if batch is None:
+        break
+
+      yield batch
+
+    if self._exception:
+      raise self._exception  # pylint: disable=raising-bad-type
+
+  def GetEvents(self):
+    """Retrieves the events read by the reader thread.
+
+    Yields:
+      tuple: containing:
+
+        EventObject: event.
+        EventData: event data.
+        EventDataStream: event data stream.
+        EventTag: event tag.
+
+    Raises:
+      Exception: if the reader thread failed to read the events.
+    """
+    for batch in self.GetEventBatches():
+      for values in batch:
+        yield values
+
+  def Start(self):
+    """Starts the reader thread."""
+    self._thread = threading.Thread(
+        name='event_reader', target=self._ReaderThreadMain)
+    self._thread.daemon = True
+    self._thread.start()
+
+  def Stop(self):
+    """Stops the reader thread."""
+    if not self._thread:
+      return
+
+    self._abort = True
+
+    self._thread.join()
+    self._thread = None
+
 
 class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
   """Psort multi-processing engine."""
 
+  # Maximum number of events pushed to the analysis processes in one batch.
+  _ANALYSIS_EVENT_BATCH_SIZE = 100
+
   _PROCESS_JOIN_TIMEOUT = 5.0
 
   _QUEUE_TIMEOUT = 10 * 60
@@ -227,6 +487,8 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
 
     super(PsortMultiProcessEngine, self).__init__()
     self._analysis_plugins = {}
+    self._analysis_process_names = {}
+    self._analysis_shard_reports = {}
     self._completed_analysis_processes = set()
     self._data_location = None
     self._event_filter_expression = None
@@ -237,6 +499,8 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
     # a deterministic way.
     self._export_event_heap = PsortEventHeap()
     self._export_event_timestamp = 0
+    self._inline_analysis_plugin_names = frozenset()
+    self._inline_analysis_runners = {}
     self._knowledge_base = None
     self._memory_profiler = None
     self._merge_task = None
@@ -250,6 +514,7 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
     self._number_of_produced_reports = 0
     self._number_of_produced_sources = 0
     self._number_of_produced_warnings = 0
+    self._number_of_pushed_event_batches = 0
     self._processing_configuration = None
     self._processing_profiler = None
     self._serializers_profiler = None
@@ -283,6 +548,7 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
     self._number_of_produced_reports = 0
     self._number_of_produced_sources = 0
     self._number_of_produced_warnings = 0
+    self._number_of_pushed_event_batches = 0
 
     number_of_filtered_events = 0
 
@@ -290,7 +556,15 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
 
     filter_limit = getattr(event_filter, 'limit', None)
 
-    for event in storage_writer.GetSortedEvents():
+    # Conditions that can be evaluated by the storage are pushed down so that
+    # non-matching events do not need to be deserialized.
+    storage_filter = None
+    if event_filter:
+      storage_filter, event_filter = event_filter.PlanStorageFilter(
+          message_text_index=storage_writer.HasTextIndexAttribute('message'))
+
+    batched_events = []
+    for event in storage_writer.GetSortedEvents(storage_filter=storage_filter):
       event_data_identifier = event.GetEventDataIdentifier()
       event_data = storage_writer.GetEventDataByIdentifier(
           event_data_identifier)
@@ -317,9 +591,15 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
         number_of_filtered_events += 1
         continue
 
-      for event_queue in self._event_queues.values():
-        # TODO: Check for premature exit of analysis plugins.
-        event_queue.PushItem((event, event_data, event_data_stream))
+      for inline_analysis_runner in self._inline_analysis_runners.values():
+        inline_analysis_runner.ProcessEvent(
+            event, event_data, event_data_stream)
+
+      if self._event_queues:
+        batched_events.append((event, event_data, event_data_stream))
+        if len(batched_events) >= self._ANALYSIS_EVENT_BATCH_SIZE:
+          self._PushAnalysisEventBatch(batched_events)
+          batched_events = []
 
       self._number_of_consumed_events += 1
 
@@ -327,54 +607,10 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
           filter_limit == self._number_of_consumed_events):
         break
 
-    logger.debug('Finished pushing events to analysis plugins.')
-    # Signal that we have finished adding events.
-    for event_queue in self._event_queues.values():
-      event_queue.PushItem(plaso_queue.QueueAbort(), block=False)
-
-    logger.debug('Processing analysis plugin results.')
-
-    # TODO: use a task based approach.
-    plugin_names = list(analysis_plugins.keys())
-    while plugin_names:
-      for plugin_name in list(plugin_names):
-        if self._abort:
-          break
-
-        # TODO: temporary solution.
-        task = tasks.Task()
-        task.storage_format = definitions.STORAGE_FORMAT_SQLITE
-        task.identifier = plugin_name
-
-        merge_ready = storage_writer.CheckTaskReadyForMerge(task)
-        if merge_ready:
-          storage_writer.PrepareMergeTaskStorage(task)
-          self._status = definitions.STATUS_INDICATOR_MERGING
-
-          event_queue = self._event_queues[plugin_name]
-          del self._event_queues[plugin_name]
-
-          event_queue.Close()
+    if batched_events:
+      self._PushAnalysisEventBatch(batched_events)
 
-          storage_merge_reader = storage_writer.StartMergeTaskStorage(task)
-
-          storage_merge_reader.MergeAttributeContainers(
-              callback=self._MergeEventTag)
-          # TODO: temporary solution.
-          plugin_names.remove(plugin_name)
-
-          self._status = definitions.STATUS_INDICATOR_RUNNING
-
-          self._number_of_produced_event_tags = (
-              storage_writer.number_of_event_tags)
-          self._number_of_produced_reports = (
-              storage_writer.number_of_analysis_reports)
-
-    try:
-      storage_writer.StopTaskStorage(abort=self._abort)
-    except (IOError, OSError) as exception:
-      logger.error('Unable to stop task storage with error: {0!s}'.format(
-          exception))
+    self._CompleteAnalysis(storage_writer)
 
     if self._abort:
       logger.debug('Processing aborted.')
@@ -465,31 +701,157 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
 
       self._TerminateProcessByPid(pid)
 
+  def _CompleteAnalysis(self, storage_writer):
+    """Completes the analysis and merges the results of the analysis plugins.
+
+    Args:
+      storage_writer (StorageWriter): storage writer.
+    """
+    for inline_analysis_runner in self._inline_analysis_runners.values():
+      inline_analysis_runner.Stop(abort=self._abort)
+
+    logger.debug('Finished pushing events to analysis plugins.')
+    # Signal that we have finished adding events.
+    for event_queue in self._event_queues.values():
+      event_queue.PushItem(plaso_queue.QueueAbort(), block=False)
+
+    logger.debug('Processing analysis plugin results.')
+
+    analysis_shard_process_names = set()
+    for process_names in self._analysis_process_names.values():
+      if len(process_names) > 1:
+        analysis_shard_process_names.update(process_names)
+
+    # The task identifier of an analysis process is the process name and
+    # that of an inline analysis plugin the plugin name.
+    # TODO: use a task based approach.
+    task_identifiers = list(self._analysis_plugins.keys())
+    while task_identifiers:
+      for task_identifier in list(task_identifiers):
+        if self._abort:
+          break
+
+        # TODO: temporary solution.
+        task = tasks.Task()
+        task.storage_format = definitions.STORAGE_FORMAT_SQLITE
+        task.identifier = task_identifier
+
+        merge_ready = storage_writer.CheckTaskReadyForMerge(task)
+        if merge_ready:
+          storage_writer.PrepareMergeTaskStorage(task)
+          self._status = definitions.STATUS_INDICATOR_MERGING
+
+          # Inline analysis plugins do not have an event queue.
+          event_queue = self._event_queues.pop(task_identifier, None)
+          if event_queue:
+            event_queue.Close()
+
+          if task_identifier in analysis_shard_process_names:
+            merge_callback = self._MergeAnalysisShardAttributeContainer
+          else:
+            merge_callback = self._MergeEventTag
+
+          storage_merge_reader = storage_writer.StartMergeTaskStorage(task)
+
+          storage_merge_reader.MergeAttributeContainers(
+              callback=merge_callback)
+          # TODO: temporary solution.
+          task_identifiers.remove(task_identifier)
+
+          self._status = definitions.STATUS_INDICATOR_RUNNING
+
+          self._number_of_produced_event_tags = (
+              storage_writer.number_of_event_tags)
+          self._number_of_produced_reports = (
+              storage_writer.number_of_analysis_reports)
+
+    if not self._abort:
+      for analysis_report in self._analysis_shard_reports.values():
+        storage_writer.AddAnalysisReport(analysis_report)
+
+      self._number_of_produced_reports = (
+          storage_writer.number_of_analysis_reports)
+
+    self._analysis_shard_reports = {}
+
+    try:
+      storage_writer.StopTaskStorage(abort=self._abort)
+    except (IOError, OSError) as exception:
+      logger.error('Unable to stop task storage with error: {0!s}'.format(
+          exception))
+
+  def _ExamineEventInline(
+      self, event, event_data, event_data_stream, event_tag):
+    """Examines an event with the inline analysis plugins.
+
+    Args:
+      event (EventObject): event.
+      event_data (EventData): event data.
+      event_data_stream (EventDataStream): event data stream.
+      event_tag (EventTag): event tag of the event in the storage.
+
+    Returns:
+      EventTag: event tag with the labels of the event tag in the storage and
+          those of the event tags produced by the inline analysis plugins, or
+          None if the event has no event tag.
+    """
+    produced_event_tags = []
+    for inline_analysis_runner in self._inline_analysis_runners.values():
+      produced_event_tags.extend(inline_analysis_runner.ProcessEvent(
+          event, event_data, event_data_stream))
+
+    if not produced_event_tags:
+      return event_tag
+
+    # Note that the event tags are merged into the storage after analysis has
+    # completed, hence a new event tag is used for the export. The labels are
+    # added in the same order as _MergeEventTag() does.
+    merged_event_tag = events.EventTag()
+    merged_event_tag.SetEventIdentifier(event.GetIdentifier())
+
+    for produced_event_tag in produced_event_tags:
+      merged_event_tag.AddLabels(produced_event_tag.labels)
+
+    if event_tag:
+      merged_event_tag.AddLabels(event_tag.labels)
+
+    return merged_event_tag
+
   def _ExportEvent(
-      self, storage_reader, output_module, event, event_data, event_data_stream,
+      self, output_module, event, event_data, event_data_stream, event_tag,
       deduplicate_events=True):
     """Exports an event using an output module.
 
+    If inline analysis plugins are used, the event is examined by them before
+    it is exported, so that the exported event tag includes the labels they
+    produce.
+
     Args:
-      storage_reader (StorageReader): storage reader.
       output_module (OutputModule): output module.
       event (EventObject): event.
       event_data (EventData): event data.
       event_data_stream (EventDataStream): event data stream.
+      event_tag (EventTag): event tag.
       deduplicate_events (Optional[bool]): True if events should be
           deduplicated.
     """
+    if self._inline_analysis_runners:
+      event_tag = self._ExamineEventInline(
+          event, event_data, event_data_stream, event_tag)
+
     if (event.timestamp != self._export_event_timestamp or
         self._export_event_heap.number_of_events > self._HEAP_MAXIMUM_EVENTS):
       self._FlushExportBuffer(
-          storage_reader, output_module, deduplicate_events=deduplicate_events)
+          output_module, deduplicate_events=deduplicate_events)
       self._export_event_timestamp = event.timestamp
 
-    self._export_event_heap.PushEvent(event, event_data, event_data_stream)
+    self._export_event_heap.PushEvent(
+        event, event_data, event_data_stream, event_tag=event_tag)
 
   def _ExportEvents(
       self, storage_reader, output_module, deduplicate_events=True,
-      event_filter=None, time_slice=None, use_time_slicer=False):
+      event_filter=None, export_watermark=None, merge_storage_readers=None,
+      time_slice=None, use_time_slicer=False):
     """Exports events using an output module.
 
     Args:
@@ -498,6 +860,13 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
       deduplicate_events (Optional[bool]): True if events should be
           deduplicated.
       event_filter (Optional[EventObjectFilter]): event filter.
+      export_watermark (Optional[ExportWatermark]): export watermark of
+          a previous export, where only events added to the store after
+          the previous export are exported.
+      merge_storage_readers (Optional[dict[str, StorageReader]]): storage
+          readers per storage file name, of all the storage files, including
+          that of the storage reader, of which the events should be merged
+          into a single timeline.
       time_slice (Optional[TimeRange]): time range that defines a time slice
           to filter events.
       use_time_slicer (Optional[bool]): True if the 'time slicer' should be
@@ -518,49 +887,125 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
         time_slice_buffer = bufferlib.CircularBuffer(time_slice.duration)
 
     filter_limit = getattr(event_filter, 'limit', None)
-    forward_entries = 0
+
+    # Conditions that can be evaluated by the storage are pushed down so that
+    # non-matching events do not need to be deserialized. Message conditions
+    # are only pushed down if all the storage files have a text index that
+    # contains the formatted messages, otherwise they are evaluated by
+    # the event filter.
+    storage_filter = None
+    if event_filter:
+      if merge_storage_readers:
+        storage_readers = list(merge_storage_readers.values())
+      else:
+        storage_readers = [storage_reader]
+
+      message_text_index = all(
+          reader.HasTextIndexAttribute('message') for reader in storage_readers)
+      storage_filter, event_filter = event_filter.PlanStorageFilter(
+          message_text_index=message_text_index)
+
+    # The time slicer needs the events that do not match as context, hence
+    # the storage filter is used to determine the events that match instead
+    # of to filter the events that are read.
+    storage_filter_matches = None
+    if storage_filter and time_slice_buffer:
+      storage_filter_matches = self._GetStorageFilterMatches(
+          storage_reader, storage_filter,
+          merge_storage_readers=merge_storage_readers,
+          time_range=time_slice_range)
+      storage_filter = None
+
+    if export_watermark:
+      if not storage_filter:
+        storage_filter = storage_filters.StorageFilter()
+
+      storage_filter.SetMinimumEventRowIdentifier(
+          export_watermark.event_row_identifier + 1)
 
     self._events_status.number_of_filtered_events = 0
     self._events_status.number_of_events_from_time_slice = 0
 
-    for event in storage_reader.GetSortedEvents(time_range=time_slice_range):
-      event_data_identifier = event.GetEventDataIdentifier()
-      event_data = storage_reader.GetEventDataByIdentifier(
-          event_data_identifier)
+    # Reading events from storage is done by a separate thread so that it can
+    # overlap with filtering, sorting and formatting the events.
+    event_reader = PsortEventReader(
+        storage_reader, self._event_tag_index, storage_filter=storage_filter,
+        time_range=time_slice_range,
+        merge_storage_readers=merge_storage_readers)
+    event_reader.Start()
 
-      event_data_stream_identifier = event_data.GetEventDataStreamIdentifier()
-      if event_data_stream_identifier:
-        event_data_stream = storage_reader.GetEventDataStreamByIdentifier(
-            event_data_stream_identifier)
-      else:
-        event_data_stream = None
+    start_time = time.perf_counter()
 
-      event_identifier = event.GetIdentifier()
-      event_tag = self._event_tag_index.GetEventTagByIdentifier(
-          storage_reader, event_identifier)
+    try:
+      self._ExportEventsFromReader(
+          event_reader, output_module, deduplicate_events=deduplicate_events,
+          event_filter=event_filter, filter_limit=filter_limit,
+          storage_filter_matches=storage_filter_matches,
+          time_slice=time_slice, time_slice_buffer=time_slice_buffer,
+          time_slice_range=time_slice_range)
+
+    finally:
+      event_reader.Stop()
+
+    self._FlushExportBuffer(output_module)
+
+    export_time = time.perf_counter() - start_time
+
+    logger.info((
+        'Export stages: read: {0:.3f} seconds (waited: {1:.3f} seconds), '
+        'filter, sort and format: {2:.3f} seconds (waited: {3:.3f} '
+        'seconds).').format(
+            event_reader.read_time, event_reader.reader_wait_time,
+            export_time - event_reader.consumer_wait_time,
+            event_reader.consumer_wait_time))
+
+  def _ExportEventsFromReader(
+      self, event_reader, output_module, deduplicate_events=True,
+      event_filter=None, filter_limit=None, storage_filter_matches=None,
+      time_slice=None, time_slice_buffer=None, time_slice_range=None):
+    """Exports events read by an event reader using an output module.
 
+    Args:
+      event_reader (PsortEventReader): event reader.
+      output_module (OutputModule): output module.
+      deduplicate_events (Optional[bool]): True if events should be
+          deduplicated.
+      event_filter (Optional[EventObjectFilter]): event filter.
+      filter_limit (Optional[int]): maximum number of events that match
+          the event filter to export.
+      storage_filter_matches (Optional[set[tuple[str, str]]]): keys of
+          the events that match the storage filter, as determined by
+          _GetStorageFilterMatches(), where None represents the events read
+          have already been filtered by the storage filter.
+      time_slice (Optional[TimeRange]): time range that defines a time slice
+          to filter events.
+      time_slice_buffer (Optional[CircularBuffer]): buffer of the 'time
+          slicer'.
+      time_slice_range (Optional[TimeRange]): time range of the time slice.
+    """
+    forward_entries = 0
+
+    for event, event_data, event_data_stream, event_tag, filter_match in (
+        self._MatchEventBatches(
+            event_reader, event_filter,
+            storage_filter_matches=storage_filter_matches)):
       if time_slice_range and event.timestamp != time_slice.event_timestamp:
         self._events_status.number_of_events_from_time_slice += 1
 
-      if event_filter:
-        filter_match = event_filter.Match(
-            event, event_data, event_data_stream, event_tag)
-      else:
-        filter_match = None
-
       # pylint: disable=singleton-comparison
       if filter_match == False:
         if not time_slice_buffer:
           self._events_status.number_of_filtered_events += 1
 
         elif forward_entries == 0:
-          time_slice_buffer.Append((event, event_data))
+          time_slice_buffer.Append(
+              (event, event_data, event_data_stream, event_tag))
           self._events_status.number_of_filtered_events += 1
 
         elif forward_entries <= time_slice_buffer.size:
           self._ExportEvent(
-              storage_reader, output_module, event, event_data,
-              event_data_stream, deduplicate_events=deduplicate_events)
+              output_module, event, event_data, event_data_stream, event_tag,
+              deduplicate_events=deduplicate_events)
           self._number_of_consumed_events += 1
           self._events_status.number_of_events_from_time_slice += 1
           forward_entries += 1
@@ -575,11 +1020,12 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
         # pylint: disable=singleton-comparison
         if filter_match == True and time_slice_buffer:
           # Empty the time slice buffer.
-          for event_in_buffer, event_data_in_buffer in (
-              time_slice_buffer.Flush()):
+          for (event_in_buffer, event_data_in_buffer,
+               event_data_stream_in_buffer, event_tag_in_buffer) in (
+                   time_slice_buffer.Flush()):
             self._ExportEvent(
-                storage_reader, output_module, event_in_buffer,
-                event_data_in_buffer, event_data_stream,
+                output_module, event_in_buffer, event_data_in_buffer,
+                event_data_stream_in_buffer, event_tag_in_buffer,
                 deduplicate_events=deduplicate_events)
             self._number_of_consumed_events += 1
             self._events_status.number_of_filtered_events += 1
@@ -588,7 +1034,7 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
           forward_entries = 1
 
         self._ExportEvent(
-            storage_reader, output_module, event, event_data, event_data_stream,
+            output_module, event, event_data, event_data_stream, event_tag,
             deduplicate_events=deduplicate_events)
         self._number_of_consumed_events += 1
 
@@ -597,14 +1043,10 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
             filter_limit == self._number_of_consumed_events):
           break
 
-    self._FlushExportBuffer(storage_reader, output_module)
-
-  def _FlushExportBuffer(
-      self, storage_reader, output_module, deduplicate_events=True):
+  def _FlushExportBuffer(self, output_module, deduplicate_events=True):
     """Flushes buffered events and writes them to the output module.
 
     Args:
-      storage_reader (StorageReader): storage reader.
       output_module (OutputModule): output module.
       deduplicate_events (Optional[bool]): True if events should be
           deduplicated.
@@ -616,15 +1058,11 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
     generator = self._export_event_heap.PopEvents()
 
     for (macb_group_identifier, content_identifier, event, event_data,
-         event_data_stream) in generator:
+         event_data_stream, event_tag) in generator:
       if deduplicate_events and last_content_identifier == content_identifier:
         self._events_status.number_of_duplicate_events += 1
         continue
 
-      event_identifier = event.GetIdentifier()
-      event_tag = self._event_tag_index.GetEventTagByIdentifier(
-          storage_reader, event_identifier)
-
       if macb_group_identifier is None:
         if macb_group:
           output_module.WriteEventMACBGroup(macb_group)
@@ -650,6 +1088,137 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
     if macb_group:
       output_module.WriteEventMACBGroup(macb_group)
 
+  def _GetStorageFilterMatchKey(self, event, event_data):
+    """Retrieves the key of an event to look up storage filter matches.
+
+    Args:
+      event (EventObject): event.
+      event_data (EventData): event data.
+
+    Returns:
+      tuple[str, str]: name of the storage file the event was read from or None
+          if the events of a single storage file are read, and the identifier
+          of the event.
+    """
+    event_identifier = event.GetIdentifier()
+    return (getattr(event_data, 'storage_file', None),
+            event_identifier.CopyToString())
+
+  def _GetStorageFilterMatches(
+      self, storage_reader, storage_filter, merge_storage_readers=None,
+      time_range=None):
+    """Determines the events that match a storage filter.
+
+    Args:
+      storage_reader (StorageReader): storage reader.
+      storage_filter (StorageFilter): storage filter.
+      merge_storage_readers (Optional[dict[str, StorageReader]]): storage
+          readers per storage file name, of all the storage files, including
+          that of the storage reader, of which the events are merged.
+      time_range (Optional[TimeRange]): time range used to filter events
+          that fall in a specific period.
+
+    Returns:
+      set[tuple[str, str]]: keys of the events that match the storage filter,
+          as returned by _GetStorageFilterMatchKey().
+    """
+    if merge_storage_readers:
+      storage_readers = merge_storage_readers.items()
+    else:
+      storage_readers = [(None, storage_reader)]
+
+    storage_filter_matches = set()
+    for storage_file_name, storage_file_reader in storage_readers:
+      for event in storage_file_reader.GetSortedEvents(
+          time_range=time_range, storage_filter=storage_filter):
+        event_identifier = event.GetIdentifier()
+        storage_filter_matches.add(
+            (storage_file_name, event_identifier.CopyToString()))
+
+    return storage_filter_matches
+
+  def _MatchEventBatches(
+      self, event_reader, event_filter, storage_filter_matches=None):
+    """Matches the batches of events read by an event reader.
+
+    The event filter is evaluated against a batch of events at once, which
+    is faster than evaluating it against the individual events.
+
+    Args:
+      event_reader (PsortEventReader): event reader.
+      event_filter (EventObjectFilter): event filter or None if no filter
+          is used.
+      storage_filter_matches (Optional[set[tuple[str, str]]]): keys of
+          the events that match the storage filter, as determined by
+          _GetStorageFilterMatches(), where None represents the events read
+          have already been filtered by the storage filter.
+
+    Yields:
+      tuple: containing:
+
+        EventObject: event.
+        EventData: event data.
+        EventDataStream: event data stream.
+        EventTag: event tag.
+        bool: True if the event matches the event filter, False if not or
+            None if no filter is used.
+    """
+    for batch in event_reader.GetEventBatches():
+      if event_filter:
+        filter_matches = event_filter.MatchBatch(batch)
+      elif storage_filter_matches is not None:
+        filter_matches = [True] * len(batch)
+      else:
+        filter_matches = [None] * len(batch)
+
+      if storage_filter_matches is not None:
+        filter_matches = [
+            filter_match and self._GetStorageFilterMatchKey(
+                event, event_data) in storage_filter_matches
+            for (event, event_data, _, _), filter_match in zip(
+                batch, filter_matches)]
+
+      for (event, event_data, event_data_stream, event_tag), filter_match in (
+          zip(batch, filter_matches)):
+        yield event, event_data, event_data_stream, event_tag, filter_match
+
+  def _MergeAnalysisShardAttributeContainer(
+      self, storage_writer, attribute_container):
+    """Merges an attribute container of an analysis shard process.
+
+    The analysis report of an analysis shard process is not merged but combined
+    with the analysis reports of the other analysis shard processes of the same
+    analysis plugin, by adding up their analysis counters. The combined
+    analysis report is written when the analysis is completed.
+
+    Args:
+      storage_writer (StorageWriter): storage writer.
+      attribute_container (AttributeContainer): container.
+
+    Returns:
+      bool: False if the attribute container should not be merged.
+    """
+    if attribute_container.CONTAINER_TYPE != 'analysis_report':
+      self._MergeEventTag(storage_writer, attribute_container)
+      return True
+
+    plugin_name = attribute_container.plugin_name
+    analysis_report = self._analysis_shard_reports.get(plugin_name, None)
+    if not analysis_report:
+      self._analysis_shard_reports[plugin_name] = attribute_container
+      return False
+
+    analysis_counter = collections.Counter(
+        analysis_report.analysis_counter or {})
+    analysis_counter.update(attribute_container.analysis_counter or {})
+    analysis_report.analysis_counter = analysis_counter
+
+    if ((attribute_container.time_compiled or 0) >
+        (analysis_report.time_compiled or 0)):
+      analysis_report.time_compiled = attribute_container.time_compiled
+
+    return False
+
   def _MergeEventTag(self, storage_writer, attribute_container):
     """Merges an event tag with the last stored event tag.
 
@@ -677,23 +1246,91 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
 
     self._event_tag_index.SetEventTag(attribute_container)
 
-  def _StartAnalysisProcesses(self, storage_writer, analysis_plugins):
+  def _PrepareExport(self, storage_readers, output_module):
+    """Prepares the export of events from storage.
+
+    Args:
+      storage_readers (list[StorageReader|StorageWriter]): storage readers or
+          writers to export events from.
+      output_module (OutputModule): output module.
+    """
+    total_number_of_events = 0
+    for storage_reader in storage_readers:
+      for stored_session in storage_reader.GetSessions():
+        total_number_of_events += stored_session.parsers_counter['total']
+
+      if output_module.USES_SERIALIZED_DATA:
+        storage_reader.SetRetainSerializedData(True)
+
+    self._events_status.total_number_of_events = total_number_of_events
+
+  def _PushAnalysisEventBatch(self, batched_events):
+    """Pushes a batch of events onto the queues of the analysis processes.
+
+    The batch is serialized once and the same serialized batch is pushed onto
+    the queue of one analysis process per analysis plugin. The batches of an
+    analysis plugin that runs in multiple analysis shard processes are
+    distributed over these processes in turn.
+
+    Args:
+      batched_events (list[tuple[EventObject, EventData, EventDataStream]]):
+          events and corresponding event data and event data streams.
+    """
+    event_batch = analysis_process.AnalysisEventBatch()
+    event_batch.SetEvents(batched_events)
+
+    for process_names in self._analysis_process_names.values():
+      shard_index = self._number_of_pushed_event_batches % len(process_names)
+      event_queue = self._event_queues.get(process_names[shard_index], None)
+      if event_queue:
+        # TODO: Check for premature exit of analysis plugins.
+        event_queue.PushItem(event_batch)
+
+    self._number_of_pushed_event_batches += 1
+
+  def _StartAnalysisProcesses(
+      self, storage_writer, analysis_plugins, number_of_analysis_shards=1):
     """Starts the analysis processes.
 
     Args:
       storage_writer (StorageWriter): storage writer.
       analysis_plugins (dict[str, AnalysisPlugin]): analysis plugins that
           should be run and their names.
+      number_of_analysis_shards (Optional[int]): number of analysis processes
+          to run per analysis plugin that supports it, where every analysis
+          shard process analyzes part of the events.
     """
     logger.info('Starting analysis plugins.')
 
     for analysis_plugin in analysis_plugins.values():
-      self._analysis_plugins[analysis_plugin.NAME] = analysis_plugin
+      if analysis_plugin.NAME in self._inline_analysis_plugin_names:
+        self._analysis_plugins[analysis_plugin.NAME] = analysis_plugin
+
+        inline_analysis_runner = inline_analysis.InlineAnalysisPluginRunner(
+            storage_writer, self._knowledge_base, analysis_plugin,
+            data_location=self._data_location)
+        inline_analysis_runner.Start()
+
+        self._inline_analysis_runners[analysis_plugin.NAME] = (
+            inline_analysis_runner)
+        continue
+
+      if analysis_plugin.SHARDABLE and number_of_analysis_shards > 1:
+        process_names = [
+            '{0:s}_shard{1:d}'.format(analysis_plugin.NAME, shard_index)
+            for shard_index in range(number_of_analysis_shards)]
+      else:
+        process_names = [analysis_plugin.NAME]
+
+      self._analysis_process_names[analysis_plugin.NAME] = process_names
 
-      process = self._StartWorkerProcess(analysis_plugin.NAME, storage_writer)
-      if not process:
-        logger.error('Unable to create analysis process: {0:s}'.format(
-            analysis_plugin.NAME))
+      for process_name in process_names:
+        self._analysis_plugins[process_name] = analysis_plugin
+
+        process = self._StartWorkerProcess(process_name, storage_writer)
+        if not process:
+          logger.error('Unable to create analysis process: {0:s}'.format(
+              process_name))
 
     logger.info('Analysis plugins running')
 
@@ -721,6 +1358,13 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
     logger.debug('Stopping analysis processes.')
     self._StopMonitoringProcesses()
 
+    # Inline analysis plugins that were not stopped after analysis, for
+    # example on keyboard interrupt, are stopped without a report.
+    for inline_analysis_runner in self._inline_analysis_runners.values():
+      inline_analysis_runner.Stop(abort=True)
+
+    self._inline_analysis_runners = {}
+
     if abort:
       # Signal all the processes to abort.
       self._AbortTerminate()
@@ -893,7 +1537,8 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
   def AnalyzeEvents(
       self, knowledge_base_object, storage_writer, data_location,
       analysis_plugins, processing_configuration, event_filter=None,
-      event_filter_expression=None, status_update_callback=None):
+      event_filter_expression=None, inline_analysis_plugins=None,
+      number_of_analysis_shards=1, status_update_callback=None):
     """Analyzes events in a plaso storage.
 
     Args:
@@ -908,6 +1553,12 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
           configuration.
       event_filter (Optional[EventObjectFilter]): event filter.
       event_filter_expression (Optional[str]): event filter expression.
+      inline_analysis_plugins (Optional[list[str]]): names of the analysis
+          plugins that should be run inline, in the main process, instead of
+          in a separate analysis process.
+      number_of_analysis_shards (Optional[int]): number of analysis processes
+          to run per analysis plugin that supports it, where every analysis
+          shard process analyzes part of the events.
       status_update_callback (Optional[function]): callback function for status
           updates.
 
@@ -922,9 +1573,12 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
     queue_full = False
 
     self._analysis_plugins = {}
+    self._analysis_process_names = {}
     self._data_location = data_location
     self._event_filter_expression = event_filter_expression
     self._events_status = processing_status.EventsStatus()
+    self._inline_analysis_plugin_names = frozenset(
+        inline_analysis_plugins or [])
     self._knowledge_base = knowledge_base_object
     self._status_update_callback = status_update_callback
     self._processing_configuration = processing_configuration
@@ -934,7 +1588,9 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
     # Set up the storage writer before the analysis processes.
     storage_writer.StartTaskStorage()
 
-    self._StartAnalysisProcesses(storage_writer, analysis_plugins)
+    self._StartAnalysisProcesses(
+        storage_writer, analysis_plugins,
+        number_of_analysis_shards=number_of_analysis_shards)
 
     # Start the status update thread after open of the storage writer
     # so we don't have to clean up the thread if the open fails.
@@ -1000,8 +1656,10 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
 
     # Reset values.
     self._analysis_plugins = {}
+    self._analysis_process_names = {}
     self._data_location = None
     self._event_filter_expression = None
+    self._inline_analysis_plugin_names = frozenset()
     self._knowledge_base = None
     self._processing_configuration = None
     self._status_update_callback = None
@@ -1012,12 +1670,150 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
     if keyboard_interrupt:
       raise KeyboardInterrupt
 
+  def AnalyzeAndExportEvents(
+      self, knowledge_base_object, storage_writer, data_location,
+      analysis_plugins, output_module, processing_configuration,
+      deduplicate_events=True, event_filter=None, event_filter_expression=None,
+      export_watermark=None, status_update_callback=None, time_slice=None,
+      use_time_slicer=False):
+    """Analyzes and exports events in a single pass over a plaso storage.
+
+    The analysis plugins are run inline, in the main process, on the events
+    that are exported. The event tags produced by the analysis plugins while
+    examining an event are applied to the event before it is written by
+    the output module. Event tags that are only produced when the analysis
+    report is compiled are stored but not exported.
+
+    Args:
+      knowledge_base_object (KnowledgeBase): contains information from
+          the source data needed for processing.
+      storage_writer (StorageWriter): storage writer.
+      data_location (str): path to the location that data files should
+          be loaded from.
+      analysis_plugins (dict[str, AnalysisPlugin]): analysis plugins that
+          should be run and their names.
+      output_module (OutputModule): output module.
+      processing_configuration (ProcessingConfiguration): processing
+          configuration.
+      deduplicate_events (Optional[bool]): True if events should be
+          deduplicated.
+      event_filter (Optional[EventObjectFilter]): event filter.
+      event_filter_expression (Optional[str]): event filter expression.
+      export_watermark (Optional[ExportWatermark]): export watermark of
+          a previous export, where only events added to the store after
+          the previous export are exported.
+      status_update_callback (Optional[function]): callback function for status
+          updates.
+      time_slice (Optional[TimeSlice]): slice of time to output.
+      use_time_slicer (Optional[bool]): True if the 'time slicer' should be
+          used. The 'time slicer' will provide a context of events around
+          an event of interest.
+
+    Raises:
+      KeyboardInterrupt: if a keyboard interrupt was raised.
+    """
+    keyboard_interrupt = False
+
+    self._analysis_plugins = {}
+    self._analysis_process_names = {}
+    self._data_location = data_location
+    self._event_filter_expression = event_filter_expression
+    self._events_status = processing_status.EventsStatus()
+    self._inline_analysis_plugin_names = frozenset(analysis_plugins.keys())
+    self._knowledge_base = knowledge_base_object
+    self._processing_configuration = processing_configuration
+    self._status_update_callback = status_update_callback
+
+    self._StartProfiling(self._processing_configuration.profiling)
+
+    storage_writer.StartTaskStorage()
+
+    # All analysis plugins are run inline, hence no analysis processes are
+    # started.
+    self._StartAnalysisProcesses(storage_writer, analysis_plugins)
+
+    self._StartStatusUpdateThread()
+
+    try:
+      storage_writer.Open()
+
+      self._PrepareExport([storage_writer], output_module)
+
+      storage_writer.WriteSessionStart()
+
+      try:
+        storage_writer.WriteSessionConfiguration()
+
+        output_module.WriteHeader()
+
+        self._ExportEvents(
+            storage_writer, output_module,
+            deduplicate_events=deduplicate_events, event_filter=event_filter,
+            export_watermark=export_watermark, time_slice=time_slice,
+            use_time_slicer=use_time_slicer)
+
+        output_module.WriteFooter()
+
+        self._CompleteAnalysis(storage_writer)
+
+        self._status = definitions.STATUS_INDICATOR_FINALIZING
+
+      except KeyboardInterrupt:
+        keyboard_interrupt = True
+        self._abort = True
+
+      finally:
+        if self._abort:
+          self._processing_status.aborted = True
+          if self._status_update_callback:
+            self._status_update_callback(self._processing_status)
+
+        storage_writer.WriteSessionCompletion(aborted=self._abort)
+
+        storage_writer.Close()
+
+    finally:
+      # Stop the status update thread after close of the storage writer
+      # so we include the storage sync to disk in the status updates.
+      self._StopStatusUpdateThread()
+
+    self._StopAnalysisProcesses(abort=self._abort)
+
+    self._StopProfiling()
+
+    self._UpdateForemanProcessStatus()
+
+    if self._status_update_callback:
+      self._status_update_callback(self._processing_status)
+
+    # Reset values.
+    self._analysis_plugins = {}
+    self._analysis_process_names = {}
+    self._data_location = None
+    self._event_filter_expression = None
+    self._events_status = None
+    self._inline_analysis_plugin_names = frozenset()
+    self._knowledge_base = None
+    self._processing_configuration = None
+    self._status = definitions.STATUS_INDICATOR_IDLE
+    self._status_update_callback = None
+
+    if keyboard_interrupt:
+      raise KeyboardInterrupt
+
   def ExportEvents(
       self, knowledge_base_object, storage_reader, output_module,
       processing_configuration, deduplicate_events=True, event_filter=None,
+      export_watermark=None, merge_storage_readers=None,
       status_update_callback=None, time_slice=None, use_time_slicer=False):
     """Exports events using an output module.
 
+    When storage readers to merge are provided, the sorted events of all
+    the storage files are merged into a single timeline, where every event
+    is annotated with the name of its storage file, in the "storage_file"
+    attribute of the event data. Events that are duplicates across storage
+    files are deduplicated as well, if deduplication is enabled.
+
     Args:
       knowledge_base_object (KnowledgeBase): contains information from
           the source data needed for processing.
@@ -1028,23 +1824,40 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
       deduplicate_events (Optional[bool]): True if events should be
           deduplicated.
       event_filter (Optional[EventObjectFilter]): event filter.
+      export_watermark (Optional[ExportWatermark]): export watermark of
+          a previous export, where only events added to the store after
+          the previous export are exported. Export watermarks are specific
+          to a storage file and hence are not supported when merging
+          storage files.
+      merge_storage_readers (Optional[dict[str, StorageReader]]): storage
+          readers per storage file name, of all the storage files, including
+          that of the storage reader, of which the events should be merged
+          into a single timeline.
       status_update_callback (Optional[function]): callback function for status
           updates.
       time_slice (Optional[TimeSlice]): slice of time to output.
       use_time_slicer (Optional[bool]): True if the 'time slicer' should be
           used. The 'time slicer' will provide a context of events around
           an event of interest.
+
+    Raises:
+      ValueError: if an export watermark is combined with storage readers to
+          merge.
     """
+    if merge_storage_readers and export_watermark:
+      raise ValueError(
+          'Export watermark not supported when merging storage files.')
+
     self._events_status = processing_status.EventsStatus()
     self._knowledge_base = knowledge_base_object
     self._processing_configuration = processing_configuration
     self._status_update_callback = status_update_callback
 
-    total_number_of_events = 0
-    for session in storage_reader.GetSessions():
-      total_number_of_events += session.parsers_counter['total']
+    storage_readers = [storage_reader]
+    if merge_storage_readers:
+      storage_readers = list(merge_storage_readers.values())
 
-    self._events_status.total_number_of_events = total_number_of_events
+    self._PrepareExport(storage_readers, output_module)
 
     output_module.WriteHeader()
 
@@ -1055,7 +1868,8 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
     try:
       self._ExportEvents(
           storage_reader, output_module, deduplicate_events=deduplicate_events,
-          event_filter=event_filter, time_slice=time_slice,
+          event_filter=event_filter, export_watermark=export_watermark,
+          merge_storage_readers=merge_storage_readers, time_slice=time_slice,
           use_time_slicer=use_time_slicer)
 
     finally:
@@ -1074,6 +1888,7 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
 
     # Reset values.
     self._status_update_callback = None
+    self._status = definitions.STATUS_INDICATOR_IDLE
     self._processing_configuration = None
     self._knowledge_base = None
     self._events_status = None
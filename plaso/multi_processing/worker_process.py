@@ -7,7 +7,9 @@ from dfvfs.resolver import context
 from dfvfs.resolver import resolver
 
 from plaso.engine import plaso_queue
+from plaso.engine import tagging_file
 from plaso.engine import worker
+from plaso.filters import compiled_cache
 from plaso.lib import definitions
 from plaso.lib import errors
 from plaso.multi_processing import base_process
@@ -157,11 +159,23 @@ class WorkerProcess(base_process.MultiProcessBaseProcess):
           credential_configuration.credential_type,
           credential_configuration.credential_data)
 
+    tagging_rule_index = None
+    if self._processing_configuration.tagging_file:
+      filter_cache = None
+      if self._processing_configuration.filter_cache_path:
+        filter_cache = compiled_cache.CompiledFilterCache(
+            self._processing_configuration.filter_cache_path)
+
+      tagging_file_object = tagging_file.TaggingFile(
+          self._processing_configuration.tagging_file, cache=filter_cache)
+      tagging_rule_index = tagging_file_object.GetEventTaggingRuleIndex()
+
     self._parser_mediator = parsers_mediator.ParserMediator(
         None, self._knowledge_base,
         collection_filters_helper=self._collection_filters_helper,
         preferred_year=self._processing_configuration.preferred_year,
         resolver_context=self._resolver_context,
+        tagging_rule_index=tagging_rule_index,
         temporary_directory=self._processing_configuration.temporary_directory)
 
     # We need to initialize the parser and hasher objects after the process
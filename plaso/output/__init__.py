@@ -5,6 +5,7 @@ from plaso.output import dynamic
 from plaso.output import elastic
 from plaso.output import elastic_ts
 from plaso.output import json_line
+from plaso.output import json_line_raw
 from plaso.output import json_out
 from plaso.output import kml
 from plaso.output import l2t_csv
@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 """Dynamic selected delimiter separated values output module."""
 
-from plaso.lib import timelib
 from plaso.output import formatting_helper
 from plaso.output import manager
 from plaso.output import shared_dsv
@@ -56,9 +55,7 @@ class DynamicFieldFormattingHelper(formatting_helper.FieldFormattingHelper):
       str: date field.
     """
     try:
-      iso_date_time = timelib.Timestamp.CopyToIsoFormat(
-          event.timestamp, timezone=self._output_mediator.timezone,
-          raise_error=True)
+      iso_date_time = self._CopyTimestampToIsoFormat(event)
 
       return iso_date_time[:10]
 
@@ -81,9 +78,7 @@ class DynamicFieldFormattingHelper(formatting_helper.FieldFormattingHelper):
       str: date and time field.
     """
     try:
-      return timelib.Timestamp.CopyToIsoFormat(
-          event.timestamp, timezone=self._output_mediator.timezone,
-          raise_error=True)
+      return self._CopyTimestampToIsoFormat(event)
 
     except (OverflowError, ValueError) as exception:
       self._ReportEventError(event, event_data, (
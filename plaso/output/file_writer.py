@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""The threaded output file writer."""
+
+import queue
+import threading
+import time
+
+
+class ThreadedFileWriter(object):
+  """Threaded output file writer.
+
+  The threaded file writer buffers written text and passes it in large chunks,
+  by means of a bounded queue, to a writer thread that writes the chunks to
+  the underlying file object. This allows the caller to continue formatting
+  events while the output is being written.
+
+  The threaded file writer is a file-like object that can be used in place of
+  the underlying file object by a single producer.
+
+  Attributes:
+    wait_time (float): time in seconds the producer waited for the writer
+        thread, because the queue was full.
+    write_time (float): time in seconds the writer thread spent writing.
+  """
+
+  # The maximum number of characters to buffer before passing them to the
+  # writer thread.
+  _MAXIMUM_BUFFER_SIZE = 4 * 1024 * 1024
+
+  # The maximum number of chunks that can be queued for the writer thread.
+  _MAXIMUM_QUEUE_SIZE = 16
+
+  def __init__(self, file_object):
+    """Initializes a threaded file writer.
+
+    Args:
+      file_object (file): file-like object to write to.
+    """
+    super(ThreadedFileWriter, self).__init__()
+    self._buffer = []
+    self._buffer_size = 0
+    self._exception = None
+    self._file_object = file_object
+    self._queue = queue.Queue(maxsize=self._MAXIMUM_QUEUE_SIZE)
+    self._thread = threading.Thread(
+        name='output_writer', target=self._WriterThreadMain)
+    self._thread.daemon = True
+    self._thread.start()
+
+    self.wait_time = 0.0
+    self.write_time = 0.0
+
+  def _FlushBuffer(self):
+    """Passes the buffered text to the writer thread."""
+    if not self._buffer:
+      return
+
+    chunk = ''.join(self._buffer)
+    self._buffer = []
+    self._buffer_size = 0
+
+    self._PutChunk(chunk)
+
+  def _PutChunk(self, chunk):
+    """Puts a chunk on the queue of the writer thread.
+
+    Args:
+      chunk (str): text to write or None to signal the writer thread to stop.
+
+    Raises:
+      IOError: if the writer thread failed to write to the file object.
+      OSError: if the writer thread failed to write to the file object.
+    """
+    self._RaiseIfFailed()
+
+    start_time = time.perf_counter()
+    self._queue.put(chunk)
+    self.wait_time += time.perf_counter() - start_time
+
+  def _RaiseIfFailed(self):
+    """Raises if the writer thread failed to write to the file object.
+
+    Raises:
+      IOError: if the writer thread failed to write to the file object.
+      OSError: if the writer thread failed to write to the file object.
+    """
+    if self._exception:
+      raise IOError('Unable to write output with error: {0!s}'.format(
+          self._exception))
+
+  def _WriterThreadMain(self):
+    """Main function of the writer thread."""
+    while True:
+      chunk = self._queue.get()
+      if chunk is None:
+        break
+
+      # After a failure the remaining chunks are discarded, so that
+      # the producer does not block on a full queue.
+      if self._exception:
+        continue
+
+      start_time = time.perf_counter()
+      try:
+        self._file_object.write(chunk)
+      except (IOError, OSError, ValueError) as exception:
+        self._exception = exception
+
+      self.write_time += time.perf_counter() - start_time
+
+  def close(self):
+    """Writes the remaining buffered text and closes the file object.
+
+    Raises:
+      IOError: if the writer thread failed to write to the file object.
+      OSError: if the writer thread failed to write to the file object.
+    """
+    if not self._thread:
+      return
+
+    try:
+      self._FlushBuffer()
+
+    finally:
+      self._queue.put(None)
+      self._thread.join()
+      self._thread = None
+
+      self._file_object.close()
+
+    self._RaiseIfFailed()
+
+  def write(self, text):
+    """Writes text.
+
+    Args:
+      text (str): text to write.
+
+    Raises:
+      IOError: if the writer thread failed to write to the file object.
+      OSError: if the writer thread failed to write to the file object.
+    """
+    self._buffer.append(text)
+    self._buffer_size += len(text)
+
+    if self._buffer_size >= self._MAXIMUM_BUFFER_SIZE:
+      self._FlushBuffer()
@@ -9,8 +9,8 @@ import os
 from dfvfs.lib import definitions as dfvfs_definitions
 
 from plaso.lib import errors
-from plaso.lib import timelib
 from plaso.output import logger
+from plaso.output import timestamp_formatter
 
 
 class EventFormattingHelper(object):
@@ -40,6 +40,59 @@ class EventFormattingHelper(object):
     """
 
 
+class FieldFormattingContext(object):
+  """Field formatting context of an event.
+
+  The field formatting context contains the values that are used to format
+  multiple fields of the same event, such as the event values used to format
+  the message fields, so that these only need to be determined once per event.
+
+  Attributes:
+    event (EventObject): event.
+    event_data (EventData): event data.
+    event_data_stream (EventDataStream): event data stream.
+    event_values (dict[str, object]): event values used to format the message
+        fields or None if not yet determined.
+    field_values (dict[str, str]): formatted field values per field format
+        callback name.
+    iso_date_time (str): ISO 8601 date and time representation of the event
+        timestamp in the output time zone or None if not yet determined.
+    iso_date_time_error (Exception): error that occurred while determining
+        the ISO 8601 date and time representation or None if not set.
+  """
+
+  def __init__(self, event, event_data, event_data_stream):
+    """Initializes a field formatting context.
+
+    Args:
+      event (EventObject): event.
+      event_data (EventData): event data.
+      event_data_stream (EventDataStream): event data stream.
+    """
+    super(FieldFormattingContext, self).__init__()
+    self.event = event
+    self.event_data = event_data
+    self.event_data_stream = event_data_stream
+    self.event_values = None
+    self.field_values = {}
+    self.iso_date_time = None
+    self.iso_date_time_error = None
+
+  def IsContextOf(self, event, event_data, event_data_stream):
+    """Determines if this is the formatting context of a specific event.
+
+    Args:
+      event (EventObject): event.
+      event_data (EventData): event data.
+      event_data_stream (EventDataStream): event data stream.
+
+    Returns:
+      bool: True if this is the formatting context of the event.
+    """
+    return (self.event is event and self.event_data is event_data and
+            self.event_data_stream is event_data_stream)
+
+
 class FieldFormattingHelper(object):
   """Output module field formatting helper."""
 
@@ -53,8 +106,97 @@ class FieldFormattingHelper(object):
       output_mediator (OutputMediator): output mediator.
     """
     super(FieldFormattingHelper, self).__init__()
+    self._formatting_context = None
     self._output_mediator = output_mediator
     self._source_mappings = {}
+    self._timestamp_formatter = timestamp_formatter.TimestampFormatter()
+
+  def _CopyTimestampToIsoFormat(self, event):
+    """Copies the timestamp of an event to an ISO 8601 date and time string.
+
+    Within a field formatting context the string is determined only once per
+    event.
+
+    Args:
+      event (EventObject): event.
+
+    Returns:
+      str: ISO 8601 date and time representation of the event timestamp in
+          the output time zone.
+
+    Raises:
+      OverflowError: if the timestamp value is out of bounds.
+      ValueError: if the timestamp value is out of bounds.
+    """
+    formatting_context = self._formatting_context
+    if formatting_context and formatting_context.event is event:
+      if formatting_context.iso_date_time_error:
+        raise formatting_context.iso_date_time_error
+
+      if formatting_context.iso_date_time is not None:
+        return formatting_context.iso_date_time
+
+    try:
+      iso_date_time = self._timestamp_formatter.CopyToIsoFormat(
+          event.timestamp, self._output_mediator.timezone)
+
+    except (OverflowError, ValueError) as exception:
+      if formatting_context and formatting_context.event is event:
+        formatting_context.iso_date_time_error = exception
+      raise
+
+    if formatting_context and formatting_context.event is event:
+      formatting_context.iso_date_time = iso_date_time
+
+    return iso_date_time
+
+  def _GetFormattedEventValues(self, event, event_data, event_data_stream):
+    """Retrieves the event values used to format the message fields.
+
+    Within a field formatting context the event values are determined only
+    once per event.
+
+    Args:
+      event (EventObject): event.
+      event_data (EventData): event data.
+      event_data_stream (EventDataStream): event data stream.
+
+    Returns:
+      tuple[EventFormatter, dict[str, object]]: message formatter and event
+          values.
+
+    Raises:
+      NoFormatterFound: if no message formatter can be found to match the data
+          type in the event data.
+      WrongFormatter: if the event data cannot be formatted by the message
+          formatter.
+    """
+    message_formatter = self._output_mediator.GetMessageFormatter(
+        event_data.data_type)
+    if not message_formatter:
+      raise errors.NoFormatterFound((
+          'Unable to find message formatter event with data type: '
+          '{0:s}.').format(event_data.data_type))
+
+    formatting_context = self._formatting_context
+    if formatting_context and not formatting_context.IsContextOf(
+        event, event_data, event_data_stream):
+      formatting_context = None
+
+    if formatting_context and formatting_context.event_values is not None:
+      return message_formatter, formatting_context.event_values
+
+    event_values = event_data.CopyToDict()
+    message_formatter.FormatEventValues(event_values)
+
+    if event_data.data_type in ('windows:evt:record', 'windows:evtx:record'):
+      event_values['message_string'] = self._FormatWindowsEventLogMessage(
+          event, event_data, event_data_stream)
+
+    if formatting_context:
+      formatting_context.event_values = event_values
+
+    return message_formatter, event_values
 
   # The field format callback methods require specific arguments hence
   # the check for unused arguments is disabled here.
@@ -174,19 +316,8 @@ class FieldFormattingHelper(object):
       WrongFormatter: if the event data cannot be formatted by the message
           formatter.
     """
-    message_formatter = self._output_mediator.GetMessageFormatter(
-        event_data.data_type)
-    if not message_formatter:
-      raise errors.NoFormatterFound((
-          'Unable to find message formatter event with data type: '
-          '{0:s}.').format(event_data.data_type))
-
-    event_values = event_data.CopyToDict()
-    message_formatter.FormatEventValues(event_values)
-
-    if event_data.data_type in ('windows:evt:record', 'windows:evtx:record'):
-      event_values['message_string'] = self._FormatWindowsEventLogMessage(
-          event, event_data, event_data_stream)
+    message_formatter, event_values = self._GetFormattedEventValues(
+        event, event_data, event_data_stream)
 
     return message_formatter.GetMessage(event_values)
 
@@ -207,19 +338,8 @@ class FieldFormattingHelper(object):
       WrongFormatter: if the event data cannot be formatted by the message
           formatter.
     """
-    message_formatter = self._output_mediator.GetMessageFormatter(
-        event_data.data_type)
-    if not message_formatter:
-      raise errors.NoFormatterFound((
-          'Unable to find message formatter event with data type: '
-          '{0:s}.').format(event_data.data_type))
-
-    event_values = event_data.CopyToDict()
-    message_formatter.FormatEventValues(event_values)
-
-    if event_data.data_type in ('windows:evt:record', 'windows:evtx:record'):
-      event_values['message_string'] = self._FormatWindowsEventLogMessage(
-          event, event_data, event_data_stream)
+    message_formatter, event_values = self._GetFormattedEventValues(
+        event, event_data, event_data_stream)
 
     return message_formatter.GetMessageShort(event_values)
 
@@ -299,9 +419,7 @@ class FieldFormattingHelper(object):
       str: time field.
     """
     try:
-      iso_date_time = timelib.Timestamp.CopyToIsoFormat(
-          event.timestamp, timezone=self._output_mediator.timezone,
-          raise_error=True)
+      iso_date_time = self._CopyTimestampToIsoFormat(event)
 
       return iso_date_time[11:19]
 
@@ -438,6 +556,14 @@ class FieldFormattingHelper(object):
     if callback_name == '_FormatTag':
       return self._FormatTag(event_tag)
 
+    formatting_context = self._formatting_context
+    if formatting_context and not formatting_context.IsContextOf(
+        event, event_data, event_data_stream):
+      formatting_context = None
+
+    if formatting_context and callback_name in formatting_context.field_values:
+      return formatting_context.field_values[callback_name]
+
     callback_function = None
     if callback_name:
       callback_function = getattr(self, callback_name, None)
@@ -455,4 +581,37 @@ class FieldFormattingHelper(object):
     elif not isinstance(output_value, str):
       output_value = '{0!s}'.format(output_value)
 
+    if formatting_context and callback_function:
+      formatting_context.field_values[callback_name] = output_value
+
     return output_value
+
+  def GetFormattedFields(
+      self, field_names, event, event_data, event_data_stream, event_tag):
+    """Formats the specified fields of an event.
+
+    The fields are formatted within a field formatting context, so that
+    values needed by multiple fields, such as the event values used to
+    format the message fields, are only determined once.
+
+    Args:
+      field_names (list[str]): names of the fields.
+      event (EventObject): event.
+      event_data (EventData): event data.
+      event_data_stream (EventDataStream): event data stream.
+      event_tag (EventTag): event tag.
+
+    Returns:
+      list[str]: values of the fields.
+    """
+    self._formatting_context = FieldFormattingContext(
+        event, event_data, event_data_stream)
+
+    try:
+      return [
+          self.GetFormattedField(
+              field_name, event, event_data, event_data_stream, event_tag)
+          for field_name in field_names]
+
+    finally:
+      self._formatting_context = None
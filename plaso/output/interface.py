@@ -2,9 +2,20 @@
 """This file contains the output module interface classes."""
 
 import abc
+import bz2
+import gzip
+import lzma
 import os
 
+import lz4.frame
+
+try:
+  import zstandard
+except ImportError:
+  zstandard = None
+
 from plaso.lib import errors
+from plaso.output import file_writer
 from plaso.output import logger
 
 
@@ -14,6 +25,10 @@ class OutputModule(object):
   NAME = ''
   DESCRIPTION = ''
 
+  # Value to indicate the output module uses the serialized form of the
+  # attribute containers, as read from storage.
+  USES_SERIALIZED_DATA = False
+
   # Value to indicate the output module writes to an output file.
   WRITES_OUTPUT_FILE = False
 
@@ -138,6 +153,18 @@ class TextFileOutputModule(OutputModule):
 
   _ENCODING = 'utf-8'
 
+  # Compression methods of the output file per file name extension.
+  _COMPRESSION_METHODS_PER_EXTENSION = {
+      '.bz2': 'bzip2',
+      '.gz': 'gzip',
+      '.lz4': 'lz4',
+      '.xz': 'xz',
+      '.zst': 'zstd'}
+
+  # Compression level of gzip compressed output, which is the default of
+  # the gzip tool and considerably faster than the default of the gzip module.
+  _GZIP_COMPRESSION_LEVEL = 6
+
   def __init__(self, output_mediator, event_formatting_helper):
     """Initializes an output module that writes to a text file.
 
@@ -150,22 +177,87 @@ class TextFileOutputModule(OutputModule):
     self._event_formatting_helper = event_formatting_helper
     self._file_object = None
 
+  def _OpenOutputFile(self, path):
+    """Opens the output file.
+
+    The output is compressed if the file name extension of the output file
+    corresponds to a supported compression method.
+
+    Args:
+      path (str): path of the output file.
+
+    Returns:
+      file: file-like object of the output file in text mode.
+
+    Raises:
+      ValueError: if the compression method is not supported.
+    """
+    _, extension = os.path.splitext(path)
+    compression_method = self._COMPRESSION_METHODS_PER_EXTENSION.get(
+        extension.lower(), None)
+
+    if compression_method == 'bzip2':
+      return bz2.open(path, 'wt', encoding=self._ENCODING)
+
+    if compression_method == 'gzip':
+      return gzip.open(
+          path, 'wt', compresslevel=self._GZIP_COMPRESSION_LEVEL,
+          encoding=self._ENCODING)
+
+    if compression_method == 'lz4':
+      # Older versions of lz4 do not support opening a file.
+      if not hasattr(lz4.frame, 'open'):
+        raise ValueError((
+            'Unsupported compression method: lz4, lz4 version does not '
+            'support lz4.frame.open.'))
+
+      return lz4.frame.open(path, 'wt', encoding=self._ENCODING)
+
+    if compression_method == 'xz':
+      return lzma.open(path, 'wt', encoding=self._ENCODING)
+
+    if compression_method == 'zstd':
+      if not zstandard:
+        raise ValueError(
+            'Unsupported compression method: zstd, missing zstandard.')
+
+      # Versions of zstandard before 0.15 do not support opening a file.
+      if not hasattr(zstandard, 'open'):
+        raise ValueError((
+            'Unsupported compression method: zstd, zstandard version does not '
+            'support zstandard.open.'))
+
+      return zstandard.open(path, 'wt', encoding=self._ENCODING)
+
+    return open(path, 'wt', encoding=self._ENCODING)
+
   def Close(self):
     """Closes the output file."""
     if self._file_object:
       self._file_object.close()
+
+      if isinstance(self._file_object, file_writer.ThreadedFileWriter):
+        logger.info((
+            'Output writer stage: writing: {0:.3f} seconds, producer waited: '
+            '{1:.3f} seconds.').format(
+                self._file_object.write_time, self._file_object.wait_time))
+
       self._file_object = None
 
   def Open(self, path=None, **kwargs):  # pylint: disable=arguments-differ
     """Opens the output file.
 
+    The output is written compressed if the output file has a ".bz2", ".gz",
+    ".lz4", ".xz" or ".zst" file name extension.
+
     Args:
       path (Optional[str]): path of the output file.
 
     Raises:
       IOError: if the specified output file already exists.
       OSError: if the specified output file already exists.
-      ValueError: if path is not set.
+      ValueError: if path is not set or the compression method is not
+          supported.
     """
     if not path:
       raise ValueError('Missing path.')
@@ -175,7 +267,11 @@ class TextFileOutputModule(OutputModule):
           'Unable to use an already existing file for output '
           '[{0:s}]').format(path))
 
-    self._file_object = open(path, 'wt', encoding=self._ENCODING)
+    file_object = self._OpenOutputFile(path)
+
+    # Writes, including compression, are done by a separate thread so that
+    # formatting events and writing the output can overlap.
+    self._file_object = file_writer.ThreadedFileWriter(file_object)
 
   def WriteEventBody(self, event, event_data, event_data_stream, event_tag):
     """Writes event values to the output.
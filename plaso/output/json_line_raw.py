@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""Output module that saves the stored events into a JSON line format.
+
+The raw JSON line format writes a single JSON entry per event that contains
+the event, event data, event data stream and event tag as stored, instead of
+formatting every attribute value of the event.
+"""
+
+from plaso.output import interface
+from plaso.output import manager
+from plaso.output import shared_json
+
+
+class JSONLineRawOutputModule(interface.TextFileOutputModule):
+  """Output module for the raw JSON line format."""
+
+  NAME = 'json_line_raw'
+  DESCRIPTION = (
+      'Saves the events as stored, without formatting the event values, into '
+      'a JSON line format.')
+
+  USES_SERIALIZED_DATA = True
+
+  def __init__(self, output_mediator):
+    """Initializes the output module object.
+
+    Args:
+      output_mediator (OutputMediator): mediates interactions between output
+          modules and other components, such as storage and dfvfs.
+    """
+    event_formatting_helper = shared_json.JSONRawEventFormattingHelper(
+        output_mediator)
+    super(JSONLineRawOutputModule, self).__init__(
+        output_mediator, event_formatting_helper)
+
+  def SetFields(self, field_names):
+    """Sets the names of the computed fields to output.
+
+    Args:
+      field_names (list[str]): names of the computed fields to output, such as
+          "message".
+    """
+    self._event_formatting_helper.SetFields(field_names)
+
+  def WriteEventBody(self, event, event_data, event_data_stream, event_tag):
+    """Writes event values to the output.
+
+    Args:
+      event (EventObject): event.
+      event_data (EventData): event data.
+      event_data_stream (EventDataStream): event data stream.
+      event_tag (EventTag): event tag.
+    """
+    output_text = self._event_formatting_helper.GetFormattedEvent(
+        event, event_data, event_data_stream, event_tag)
+
+    self.WriteLine(output_text)
+
+
+manager.OutputManager.RegisterOutput(JSONLineRawOutputModule)
@@ -7,7 +7,6 @@ https://forensicswiki.xyz/wiki/index.php?title=L2T_CSV
 
 from plaso.lib import definitions
 from plaso.lib import errors
-from plaso.lib import timelib
 from plaso.output import formatting_helper
 from plaso.output import interface
 from plaso.output import logger
@@ -18,6 +17,8 @@ from plaso.output import shared_dsv
 class L2TCSVEventFormattingHelper(shared_dsv.DSVEventFormattingHelper):
   """L2T CSV output module event formatting helper."""
 
+  _MACB_GROUP_FIELD_NAMES = frozenset(['MACB', 'type'])
+
   def GetFormattedEventMACBGroup(self, event_macb_group):
     """Retrieves a string representation of the event.
 
@@ -32,6 +33,17 @@ class L2TCSVEventFormattingHelper(shared_dsv.DSVEventFormattingHelper):
     timestamp_descriptions = [
         event.timestamp_desc for event, _, _, _ in event_macb_group]
 
+    # The MACB and type fields are determined from the timestamp descriptions
+    # of all the events in the group, hence these are not formatted per event.
+    field_names = [
+        field_name for field_name in self._field_names
+        if field_name not in self._MACB_GROUP_FIELD_NAMES]
+
+    event, event_data, event_data_stream, event_tag = event_macb_group[0]
+    formatted_field_values = dict(zip(
+        field_names, self._field_formatting_helper.GetFormattedFields(
+            field_names, event, event_data, event_data_stream, event_tag)))
+
     field_values = []
     for field_name in self._field_names:
       if field_name == 'MACB':
@@ -42,9 +54,7 @@ class L2TCSVEventFormattingHelper(shared_dsv.DSVEventFormattingHelper):
         # TODO: fix timestamp description in source.
         field_value = '; '.join(timestamp_descriptions)
       else:
-        event, event_data, event_data_stream, event_tag = event_macb_group[0]
-        field_value = self._field_formatting_helper.GetFormattedField(
-            field_name, event, event_data, event_data_stream, event_tag)
+        field_value = formatted_field_values[field_name]
 
       field_value = self._SanitizeField(field_value)
       field_values.append(field_value)
@@ -93,9 +103,7 @@ class L2TCSVFieldFormattingHelper(formatting_helper.FieldFormattingHelper):
       str: date field.
     """
     try:
-      iso_date_time = timelib.Timestamp.CopyToIsoFormat(
-          event.timestamp, timezone=self._output_mediator.timezone,
-          raise_error=True)
+      iso_date_time = self._CopyTimestampToIsoFormat(event)
 
       return '{0:s}/{1:s}/{2:s}'.format(
           iso_date_time[5:7], iso_date_time[8:10], iso_date_time[:4])
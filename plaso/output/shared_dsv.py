@@ -51,13 +51,11 @@ class DSVEventFormattingHelper(formatting_helper.EventFormattingHelper):
     Returns:
       str: string representation of the event.
     """
-    field_values = []
-    for field_name in self._field_names:
-      field_value = self._field_formatting_helper.GetFormattedField(
-          field_name, event, event_data, event_data_stream, event_tag)
+    field_values = self._field_formatting_helper.GetFormattedFields(
+        self._field_names, event, event_data, event_data_stream, event_tag)
 
-      field_value = self._SanitizeField(field_value)
-      field_values.append(field_value)
+    field_values = [
+        self._SanitizeField(field_value) for field_value in field_values]
 
     return self._field_delimiter.join(field_values)
 
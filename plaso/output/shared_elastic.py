@@ -1,8 +1,12 @@
 # -*- coding: utf-8 -*-
 """Shared functionality for Elasticsearch output modules."""
 
+import json
 import logging
 import os
+import queue
+import threading
+import time
 
 from dfdatetime import posix_time as dfdatetime_posix_time
 from dfvfs.serializer.json_serializer import JsonPathSpecSerializer
@@ -140,9 +144,27 @@ class SharedElasticsearchOutputModule(interface.OutputModule):
 
   _DEFAULT_FLUSH_INTERVAL = 1000
 
+  # The default maximum size in bytes of the documents in a bulk request.
+  _DEFAULT_MAXIMUM_BULK_SIZE = 10 * 1024 * 1024
+
+  # The default maximum number of bulk requests that run concurrently.
+  _DEFAULT_NUMBER_OF_BULK_REQUESTS = 2
+
   # Number of seconds to wait before a request to Elasticsearch is timed out.
   _DEFAULT_REQUEST_TIMEOUT = 300
 
+  # The maximum number of times a bulk request, or the part of a bulk request
+  # that was rejected, is retried.
+  _MAXIMUM_NUMBER_OF_RETRIES = 5
+
+  # The HTTP status codes that indicate Elasticsearch is temporarily unable
+  # to handle a request, for example because its write queue is full.
+  _RETRY_STATUS_CODES = frozenset([429, 503])
+
+  # Number of seconds to wait before the first retry, which is doubled for
+  # every subsequent retry.
+  _RETRY_WAIT_TIME = 1.0
+
   _DEFAULT_FIELD_NAMES = [
       'datetime',
       'display_name',
@@ -161,8 +183,11 @@ class SharedElasticsearchOutputModule(interface.OutputModule):
           modules and other components, such as storage and dfvfs.
     """
     super(SharedElasticsearchOutputModule, self).__init__(output_mediator)
+    self._bulk_request_queue = None
+    self._bulk_request_threads = []
     self._client = None
     self._event_documents = []
+    self._event_documents_size = 0
     self._field_names = self._DEFAULT_FIELD_NAMES
     self._field_formatting_helper = SharedElasticsearchFieldFormattingHelper(
         output_mediator)
@@ -170,14 +195,46 @@ class SharedElasticsearchOutputModule(interface.OutputModule):
     self._host = None
     self._index_name = None
     self._mappings = None
+    self._maximum_bulk_size = self._DEFAULT_MAXIMUM_BULK_SIZE
     self._number_of_buffered_events = 0
+    self._number_of_bulk_requests = self._DEFAULT_NUMBER_OF_BULK_REQUESTS
+    self._number_of_failed_events = 0
+    self._number_of_inserted_events = 0
     self._password = None
+    self._statistics_lock = threading.Lock()
     self._port = None
     self._username = None
     self._use_ssl = None
     self._ca_certs = None
     self._url_prefix = None
 
+  def _BulkRequestThreadMain(self):
+    """Main function of a bulk request thread."""
+    while True:
+      event_documents = self._bulk_request_queue.get()
+      if event_documents is None:
+        break
+
+      number_of_events = len(event_documents) // 2
+      number_of_failed_events = number_of_events
+
+      try:
+        number_of_failed_events = self._SendBulkRequest(event_documents)
+
+      # All exceptions need to be caught here to prevent the bulk request
+      # thread from stopping, which would block the producer.
+      except Exception as exception:  # pylint: disable=broad-except
+        logger.warning('Unable to bulk insert with error: {0!s}'.format(
+            exception))
+
+      with self._statistics_lock:
+        self._number_of_failed_events += number_of_failed_events
+        self._number_of_inserted_events += (
+            number_of_events - number_of_failed_events)
+
+      logger.debug('Inserted {0:d} events into Elasticsearch'.format(
+          number_of_events - number_of_failed_events))
+
   def _Connect(self):
     """Connects to an Elasticsearch server.
 
@@ -229,27 +286,22 @@ class SharedElasticsearchOutputModule(interface.OutputModule):
               exception))
 
   def _FlushEvents(self):
-    """Inserts the buffered event documents into Elasticsearch."""
-    try:
-      # pylint: disable=unexpected-keyword-arg
-      bulk_arguments = {
-          'body': self._event_documents,
-          'index': self._index_name,
-          'request_timeout': self._DEFAULT_REQUEST_TIMEOUT}
+    """Inserts the buffered event documents into Elasticsearch.
 
-      self._client.bulk(**bulk_arguments)
+    The event documents are passed to the bulk request threads. If the
+    maximum number of bulk requests are pending, the flush blocks until
+    a bulk request thread is available.
+    """
+    if not self._event_documents:
+      return
 
-    except (
-        ValueError,
-        elasticsearch.exceptions.ElasticsearchException) as exception:
-      # Ignore problematic events
-      logger.warning('Unable to bulk insert with error: {0!s}'.format(
-          exception))
+    if not self._bulk_request_threads:
+      self._StartBulkRequestThreads()
 
-    logger.debug('Inserted {0:d} events into Elasticsearch'.format(
-        self._number_of_buffered_events))
+    self._bulk_request_queue.put(self._event_documents)
 
     self._event_documents = []
+    self._event_documents_size = 0
     self._number_of_buffered_events = 0
 
   def _GetSanitizedEventValues(
@@ -310,8 +362,9 @@ class SharedElasticsearchOutputModule(interface.OutputModule):
   def _InsertEvent(self, event, event_data, event_data_stream, event_tag):
     """Inserts an event.
 
-    Events are buffered in the form of documents and inserted to Elasticsearch
-    when the flush interval (threshold) has been reached.
+    Events are buffered in the form of serialized documents and inserted to
+    Elasticsearch when the flush interval (threshold) or the maximum bulk size
+    has been reached.
 
     Args:
       event (EventObject): event.
@@ -319,16 +372,33 @@ class SharedElasticsearchOutputModule(interface.OutputModule):
       event_data_stream (EventDataStream): event data stream.
       event_tag (EventTag): event tag.
     """
-    event_document = {'index': {'_index': self._index_name}}
-
     event_values = self._GetSanitizedEventValues(
         event, event_data, event_data_stream, event_tag)
 
+    try:
+      action_document = self._SerializeDocument(
+          {'index': {'_index': self._index_name}})
+      event_document = self._SerializeDocument(event_values)
+
+    except (TypeError, ValueError) as exception:
+      # Ignore problematic events
+      logger.warning('Unable to serialize event with error: {0!s}'.format(
+          exception))
+      return
+
+    self._event_documents.append(action_document)
     self._event_documents.append(event_document)
-    self._event_documents.append(event_values)
+
+    # The maximum bulk size is in bytes, hence the size of the UTF-8 encoded
+    # documents, including the newlines that separate them in the bulk
+    # request body, is used.
+    self._event_documents_size += (
+        len(action_document.encode('utf-8')) +
+        len(event_document.encode('utf-8')) + 2)
     self._number_of_buffered_events += 1
 
-    if self._number_of_buffered_events > self._flush_interval:
+    if (self._number_of_buffered_events > self._flush_interval or
+        self._event_documents_size >= self._maximum_bulk_size):
       self._FlushEvents()
 
   def _SanitizeField(self, data_type, attribute_name, field):
@@ -352,15 +422,155 @@ class SharedElasticsearchOutputModule(interface.OutputModule):
 
     return field
 
+  def _SendBulkRequest(self, event_documents):
+    """Sends a bulk request to Elasticsearch.
+
+    Bulk requests that are rejected because Elasticsearch is temporarily
+    unable to handle them and the documents of a bulk request that were
+    rejected for this reason are retried, with an exponentially increasing
+    wait time.
+
+    Args:
+      event_documents (list[str]): serialized action and event documents.
+
+    Returns:
+      int: number of events that could not be inserted.
+    """
+    number_of_failed_events = 0
+    number_of_retries = 0
+    while True:
+      body = '\n'.join(event_documents + [''])
+      retry_event_documents = []
+
+      try:
+        # pylint: disable=unexpected-keyword-arg
+        response = self._client.bulk(
+            body=body, index=self._index_name,
+            request_timeout=self._DEFAULT_REQUEST_TIMEOUT)
+
+      except Exception as exception:  # pylint: disable=broad-except
+        status_code = getattr(exception, 'status_code', None)
+        if status_code not in self._RETRY_STATUS_CODES:
+          raise
+
+        logger.debug('Bulk request rejected with status code: {0:d}'.format(
+            status_code))
+
+        response = None
+        retry_event_documents = event_documents
+
+      if response and response.get('errors', False):
+        for item_index, item in enumerate(response.get('items', [])):
+          # Every item is a dictionary with the action, such as "index", as
+          # key and the result of the action as value.
+          result = list(item.values())[0] if item else {}
+          status_code = result.get('status', 200)
+          if status_code < 300:
+            continue
+
+          if status_code in self._RETRY_STATUS_CODES:
+            document_index = item_index * 2
+            retry_event_documents.extend(
+                event_documents[document_index:document_index + 2])
+
+          else:
+            logger.warning(
+                'Unable to insert event with status code: {0:d} and error: '
+                '{1!s}'.format(status_code, result.get('error', None)))
+            number_of_failed_events += 1
+
+      if not retry_event_documents:
+        return number_of_failed_events
+
+      if number_of_retries >= self._MAXIMUM_NUMBER_OF_RETRIES:
+        logger.warning((
+            'Unable to insert {0:d} events after {1:d} retries.').format(
+                len(retry_event_documents) // 2, number_of_retries))
+        return number_of_failed_events + len(retry_event_documents) // 2
+
+      time.sleep(self._RETRY_WAIT_TIME * (2 ** number_of_retries))
+
+      event_documents = retry_event_documents
+      number_of_retries += 1
+
+  def _SerializeDocument(self, document):
+    """Serializes a document for a bulk request.
+
+    Args:
+      document (dict[str, object]): document.
+
+    Returns:
+      str: JSON serialized document.
+
+    Raises:
+      TypeError: if the document contains a value that cannot be serialized.
+      ValueError: if the document contains a value that cannot be serialized.
+    """
+    return json.dumps(document, ensure_ascii=False, separators=(',', ':'))
+
+  def _StartBulkRequestThreads(self):
+    """Starts the bulk request threads."""
+    # The queue holds at most one pending bulk request per thread, which
+    # bounds the memory used when Elasticsearch cannot keep up.
+    self._bulk_request_queue = queue.Queue(
+        maxsize=self._number_of_bulk_requests)
+
+    for thread_index in range(self._number_of_bulk_requests):
+      thread = threading.Thread(
+          name='elastic_bulk_request_{0:d}'.format(thread_index),
+          target=self._BulkRequestThreadMain)
+      thread.daemon = True
+      thread.start()
+
+      self._bulk_request_threads.append(thread)
+
+  def _StopBulkRequestThreads(self):
+    """Stops the bulk request threads.
+
+    Waits for the pending bulk requests to complete.
+    """
+    for _ in self._bulk_request_threads:
+      self._bulk_request_queue.put(None)
+
+    for thread in self._bulk_request_threads:
+      thread.join()
+
+    self._bulk_request_queue = None
+    self._bulk_request_threads = []
+
   def Close(self):
     """Closes connection to Elasticsearch.
 
-    Inserts any remaining buffered event documents.
+    Inserts any remaining buffered event documents and waits for the pending
+    bulk requests to complete.
     """
     self._FlushEvents()
 
+    if self._bulk_request_threads:
+      self._StopBulkRequestThreads()
+
+      logger.debug((
+          'Inserted {0:d} events into Elasticsearch, {1:d} events could not '
+          'be inserted.').format(
+              self._number_of_inserted_events, self._number_of_failed_events))
+
     self._client = None
 
+  def SetBulkRequestOptions(self, number_of_bulk_requests, maximum_bulk_size):
+    """Sets the bulk request options.
+
+    Args:
+      number_of_bulk_requests (int): maximum number of bulk requests that run
+          concurrently.
+      maximum_bulk_size (int): maximum size in bytes of the documents in
+          a bulk request.
+    """
+    self._number_of_bulk_requests = max(1, number_of_bulk_requests)
+    self._maximum_bulk_size = maximum_bulk_size
+    logger.debug((
+        'Elasticsearch number of bulk requests: {0:d} maximum bulk size: '
+        '{1:d}').format(number_of_bulk_requests, maximum_bulk_size))
+
   def SetFields(self, field_names):
     """Sets the names of the fields to output.
 
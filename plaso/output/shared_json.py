@@ -91,3 +91,95 @@ class JSONEventFormattingHelper(formatting_helper.EventFormattingHelper):
         event, event_data, event_data_stream, event_tag)
 
     return json.dumps(json_dict, sort_keys=True)
+
+
+class JSONRawEventFormattingHelper(formatting_helper.EventFormattingHelper):
+  """JSON output module raw event formatting helper.
+
+  The raw event formatting helper writes the event, event data, event data
+  stream and event tag in their serialized form, as read from storage, so that
+  their attribute values do not need to be formatted and re-encoded. Values
+  that are computed from the event, such as the message, are only added when
+  requested.
+  """
+
+  _JSON_SERIALIZER = json_serializer.JSONAttributeContainerSerializer
+
+  def __init__(self, output_mediator):
+    """Initializes a JSON output module raw event formatting helper.
+
+    Args:
+      output_mediator (OutputMediator): output mediator.
+    """
+    super(JSONRawEventFormattingHelper, self).__init__(output_mediator)
+    self._field_formatting_helper = dynamic.DynamicFieldFormattingHelper(
+        output_mediator)
+    self._field_names = []
+
+  def _GetSerializedData(self, attribute_container):
+    """Retrieves the serialized form of an attribute container.
+
+    Args:
+      attribute_container (AttributeContainer): attribute container.
+
+    Returns:
+      str: JSON serialized attribute container.
+    """
+    serialized_data = attribute_container.GetSerializedData()
+    if not serialized_data:
+      # The attribute container was not read from a store that retains
+      # serialized data, hence it needs to be serialized.
+      serialized_data = self._JSON_SERIALIZER.WriteSerialized(
+          attribute_container)
+
+    return serialized_data
+
+  def GetFormattedEvent(self, event, event_data, event_data_stream, event_tag):
+    """Retrieves a string representation of the event.
+
+    Args:
+      event (EventObject): event.
+      event_data (EventData): event data.
+      event_data_stream (EventDataStream): event data stream.
+      event_tag (EventTag): event tag.
+
+    Returns:
+      str: string representation of the event.
+    """
+    output_values = ['{"event": ', self._GetSerializedData(event)]
+
+    if event_data:
+      output_values.extend([
+          ', "event_data": ', self._GetSerializedData(event_data)])
+
+    if event_data_stream:
+      output_values.extend([
+          ', "event_data_stream": ', self._GetSerializedData(
+              event_data_stream)])
+
+    if event_tag:
+      output_values.extend([
+          ', "event_tag": ', self._GetSerializedData(event_tag)])
+
+    for field_name in self._field_names:
+      try:
+        field_value = self._field_formatting_helper.GetFormattedField(
+            field_name, event, event_data, event_data_stream, event_tag)
+      except (errors.NoFormatterFound, errors.WrongFormatter):
+        continue
+
+      output_values.extend([
+          ', ', json.dumps(field_name), ': ', json.dumps(field_value)])
+
+    output_values.append('}')
+
+    return ''.join(output_values)
+
+  def SetFields(self, field_names):
+    """Sets the names of the computed fields to output.
+
+    Args:
+      field_names (list[str]): names of the computed fields to output, such as
+          "message".
+    """
+    self._field_names = field_names
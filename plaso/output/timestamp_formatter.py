@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""The output timestamp formatter."""
+
+import bisect
+import datetime
+
+import pytz
+
+from plaso.lib import timelib
+
+
+class TimestampFormatter(object):
+  """Output timestamp formatter.
+
+  The timestamp formatter converts timestamps into time zone adjusted ISO 8601
+  date and time strings, with the same result as Timestamp.CopyToIsoFormat().
+  It speeds up the conversion by:
+
+  * caching recently formatted timestamps, since sorted events, such as those
+    of a MACB group, often share the same timestamp;
+  * determining the UTC offset of a time zone once per interval between
+    daylight saving time (DST) transitions, instead of once per timestamp.
+  """
+
+  # The maximum number of formatted timestamps to cache.
+  _MAXIMUM_CACHED_VALUES = 512
+
+  _EPOCH = datetime.datetime(1970, 1, 1, 0, 0, 0, 0)
+
+  _EPOCH_UTC = datetime.datetime(1970, 1, 1, 0, 0, 0, 0, tzinfo=pytz.UTC)
+
+  def __init__(self):
+    """Initializes a timestamp formatter."""
+    super(TimestampFormatter, self).__init__()
+    self._cached_values = {}
+    self._utc_offset_interval = None
+
+  def _GetTimestampFromDatetime(self, datetime_object):
+    """Retrieves a timestamp from a naive UTC datetime object.
+
+    Args:
+      datetime_object (datetime.datetime): naive UTC datetime object.
+
+    Returns:
+      int: number of microseconds since January 1, 1970, 00:00:00 UTC.
+    """
+    time_delta = datetime_object - self._EPOCH
+    return (((time_delta.days * 86400) + time_delta.seconds) * 1000000 +
+            time_delta.microseconds)
+
+  def _GetUTCOffsetInterval(self, timestamp, timezone):
+    """Retrieves the interval with the same UTC offset as a timestamp.
+
+    Args:
+      timestamp (int): number of microseconds since January 1, 1970, 00:00:00
+          UTC.
+      timezone (pytz.timezone): time zone.
+
+    Returns:
+      tuple[object, int, int, datetime.tzinfo]: time zone, start and end
+          timestamp of the interval and fixed offset time zone of the interval,
+          where a start or end timestamp of None represents an unbounded
+          interval or None if the time zone is not supported.
+    """
+    if timezone is pytz.UTC or isinstance(timezone, pytz.tzinfo.StaticTzInfo):
+      utc_offset = timezone.utcoffset(self._EPOCH)
+      return timezone, None, None, datetime.timezone(utc_offset)
+
+    if not isinstance(timezone, pytz.tzinfo.DstTzInfo):
+      return None
+
+    # Note that the transition times and information are determined in the same
+    # way as pytz does in DstTzInfo.fromutc().
+    # pylint: disable=protected-access
+    transition_times = timezone._utc_transition_times
+    datetime_object = self._EPOCH + datetime.timedelta(microseconds=timestamp)
+
+    index = max(0, bisect.bisect_right(transition_times, datetime_object) - 1)
+
+    start_timestamp = None
+    if index > 0:
+      start_timestamp = self._GetTimestampFromDatetime(transition_times[index])
+
+    end_timestamp = None
+    if index + 1 < len(transition_times):
+      end_timestamp = self._GetTimestampFromDatetime(
+          transition_times[index + 1])
+
+    utc_offset, _, _ = timezone._transition_info[index]
+    return timezone, start_timestamp, end_timestamp, datetime.timezone(
+        utc_offset)
+
+  def CopyToIsoFormat(self, timestamp, timezone):
+    """Copies a timestamp to an ISO 8601 formatted string.
+
+    Args:
+      timestamp (int): number of microseconds since January 1, 1970, 00:00:00
+          UTC.
+      timezone (pytz.timezone): time zone.
+
+    Returns:
+      str: date and time formatted in ISO 8601.
+
+    Raises:
+      OverflowError: if the timestamp value is out of bounds.
+      ValueError: if the timestamp value is missing.
+    """
+    lookup_key = (timestamp, timezone)
+    iso_date_time = self._cached_values.get(lookup_key, None)
+    if iso_date_time:
+      return iso_date_time
+
+    if not timestamp:
+      raise ValueError('Missing timestamp value')
+
+    utc_offset_interval = self._utc_offset_interval
+    if utc_offset_interval:
+      interval_timezone, start_timestamp, end_timestamp, _ = (
+          utc_offset_interval)
+      if (interval_timezone is not timezone or (
+          start_timestamp is not None and timestamp < start_timestamp) or (
+              end_timestamp is not None and timestamp >= end_timestamp)):
+        utc_offset_interval = None
+
+    try:
+      if not utc_offset_interval:
+        utc_offset_interval = self._GetUTCOffsetInterval(timestamp, timezone)
+        self._utc_offset_interval = utc_offset_interval
+
+      if utc_offset_interval:
+        datetime_object = self._EPOCH_UTC + datetime.timedelta(
+            microseconds=timestamp)
+        datetime_object = datetime_object.astimezone(utc_offset_interval[3])
+        iso_date_time = datetime_object.isoformat()
+
+    except OverflowError:
+      # Timestamps near the bounds of datetime are formatted by CopyToIsoFormat
+      # so that they fail in the same way.
+      iso_date_time = None
+
+    if not iso_date_time:
+      iso_date_time = timelib.Timestamp.CopyToIsoFormat(
+          timestamp, timezone=timezone, raise_error=True)
+
+    if len(self._cached_values) >= self._MAXIMUM_CACHED_VALUES:
+      self._cached_values = {}
+
+    self._cached_values[lookup_key] = iso_date_time
+
+    return iso_date_time
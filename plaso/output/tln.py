@@ -48,8 +48,11 @@ class TLNFieldFormattingHelper(formatting_helper.FieldFormattingHelper):
       NoFormatterFound: If no event formatter can be found to match the data
           type in the event data.
     """
-    date_time_string = timelib.Timestamp.CopyToIsoFormat(
-        event.timestamp, timezone=self._output_mediator.timezone)
+    try:
+      date_time_string = self._CopyTimestampToIsoFormat(event)
+    except (OverflowError, ValueError):
+      date_time_string = timelib.Timestamp.CopyToIsoFormat(
+          event.timestamp, timezone=self._output_mediator.timezone)
     timestamp_description = event.timestamp_desc or 'UNKNOWN'
 
     message = self._FormatMessage(event, event_data, event_data_stream)
@@ -30,11 +30,17 @@ class XLSXOutputModule(interface.OutputModule):
   _MAXIMUM_COLUMN_WIDTH = 50
   _MINIMUM_COLUMN_WIDTH = 6
 
+  # The maximum number of rows of a worksheet, including the header row.
+  _MAXIMUM_NUMBER_OF_ROWS = 1048576
+
   # Illegal XML string characters.
   _ILLEGAL_XML_RE = re.compile((
       r'[\x00-\x08\x0b-\x1f\x7f-\x84\x86-\x9f\ud800-\udfff\ufdd0-\ufddf'
       r'\ufffe-\uffff]'))
 
+  # Printable ASCII string.
+  _PRINTABLE_ASCII_RE = re.compile(r'[\x20-\x7e]*\Z')
+
   def __init__(self, output_mediator):
     """Initializes an Excel Spreadsheet (XLSX) output module.
 
@@ -48,10 +54,29 @@ class XLSXOutputModule(interface.OutputModule):
     self._field_formatting_helper = dynamic.DynamicFieldFormattingHelper(
         output_mediator)
     self._fields = self._DEFAULT_FIELDS
+    self._formatted_fields = self._GetFormattedFieldNames(self._fields)
+    self._header_format = None
+    self._number_of_sheets = 0
     self._sheet = None
     self._timestamp_format = self._DEFAULT_TIMESTAMP_FORMAT
     self._workbook = None
 
+  def _AddWorksheet(self):
+    """Adds a worksheet to the workbook.
+
+    The first worksheet is named "Sheet" and the worksheets that are added
+    when the maximum number of rows of the previous worksheet has been reached
+    are named "Sheet 2", "Sheet 3", etc.
+    """
+    self._number_of_sheets += 1
+    if self._number_of_sheets == 1:
+      sheet_name = 'Sheet'
+    else:
+      sheet_name = 'Sheet {0:d}'.format(self._number_of_sheets)
+
+    self._sheet = self._workbook.add_worksheet(sheet_name)
+    self._current_row = 0
+
   def _FormatDateTime(self, event, event_data):  # pylint: disable=missing-return-type-doc
     """Formats the date to a datetime object without timezone information.
 
@@ -81,6 +106,18 @@ class XLSXOutputModule(interface.OutputModule):
               event.timestamp, exception))
       return 'ERROR'
 
+  def _GetFormattedFieldNames(self, fields):
+    """Retrieves the names of the fields formatted by the formatting helper.
+
+    Args:
+      fields (list[str]): names of the fields to output.
+
+    Returns:
+      list[str]: names of the fields to output, except for the datetime field,
+          that is written as a date and time value.
+    """
+    return [field_name for field_name in fields if field_name != 'datetime']
+
   def _SanitizeField(self, field):
     """Sanitizes a field for output.
 
@@ -93,13 +130,35 @@ class XLSXOutputModule(interface.OutputModule):
     Returns:
       str: sanitized value of the field.
     """
+    # Printable ASCII strings, the most common case, do not contain illegal
+    # XML string characters.
+    if self._PRINTABLE_ASCII_RE.match(field):
+      return field
+
     return self._ILLEGAL_XML_RE.sub('\ufffd', field)
 
-  def Close(self):
-    """Closes the workbook."""
+  def _SetColumnWidths(self):
+    """Sets the column widths of the current worksheet."""
     for column_index, column_width in enumerate(self._column_widths):
       self._sheet.set_column(column_index, column_index, column_width)
 
+  def _WriteHeaderRow(self):
+    """Writes the header row to the current worksheet."""
+    self._column_widths = []
+    for column_index, field_name in enumerate(self._fields):
+      self._sheet.write_string(0, column_index, field_name, self._header_format)
+
+      column_width = max(len(field_name) + 2, self._MINIMUM_COLUMN_WIDTH)
+      self._column_widths.append(column_width)
+
+    self._current_row = 1
+    self._sheet.autofilter(0, len(self._fields) - 1, 0, 0)
+    self._sheet.freeze_panes(1, 0)
+
+  def Close(self):
+    """Closes the workbook."""
+    self._SetColumnWidths()
+
     self._workbook.close()
     self._workbook = None
 
@@ -122,14 +181,17 @@ class XLSXOutputModule(interface.OutputModule):
           'Unable to use an already existing file for output '
           '[{0:s}]').format(path))
 
+    # Note that in constant memory mode rows are written to disk once a next
+    # row is started, hence the memory usage does not grow with the number of
+    # rows.
     options = {
         'constant_memory': True,
         'strings_to_urls': False,
         'strings_to_formulas': False,
         'default_date_format': self._timestamp_format}
     self._workbook = xlsxwriter.Workbook(path, options)
-    self._sheet = self._workbook.add_worksheet('Sheet')
-    self._current_row = 0
+    self._number_of_sheets = 0
+    self._AddWorksheet()
 
   def SetFields(self, fields):
     """Sets the fields to output.
@@ -138,6 +200,7 @@ class XLSXOutputModule(interface.OutputModule):
       fields (list[str]): names of the fields to output.
     """
     self._fields = fields
+    self._formatted_fields = self._GetFormattedFieldNames(fields)
 
   def SetTimestampFormat(self, timestamp_format):
     """Set the timestamp format to use for the datetime column.
@@ -150,54 +213,51 @@ class XLSXOutputModule(interface.OutputModule):
   def WriteEventBody(self, event, event_data, event_data_stream, event_tag):
     """Writes event values to the output.
 
+    If the current worksheet has reached the maximum number of rows, the event
+    values are written to a new worksheet.
+
     Args:
       event (EventObject): event.
       event_data (EventData): event data.
       event_data_stream (EventDataStream): event data stream.
       event_tag (EventTag): event tag.
     """
+    if self._current_row >= self._MAXIMUM_NUMBER_OF_ROWS:
+      self._SetColumnWidths()
+      self._AddWorksheet()
+      self._WriteHeaderRow()
+
+    field_values = iter(self._field_formatting_helper.GetFormattedFields(
+        self._formatted_fields, event, event_data, event_data_stream,
+        event_tag))
+
     for column_index, field_name in enumerate(self._fields):
       if field_name == 'datetime':
         field_value = self._FormatDateTime(event, event_data)
-
       else:
-        field_value = self._field_formatting_helper.GetFormattedField(
-            field_name, event, event_data, event_data_stream, event_tag)
-        field_value = self._SanitizeField(field_value)
+        field_value = self._SanitizeField(next(field_values))
 
-      if (field_name == 'datetime' and
-          isinstance(field_value, datetime.datetime)):
+      if isinstance(field_value, datetime.datetime):
         self._sheet.write_datetime(
             self._current_row, column_index, field_value)
         column_width = len(self._timestamp_format) + 2
       else:
-        self._sheet.write(self._current_row, column_index, field_value)
+        self._sheet.write_string(self._current_row, column_index, field_value)
         column_width = len(field_value) + 2
 
       # Auto adjust the column width based on the length of the output value.
-      column_width = min(column_width, self._MAXIMUM_COLUMN_WIDTH)
-      column_width = max(column_width, self._MINIMUM_COLUMN_WIDTH,
-                         self._column_widths[column_index])
-
-      self._column_widths[column_index] = column_width
+      if column_width > self._column_widths[column_index]:
+        self._column_widths[column_index] = min(
+            column_width, self._MAXIMUM_COLUMN_WIDTH)
 
     self._current_row += 1
 
   def WriteHeader(self):
     """Writes the header to the spreadsheet."""
-    cell_format = self._workbook.add_format({'bold': True})
-    cell_format.set_align('center')
-
-    self._column_widths = []
-    for column_index, field_name in enumerate(self._fields):
-      self._sheet.write(0, column_index, field_name, cell_format)
+    self._header_format = self._workbook.add_format({'bold': True})
+    self._header_format.set_align('center')
 
-      column_width = len(field_name) + 2
-      self._column_widths.append(column_width)
-
-    self._current_row = 1
-    self._sheet.autofilter(0, len(self._fields) - 1, 0, 0)
-    self._sheet.freeze_panes(1, 0)
+    self._WriteHeaderRow()
 
 
 manager.OutputManager.RegisterOutput(XLSXOutputModule)
@@ -7,6 +7,7 @@ import time
 
 from dfvfs.lib import definitions as dfvfs_definitions
 
+from plaso.containers import events
 from plaso.containers import warnings
 from plaso.engine import path_helper
 from plaso.engine import profilers
@@ -33,7 +34,8 @@ class ParserMediator(object):
 
   def __init__(
       self, storage_writer, knowledge_base, collection_filters_helper=None,
-      preferred_year=None, resolver_context=None, temporary_directory=None):
+      preferred_year=None, resolver_context=None, tagging_rule_index=None,
+      temporary_directory=None):
     """Initializes a parser mediator.
 
     Args:
@@ -44,20 +46,26 @@ class ParserMediator(object):
           filters helper.
       preferred_year (Optional[int]): preferred year.
       resolver_context (Optional[dfvfs.Context]): resolver context.
+      tagging_rule_index (Optional[EventFilterRuleIndex]): event tagging
+          rules, where None represents that the produced events should not
+          be tagged.
       temporary_directory (Optional[str]): path of the directory for temporary
           files.
     """
     super(ParserMediator, self).__init__()
     self._abort = False
     self._cpu_time_profiler = None
+    self._event_data_stream = None
     self._event_data_stream_identifier = None
     self._extra_event_attributes = {}
     self._file_entry = None
     self._knowledge_base = knowledge_base
+    self._last_event_data = None
     self._last_event_data_hash = None
     self._last_event_data_identifier = None
     self._memory_profiler = None
     self._number_of_event_sources = 0
+    self._number_of_event_tags = 0
     self._number_of_events = 0
     self._number_of_warnings = 0
     self._parser_chain_components = []
@@ -65,6 +73,7 @@ class ParserMediator(object):
     self._process_information = None
     self._resolver_context = resolver_context
     self._storage_writer = storage_writer
+    self._tagging_rule_index = tagging_rule_index
     self._temporary_directory = temporary_directory
 
     self.collection_filters_helper = collection_filters_helper
@@ -95,6 +104,11 @@ class ParserMediator(object):
     """int: number of produced event sources."""
     return self._number_of_event_sources
 
+  @property
+  def number_of_produced_event_tags(self):
+    """int: number of produced event tags."""
+    return self._number_of_event_tags
+
   @property
   def number_of_produced_events(self):
     """int: number of produced events."""
@@ -183,6 +197,28 @@ class ParserMediator(object):
     year, _, _ = date_time.GetDate()
     return year
 
+  def _ProduceEventTag(self, event):
+    """Produces an event tag for an event that matches the tagging rules.
+
+    The event is matched against the event data and event data stream that
+    were last produced, hence this method should be called after the event
+    has been added to the storage writer.
+
+    Args:
+      event (EventObject): event.
+    """
+    labels = self._tagging_rule_index.GetMatchingLabels(
+        event, self._last_event_data, self._event_data_stream, None)
+    if not labels:
+      return
+
+    event_tag = events.EventTag()
+    event_tag.SetEventIdentifier(event.GetIdentifier())
+    event_tag.AddLabels(labels)
+
+    self._storage_writer.AddEventTag(event_tag)
+    self._number_of_event_tags += 1
+
   def AddEventAttribute(self, attribute_name, attribute_value):
     """Adds an attribute that will be set on all events produced.
 
@@ -434,6 +470,8 @@ class ParserMediator(object):
     if not self._storage_writer:
       raise RuntimeError('Storage writer not set.')
 
+    self._event_data_stream = event_data_stream
+
     if not event_data_stream:
       self._event_data_stream_identifier = None
     else:
@@ -502,6 +540,7 @@ class ParserMediator(object):
 
       self._storage_writer.AddEventData(event_data)
 
+      self._last_event_data = event_data
       self._last_event_data_hash = event_data_hash
       self._last_event_data_identifier = event_data.GetIdentifier()
 
@@ -515,6 +554,9 @@ class ParserMediator(object):
     self._storage_writer.AddEvent(event)
     self._number_of_events += 1
 
+    if self._tagging_rule_index:
+      self._ProduceEventTag(event)
+
     self.last_activity_timestamp = time.time()
 
   def ProduceExtractionWarning(self, message, path_spec=None):
@@ -596,6 +638,7 @@ class ParserMediator(object):
       file_entry (dfvfs.FileEntry): file entry.
     """
     self._file_entry = file_entry
+    self._event_data_stream = None
     self._event_data_stream_identifier = None
 
   def SetStorageWriter(self, storage_writer):
@@ -608,6 +651,7 @@ class ParserMediator(object):
 
     # Reset the last event data information. Each storage file should
     # contain event data for their events.
+    self._last_event_data = None
     self._last_event_data_hash = None
     self._last_event_data_identifier = None
 
@@ -87,24 +87,37 @@ class SerializedEventHeap(object):
 
         int: event timestamp or None if the heap is empty
         bytes: serialized event or None if the heap is empty
+        int: row identifier of the event data of the event or None if
+            the heap is empty or the row identifier is not set.
+        int: row identifier of the event or None if the heap is empty or
+            the row identifier is not set.
     """
     try:
-      timestamp, serialized_event = heapq.heappop(self._heap)
+      (timestamp, serialized_event, event_data_row_identifier,
+       row_identifier) = heapq.heappop(self._heap)
 
       self.data_size -= len(serialized_event)
-      return timestamp, serialized_event
+      return (
+          timestamp, serialized_event, event_data_row_identifier,
+          row_identifier)
 
     except IndexError:
-      return None, None
+      return None, None, None, None
 
-  def PushEvent(self, timestamp, event_data):
+  def PushEvent(
+      self, timestamp, event_data, event_data_row_identifier=None,
+      row_identifier=None):
     """Pushes a serialized event onto the heap.
 
     Args:
       timestamp (int): event timestamp, which contains the number of
           micro seconds since January 1, 1970, 00:00:00 UTC.
       event_data (bytes): serialized event.
+      event_data_row_identifier (Optional[int]): row identifier of the event
+          data of the event.
+      row_identifier (Optional[int]): row identifier of the event.
     """
-    heap_values = (timestamp, event_data)
+    heap_values = (
+        timestamp, event_data, event_data_row_identifier, row_identifier)
     heapq.heappush(self._heap, heap_values)
     self.data_size += len(event_data)
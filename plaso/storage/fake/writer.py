@@ -40,6 +40,7 @@ class FakeStorageWriter(interface.StorageWriter):
     self._event_sources = []
     self._event_tags = []
     self._events = []
+    self._export_watermarks = []
     self._extraction_warnings = []
     self._is_open = False
     self._task_storage_writers = {}
@@ -219,6 +220,24 @@ class FakeStorageWriter(interface.StorageWriter):
     self._event_tags.append(event_tag)
     self.number_of_event_tags += 1
 
+  def AddExportWatermark(self, export_watermark, serialized_data=None):
+    """Adds an export watermark.
+
+    Args:
+      export_watermark (ExportWatermark): export watermark.
+      serialized_data (Optional[bytes]): serialized form of the export
+          watermark.
+
+    Raises:
+      IOError: when the storage writer is closed.
+      OSError: when the storage writer is closed.
+    """
+    self._RaiseIfNotWritable()
+
+    export_watermark = self._PrepareAttributeContainer(export_watermark)
+
+    self._export_watermarks.append(export_watermark)
+
   def AddExtractionWarning(self, extraction_warning, serialized_data=None):
     """Adds an extraction warning.
 
@@ -352,6 +371,14 @@ class FakeStorageWriter(interface.StorageWriter):
     """
     return iter(self._event_tags)
 
+  def GetExportWatermarks(self):
+    """Retrieves the export watermarks.
+
+    Returns:
+      generator(ExportWatermark): export watermark generator.
+    """
+    return iter(self._export_watermarks)
+
   def GetExtractionWarnings(self):
     """Retrieves the extraction warnings.
 
@@ -404,12 +431,14 @@ class FakeStorageWriter(interface.StorageWriter):
     self._written_event_source_index += 1
     return event_source
 
-  def GetSortedEvents(self, time_range=None):
+  def GetSortedEvents(self, time_range=None, storage_filter=None):
     """Retrieves the events in increasing chronological order.
 
     Args:
       time_range (Optional[TimeRange]): time range used to filter events
           that fall in a specific period.
+      storage_filter (Optional[StorageFilter]): storage filter used to filter
+          events.
 
     Returns:
       generator(EventObject): event generator.
@@ -423,12 +452,43 @@ class FakeStorageWriter(interface.StorageWriter):
 
     event_heap = event_heaps.EventHeap()
 
+    labels_per_event_identifier = {}
+    if storage_filter and storage_filter.labels is not None:
+      for event_tag in self._event_tags:
+        lookup_key = event_tag.GetEventIdentifier().CopyToString()
+        labels = labels_per_event_identifier.setdefault(lookup_key, set())
+        labels.update(event_tag.labels or [])
+
     for event_index, event in enumerate(self._events):
       if (time_range and (
           event.timestamp < time_range.start_timestamp or
           event.timestamp > time_range.end_timestamp)):
         continue
 
+      if storage_filter:
+        # The event index is used as the analog of the row identifier of
+        # the event in a store.
+        if not storage_filter.MatchesEventRowIdentifier(event_index + 1):
+          continue
+
+        if not storage_filter.MatchesTimestamp(event.timestamp):
+          continue
+
+        if storage_filter.HasEventDataConditions():
+          event_data = None
+          event_data_identifier = event.GetEventDataIdentifier()
+          if event_data_identifier:
+            event_data = self.GetEventDataByIdentifier(event_data_identifier)
+
+          if not storage_filter.MatchesEventData(event_data):
+            continue
+
+        if storage_filter.labels is not None:
+          lookup_key = event.GetIdentifier().CopyToString()
+          labels = labels_per_event_identifier.get(lookup_key, None)
+          if not storage_filter.MatchesLabels(labels):
+            continue
+
       # The event index is used to ensure to sort events with the same date and
       # time and description in the order they were added to the store.
       event_heap.PushEvent(event, event_index)
@@ -360,6 +360,14 @@ class StorageFileReader(interface.StorageReader):
     """
     return self._storage_file.GetExtractionWarnings()
 
+  def GetExportWatermarks(self):
+    """Retrieves the export watermarks.
+
+    Returns:
+      generator(ExportWatermark): export watermark generator.
+    """
+    return self._storage_file.GetExportWatermarks()
+
   def GetNumberOfAnalysisReports(self):
     """Retrieves the number analysis reports.
 
@@ -368,6 +376,14 @@ class StorageFileReader(interface.StorageReader):
     """
     return self._storage_file.GetNumberOfAnalysisReports()
 
+  def GetNumberOfEvents(self):
+    """Retrieves the number of events.
+
+    Returns:
+      int: number of events.
+    """
+    return self._storage_file.GetNumberOfEvents()
+
   def GetNumberOfEventSources(self):
     """Retrieves the number of event sources.
 
@@ -384,7 +400,7 @@ class StorageFileReader(interface.StorageReader):
     """
     return self._storage_file.GetSessions()
 
-  def GetSortedEvents(self, time_range=None):
+  def GetSortedEvents(self, time_range=None, storage_filter=None):
     """Retrieves the events in increasing chronological order.
 
     This includes all events written to the storage including those pending
@@ -393,11 +409,14 @@ class StorageFileReader(interface.StorageReader):
     Args:
       time_range (Optional[TimeRange]): time range used to filter events
           that fall in a specific period.
+      storage_filter (Optional[StorageFilter]): storage filter used to filter
+          events.
 
     Returns:
       generator(EventObject): event generator.
     """
-    return self._storage_file.GetSortedEvents(time_range=time_range)
+    return self._storage_file.GetSortedEvents(
+        time_range=time_range, storage_filter=storage_filter)
 
   def HasAnalysisReports(self):
     """Determines if a store contains analysis reports.
@@ -423,6 +442,17 @@ class StorageFileReader(interface.StorageReader):
     """
     return self._storage_file.HasExtractionWarnings()
 
+  def HasTextIndexAttribute(self, attribute_name):
+    """Determines if the text index of the store contains a specific attribute.
+
+    Args:
+      attribute_name (str): name of the event data attribute.
+
+    Returns:
+      bool: True if the text index contains the attribute.
+    """
+    return self._storage_file.HasTextIndexAttribute(attribute_name)
+
   # TODO: remove, this method is kept for backwards compatibility reasons.
   def ReadSystemConfiguration(self, knowledge_base):
     """Reads system configuration information.
@@ -435,6 +465,15 @@ class StorageFileReader(interface.StorageReader):
     """
     self._storage_file.ReadSystemConfiguration(knowledge_base)
 
+  def SetRetainSerializedData(self, retain_serialized_data):
+    """Sets whether serialized data should be retained.
+
+    Args:
+      retain_serialized_data (bool): True if the serialized form of attribute
+          containers read from the store should be retained.
+    """
+    self._storage_file.SetRetainSerializedData(retain_serialized_data)
+
   def SetSerializersProfiler(self, serializers_profiler):
     """Sets the serializers profiler.
 
@@ -581,9 +620,14 @@ class StorageFileWriter(interface.StorageWriter):
     self._storage_file.AddAnalysisReport(
         analysis_report, serialized_data=serialized_data)
 
-    report_identifier = analysis_report.plugin_name
-    self._session.analysis_reports_counter['total'] += 1
-    self._session.analysis_reports_counter[report_identifier] += 1
+    # The session counters are only updated by the session storage writer,
+    # since analysis reports in a task storage are counted when the task
+    # storage is merged.
+    if self._storage_type == definitions.STORAGE_TYPE_SESSION:
+      report_identifier = analysis_report.plugin_name
+      self._session.analysis_reports_counter['total'] += 1
+      self._session.analysis_reports_counter[report_identifier] += 1
+
     self.number_of_analysis_reports += 1
 
   def AddAnalysisWarning(self, analysis_warning, serialized_data=None):
@@ -686,11 +730,38 @@ class StorageFileWriter(interface.StorageWriter):
 
     self._storage_file.AddEventTag(event_tag, serialized_data=serialized_data)
 
-    self._session.event_labels_counter['total'] += 1
-    for label in event_tag.labels:
-      self._session.event_labels_counter[label] += 1
+    # The session counters are only updated by the session storage writer,
+    # since event tags in a task storage are counted when the task storage
+    # is merged.
+    if self._storage_type == definitions.STORAGE_TYPE_SESSION:
+      self._session.event_labels_counter['total'] += 1
+      for label in event_tag.labels:
+        self._session.event_labels_counter[label] += 1
+
     self.number_of_event_tags += 1
 
+  def AddExportWatermark(self, export_watermark, serialized_data=None):
+    """Adds an export watermark.
+
+    Args:
+      export_watermark (ExportWatermark): an export watermark.
+      serialized_data (Optional[bytes]): serialized form of the export
+          watermark.
+
+    Raises:
+      IOError: if the storage type is not supported or
+          when the storage writer is closed.
+      OSError: if the storage type is not supported or
+          when the storage writer is closed.
+    """
+    self._RaiseIfNotWritable()
+
+    if self._storage_type != definitions.STORAGE_TYPE_SESSION:
+      raise IOError('Unsupported storage type.')
+
+    self._storage_file.AddExportWatermark(
+        export_watermark, serialized_data=serialized_data)
+
   def AddExtractionWarning(self, extraction_warning, serialized_data=None):
     """Adds an extraction warning.
 
@@ -709,6 +780,30 @@ class StorageFileWriter(interface.StorageWriter):
         extraction_warning, serialized_data=serialized_data)
     self.number_of_extraction_warnings += 1
 
+  def BuildTextIndex(self, attribute_names=None, message_callback=None):
+    """Builds a full-text index of the event data.
+
+    Args:
+      attribute_names (Optional[list[str]]): names of the event data attributes
+          to include in the text index, where None represents all attributes.
+      message_callback (Optional[function]): function that formats the message
+          of event data, which is called with the event data and event data
+          stream as arguments.
+
+    Raises:
+      IOError: if the storage type is not supported, when the storage writer
+          is closed or the text index cannot be built.
+      OSError: if the storage type is not supported, when the storage writer
+          is closed or the text index cannot be built.
+    """
+    self._RaiseIfNotWritable()
+
+    if self._storage_type != definitions.STORAGE_TYPE_SESSION:
+      raise IOError('Unsupported storage type.')
+
+    self._storage_file.BuildTextIndex(
+        attribute_names=attribute_names, message_callback=message_callback)
+
   def Close(self):
     """Closes the storage writer.
 
@@ -839,7 +934,22 @@ class StorageFileWriter(interface.StorageWriter):
         path.replace('.plaso', '')
         for path in os.listdir(self._processed_task_storage_path)]
 
-  def GetSortedEvents(self, time_range=None):
+  def GetSessions(self):
+    """Retrieves the sessions that were stored before the writer was opened.
+
+    Returns:
+      generator(Session): session generator.
+
+    Raises:
+      IOError: when the storage writer is closed.
+      OSError: when the storage writer is closed.
+    """
+    if not self._storage_file:
+      raise IOError('Unable to read from closed storage writer.')
+
+    return self._storage_file.GetSessions()
+
+  def GetSortedEvents(self, time_range=None, storage_filter=None):
     """Retrieves the events in increasing chronological order.
 
     This includes all events written to the storage including those pending
@@ -848,6 +958,8 @@ class StorageFileWriter(interface.StorageWriter):
     Args:
       time_range (Optional[TimeRange]): time range used to filter events
           that fall in a specific period.
+      storage_filter (Optional[StorageFilter]): storage filter used to filter
+          events.
 
     Returns:
       generator(EventObject): event generator.
@@ -859,7 +971,8 @@ class StorageFileWriter(interface.StorageWriter):
     if not self._storage_file:
       raise IOError('Unable to read from closed storage writer.')
 
-    return self._storage_file.GetSortedEvents(time_range=time_range)
+    return self._storage_file.GetSortedEvents(
+        time_range=time_range, storage_filter=storage_filter)
 
   def FinalizeTaskStorage(self, task):
     """Finalizes a processed task storage.
@@ -894,6 +1007,24 @@ class StorageFileWriter(interface.StorageWriter):
             'Unable to rename task storage file: {0:s} with error: '
             '{1!s}').format(storage_file_path, exception))
 
+  def HasTextIndexAttribute(self, attribute_name):
+    """Determines if the text index of the store contains a specific attribute.
+
+    Args:
+      attribute_name (str): name of the event data attribute.
+
+    Returns:
+      bool: True if the text index contains the attribute.
+
+    Raises:
+      IOError: when the storage writer is closed.
+      OSError: when the storage writer is closed.
+    """
+    if not self._storage_file:
+      raise IOError('Unable to read from closed storage writer.')
+
+    return self._storage_file.HasTextIndexAttribute(attribute_name)
+
   def Open(self, **unused_kwargs):
     """Opens the storage writer.
 
@@ -985,6 +1116,22 @@ class StorageFileWriter(interface.StorageWriter):
             'Unable to remove task storage file: {0:s} with error: '
             '{1!s}').format(processed_storage_file_path, exception))
 
+  def SetRetainSerializedData(self, retain_serialized_data):
+    """Sets whether serialized data should be retained.
+
+    Args:
+      retain_serialized_data (bool): True if the serialized form of attribute
+          containers read from the store should be retained.
+
+    Raises:
+      IOError: when the storage writer is closed.
+      OSError: when the storage writer is closed.
+    """
+    if not self._storage_file:
+      raise IOError('Unable to read from closed storage writer.')
+
+    self._storage_file.SetRetainSerializedData(retain_serialized_data)
+
   def SetSerializersProfiler(self, serializers_profiler):
     """Sets the serializers profiler.
 
@@ -1101,6 +1248,22 @@ class StorageFileWriter(interface.StorageWriter):
     self._processed_task_storage_path = None
     self._task_storage_path = None
 
+  def SupportsTextIndex(self):
+    """Determines if the store supports a text index.
+
+    Returns:
+      bool: True if the store supports a text index.
+
+    Raises:
+      IOError: when the storage writer is closed.
+      OSError: when the storage writer is closed.
+    """
+    if not self._storage_file:
+      raise IOError('Unable to read from closed storage writer.')
+
+    return (self._storage_type == definitions.STORAGE_TYPE_SESSION and
+            self._storage_file.SupportsTextIndex())
+
   def WriteSessionCompletion(self, aborted=False):
     """Writes session completion information.
 
@@ -6,6 +6,7 @@ import abc
 from plaso.containers import artifacts
 from plaso.containers import event_sources
 from plaso.containers import events
+from plaso.containers import exports
 from plaso.containers import reports
 from plaso.containers import sessions
 from plaso.containers import tasks
@@ -30,6 +31,7 @@ class BaseStore(object):
   _CONTAINER_TYPE_EVENT_DATA_STREAM = events.EventDataStream.CONTAINER_TYPE
   _CONTAINER_TYPE_EVENT_SOURCE = event_sources.EventSource.CONTAINER_TYPE
   _CONTAINER_TYPE_EVENT_TAG = events.EventTag.CONTAINER_TYPE
+  _CONTAINER_TYPE_EXPORT_WATERMARK = exports.ExportWatermark.CONTAINER_TYPE
   _CONTAINER_TYPE_EXTRACTION_WARNING = warnings.ExtractionWarning.CONTAINER_TYPE
   _CONTAINER_TYPE_SESSION_COMPLETION = sessions.SessionCompletion.CONTAINER_TYPE
   _CONTAINER_TYPE_SESSION_CONFIGURATION = (
@@ -48,6 +50,7 @@ class BaseStore(object):
       _CONTAINER_TYPE_EVENT_DATA_STREAM,
       _CONTAINER_TYPE_EVENT_SOURCE,
       _CONTAINER_TYPE_EVENT_TAG,
+      _CONTAINER_TYPE_EXPORT_WATERMARK,
       _CONTAINER_TYPE_SESSION_COMPLETION,
       _CONTAINER_TYPE_SESSION_CONFIGURATION,
       _CONTAINER_TYPE_SESSION_START,
@@ -57,6 +60,7 @@ class BaseStore(object):
 
   # Container types that only should be used in a session store.
   _SESSION_STORE_ONLY_CONTAINER_TYPES = (
+      _CONTAINER_TYPE_EXPORT_WATERMARK,
       _CONTAINER_TYPE_SESSION_COMPLETION,
       _CONTAINER_TYPE_SESSION_START,
       _CONTAINER_TYPE_SYSTEM_CONFIGURATION)
@@ -70,6 +74,7 @@ class BaseStore(object):
     """Initializes a store."""
     super(BaseStore, self).__init__()
     self._last_session = 0
+    self._retain_serialized_data = False
     self._serializer = json_serializer.JSONAttributeContainerSerializer
     self._serializers_profiler = None
     self._storage_profiler = None
@@ -257,6 +262,20 @@ class BaseStore(object):
         self._CONTAINER_TYPE_EVENT_TAG, event_tag,
         serialized_data=serialized_data)
 
+  def AddExportWatermark(self, export_watermark, serialized_data=None):
+    """Adds an export watermark.
+
+    Args:
+      export_watermark (ExportWatermark): export watermark.
+      serialized_data (Optional[bytes]): serialized form of the export
+          watermark.
+    """
+    self._RaiseIfNotWritable()
+
+    self._AddAttributeContainer(
+        self._CONTAINER_TYPE_EXPORT_WATERMARK, export_watermark,
+        serialized_data=serialized_data)
+
   def AddExtractionWarning(self, extraction_warning, serialized_data=None):
     """Adds an extraction warning.
 
@@ -363,6 +382,19 @@ class BaseStore(object):
     """
     return self._GetAttributeContainers(self._CONTAINER_TYPE_EVENT_TAG)
 
+  def GetExportWatermarks(self):
+    """Retrieves the export watermarks.
+
+    Yields:
+      ExportWatermark: export watermark.
+    """
+    # Backwards compatibility for older session storage files that do not
+    # contain export watermarks.
+    if self._HasAttributeContainers(self._CONTAINER_TYPE_EXPORT_WATERMARK):
+      for export_watermark in self._GetAttributeContainers(
+          self._CONTAINER_TYPE_EXPORT_WATERMARK):
+        yield export_watermark
+
   def GetExtractionWarnings(self):
     """Retrieves the extraction warnings.
 
@@ -380,6 +412,14 @@ class BaseStore(object):
     return self._GetNumberOfAttributeContainers(
         self._CONTAINER_TYPE_ANALYSIS_REPORT)
 
+  def GetNumberOfEvents(self):
+    """Retrieves the number events.
+
+    Returns:
+      int: number of events.
+    """
+    return self._GetNumberOfAttributeContainers(self._CONTAINER_TYPE_EVENT)
+
   def GetNumberOfEventSources(self):
     """Retrieves the number event sources.
 
@@ -453,7 +493,7 @@ class BaseStore(object):
       yield session
 
   @abc.abstractmethod
-  def GetSortedEvents(self, time_range=None):
+  def GetSortedEvents(self, time_range=None, storage_filter=None):
     """Retrieves the events in increasing chronological order.
 
     This includes all events written to the store including those pending
@@ -462,6 +502,8 @@ class BaseStore(object):
     Args:
       time_range (Optional[TimeRange]): time range used to filter events
           that fall in a specific period.
+      storage_filter (Optional[StorageFilter]): storage filter used to filter
+          events.
 
     Yields:
       EventObject: event.
@@ -491,6 +533,19 @@ class BaseStore(object):
     """
     return self._HasAttributeContainers(self._CONTAINER_TYPE_EVENT_TAG)
 
+  # pylint: disable=unused-argument
+  def HasTextIndexAttribute(self, attribute_name):
+    """Determines if the text index of the store contains a specific attribute.
+
+    Args:
+      attribute_name (str): name of the event data attribute.
+
+    Returns:
+      bool: True if the text index contains the attribute, which is never
+          the case for stores that do not support a text index.
+    """
+    return False
+
   @abc.abstractmethod
   def Open(self, **kwargs):
     """Opens the storage."""
@@ -521,6 +576,16 @@ class BaseStore(object):
     """
     self._serializers_profiler = serializers_profiler
 
+  def SetRetainSerializedData(self, retain_serialized_data):
+    """Sets whether serialized data should be retained.
+
+    Args:
+      retain_serialized_data (bool): True if the serialized form of attribute
+          containers read from the store should be retained, so that it can
+          be retrieved with AttributeContainer.GetSerializedData().
+    """
+    self._retain_serialized_data = retain_serialized_data
+
   def SetStorageProfiler(self, storage_profiler):
     """Sets the storage profiler.
 
@@ -529,6 +594,14 @@ class BaseStore(object):
     """
     self._storage_profiler = storage_profiler
 
+  def SupportsTextIndex(self):
+    """Determines if the store supports a text index.
+
+    Returns:
+      bool: True if the store supports a text index.
+    """
+    return False
+
   def WriteSessionCompletion(self, session_completion):
     """Writes session completion information.
 
@@ -645,6 +718,8 @@ class BaseStore(object):
     try:
       serialized_string = serialized_data.decode('utf-8')
       attribute_container = self._serializer.ReadSerialized(serialized_string)
+      if self._retain_serialized_data and attribute_container:
+        attribute_container.SetSerializedData(serialized_string)
 
     except UnicodeDecodeError as exception:
       raise IOError('Unable to decode serialized data: {0!s}'.format(exception))
@@ -861,7 +936,10 @@ class StorageMergeReader(object):
 
     Args:
       callback (function[StorageWriter, AttributeContainer]): function to call
-          after each attribute container is deserialized.
+          after each attribute container is deserialized. The function
+          returns False if the attribute container should not be merged.
+          Any other return value, such as None, means the attribute
+          container is merged.
       maximum_number_of_containers (Optional[int]): maximum number of
           containers to merge, where 0 represent no limit.
 
@@ -976,6 +1054,14 @@ class StorageReader(object):
       EventTag: event tag.
     """
 
+  @abc.abstractmethod
+  def GetExportWatermarks(self):
+    """Retrieves the export watermarks.
+
+    Yields:
+      ExportWatermark: export watermark.
+    """
+
   @abc.abstractmethod
   def GetExtractionWarnings(self):
     """Retrieves the extraction warnings.
@@ -992,6 +1078,14 @@ class StorageReader(object):
       int: number of analysis reports.
     """
 
+  @abc.abstractmethod
+  def GetNumberOfEvents(self):
+    """Retrieves the number of events.
+
+    Returns:
+      int: number of events.
+    """
+
   @abc.abstractmethod
   def GetNumberOfEventSources(self):
     """Retrieves the number of event sources.
@@ -1009,7 +1103,7 @@ class StorageReader(object):
     """
 
   @abc.abstractmethod
-  def GetSortedEvents(self, time_range=None):
+  def GetSortedEvents(self, time_range=None, storage_filter=None):
     """Retrieves the events in increasing chronological order.
 
     This includes all events written to the storage including those pending
@@ -1018,6 +1112,8 @@ class StorageReader(object):
     Args:
       time_range (Optional[TimeRange]): time range used to filter events
           that fall in a specific period.
+      storage_filter (Optional[StorageFilter]): storage filter used to filter
+          events.
 
     Yields:
       EventObject: event.
@@ -1047,6 +1143,19 @@ class StorageReader(object):
       bool: True if the store contains extraction warnings.
     """
 
+  # pylint: disable=unused-argument
+  def HasTextIndexAttribute(self, attribute_name):
+    """Determines if the text index of the store contains a specific attribute.
+
+    Args:
+      attribute_name (str): name of the event data attribute.
+
+    Returns:
+      bool: True if the text index contains the attribute, which is never
+          the case for stores that do not support a text index.
+    """
+    return False
+
   # TODO: remove, this method is kept for backwards compatibility reasons.
   @abc.abstractmethod
   def ReadSystemConfiguration(self, knowledge_base):
@@ -1059,6 +1168,15 @@ class StorageReader(object):
       knowledge_base (KnowledgeBase): is used to store the system configuration.
     """
 
+  @abc.abstractmethod
+  def SetRetainSerializedData(self, retain_serialized_data):
+    """Sets whether serialized data should be retained.
+
+    Args:
+      retain_serialized_data (bool): True if the serialized form of attribute
+          containers read from the store should be retained.
+    """
+
   @abc.abstractmethod
   def SetSerializersProfiler(self, serializers_profiler):
     """Sets the serializers profiler.
@@ -1183,6 +1301,16 @@ class StorageWriter(object):
       serialized_data (Optional[bytes]): serialized form of the event tag.
     """
 
+  @abc.abstractmethod
+  def AddExportWatermark(self, export_watermark, serialized_data=None):
+    """Adds an export watermark.
+
+    Args:
+      export_watermark (ExportWatermark): an export watermark.
+      serialized_data (Optional[bytes]): serialized form of the export
+          watermark.
+    """
+
   @abc.abstractmethod
   def AddExtractionWarning(self, extraction_warning, serialized_data=None):
     """Adds an extraction warning.
@@ -1273,8 +1401,17 @@ class StorageWriter(object):
       EventSource: event source or None if there are no newly written ones.
     """
 
+  def GetSessions(self):
+    """Retrieves the sessions that were stored before the writer was opened.
+
+    Returns:
+      iterator(Session): session iterator, which is empty for storage writers
+          that cannot read sessions.
+    """
+    return iter([])
+
   @abc.abstractmethod
-  def GetSortedEvents(self, time_range=None):
+  def GetSortedEvents(self, time_range=None, storage_filter=None):
     """Retrieves the events in increasing chronological order.
 
     This includes all events written to the storage including those pending
@@ -1283,6 +1420,8 @@ class StorageWriter(object):
     Args:
       time_range (Optional[TimeRange]): time range used to filter events
           that fall in a specific period.
+      storage_filter (Optional[StorageFilter]): storage filter used to filter
+          events.
 
     Yields:
       EventObject: event.
@@ -1300,6 +1439,19 @@ class StorageWriter(object):
     """
     raise NotImplementedError()
 
+  # pylint: disable=unused-argument
+  def HasTextIndexAttribute(self, attribute_name):
+    """Determines if the text index of the store contains a specific attribute.
+
+    Args:
+      attribute_name (str): name of the event data attribute.
+
+    Returns:
+      bool: True if the text index contains the attribute, which is never
+          the case for stores that do not support a text index.
+    """
+    return False
+
   @abc.abstractmethod
   def Open(self, **kwargs):
     """Opens the storage writer."""
@@ -1328,6 +1480,16 @@ class StorageWriter(object):
     """
     raise NotImplementedError()
 
+  # pylint: disable=unused-argument
+  def SetRetainSerializedData(self, retain_serialized_data):
+    """Sets whether serialized data should be retained.
+
+    Args:
+      retain_serialized_data (bool): True if the serialized form of attribute
+          containers read from the store should be retained, so that it can
+          be retrieved with AttributeContainer.GetSerializedData().
+    """
+
   @abc.abstractmethod
   def SetSerializersProfiler(self, serializers_profiler):
     """Sets the serializers profiler.
@@ -1344,6 +1506,14 @@ class StorageWriter(object):
       storage_profiler (StorageProfiler): storage profiler.
     """
 
+  def SupportsTextIndex(self):
+    """Determines if the store supports a text index.
+
+    Returns:
+      bool: True if the store supports a text index.
+    """
+    return False
+
   @abc.abstractmethod
   def WriteSessionCompletion(self, aborted=False):
     """Writes session completion information.
@@ -157,7 +157,10 @@ class RedisMergeReader(interface.StorageMergeReader):
     Args:
       container_type (str): attribute container type.
       callback (function[StorageWriter, AttributeContainer]): function to call
-          after each attribute container is deserialized.
+          after each attribute container is deserialized. The function
+          returns False if the attribute container should not be returned.
+          Any other return value, such as None, means the attribute
+          container is returned.
       cursor (int): Redis cursor for scanning items.
       maximum_number_of_items (Optional[int]): maximum number of
           containers to retrieve, where 0 represent no limit.
@@ -183,7 +186,8 @@ class RedisMergeReader(interface.StorageMergeReader):
       container.SetIdentifier(identifier)
 
       if callback:
-        callback(self._storage_writer, container)
+        if callback(self._storage_writer, container) is False:
+          continue
 
       containers.append(container)
 
@@ -203,7 +207,10 @@ class RedisMergeReader(interface.StorageMergeReader):
 
     Args:
       callback (Optional[function[StorageWriter, AttributeContainer]]): function
-          to call after each attribute container is deserialized.
+          to call after each attribute container is deserialized. The function
+          returns False if the attribute container should not be merged.
+          Any other return value, such as None, means the attribute
+          container is merged.
       maximum_number_of_containers (Optional[int]): maximum number of
           containers to merge, where 0 represent no limit.
 
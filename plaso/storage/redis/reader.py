@@ -117,6 +117,14 @@ class RedisStorageReader(interface.StorageReader):
     """
     return self._store.GetEventTags()
 
+  def GetExportWatermarks(self):
+    """Retrieves the export watermarks.
+
+    Returns:
+      generator(ExportWatermark): export watermark generator.
+    """
+    return self._store.GetExportWatermarks()
+
   def GetExtractionWarnings(self):
     """Retrieves the extraction warnings.
 
@@ -133,6 +141,14 @@ class RedisStorageReader(interface.StorageReader):
     """
     return self._store.GetNumberOfAnalysisReports()
 
+  def GetNumberOfEvents(self):
+    """Retrieves the number of events.
+
+    Returns:
+      int: number of events.
+    """
+    return self._store.GetNumberOfEvents()
+
   def GetNumberOfEventSources(self):
     """Retrieves the number of event sources.
 
@@ -141,7 +157,7 @@ class RedisStorageReader(interface.StorageReader):
     """
     return self._store.GetNumberOfEventSources()
 
-  def GetSortedEvents(self, time_range=None):
+  def GetSortedEvents(self, time_range=None, storage_filter=None):
     """Retrieves the events in increasing chronological order.
 
     This includes all events written to the storage including those pending
@@ -150,11 +166,14 @@ class RedisStorageReader(interface.StorageReader):
     Args:
       time_range (Optional[TimeRange]): time range used to filter events
           that fall in a specific period.
+      storage_filter (Optional[StorageFilter]): storage filter used to filter
+          events.
 
     Returns:
       generator(EventObject): event generator.
     """
-    return self._store.GetSortedEvents(time_range)
+    return self._store.GetSortedEvents(
+        time_range=time_range, storage_filter=storage_filter)
 
   def GetSessions(self):
     """Retrieves the sessions.
@@ -202,6 +221,15 @@ class RedisStorageReader(interface.StorageReader):
     # Not implemented by the Redis store, as it is a task store only.
     return
 
+  def SetRetainSerializedData(self, retain_serialized_data):
+    """Sets whether serialized data should be retained.
+
+    Args:
+      retain_serialized_data (bool): True if the serialized form of attribute
+          containers read from the store should be retained.
+    """
+    self._store.SetRetainSerializedData(retain_serialized_data)
+
   def SetSerializersProfiler(self, serializers_profiler):
     """Sets the serializers profiler.
 
@@ -287,21 +287,23 @@ class RedisStore(interface.BaseStore):
         name, cursor=cursor, count=maximum_number_of_items)
     return cursor, items
 
-  def GetSortedEvents(self, time_range=None):
+  def GetSortedEvents(self, time_range=None, storage_filter=None):
     """Retrieves the events in increasing chronological order.
 
     Args:
       time_range (Optional[TimeRange]): This argument is not supported by the
           Redis store.
+      storage_filter (Optional[StorageFilter]): This argument is not supported
+          by the Redis store.
 
     Yields:
       EventObject: event.
 
     Raises:
-      RuntimeError: if a time_range argument is specified.
+      RuntimeError: if a time_range or storage_filter argument is specified.
     """
     event_index_name = self._GenerateRedisKey(self._EVENT_INDEX_NAME)
-    if time_range:
+    if time_range or storage_filter:
       raise RuntimeError('Not supported')
 
     sorted_event_identifiers = self._redis_client.zscan_iter(event_index_name)
@@ -168,6 +168,20 @@ class RedisStorageWriter(interface.StorageWriter):
     """
     self._store.AddEventTag(event_tag, serialized_data=serialized_data)
 
+  def AddExportWatermark(self, export_watermark, serialized_data=None):
+    """Adds an export watermark.
+
+    Args:
+      export_watermark (ExportWatermark): an export watermark.
+      serialized_data (Optional[bytes]): serialized form of the export
+          watermark.
+
+    Raises:
+      IOError: always, as the Redis store does not support export watermarks.
+      OSError: always, as the Redis store does not support export watermarks.
+    """
+    raise IOError('Export watermarks not supported by the redis store.')
+
   def AddExtractionWarning(self, extraction_warning, serialized_data=None):
     """Adds an extraction warning.
 
@@ -255,7 +269,7 @@ class RedisStorageWriter(interface.StorageWriter):
 
     return None
 
-  def GetSortedEvents(self, time_range=None):
+  def GetSortedEvents(self, time_range=None, storage_filter=None):
     """Retrieves the events in increasing chronological order.
 
     This includes all events written to the storage including those pending
@@ -264,6 +278,8 @@ class RedisStorageWriter(interface.StorageWriter):
     Args:
       time_range (Optional[TimeRange]): time range used to filter events
           that fall in a specific period.
+      storage_filter (Optional[StorageFilter]): storage filter used to filter
+          events.
 
     Returns:
       generator(EventObject): event generator.
@@ -275,7 +291,8 @@ class RedisStorageWriter(interface.StorageWriter):
     if not self._store:
       raise IOError('Unable to read from closed storage writer.')
 
-    return self._store.GetSortedEvents(time_range=time_range)
+    return self._store.GetSortedEvents(
+        time_range=time_range, storage_filter=storage_filter)
 
   def ReadSystemConfiguration(self, knowledge_base):
     """Reads system configuration information.
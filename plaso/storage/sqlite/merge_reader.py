@@ -44,6 +44,7 @@ class SQLiteStorageMergeReader(interface.StorageMergeReader):
     self._deserialization_errors = []
     self._event_data_identifier_mappings = {}
     self._event_data_stream_identifier_mappings = {}
+    self._event_identifier_mappings = {}
     self._path = path
 
     # Create a runtime lookup table for the add container type method. This
@@ -98,10 +99,14 @@ class SQLiteStorageMergeReader(interface.StorageMergeReader):
 
       event.SetEventDataIdentifier(event_data_identifier)
 
-    # TODO: add event identifier mappings for event tags.
+    identifier = event.GetIdentifier()
+    lookup_key = identifier.CopyToString()
 
     self._storage_writer.AddEvent(event)
 
+    last_write_identifier = event.GetIdentifier()
+    self._event_identifier_mappings[lookup_key] = last_write_identifier
+
   def _AddEventData(self, event_data, serialized_data=None):
     """Adds event data.
 
@@ -159,6 +164,40 @@ class SQLiteStorageMergeReader(interface.StorageMergeReader):
     identifier = event_data_stream.GetIdentifier()
     self._event_data_stream_identifier_mappings[lookup_key] = identifier
 
+  def _AddEventTag(self, event_tag, serialized_data=None):
+    """Adds an event tag.
+
+    Event tags produced during extraction reference an event in the task
+    storage file, while event tags produced during analysis reference an
+    event in the session storage file.
+
+    Args:
+      event_tag (EventTag): event tag.
+      serialized_data (Optional[bytes]): serialized form of the event tag.
+    """
+    identifier = event_tag.GetEventIdentifier()
+    lookup_key = identifier.CopyToString()
+
+    event_identifier = self._event_identifier_mappings.get(lookup_key, None)
+    if event_identifier:
+      event_tag.SetEventIdentifier(event_identifier)
+
+      # The serialized form of the event tag contains the row identifier of
+      # the event in the task storage file and therefore cannot be used.
+      serialized_data = None
+
+    elif self._event_identifier_mappings:
+      # TODO: store this as an extraction warning so this is preserved
+      # in the storage file.
+      logger.error((
+          'Unable to merge event tag attribute container since '
+          'corresponding event: {0:s} could not be merged.').format(
+              lookup_key))
+      return
+
+    self._storage_writer.AddEventTag(
+        event_tag, serialized_data=serialized_data)
+
   def _Close(self):
     """Closes the task storage after reading."""
     self._connection.close()
@@ -223,7 +262,10 @@ class SQLiteStorageMergeReader(interface.StorageMergeReader):
 
     Args:
       callback (function[StorageWriter, AttributeContainer]): function to call
-          after each attribute container is deserialized.
+          after each attribute container is deserialized. The function
+          returns False if the attribute container should not be merged.
+          Any other return value, such as None, means the attribute
+          container is merged.
       maximum_number_of_containers (Optional[int]): maximum number of
           containers to merge, where 0 represent no limit.
 
@@ -314,7 +356,8 @@ class SQLiteStorageMergeReader(interface.StorageMergeReader):
           delattr(attribute_container, '_event_row_identifier')
 
         if callback:
-          callback(self._storage_writer, attribute_container)
+          if callback(self._storage_writer, attribute_container) is False:
+            continue
 
         self._add_active_container_method(
             attribute_container, serialized_data=serialized_data)
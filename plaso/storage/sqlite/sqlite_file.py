@@ -21,7 +21,7 @@ class SQLiteStorageFile(file_interface.BaseStorageFile):
     storage_type (str): storage type.
   """
 
-  _FORMAT_VERSION = 20210105
+  _FORMAT_VERSION = 20210514
 
   # The earliest format version, stored in-file, that this class
   # is able to append (write).
@@ -52,6 +52,60 @@ class SQLiteStorageFile(file_interface.BaseStorageFile):
       '_timestamp BIGINT,'
       '_data {1:s});')
 
+  _CREATE_INDEXED_EVENT_TABLE_QUERY = (
+      'CREATE TABLE event ('
+      '_identifier INTEGER PRIMARY KEY AUTOINCREMENT,'
+      '_timestamp BIGINT,'
+      '_event_data_row_identifier INTEGER,'
+      '_data {0:s});')
+
+  _CREATE_INDEXED_EVENT_DATA_TABLE_QUERY = (
+      'CREATE TABLE event_data ('
+      '_identifier INTEGER PRIMARY KEY AUTOINCREMENT,'
+      '_data_type TEXT,'
+      '_parser TEXT,'
+      '_data {0:s});')
+
+  _CREATE_EVENT_TAG_LABEL_TABLE_QUERY = (
+      'CREATE TABLE event_tag_label ('
+      '_event_row_identifier INTEGER,'
+      '_label TEXT);')
+
+  # Secondary indexes used to filter events without deserializing them.
+  _CREATE_SECONDARY_INDEX_QUERIES = [
+      'CREATE INDEX IF NOT EXISTS event_timestamp ON event (_timestamp)',
+      ('CREATE INDEX IF NOT EXISTS event_data_data_type ON '
+       'event_data (_data_type)'),
+      'CREATE INDEX IF NOT EXISTS event_data_parser ON event_data (_parser)',
+      ('CREATE INDEX IF NOT EXISTS event_tag_label_label ON '
+       'event_tag_label (_label)')]
+
+  _EVENT_TAG_LABEL_TABLE_NAME = 'event_tag_label'
+
+  # Full-text index of the string values of event data attributes, where
+  # the trigram tokenizer allows to match substrings.
+  _CREATE_TEXT_INDEX_TABLE_QUERY = (
+      'CREATE VIRTUAL TABLE event_data_text USING fts5('
+      '_event_data_row_identifier UNINDEXED,'
+      '_attribute_name UNINDEXED,'
+      '_value,'
+      'tokenize = \'trigram\');')
+
+  _TEXT_INDEX_TABLE_NAME = 'event_data_text'
+
+  # Metadata key of the names of the attributes in the text index.
+  _TEXT_INDEX_METADATA_KEY = 'text_index_attribute_names'
+
+  # Event data attributes that are not stored in the text index, since they
+  # are stored in secondary indexes.
+  _TEXT_INDEX_IGNORED_ATTRIBUTE_NAMES = frozenset(['data_type', 'parser'])
+
+  # The minimum length of a term that can be matched by the trigram tokenizer.
+  _TEXT_INDEX_MINIMUM_TERM_LENGTH = 3
+
+  # The number of text index values to write at once.
+  _TEXT_INDEX_WRITE_BATCH_SIZE = 10000
+
   _HAS_TABLE_QUERY = (
       'SELECT name FROM sqlite_master '
       'WHERE type = "table" AND name = "{0:s}"')
@@ -84,8 +138,12 @@ class SQLiteStorageFile(file_interface.BaseStorageFile):
     super(SQLiteStorageFile, self).__init__()
     self._connection = None
     self._cursor = None
+    self._has_secondary_indexes = False
+    self._has_text_index = False
     self._maximum_buffer_size = maximum_buffer_size
+    self._secondary_index_values = {}
     self._serialized_event_heap = event_heaps.SerializedEventHeap()
+    self._text_index_attribute_names = None
 
     if storage_type == definitions.STORAGE_TYPE_SESSION:
       self.compression_format = definitions.COMPRESSION_FORMAT_ZLIB
@@ -122,6 +180,12 @@ class SQLiteStorageFile(file_interface.BaseStorageFile):
     if not serialized_data:
       serialized_data = self._SerializeAttributeContainer(container)
 
+    if self._has_secondary_indexes and container_type in (
+        self._CONTAINER_TYPE_EVENT_DATA, self._CONTAINER_TYPE_EVENT_TAG):
+      index_values = self._GetSecondaryIndexValues(container)
+      self._secondary_index_values.setdefault(container_type, []).append(
+          index_values)
+
     container_list.PushAttributeContainer(serialized_data)
 
     if container_list.data_size > self._maximum_buffer_size:
@@ -138,9 +202,16 @@ class SQLiteStorageFile(file_interface.BaseStorageFile):
       IOError: if the event cannot be serialized.
       OSError: if the event cannot be serialized.
     """
+    # The events are written in chronological order, hence the row identifier
+    # of the event is explicitly stored so that the identifier of the event
+    # does not depend on the order in which the events are written.
+    container_list = self._GetSerializedAttributeContainerList(
+        self._CONTAINER_TYPE_EVENT)
+    container_list.next_sequence_number += 1
+
+    row_identifier = container_list.next_sequence_number
     identifier = identifiers.SQLTableIdentifier(
-        self._CONTAINER_TYPE_EVENT,
-        self._serialized_event_heap.number_of_events + 1)
+        self._CONTAINER_TYPE_EVENT, row_identifier)
 
     # This modifies the event, but the identifier is explicitly not to be
     # serialized, so it's safe to still used the already serialized form of
@@ -150,7 +221,13 @@ class SQLiteStorageFile(file_interface.BaseStorageFile):
     if not serialized_data:
       serialized_data = self._SerializeAttributeContainer(event)
 
-    self._serialized_event_heap.PushEvent(event.timestamp, serialized_data)
+    event_data_row_identifier = getattr(
+        event, '_event_data_row_identifier', None)
+
+    self._serialized_event_heap.PushEvent(
+        event.timestamp, serialized_data,
+        event_data_row_identifier=event_data_row_identifier,
+        row_identifier=row_identifier)
 
     if self._serialized_event_heap.data_size > self._maximum_buffer_size:
       self._WriteSerializedAttributeContainerList(self._CONTAINER_TYPE_EVENT)
@@ -224,13 +301,41 @@ class SQLiteStorageFile(file_interface.BaseStorageFile):
       data_column_type = 'TEXT'
 
     if container_type == self._CONTAINER_TYPE_EVENT:
-      query = self._CREATE_EVENT_TABLE_QUERY.format(
-          container_type, data_column_type)
+      if self._has_secondary_indexes:
+        query = self._CREATE_INDEXED_EVENT_TABLE_QUERY.format(
+            data_column_type)
+      else:
+        query = self._CREATE_EVENT_TABLE_QUERY.format(
+            container_type, data_column_type)
+
+    elif (container_type == self._CONTAINER_TYPE_EVENT_DATA and
+          self._has_secondary_indexes):
+      query = self._CREATE_INDEXED_EVENT_DATA_TABLE_QUERY.format(
+          data_column_type)
+
     else:
       query = self._CREATE_TABLE_QUERY.format(container_type, data_column_type)
 
     self._cursor.execute(query)
 
+  def _CreateSecondaryIndexes(self):
+    """Creates the secondary indexes used to filter events."""
+    if not self._HasTable(self._EVENT_TAG_LABEL_TABLE_NAME):
+      self._cursor.execute(self._CREATE_EVENT_TAG_LABEL_TABLE_QUERY)
+
+    for query in self._CREATE_SECONDARY_INDEX_QUERIES:
+      self._cursor.execute(query)
+
+  def _DropTextIndex(self):
+    """Drops the text index."""
+    self._cursor.execute('DROP TABLE IF EXISTS {0:s}'.format(
+        self._TEXT_INDEX_TABLE_NAME))
+    self._cursor.execute(
+        'DELETE FROM metadata WHERE key = ?', (self._TEXT_INDEX_METADATA_KEY, ))
+
+    self._has_text_index = False
+    self._text_index_attribute_names = None
+
   def _GetNumberOfAttributeContainers(self, container_type):
     """Counts the number of attribute containers of the given type.
 
@@ -415,6 +520,240 @@ class SQLiteStorageFile(file_interface.BaseStorageFile):
 
       row = cursor.fetchone()
 
+  def _GetInsertQuery(self, container_type):
+    """Retrieves the query to insert an attribute container.
+
+    Args:
+      container_type (str): attribute container type.
+
+    Returns:
+      str: SQL query.
+    """
+    if container_type == self._CONTAINER_TYPE_EVENT:
+      if self._has_secondary_indexes:
+        return (
+            'INSERT INTO event (_identifier, _timestamp, '
+            '_event_data_row_identifier, _data) VALUES (?, ?, ?, ?)')
+
+      return (
+          'INSERT INTO event (_identifier, _timestamp, _data) '
+          'VALUES (?, ?, ?)')
+
+    if (container_type == self._CONTAINER_TYPE_EVENT_DATA and
+        self._has_secondary_indexes):
+      return (
+          'INSERT INTO event_data (_data_type, _parser, _data) '
+          'VALUES (?, ?, ?)')
+
+    return 'INSERT INTO {0:s} (_data) VALUES (?)'.format(container_type)
+
+  def _GetInsertValues(
+      self, container_type, serialized_data, timestamp=None,
+      event_data_row_identifier=None, index_values=None, row_identifier=None):
+    """Retrieves the values to insert an attribute container.
+
+    Args:
+      container_type (str): attribute container type.
+      serialized_data (bytes): serialized form of the attribute container.
+      timestamp (Optional[int]): timestamp of the event.
+      event_data_row_identifier (Optional[int]): row identifier of the event
+          data of the event.
+      index_values (Optional[tuple]): secondary index values of the attribute
+          container.
+      row_identifier (Optional[int]): row identifier of the event.
+
+    Returns:
+      tuple: values that correspond with the query of _GetInsertQuery.
+    """
+    if container_type == self._CONTAINER_TYPE_EVENT:
+      if self._has_secondary_indexes:
+        return (
+            row_identifier, timestamp, event_data_row_identifier,
+            serialized_data)
+
+      return row_identifier, timestamp, serialized_data
+
+    if (container_type == self._CONTAINER_TYPE_EVENT_DATA and
+        self._has_secondary_indexes):
+      data_type, parser = index_values or (None, None)
+      return data_type, parser, serialized_data
+
+    return (serialized_data, )
+
+  def _GetSecondaryIndexValues(self, attribute_container):
+    """Retrieves the secondary index values of an attribute container.
+
+    Args:
+      attribute_container (AttributeContainer): attribute container.
+
+    Returns:
+      tuple: secondary index values of the attribute container, where
+          the values depend on the container type.
+    """
+    container_type = attribute_container.CONTAINER_TYPE
+    if container_type == self._CONTAINER_TYPE_EVENT_DATA:
+      return (getattr(attribute_container, 'data_type', None),
+              getattr(attribute_container, 'parser', None))
+
+    if container_type == self._CONTAINER_TYPE_EVENT_TAG:
+      return (getattr(attribute_container, '_event_row_identifier', None),
+              list(attribute_container.labels or []))
+
+    return None
+
+  def _GetStorageFilterExpressions(self, storage_filter):
+    """Retrieves SQL filter expressions of a storage filter.
+
+    Args:
+      storage_filter (StorageFilter): storage filter.
+
+    Returns:
+      list[str]: SQL filter expressions, that all must match.
+    """
+    filter_expressions = []
+    if storage_filter.start_timestamp is not None:
+      filter_expressions.append(
+          '_timestamp >= {0:d}'.format(storage_filter.start_timestamp))
+
+    if storage_filter.end_timestamp is not None:
+      filter_expressions.append(
+          '_timestamp <= {0:d}'.format(storage_filter.end_timestamp))
+
+    if storage_filter.minimum_event_row_identifier is not None:
+      filter_expressions.append('_identifier >= {0:d}'.format(
+          storage_filter.minimum_event_row_identifier))
+
+    if not self._has_secondary_indexes:
+      return filter_expressions
+
+    event_data_expressions = []
+    if storage_filter.data_types is not None:
+      event_data_expressions.append('_data_type IN ({0:s})'.format(
+          self._QuoteStringValues(storage_filter.data_types)))
+
+    if storage_filter.parsers is not None:
+      event_data_expressions.append('_parser IN ({0:s})'.format(
+          self._QuoteStringValues(storage_filter.parsers)))
+
+    if event_data_expressions:
+      filter_expressions.append((
+          '_event_data_row_identifier IN (SELECT _identifier FROM event_data '
+          'WHERE {0:s})').format(' AND '.join(event_data_expressions)))
+
+    for label in sorted(storage_filter.labels or []):
+      filter_expressions.append((
+          '_identifier IN (SELECT _event_row_identifier FROM event_tag_label '
+          'WHERE _label = {0:s})').format(self._QuoteStringValues([label])))
+
+    if not self._has_text_index:
+      return filter_expressions
+
+    # The text terms only need to be evaluated when the text index can do so
+    # more efficiently, since the event filter evaluates them as well.
+    text_terms = storage_filter.text_terms or {}
+    for attribute_name, terms in sorted(text_terms.items()):
+      if not self.HasTextIndexAttribute(attribute_name):
+        continue
+
+      for term in sorted(terms):
+        if len(term) >= self._TEXT_INDEX_MINIMUM_TERM_LENGTH:
+          filter_expressions.append(
+              self._GetTextIndexExpression(attribute_name, term))
+
+    if (storage_filter.message_terms is not None and
+        self.HasTextIndexAttribute('message')):
+      for term in sorted(storage_filter.message_terms):
+        filter_expressions.append(
+            self._GetTextIndexExpression('message', term))
+
+    return filter_expressions
+
+  def _GetTextIndexExpression(self, attribute_name, term):
+    """Retrieves a SQL filter expression that matches a term in the text index.
+
+    Args:
+      attribute_name (str): name of the event data attribute.
+      term (str): string the attribute value must contain, where the comparison
+          is case insensitive.
+
+    Returns:
+      str: SQL filter expression.
+    """
+    if len(term) >= self._TEXT_INDEX_MINIMUM_TERM_LENGTH:
+      phrase = '"{0:s}"'.format(term.replace('"', '""'))
+      value_expression = '_value MATCH {0:s}'.format(
+          self._QuoteStringValues([phrase]))
+
+    else:
+      # Note that LIKE is only case insensitive for ASCII characters.
+      pattern = '%{0:s}%'.format(
+          term.replace('\\', '\\\\').replace('%', '\\%').replace(
+              '_', '\\_'))
+      value_expression = '_value LIKE {0:s} ESCAPE \'\\\''.format(
+          self._QuoteStringValues([pattern]))
+
+    return (
+        '_event_data_row_identifier IN (SELECT _event_data_row_identifier '
+        'FROM event_data_text WHERE _attribute_name = {0:s} AND {1:s})').format(
+            self._QuoteStringValues([attribute_name]), value_expression)
+
+  def _GetTextIndexValues(self, event_data, event_data_stream):
+    """Retrieves the values of event data to store in the text index.
+
+    The values of the event data stream take precedence over those of
+    the event data, which corresponds with how the event filter determines
+    the value of an attribute.
+
+    Args:
+      event_data (EventData): event data.
+      event_data_stream (EventDataStream): event data stream.
+
+    Returns:
+      list[tuple[str, str]]: attribute names and string values.
+    """
+    attribute_values = dict(event_data.GetAttributes())
+    if event_data_stream:
+      attribute_values.update(event_data_stream.GetAttributes())
+
+    text_values = []
+    for attribute_name, attribute_value in sorted(attribute_values.items()):
+      if (attribute_name[0] == '_' or
+          attribute_name in self._TEXT_INDEX_IGNORED_ATTRIBUTE_NAMES):
+        continue
+
+      if (self._text_index_attribute_names is not None and
+          attribute_name not in self._text_index_attribute_names):
+        continue
+
+      # Only strings and strings contained in lists or as dictionary keys
+      # can contain a string according to the event filter.
+      if isinstance(attribute_value, str):
+        values = [attribute_value]
+      elif isinstance(attribute_value, (dict, list, tuple)):
+        values = [value for value in attribute_value if isinstance(value, str)]
+      else:
+        values = []
+
+      text_values.extend([
+          (attribute_name, value) for value in values if value])
+
+    return text_values
+
+  def _GetEventLabelsPerRowIdentifier(self):
+    """Retrieves the event tag labels per event row identifier.
+
+    Returns:
+      dict[int, set[str]]: labels per event row identifier.
+    """
+    labels_per_row_identifier = {}
+    for event_tag in self.GetEventTags():
+      event_identifier = event_tag.GetEventIdentifier()
+      labels = labels_per_row_identifier.setdefault(
+          event_identifier.row_identifier, set())
+      labels.update(event_tag.labels or [])
+
+    return labels_per_row_identifier
+
   # TODO: determine if this method should account for non-stored attribute
   # containers or that it is better to rename the method to
   # _HasStoredAttributeContainers.
@@ -431,6 +770,21 @@ class SQLiteStorageFile(file_interface.BaseStorageFile):
     count = self._GetNumberOfAttributeContainers(container_type)
     return count > 0
 
+  def _HasSecondaryIndexes(self):
+    """Determines if the store contains secondary indexes.
+
+    Stores of format versions before 20210514 do not contain secondary indexes.
+
+    Returns:
+      bool: True if the store contains secondary indexes.
+    """
+    if not self._HasTable(self._EVENT_TAG_LABEL_TABLE_NAME):
+      return False
+
+    self._cursor.execute('PRAGMA table_info(event)')
+    column_names = [row[1] for row in self._cursor.fetchall()]
+    return '_event_data_row_identifier' in column_names
+
   def _HasTable(self, table_name):
     """Determines if a specific table exists.
 
@@ -445,6 +799,20 @@ class SQLiteStorageFile(file_interface.BaseStorageFile):
     self._cursor.execute(query)
     return bool(self._cursor.fetchone())
 
+  @classmethod
+  def _QuoteStringValues(cls, values):
+    """Quotes string values for use in a SQL expression.
+
+    Args:
+      values (iterable[str]): string values.
+
+    Returns:
+      str: comma separated quoted string values.
+    """
+    return ', '.join([
+        '\'{0:s}\''.format(value.replace('\'', '\'\''))
+        for value in sorted(values)])
+
   def _ReadAndCheckStorageMetadata(self, check_readable_only=False):
     """Reads storage metadata and checks that the values are valid.
 
@@ -466,6 +834,26 @@ class SQLiteStorageFile(file_interface.BaseStorageFile):
     self.serialization_format = metadata_values['serialization_format']
     self.storage_type = metadata_values['storage_type']
 
+  def _ReadTextIndexMetadata(self):
+    """Reads the metadata of the text index if the store contains one."""
+    self._has_text_index = False
+    self._text_index_attribute_names = None
+
+    if not self._has_secondary_indexes or not self._HasTable(
+        self._TEXT_INDEX_TABLE_NAME):
+      return
+
+    self._cursor.execute(
+        'SELECT value FROM metadata WHERE key = ?',
+        (self._TEXT_INDEX_METADATA_KEY, ))
+    row = self._cursor.fetchone()
+    if not row:
+      return
+
+    self._has_text_index = True
+    if row[0]:
+      self._text_index_attribute_names = frozenset(row[0].split(','))
+
   def _UpdateEventDataIdentifierAfterDeserialize(self, event):
     """Updates the event data identifier after deserialization.
 
@@ -591,26 +979,38 @@ class SQLiteStorageFile(file_interface.BaseStorageFile):
       serialized_data (Optional[bytes]): serialized form of the attribute
           container.
     """
-    if attribute_container.CONTAINER_TYPE == self._CONTAINER_TYPE_EVENT:
-      timestamp, serialized_data = self._serialized_event_heap.PopEvent()
+    event_data_row_identifier = None
+    row_identifier = None
+    timestamp = None
+
+    container_type = attribute_container.CONTAINER_TYPE
+    if container_type == self._CONTAINER_TYPE_EVENT:
+      (timestamp, serialized_data, event_data_row_identifier,
+       row_identifier) = self._serialized_event_heap.PopEvent()
     else:
+      if (container_type == self._CONTAINER_TYPE_EVENT_DATA and
+          self._has_text_index):
+        self._DropTextIndex()
+
       if not serialized_data:
         serialized_data = self._SerializeAttributeContainer(
             attribute_container)
 
+    index_values = None
+    if self._has_secondary_indexes:
+      index_values = self._GetSecondaryIndexValues(attribute_container)
+
     if self.compression_format == definitions.COMPRESSION_FORMAT_ZLIB:
       compressed_data = zlib.compress(serialized_data)
       serialized_data = sqlite3.Binary(compressed_data)
     else:
       compressed_data = ''
 
-    if attribute_container.CONTAINER_TYPE == self._CONTAINER_TYPE_EVENT:
-      query = 'INSERT INTO event (_timestamp, _data) VALUES (?, ?)'
-      values = (timestamp, serialized_data)
-    else:
-      query = 'INSERT INTO {0:s} (_data) VALUES (?)'.format(
-          attribute_container.CONTAINER_TYPE)
-      values = (serialized_data, )
+    query = self._GetInsertQuery(container_type)
+    values = self._GetInsertValues(
+        container_type, serialized_data, timestamp=timestamp,
+        event_data_row_identifier=event_data_row_identifier,
+        index_values=index_values, row_identifier=row_identifier)
 
     if self._storage_profiler:
       self._storage_profiler.StartTiming('write_container')
@@ -618,6 +1018,9 @@ class SQLiteStorageFile(file_interface.BaseStorageFile):
     try:
       self._cursor.execute(query, values)
 
+      if index_values and container_type == self._CONTAINER_TYPE_EVENT_TAG:
+        self._WriteEventTagLabels([index_values])
+
     finally:
       if self._storage_profiler:
         self._storage_profiler.StopTiming('write_container')
@@ -629,6 +1032,23 @@ class SQLiteStorageFile(file_interface.BaseStorageFile):
         attribute_container.CONTAINER_TYPE, self._cursor.lastrowid)
     attribute_container.SetIdentifier(identifier)
 
+  def _WriteEventTagLabels(self, index_values_list):
+    """Writes the labels of event tags to the event tag label index.
+
+    Args:
+      index_values_list (list[tuple[int, list[str]]]): event row identifier
+          and labels of the event tags.
+    """
+    values_tuple_list = []
+    for event_row_identifier, labels in index_values_list:
+      for label in labels:
+        values_tuple_list.append((event_row_identifier, label))
+
+    if values_tuple_list:
+      self._cursor.executemany((
+          'INSERT INTO event_tag_label (_event_row_identifier, _label) '
+          'VALUES (?, ?)'), values_tuple_list)
+
   def _WriteSerializedAttributeContainerList(self, container_type):
     """Writes a serialized attribute container list.
 
@@ -650,24 +1070,39 @@ class SQLiteStorageFile(file_interface.BaseStorageFile):
       number_of_attribute_containers = (
           container_list.number_of_attribute_containers)
 
+      # The text index no longer covers all event data once event data is
+      # added to the store.
+      if (container_type == self._CONTAINER_TYPE_EVENT_DATA and
+          self._has_text_index):
+        self._DropTextIndex()
+
     if self._serializers_profiler:
       self._serializers_profiler.StartTiming('write')
 
-    if container_type == self._CONTAINER_TYPE_EVENT:
-      query = 'INSERT INTO event (_timestamp, _data) VALUES (?, ?)'
-    else:
-      query = 'INSERT INTO {0:s} (_data) VALUES (?)'.format(container_type)
+    query = self._GetInsertQuery(container_type)
+
+    # The secondary index values are stored in the same order as the
+    # serialized attribute containers.
+    index_values_list = self._secondary_index_values.pop(container_type, [])
 
     total_compressed_data_size = 0
     total_serialized_data_size = 0
 
     # TODO: directly use container_list instead of values_tuple_list.
     values_tuple_list = []
-    for _ in range(number_of_attribute_containers):
+    for index in range(number_of_attribute_containers):
+      event_data_row_identifier = None
+      index_values = None
+      row_identifier = None
+      timestamp = None
+
       if container_type == self._CONTAINER_TYPE_EVENT:
-        timestamp, serialized_data = self._serialized_event_heap.PopEvent()
+        (timestamp, serialized_data, event_data_row_identifier,
+         row_identifier) = self._serialized_event_heap.PopEvent()
       else:
         serialized_data = container_list.PopAttributeContainer()
+        if index < len(index_values_list):
+          index_values = index_values_list[index]
 
       if self.compression_format == definitions.COMPRESSION_FORMAT_ZLIB:
         compressed_data = zlib.compress(serialized_data)
@@ -679,10 +1114,10 @@ class SQLiteStorageFile(file_interface.BaseStorageFile):
         total_compressed_data_size += len(compressed_data)
         total_serialized_data_size += len(serialized_data)
 
-      if container_type == self._CONTAINER_TYPE_EVENT:
-        values_tuple_list.append((timestamp, serialized_data))
-      else:
-        values_tuple_list.append((serialized_data, ))
+      values_tuple_list.append(self._GetInsertValues(
+          container_type, serialized_data, timestamp=timestamp,
+          event_data_row_identifier=event_data_row_identifier,
+          index_values=index_values, row_identifier=row_identifier))
 
     if self._storage_profiler:
       self._storage_profiler.StartTiming('write_containers_list')
@@ -690,6 +1125,10 @@ class SQLiteStorageFile(file_interface.BaseStorageFile):
     try:
       self._cursor.executemany(query, values_tuple_list)
 
+      if (index_values_list and
+          container_type == self._CONTAINER_TYPE_EVENT_TAG):
+        self._WriteEventTagLabels(index_values_list)
+
     finally:
       if self._storage_profiler:
         self._storage_profiler.StopTiming('write_containers_list')
@@ -781,6 +1220,103 @@ class SQLiteStorageFile(file_interface.BaseStorageFile):
     self._UpdateEventIdentifierBeforeSerialize(event_tag)
     self._AddAttributeContainer(self._CONTAINER_TYPE_EVENT_TAG, event_tag)
 
+  def BuildTextIndex(self, attribute_names=None, message_callback=None):
+    """Builds a full-text index of the event data in the store.
+
+    The text index contains the string values of the event data attributes
+    and is used to evaluate conditions, that an attribute contains a string,
+    of storage filters. An existing text index is replaced and the text index
+    is dropped when event data is added to the store.
+
+    Args:
+      attribute_names (Optional[list[str]]): names of the event data attributes
+          to include in the text index, where None represents all attributes.
+      message_callback (Optional[function]): function that formats the message
+          of event data, which is stored in the text index as the "message"
+          attribute. The function is called with the event data and event data
+          stream as arguments and returns the message or None if not available.
+
+    Raises:
+      IOError: if the storage file is not writable, does not support a text
+          index or the text index cannot be created.
+      OSError: if the storage file is not writable, does not support a text
+          index or the text index cannot be created.
+    """
+    self._RaiseIfNotWritable()
+
+    if not self._has_secondary_indexes:
+      raise IOError('Text index not supported by storage file.')
+
+    # Make sure the text index covers the buffered event data as well.
+    self._WriteSerializedAttributeContainerList(
+        self._CONTAINER_TYPE_EVENT_DATA_STREAM)
+    self._WriteSerializedAttributeContainerList(
+        self._CONTAINER_TYPE_EVENT_DATA)
+
+    self._DropTextIndex()
+
+    try:
+      self._cursor.execute(self._CREATE_TEXT_INDEX_TABLE_QUERY)
+    except sqlite3.OperationalError as exception:
+      raise IOError('Unable to create text index with error: {0!s}'.format(
+          exception))
+
+    if attribute_names is not None:
+      attribute_names = set(attribute_names)
+      if message_callback:
+        attribute_names.add('message')
+
+      self._text_index_attribute_names = frozenset(attribute_names)
+
+    query = (
+        'INSERT INTO event_data_text (_event_data_row_identifier, '
+        '_attribute_name, _value) VALUES (?, ?, ?)')
+
+    event_data_streams = {}
+    values_tuple_list = []
+    for event_data in self._GetAttributeContainers(
+        self._CONTAINER_TYPE_EVENT_DATA):
+      event_data_identifier = event_data.GetIdentifier()
+
+      self._UpdateEventDataStreamIdentifierAfterDeserialize(event_data)
+
+      event_data_stream = None
+      event_data_stream_identifier = event_data.GetEventDataStreamIdentifier()
+      if event_data_stream_identifier:
+        lookup_key = event_data_stream_identifier.CopyToString()
+        event_data_stream = event_data_streams.get(lookup_key, None)
+        if not event_data_stream:
+          event_data_stream = self.GetEventDataStreamByIdentifier(
+              event_data_stream_identifier)
+          event_data_streams[lookup_key] = event_data_stream
+
+      text_values = self._GetTextIndexValues(event_data, event_data_stream)
+      if message_callback:
+        message = message_callback(event_data, event_data_stream)
+        if message:
+          text_values.append(('message', message))
+
+      for attribute_name, value in text_values:
+        values_tuple_list.append((
+            event_data_identifier.row_identifier, attribute_name, value))
+
+      if len(values_tuple_list) >= self._TEXT_INDEX_WRITE_BATCH_SIZE:
+        self._cursor.executemany(query, values_tuple_list)
+        values_tuple_list = []
+
+    if values_tuple_list:
+      self._cursor.executemany(query, values_tuple_list)
+
+    # An empty value represents that the text index contains all attributes.
+    self._cursor.execute(
+        'INSERT INTO metadata (key, value) VALUES (?, ?)', (
+            self._TEXT_INDEX_METADATA_KEY,
+            ','.join(sorted(self._text_index_attribute_names or []))))
+
+    self._connection.commit()
+
+    self._has_text_index = True
+
   @classmethod
   def CheckSupportedFormat(cls, path, check_readable_only=False):
     """Checks if the storage file format is supported.
@@ -840,6 +1376,8 @@ class SQLiteStorageFile(file_interface.BaseStorageFile):
           self._CONTAINER_TYPE_EVENT_TAG)
       self._WriteSerializedAttributeContainerList(
           self._CONTAINER_TYPE_EXTRACTION_WARNING)
+      self._WriteSerializedAttributeContainerList(
+          self._CONTAINER_TYPE_EXPORT_WATERMARK)
 
     if self._connection:
       # We need to run commit or not all data is stored in the database.
@@ -964,20 +1502,21 @@ class SQLiteStorageFile(file_interface.BaseStorageFile):
         self._CONTAINER_TYPE_EVENT_SOURCE)
     return number_of_event_sources
 
-  def GetSortedEvents(self, time_range=None):
+  def GetSortedEvents(self, time_range=None, storage_filter=None):
     """Retrieves the events in increasing chronological order.
 
     Args:
       time_range (Optional[TimeRange]): time range used to filter events
           that fall in a specific period.
+      storage_filter (Optional[StorageFilter]): storage filter used to filter
+          events, where conditions are evaluated by means of the secondary
+          indexes if the store contains them.
 
     Yield:
       EventObject: event.
     """
-    filter_expression = None
+    filter_expression = []
     if time_range:
-      filter_expression = []
-
       if time_range.start_timestamp:
         filter_expression.append(
             '_timestamp >= {0:d}'.format(time_range.start_timestamp))
@@ -986,17 +1525,73 @@ class SQLiteStorageFile(file_interface.BaseStorageFile):
         filter_expression.append(
             '_timestamp <= {0:d}'.format(time_range.end_timestamp))
 
-      filter_expression = ' AND '.join(filter_expression)
+    if storage_filter:
+      filter_expression.extend(
+          self._GetStorageFilterExpressions(storage_filter))
+
+    filter_expression = ' AND '.join(filter_expression) or None
+
+    # Stores without secondary indexes evaluate the event data and label
+    # conditions on the deserialized attribute containers, as do stores
+    # without a text index that contains the message for message conditions.
+    event_data_per_row_identifier = None
+    labels_per_row_identifier = None
+    if storage_filter and not self._has_secondary_indexes:
+      if storage_filter.HasEventDataConditions():
+        event_data_per_row_identifier = {}
+
+      if storage_filter.labels is not None:
+        labels_per_row_identifier = self._GetEventLabelsPerRowIdentifier()
+
+    elif (storage_filter and storage_filter.message_terms is not None and
+          not self.HasTextIndexAttribute('message')):
+      event_data_per_row_identifier = {}
 
     event_generator = self._GetAttributeContainers(
         self._CONTAINER_TYPE_EVENT, filter_expression=filter_expression,
         order_by='_timestamp')
 
     for event in event_generator:
+      if labels_per_row_identifier is not None:
+        event_identifier = event.GetIdentifier()
+        labels = labels_per_row_identifier.get(
+            event_identifier.row_identifier, None)
+        if not storage_filter.MatchesLabels(labels):
+          continue
+
       self._UpdateEventDataIdentifierAfterDeserialize(event)
+
+      if event_data_per_row_identifier is not None:
+        event_data_identifier = event.GetEventDataIdentifier()
+        row_identifier = event_data_identifier.row_identifier
+
+        matches = event_data_per_row_identifier.get(row_identifier, None)
+        if matches is None:
+          event_data = self.GetEventDataByIdentifier(event_data_identifier)
+          matches = storage_filter.MatchesEventData(event_data)
+          event_data_per_row_identifier[row_identifier] = matches
+
+        if not matches:
+          continue
+
       yield event
 
   # pylint: disable=arguments-differ
+  def HasTextIndexAttribute(self, attribute_name):
+    """Determines if the text index contains a specific attribute.
+
+    Args:
+      attribute_name (str): name of the event data attribute.
+
+    Returns:
+      bool: True if the text index contains the attribute.
+    """
+    if not self._has_text_index:
+      return False
+
+    return (self._text_index_attribute_names is None or
+            attribute_name in self._text_index_attribute_names)
+
   def Open(self, path=None, read_only=True, **unused_kwargs):
     """Opens the storage.
 
@@ -1020,8 +1615,12 @@ class SQLiteStorageFile(file_interface.BaseStorageFile):
 
     path = os.path.abspath(path)
 
+    # The connection can be used by a thread other than the one that opened
+    # it, such as the psort event reader, but not by multiple threads at
+    # the same time.
     connection = sqlite3.connect(
-        path, detect_types=sqlite3.PARSE_DECLTYPES|sqlite3.PARSE_COLNAMES)
+        path, check_same_thread=False,
+        detect_types=sqlite3.PARSE_DECLTYPES|sqlite3.PARSE_COLNAMES)
 
     cursor = connection.cursor()
     if not cursor:
@@ -1034,6 +1633,10 @@ class SQLiteStorageFile(file_interface.BaseStorageFile):
 
     if read_only:
       self._ReadAndCheckStorageMetadata(check_readable_only=True)
+
+      self._has_secondary_indexes = self._HasSecondaryIndexes()
+      self._ReadTextIndexMetadata()
+
     else:
       # self._cursor.execute('PRAGMA journal_mode=MEMORY')
 
@@ -1045,6 +1648,13 @@ class SQLiteStorageFile(file_interface.BaseStorageFile):
       else:
         self._ReadAndCheckStorageMetadata()
 
+      # Secondary indexes are only maintained in session stores that were
+      # created with a format version that supports them.
+      if self.storage_type == definitions.STORAGE_TYPE_SESSION:
+        self._has_secondary_indexes = (
+            not self._HasTable(self._CONTAINER_TYPE_EVENT) or
+            self._HasSecondaryIndexes())
+
       for container_type in self._CONTAINER_TYPES:
         if (self.storage_type == definitions.STORAGE_TYPE_SESSION and
             container_type in self._TASK_STORE_ONLY_CONTAINER_TYPES):
@@ -1057,6 +1667,11 @@ class SQLiteStorageFile(file_interface.BaseStorageFile):
         if not self._HasTable(container_type):
           self._CreateAttributeContainerTable(container_type)
 
+      if self._has_secondary_indexes:
+        self._CreateSecondaryIndexes()
+
+      self._ReadTextIndexMetadata()
+
       self._connection.commit()
 
     last_session_start = self._GetNumberOfAttributeContainers(
@@ -1077,3 +1692,15 @@ class SQLiteStorageFile(file_interface.BaseStorageFile):
       logger.warning('Detected unclosed session.')
 
     self._last_session = last_session_completion
+
+  def SupportsTextIndex(self):
+    """Determines if the store supports a text index.
+
+    The text index refers to the event data by means of the secondary indexes,
+    hence stores of format versions before 20210514, that do not contain
+    secondary indexes, do not support a text index.
+
+    Returns:
+      bool: True if the store supports a text index.
+    """
+    return self._has_secondary_indexes
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""Storage filter objects."""
+
+
+class StorageFilter(object):
+  """Storage filter.
+
+  A storage filter defines conditions that can be evaluated by a store, for
+  example by means of secondary indexes, before events are deserialized.
+  All conditions must be met for an event to match the filter.
+
+  Attributes:
+    data_types (set[str]): data types of which the event data must be one,
+        or None if not set.
+    end_timestamp (int): timestamp the event timestamp must be less than or
+        equal to, or None if not set.
+    labels (set[str]): labels the event must all have been tagged with, or
+        None if not set.
+    message_terms (set[str]): strings the message of the event must all
+        contain, or None if not set. A store with a text index evaluates
+        the terms against the formatted messages, otherwise against
+        the message attribute of the event data.
+    minimum_event_row_identifier (int): row identifier the row identifier of
+        the event must be greater than or equal to, or None if not set.
+    parsers (set[str]): parsers of which the event data must be produced by
+        one, or None if not set.
+    start_timestamp (int): timestamp the event timestamp must be greater than
+        or equal to, or None if not set.
+    text_terms (dict[str, set[str]]): strings that the values of event data
+        attributes must contain per attribute name, or None if not set. A store
+        can use the terms to skip events by means of a text index, but is not
+        required to evaluate them, hence events that match the storage filter
+        still need to be evaluated against the conditions of the terms.
+  """
+
+  def __init__(self):
+    """Initializes a storage filter."""
+    super(StorageFilter, self).__init__()
+    self.data_types = None
+    self.end_timestamp = None
+    self.labels = None
+    self.message_terms = None
+    self.minimum_event_row_identifier = None
+    self.parsers = None
+    self.start_timestamp = None
+    self.text_terms = None
+
+  def AddDataTypes(self, data_types):
+    """Restricts the data types an event can have.
+
+    Args:
+      data_types (set[str]): data types.
+    """
+    if self.data_types is None:
+      self.data_types = set(data_types)
+    else:
+      self.data_types.intersection_update(data_types)
+
+  def AddLabel(self, label):
+    """Adds a label an event must have been tagged with.
+
+    Args:
+      label (str): label.
+    """
+    if self.labels is None:
+      self.labels = set()
+    self.labels.add(label)
+
+  def AddMessageTerm(self, term):
+    """Adds a string the message of an event must contain.
+
+    Args:
+      term (str): string the message must contain, where the comparison is
+          case insensitive.
+    """
+    if self.message_terms is None:
+      self.message_terms = set()
+    self.message_terms.add(term)
+
+  def AddParsers(self, parsers):
+    """Restricts the parsers that can have produced the event.
+
+    Args:
+      parsers (set[str]): parser names.
+    """
+    if self.parsers is None:
+      self.parsers = set(parsers)
+    else:
+      self.parsers.intersection_update(parsers)
+
+  def AddTextTerm(self, attribute_name, term):
+    """Adds a string the value of an event data attribute should contain.
+
+    Args:
+      attribute_name (str): name of the event data attribute.
+      term (str): string the attribute value should contain.
+    """
+    if self.text_terms is None:
+      self.text_terms = {}
+    self.text_terms.setdefault(attribute_name, set()).add(term)
+
+  def HasEventDataConditions(self):
+    """Determines if the filter has conditions on the event data.
+
+    Note that the text terms are not considered conditions on the event data
+    since they do not need to be evaluated by the store.
+
+    Returns:
+      bool: True if the filter has conditions on the event data.
+    """
+    return (self.data_types is not None or self.message_terms is not None or
+            self.parsers is not None)
+
+  def IsEmpty(self):
+    """Determines if the filter has no conditions.
+
+    Returns:
+      bool: True if the filter has no conditions.
+    """
+    return (self.data_types is None and self.end_timestamp is None and
+            self.labels is None and self.message_terms is None and
+            self.minimum_event_row_identifier is None and
+            self.parsers is None and self.start_timestamp is None and
+            self.text_terms is None)
+
+  def MatchesEventData(self, event_data):
+    """Determines if event data matches the event data conditions.
+
+    Args:
+      event_data (EventData): event data.
+
+    Returns:
+      bool: True if the event data matches the conditions.
+    """
+    if self.data_types is not None and (
+        getattr(event_data, 'data_type', None) not in self.data_types):
+      return False
+
+    if self.parsers is not None and (
+        getattr(event_data, 'parser', None) not in self.parsers):
+      return False
+
+    if self.message_terms is not None:
+      message = getattr(event_data, 'message', None)
+      if not isinstance(message, str):
+        return False
+
+      message = message.lower()
+      for term in self.message_terms:
+        if term.lower() not in message:
+          return False
+
+    return True
+
+  def MatchesEventRowIdentifier(self, row_identifier):
+    """Determines if an event row identifier matches the row conditions.
+
+    Args:
+      row_identifier (int): row identifier of the event.
+
+    Returns:
+      bool: True if the row identifier matches the conditions.
+    """
+    if self.minimum_event_row_identifier is None:
+      return True
+
+    return row_identifier >= self.minimum_event_row_identifier
+
+  def MatchesLabels(self, labels):
+    """Determines if labels match the label conditions.
+
+    Args:
+      labels (list[str]): labels of the event tag of an event.
+
+    Returns:
+      bool: True if the labels match the conditions.
+    """
+    if self.labels is None:
+      return True
+
+    return self.labels.issubset(labels or [])
+
+  def MatchesTimestamp(self, timestamp):
+    """Determines if a timestamp matches the timestamp conditions.
+
+    Args:
+      timestamp (int): timestamp, which contains the number of microseconds
+          since January 1, 1970, 00:00:00 UTC.
+
+    Returns:
+      bool: True if the timestamp matches the conditions.
+    """
+    if self.start_timestamp is not None and (
+        timestamp is None or timestamp < self.start_timestamp):
+      return False
+
+    if self.end_timestamp is not None and (
+        timestamp is None or timestamp > self.end_timestamp):
+      return False
+
+    return True
+
+  def SetEndTimestamp(self, timestamp):
+    """Restricts the latest timestamp of an event.
+
+    Args:
+      timestamp (int): timestamp, which contains the number of microseconds
+          since January 1, 1970, 00:00:00 UTC.
+    """
+    if self.end_timestamp is None or timestamp < self.end_timestamp:
+      self.end_timestamp = timestamp
+
+  def SetMinimumEventRowIdentifier(self, row_identifier):
+    """Restricts the events to those stored from a specific row onwards.
+
+    Args:
+      row_identifier (int): row identifier of the first event that can match.
+    """
+    if (self.minimum_event_row_identifier is None or
+        row_identifier > self.minimum_event_row_identifier):
+      self.minimum_event_row_identifier = row_identifier
+
+  def SetStartTimestamp(self, timestamp):
+    """Restricts the earliest timestamp of an event.
+
+    Args:
+      timestamp (int): timestamp, which contains the number of microseconds
+          since January 1, 1970, 00:00:00 UTC.
+    """
+    if self.start_timestamp is None or timestamp > self.start_timestamp:
+      self.start_timestamp = timestamp
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for the hash analysis cache."""
+
+import os
+import unittest
+
+from plaso.analysis import hash_cache
+from plaso.analysis import hash_tagging
+
+from tests import test_lib as shared_test_lib
+
+
+class HashAnalysisCacheTest(shared_test_lib.BaseTestCase):
+  """Tests for the hash analysis cache."""
+
+  _HASH_1 = 'ba4b1f9d0da5c8a35c1e8a76e7a9f3ad'
+  _HASH_2 = '0b3fd3ad9a6bd50c0f2c0f1e8e2d7b4c'
+  _HASH_3 = 'aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa'
+
+  def testGetAndStoreHashAnalyses(self):
+    """Tests the GetHashAnalyses and StoreHashAnalyses functions."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      path = os.path.join(temp_directory, 'hash_cache.db')
+
+      cache = hash_cache.HashAnalysisCache(path)
+
+      with self.assertRaises(IOError):
+        cache.GetHashAnalyses('test', 'localhost:9120', 'md5', [self._HASH_1])
+
+      cache.Open()
+
+      try:
+        with self.assertRaises(IOError):
+          cache.Open()
+
+        cache.StoreHashAnalyses('test', 'localhost:9120', 'md5', [
+            (hash_tagging.HashAnalysis(self._HASH_1.upper(), {'count': 1}),
+             False),
+            (hash_tagging.HashAnalysis(self._HASH_2, False), True),
+            (hash_tagging.HashAnalysis(self._HASH_3, None), True)])
+
+        hash_information = cache.GetHashAnalyses(
+            'test', 'localhost:9120', 'md5',
+            [self._HASH_1, self._HASH_2, self._HASH_3])
+        self.assertEqual(hash_information, {
+            self._HASH_1: {'count': 1}, self._HASH_2: False})
+
+        hash_information = cache.GetHashAnalyses(
+            'other', 'localhost:9120', 'md5', [self._HASH_1])
+        self.assertEqual(hash_information, {})
+
+        hash_information = cache.GetHashAnalyses(
+            'test', 'localhost:9121', 'md5', [self._HASH_1])
+        self.assertEqual(hash_information, {})
+
+        hash_information = cache.GetHashAnalyses(
+            'test', 'localhost:9120', 'sha1', [self._HASH_1])
+        self.assertEqual(hash_information, {})
+
+      finally:
+        cache.Close()
+
+      # Test that the cache persists and results expire.
+      cache = hash_cache.HashAnalysisCache(path, negative_time_to_live=-1)
+      cache.Open()
+
+      try:
+        hash_information = cache.GetHashAnalyses(
+            'test', 'localhost:9120', 'md5', [self._HASH_1, self._HASH_2])
+        self.assertEqual(hash_information, {self._HASH_1: {'count': 1}})
+
+      finally:
+        cache.Close()
+
+      # Test that results are not cached when their time to live is 0.
+      cache = hash_cache.HashAnalysisCache(
+          path, negative_time_to_live=0, time_to_live=0)
+      cache.Open()
+
+      try:
+        cache.StoreHashAnalyses('test', 'localhost:9120', 'md5', [
+            (hash_tagging.HashAnalysis(self._HASH_3, True), False)])
+
+        cache.time_to_live = hash_cache.HashAnalysisCache.DEFAULT_TIME_TO_LIVE
+
+        hash_information = cache.GetHashAnalyses(
+            'test', 'localhost:9120', 'md5', [self._HASH_3])
+        self.assertEqual(hash_information, {})
+
+      finally:
+        cache.Close()
+
+
+if __name__ == '__main__':
+  unittest.main()
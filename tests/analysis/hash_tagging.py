@@ -2,13 +2,17 @@
 # -*- coding: utf-8 -*-
 """Tests for the hash tagging analysis plugin."""
 
+import os
+import queue
 import unittest
 
 from dfvfs.path import fake_path_spec
 
+from plaso.analysis import hash_cache
 from plaso.analysis import hash_tagging
 from plaso.lib import definitions
 
+from tests import test_lib as shared_test_lib
 from tests.analysis import test_lib
 
 
@@ -68,6 +72,8 @@ class TestHashTaggingAnalysisPlugin(hash_tagging.HashTaggingAnalysisPlugin):
 class HashTaggingAnalysisPluginTest(test_lib.AnalysisPluginTestCase):
   """Tests for the hash tagging analysis plugin."""
 
+  # pylint: disable=protected-access
+
   _EVENT_1_HASH = (
       '2d79fcc6b02a2e183a0cb30e0e25d103f42badda9fbf86bbee06f93aa3855aff')
 
@@ -134,6 +140,37 @@ class HashTaggingAnalysisPluginTest(test_lib.AnalysisPluginTestCase):
       labels.extend(event_tag.labels)
     self.assertEqual(len(labels), 0)
 
+  def testExamineEventAndCompileReportWithCache(self):
+    """Tests the ExamineEvent and CompileReport functions with a cache."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      path = os.path.join(temp_directory, 'hash_cache.db')
+
+      # Store a result for the second hash that differs from the result of
+      # the test hash analyzer, to determine that it was used.
+      cache = hash_cache.HashAnalysisCache(path)
+      cache.Open()
+      cache.StoreHashAnalyses('test', '', 'sha256', [
+          (hash_tagging.HashAnalysis(self._EVENT_2_HASH, True), False)])
+      cache.Close()
+
+      plugin = TestHashTaggingAnalysisPlugin()
+      plugin.SetHashAnalysisCache(hash_cache.HashAnalysisCache(path))
+
+      storage_writer = self._AnalyzeEvents(self._TEST_EVENTS, plugin)
+
+      self.assertEqual(storage_writer.number_of_event_tags, 2)
+      self.assertEqual(plugin._analyzer.hashes_from_cache, 1)
+
+      # The result of the first hash is cached by the first run.
+      plugin = TestHashTaggingAnalysisPlugin()
+      plugin.SetHashAnalysisCache(hash_cache.HashAnalysisCache(path))
+
+      storage_writer = self._AnalyzeEvents(self._TEST_EVENTS, plugin)
+
+      self.assertEqual(storage_writer.number_of_event_tags, 2)
+      self.assertEqual(plugin._analyzer.hashes_from_cache, 2)
+      self.assertEqual(plugin._analyzer.analyses_performed, 0)
+
   def testSetLookupHash(self):
     """Tests the SetLookupHash function."""
     plugin = TestHashTaggingAnalysisPlugin()
@@ -144,5 +181,29 @@ class HashTaggingAnalysisPluginTest(test_lib.AnalysisPluginTestCase):
       plugin.SetLookupHash('bogus')
 
 
+class HashAnalyzerTest(unittest.TestCase):
+  """Tests for the hash analyzer."""
+
+  # pylint: disable=protected-access
+
+  def testGetHashes(self):
+    """Tests the _GetHashes function."""
+    hash_queue = queue.Queue()
+    for digest in ('a', 'b', 'c', 'd', 'e'):
+      hash_queue.put(digest)
+
+    analyzer = TestHashAnalyzer(hash_queue, queue.Queue())
+    analyzer.EMPTY_QUEUE_WAIT_TIME = 0.1
+
+    hashes = analyzer._GetHashes(hash_queue, 3)
+    self.assertEqual(hashes, ['a', 'b', 'c'])
+
+    hashes = analyzer._GetHashes(hash_queue, 3)
+    self.assertEqual(hashes, ['d', 'e'])
+
+    hashes = analyzer._GetHashes(hash_queue, 3)
+    self.assertEqual(hashes, [])
+
+
 if __name__ == '__main__':
   unittest.main()
@@ -11,8 +11,8 @@ class AnalysisImportTest(test_lib.ImportCheckTestCase):
   """Tests that analysis plugin classes are imported correctly."""
 
   _IGNORABLE_FILES = frozenset([
-      'definitions.py', 'hash_tagging.py', 'interface.py', 'logger.py',
-      'manager.py', 'mediator.py'])
+      'definitions.py', 'hash_cache.py', 'hash_tagging.py', 'interface.py',
+      'logger.py', 'manager.py', 'mediator.py'])
 
   def testAnalysisPluginsImported(self):
     """Tests that all parsers are imported."""
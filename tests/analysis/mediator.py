@@ -8,7 +8,9 @@ from dfvfs.lib import definitions as dfvfs_definitions
 from dfvfs.path import factory as path_spec_factory
 
 from plaso.analysis import mediator
+from plaso.containers import events
 from plaso.containers import sessions
+from plaso.storage import identifiers
 from plaso.storage.fake import writer as fake_writer
 
 from tests.analysis import test_lib
@@ -35,6 +37,38 @@ class AnalysisMediatorTest(test_lib.AnalysisPluginTestCase):
     self.assertEqual(display_name, expected_display_name)
 
   # TODO: add test for GetUsernameForPath.
+
+  def testPopProducedEventTags(self):
+    """Tests the PopProducedEventTags function."""
+    session = sessions.Session()
+    storage_writer = fake_writer.FakeStorageWriter(session)
+    storage_writer.Open()
+    knowledge_base = self._SetUpKnowledgeBase()
+
+    analysis_mediator = mediator.AnalysisMediator(
+        storage_writer, knowledge_base)
+
+    event_tag = events.EventTag()
+    event_tag.AddLabel('test')
+    event_tag.SetEventIdentifier(identifiers.FakeIdentifier(1))
+    analysis_mediator.ProduceEventTag(event_tag)
+
+    produced_event_tags = analysis_mediator.PopProducedEventTags()
+    self.assertEqual(produced_event_tags, [])
+
+    analysis_mediator = mediator.AnalysisMediator(
+        storage_writer, knowledge_base, retain_event_tags=True)
+
+    analysis_mediator.ProduceEventTag(event_tag)
+
+    produced_event_tags = analysis_mediator.PopProducedEventTags()
+    self.assertEqual(produced_event_tags, [event_tag])
+
+    produced_event_tags = analysis_mediator.PopProducedEventTags()
+    self.assertEqual(produced_event_tags, [])
+
+    storage_writer.Close()
+
   # TODO: add test for ProduceAnalysisReport.
   # TODO: add test for ProduceEventTag.
 
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for the NSRL analysis plugin."""
+
+import os
+import sqlite3
+import unittest
+
+from dfvfs.path import fake_path_spec
+
+from plaso.analysis import hash_cache
+from plaso.analysis import nsrl
+from plaso.lib import definitions
+
+from tests import test_lib as shared_test_lib
+from tests.analysis import test_lib
+
+
+class NsrlTestCase(test_lib.AnalysisPluginTestCase):
+  """Shared functionality for NSRL analysis plugin tests."""
+
+  _MD5_HASH_1 = 'ba4b1f9d0da5c8a35c1e8a76e7a9f3ad'
+  _MD5_HASH_2 = '0b3fd3ad9a6bd50c0f2c0f1e8e2d7b4c'
+  _MD5_HASH_3 = 'aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa'
+
+  _SHA256_HASH_1 = (
+      '2d79fcc6b02a2e183a0cb30e0e25d103f42badda9fbf86bbee06f93aa3855aff')
+
+  def _CreateNSRLFile(self, path):
+    """Creates a RDS version 2 NSRLFile.txt.
+
+    Args:
+      path (str): path of the NSRLFile.txt.
+    """
+    with open(path, 'w', encoding='utf-8') as file_object:
+      file_object.write(
+          '"SHA-1","MD5","CRC32","FileName","FileSize","ProductCode",'
+          '"OpSystemCode","SpecialCode"\n')
+      file_object.write(
+          '"0000002D9D62AEBE1E0E9DB6C4C4C7C16A163D2C","{0:s}","7A5407CA",'
+          '"good.exe",2226,228,"358",""\n'.format(self._MD5_HASH_1.upper()))
+      file_object.write(
+          '"0000004DA6391F7F5D2F7FCCF36CEBDA60C6EA02","{0:s}","E39149E4",'
+          '"other.dll",30720,8000,"2",""\n'.format(self._MD5_HASH_2.upper()))
+      file_object.write(
+          '"00000079FD7AAC9B2F9C988C50750E1F50B27EB5","{0:s}","E39149E4",'
+          '"good, copy.exe",2226,228,"358",""\n'.format(
+              self._MD5_HASH_1.upper()))
+      file_object.write(
+          '"000000F694CB9B9D2B0F2B9D2C1D4B9B1E9F1A2B","bogus","E39149E4",'
+          '"bogus.exe",10,228,"358",""\n')
+
+
+class NsrlHashSetFileTest(NsrlTestCase):
+  """Tests for the NSRL hash set file and builder."""
+
+  def testBuildFromCSVFile(self):
+    """Tests building a hash set file from a RDS version 2 CSV file."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      rds_path = os.path.join(temp_directory, 'NSRLFile.txt')
+      self._CreateNSRLFile(rds_path)
+
+      hash_set_path = os.path.join(temp_directory, 'nsrl_md5.hashset')
+
+      builder = nsrl.NsrlHashSetFileBuilder('md5')
+      number_of_digests = builder.Build([rds_path], hash_set_path)
+      self.assertEqual(number_of_digests, 2)
+      self.assertEqual(builder.number_of_invalid_digests, 1)
+
+      hash_set_file = nsrl.NsrlHashSetFile()
+      hash_set_file.Open(hash_set_path)
+
+      try:
+        self.assertEqual(hash_set_file.hash_type, 'md5')
+        self.assertEqual(hash_set_file.number_of_digests, 2)
+
+        self.assertTrue(hash_set_file.HasDigest(self._MD5_HASH_1))
+        self.assertTrue(hash_set_file.HasDigest(self._MD5_HASH_2))
+        self.assertFalse(hash_set_file.HasDigest(self._MD5_HASH_3))
+        self.assertFalse(hash_set_file.HasDigest('bogus'))
+
+      finally:
+        hash_set_file.Close()
+
+      builder = nsrl.NsrlHashSetFileBuilder('sha256')
+      with self.assertRaises(IOError):
+        builder.Build([rds_path], hash_set_path)
+
+      self.assertFalse(os.path.exists(hash_set_path))
+
+  def testBuildFromSQLiteFile(self):
+    """Tests building a hash set file from a RDS version 3 SQLite file."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      rds_path = os.path.join(temp_directory, 'RDS_modern.db')
+
+      connection = sqlite3.connect(rds_path)
+      connection.execute((
+          'CREATE TABLE FILE (sha256 VARCHAR, sha1 VARCHAR, md5 VARCHAR, '
+          'file_name VARCHAR)'))
+      connection.execute(
+          'INSERT INTO FILE VALUES (?, NULL, ?, ?)',
+          (self._SHA256_HASH_1.upper(), self._MD5_HASH_1.upper(), 'good.exe'))
+      connection.commit()
+      connection.close()
+
+      hash_set_path = os.path.join(temp_directory, 'nsrl_sha256.hashset')
+
+      builder = nsrl.NsrlHashSetFileBuilder('sha256')
+      number_of_digests = builder.Build([rds_path], hash_set_path)
+      self.assertEqual(number_of_digests, 1)
+
+      hash_set_file = nsrl.NsrlHashSetFile()
+      hash_set_file.Open(hash_set_path)
+
+      try:
+        self.assertEqual(hash_set_file.hash_type, 'sha256')
+        self.assertTrue(hash_set_file.HasDigest(self._SHA256_HASH_1))
+
+      finally:
+        hash_set_file.Close()
+
+      hash_set_path = os.path.join(temp_directory, 'nsrl_sha1.hashset')
+
+      builder = nsrl.NsrlHashSetFileBuilder('sha1')
+      number_of_digests = builder.Build([rds_path], hash_set_path)
+      self.assertEqual(number_of_digests, 0)
+
+      hash_set_file = nsrl.NsrlHashSetFile()
+      hash_set_file.Open(hash_set_path)
+
+      try:
+        self.assertFalse(hash_set_file.HasDigest('0' * 40))
+
+      finally:
+        hash_set_file.Close()
+
+  def testBuildFromTextFile(self):
+    """Tests building a hash set file from a text file."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      rds_path = os.path.join(temp_directory, 'hashes.txt')
+      with open(rds_path, 'w', encoding='utf-8') as file_object:
+        file_object.write('{0:s}\n{1:s}\n'.format(
+            self._MD5_HASH_2, self._MD5_HASH_1))
+
+      hash_set_path = os.path.join(temp_directory, 'nsrl_md5.hashset')
+
+      builder = nsrl.NsrlHashSetFileBuilder('md5')
+      number_of_digests = builder.Build([rds_path], hash_set_path)
+      self.assertEqual(number_of_digests, 2)
+
+      hash_set_file = nsrl.NsrlHashSetFile()
+      hash_set_file.Open(hash_set_path)
+
+      try:
+        self.assertTrue(hash_set_file.HasDigest(self._MD5_HASH_1))
+        self.assertTrue(hash_set_file.HasDigest(self._MD5_HASH_2))
+        self.assertFalse(hash_set_file.HasDigest(self._MD5_HASH_3))
+
+      finally:
+        hash_set_file.Close()
+
+  def testOpen(self):
+    """Tests the Open function."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      hash_set_path = os.path.join(temp_directory, 'bogus.hashset')
+      with open(hash_set_path, 'wb') as file_object:
+        file_object.write(b'bogus')
+
+      hash_set_file = nsrl.NsrlHashSetFile()
+      with self.assertRaises(IOError):
+        hash_set_file.Open(hash_set_path)
+
+      with self.assertRaises(IOError):
+        hash_set_file.HasDigest(self._MD5_HASH_1)
+
+
+class NsrlAnalysisPluginTest(NsrlTestCase):
+  """Tests for the NSRL analysis plugin."""
+
+  def testExamineEventAndCompileReport(self):
+    """Tests the ExamineEvent and CompileReport functions."""
+    test_events = [
+        {'data_type': 'fs:stat',
+         'md5_hash': self._MD5_HASH_1,
+         'path_spec': fake_path_spec.FakePathSpec(
+             location='C:\\WINDOWS\\system32\\good.exe'),
+         'timestamp': '2015-01-01 17:00:00',
+         'timestamp_desc': definitions.TIME_DESCRIPTION_CREATION},
+        {'data_type': 'fs:stat:ntfs',
+         'md5_hash': self._MD5_HASH_3,
+         'path_spec': fake_path_spec.FakePathSpec(
+             location='C:\\WINDOWS\\system32\\evil.exe'),
+         'timestamp': '2016-01-01 17:00:00',
+         'timestamp_desc': definitions.TIME_DESCRIPTION_CREATION}]
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      rds_path = os.path.join(temp_directory, 'NSRLFile.txt')
+      self._CreateNSRLFile(rds_path)
+
+      hash_set_path = os.path.join(temp_directory, 'nsrl_md5.hashset')
+
+      builder = nsrl.NsrlHashSetFileBuilder('md5')
+      builder.Build([rds_path], hash_set_path)
+
+      plugin = nsrl.NsrlAnalysisPlugin()
+      plugin.SetLabel('nsrl_present')
+      plugin.SetLookupHash('md5')
+      plugin.SetHashSetPath(hash_set_path)
+
+      storage_writer = self._AnalyzeEvents(test_events, plugin)
+
+    self.assertEqual(len(storage_writer.analysis_reports), 1)
+    self.assertEqual(storage_writer.number_of_event_tags, 1)
+
+    report = storage_writer.analysis_reports[0]
+    self.assertIsNotNone(report)
+
+    expected_text = (
+        'nsrl hash tagging results\n'
+        '1 path specifications tagged with label: nsrl_present\n')
+    self.assertEqual(report.text, expected_text)
+
+    labels = []
+    for event_tag in storage_writer.GetEventTags():
+      labels.extend(event_tag.labels)
+
+    self.assertEqual(labels, ['nsrl_present'])
+
+  def testSetHashAnalysisCache(self):
+    """Tests the SetHashAnalysisCache function."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      path = os.path.join(temp_directory, 'hash_cache.db')
+
+      plugin = nsrl.NsrlAnalysisPlugin()
+      plugin.SetHashAnalysisCache(hash_cache.HashAnalysisCache(path))
+
+      # pylint: disable=protected-access
+      self.assertIsNone(plugin._analyzer._cache)
+
+  def testSetHashSetPath(self):
+    """Tests the SetHashSetPath function."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      rds_path = os.path.join(temp_directory, 'NSRLFile.txt')
+      self._CreateNSRLFile(rds_path)
+
+      hash_set_path = os.path.join(temp_directory, 'nsrl_md5.hashset')
+
+      builder = nsrl.NsrlHashSetFileBuilder('md5')
+      builder.Build([rds_path], hash_set_path)
+
+      plugin = nsrl.NsrlAnalysisPlugin()
+      plugin.SetLookupHash('sha1')
+
+      with self.assertRaises(IOError):
+        plugin.SetHashSetPath(hash_set_path)
+
+      with self.assertRaises(IOError):
+        plugin.SetHashSetPath(os.path.join(temp_directory, 'bogus.hashset'))
+
+
+if __name__ == '__main__':
+  unittest.main()
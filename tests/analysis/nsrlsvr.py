@@ -20,9 +20,8 @@ from tests.analysis import test_lib
 class _MockNsrlsvrSocket(object):
   """Mock socket object for testing."""
 
-  _EXPECTED_DATA = (
-      b'QUERY 2d79fcc6b02a2e183a0cb30e0e25d103f42badda9fbf86bbee06f93aa3855aff'
-      b'\n')
+  _KNOWN_HASHES = frozenset([
+      b'2d79fcc6b02a2e183a0cb30e0e25d103f42badda9fbf86bbee06f93aa3855aff'])
 
   def __init__(self):
     """Initializes a mock socket."""
@@ -36,13 +35,18 @@ class _MockNsrlsvrSocket(object):
   # pylint: disable=unused-argument
   def recv(self, buffer_size):
     """Mocks the socket.recv method."""
-    expected_data = self._data == self._EXPECTED_DATA
-    self._data = None
+    responses = []
+    for query in (self._data or b'').split(b'\n'):
+      if not query.startswith(b'QUERY '):
+        continue
 
-    if expected_data:
-      return b'OK 1'
+      response = b''.join([
+          b'1' if digest in self._KNOWN_HASHES else b'0'
+          for digest in query.split(b' ')[1:]])
+      responses.append(b''.join([b'OK ', response, b'\n']))
 
-    return b'OK 0'
+    self._data = None
+    return b''.join(responses)
 
   def sendall(self, data):
     """Mocks the socket.sendall method"""
@@ -128,6 +132,28 @@ class NsrlSvrTest(test_lib.AnalysisPluginTestCase):
     expected_labels = ['nsrl_present']
     self.assertEqual(labels, expected_labels)
 
+  def testGetHashSourceIdentifier(self):
+    """Tests the GetHashSourceIdentifier function."""
+    analyzer = nsrlsvr.NsrlsvrAnalyzer(None, None)
+    analyzer.SetHost('localhost')
+    analyzer.SetPort(9120)
+
+    hash_source = analyzer.GetHashSourceIdentifier()
+    self.assertEqual(hash_source, 'localhost:9120')
+
+  def testQueryHashes(self):
+    """Tests the _QueryHashes function."""
+    analyzer = nsrlsvr.NsrlsvrAnalyzer(None, None)
+
+    hashes = [self._EVENT_2_HASH] * 150
+    hashes[120] = self._EVENT_1_HASH
+
+    # pylint: disable=protected-access
+    results = analyzer._QueryHashes(_MockNsrlsvrSocket(), hashes)
+    self.assertEqual(len(results), 150)
+    self.assertTrue(results[120])
+    self.assertEqual(results.count(True), 1)
+
 
 if __name__ == '__main__':
   unittest.main()
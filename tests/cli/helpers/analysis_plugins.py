@@ -18,7 +18,8 @@ class AnalysisPluginsArgumentsHelperTest(cli_test_lib.CLIToolTestCase):
   # pylint: disable=no-member,protected-access
 
   _EXPECTED_OUTPUT = """\
-usage: cli_helper.py [--analysis PLUGIN_LIST]
+usage: cli_helper.py [--analysis PLUGIN_LIST] [--analysis_shards NUMBER]
+                     [--inline_analysis PLUGIN_LIST]
 
 Test argument parser.
 
@@ -27,6 +28,17 @@ optional arguments:
                         A comma separated list of analysis plugin names to be
                         loaded or "--analysis list" to see a list of available
                         plugins.
+  --analysis_shards NUMBER, --analysis-shards NUMBER
+                        Number of analysis processes to run per loaded
+                        analysis plugin that supports it, such as "tagging",
+                        where every process analyzes part of the events. The
+                        default is 1.
+  --inline_analysis PLUGIN_LIST, --inline-analysis PLUGIN_LIST
+                        A comma separated list of names of the loaded analysis
+                        plugins that should be run inline, in the main
+                        process, instead of in a separate analysis process.
+                        This is intended for analysis plugins that do little
+                        work per event, such as "tagging".
 """
 
   def testAddArguments(self):
@@ -52,6 +64,38 @@ optional arguments:
         options, test_tool)
 
     self.assertEqual(test_tool._analysis_plugins, ['tagging'])
+    self.assertEqual(test_tool._inline_analysis_plugins, [])
+    self.assertEqual(test_tool._number_of_analysis_shards, 1)
+
+    options.analysis_shards = 4
+
+    analysis_plugins.AnalysisPluginsArgumentsHelper.ParseOptions(
+        options, test_tool)
+
+    self.assertEqual(test_tool._number_of_analysis_shards, 4)
+
+    options.analysis_shards = 0
+
+    with self.assertRaises(errors.BadConfigOption):
+      analysis_plugins.AnalysisPluginsArgumentsHelper.ParseOptions(
+          options, test_tool)
+
+    options.analysis_shards = 1
+
+    options.inline_analysis_plugins = 'tagging'
+
+    analysis_plugins.AnalysisPluginsArgumentsHelper.ParseOptions(
+        options, test_tool)
+
+    self.assertEqual(test_tool._inline_analysis_plugins, ['tagging'])
+
+    options.inline_analysis_plugins = 'browser_search'
+
+    with self.assertRaises(errors.BadConfigOption):
+      analysis_plugins.AnalysisPluginsArgumentsHelper.ParseOptions(
+          options, test_tool)
+
+    options.inline_analysis_plugins = ''
 
     with self.assertRaises(errors.BadConfigObject):
       analysis_plugins.AnalysisPluginsArgumentsHelper.ParseOptions(
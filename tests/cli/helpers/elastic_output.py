@@ -21,6 +21,7 @@ class ElasticSearchOutputArgumentsHelperTest(
 
   _EXPECTED_OUTPUT = """\
 usage: cli_helper.py [--index_name NAME] [--flush_interval INTERVAL]
+                     [--bulk_requests NUMBER] [--bulk_size SIZE]
                      [--raw_fields] [--additional_fields ADDITIONAL_FIELDS]
                      [--elastic_mappings PATH] [--elastic_user USERNAME]
                      [--elastic_password PASSWORD] [--use_ssl]
@@ -36,6 +37,12 @@ optional arguments:
                         addition to the default fields, which are datetime,
                         display_name, message, source_long, source_short, tag,
                         timestamp, timestamp_desc.
+  --bulk_requests NUMBER, --bulk-requests NUMBER
+                        Maximum number of bulk inserts to ElasticSearch that
+                        run concurrently, the default is 2.
+  --bulk_size SIZE, --bulk-size SIZE
+                        Maximum size in bytes of the events in a bulk insert
+                        to ElasticSearch, the default is 10485760.
   --ca_certificates_file_path PATH, --ca-certificates-file-path PATH
                         Path to a file containing a list of root certificates
                         to trust.
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for the compiled filter cache CLI arguments helper."""
+
+import argparse
+import os
+import unittest
+
+from plaso.cli import tools
+from plaso.cli.helpers import filter_cache
+from plaso.lib import errors
+
+from tests import test_lib as shared_test_lib
+from tests.cli import test_lib as cli_test_lib
+
+
+class FilterCacheArgumentsHelperTest(cli_test_lib.CLIToolTestCase):
+  """Tests for the compiled filter cache CLI arguments helper."""
+
+  # pylint: disable=no-member,protected-access
+
+  _EXPECTED_OUTPUT = """\
+usage: cli_helper.py [--filter_cache DIRECTORY]
+
+Test argument parser.
+
+optional arguments:
+  --filter_cache DIRECTORY, --filter-cache DIRECTORY
+                        Path of a directory to cache compiled event filters
+                        and tagging rules in, so that later runs and other
+                        processes do not need to compile them again. Compiled
+                        filters are only used for the same filter expression
+                        or tagging file contents and the same version of
+                        plaso.
+"""
+
+  def testAddArguments(self):
+    """Tests the AddArguments function."""
+    argument_parser = argparse.ArgumentParser(
+        prog='cli_helper.py', description='Test argument parser.',
+        add_help=False,
+        formatter_class=cli_test_lib.SortedArgumentsHelpFormatter)
+
+    filter_cache.FilterCacheArgumentsHelper.AddArguments(argument_parser)
+
+    output = self._RunArgparseFormatHelp(argument_parser)
+    self.assertEqual(output, self._EXPECTED_OUTPUT)
+
+  def testParseOptions(self):
+    """Tests the ParseOptions function."""
+    options = cli_test_lib.TestOptions()
+
+    test_tool = tools.CLITool()
+    filter_cache.FilterCacheArgumentsHelper.ParseOptions(options, test_tool)
+
+    self.assertIsNone(test_tool._filter_cache_path)
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      options.filter_cache = os.path.join(temp_directory, 'cache')
+
+      filter_cache.FilterCacheArgumentsHelper.ParseOptions(options, test_tool)
+
+      self.assertEqual(test_tool._filter_cache_path, options.filter_cache)
+
+      options.filter_cache = os.path.join(temp_directory, 'file')
+      with open(options.filter_cache, 'wb') as file_object:
+        file_object.write(b'')
+
+      with self.assertRaises(errors.BadConfigOption):
+        filter_cache.FilterCacheArgumentsHelper.ParseOptions(
+            options, test_tool)
+
+    with self.assertRaises(errors.BadConfigObject):
+      filter_cache.FilterCacheArgumentsHelper.ParseOptions(options, None)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for the hash analysis cache CLI arguments helper."""
+
+import argparse
+import os
+import unittest
+
+from plaso.analysis import nsrlsvr
+from plaso.analysis import tagging
+from plaso.lib import errors
+from plaso.cli.helpers import hash_analysis_cache
+
+from tests import test_lib as shared_test_lib
+from tests.cli import test_lib as cli_test_lib
+from tests.cli.helpers import test_lib
+
+
+class HashAnalysisCacheArgumentsHelperTest(
+    test_lib.AnalysisPluginArgumentsHelperTest):
+  """Tests the hash analysis cache CLI arguments helper."""
+
+  # pylint: disable=no-member,protected-access
+
+  _EXPECTED_OUTPUT = """\
+usage: cli_helper.py [--hash-cache PATH] [--hash-cache-negative-ttl DAYS]
+                     [--hash-cache-ttl DAYS]
+
+Test argument parser.
+
+optional arguments:
+  --hash-cache PATH, --hash_cache PATH
+                        Path of a file to cache the results of hash look ups
+                        of the hash tagging analysis plugins, such as nsrlsvr
+                        and virustotal, in. The cache is shared between runs
+                        and can be shared between cases.
+  --hash-cache-negative-ttl DAYS, --hash_cache_negative_ttl DAYS
+                        Number of days cached results that indicate a hash is
+                        not known remain valid, where 0 represents that these
+                        results are not cached. The default is: 1.
+  --hash-cache-ttl DAYS, --hash_cache_ttl DAYS
+                        Number of days other cached results remain valid,
+                        where 0 represents that these results are not cached.
+                        The default is: 30.
+"""
+
+  def testAddArguments(self):
+    """Tests the AddArguments function."""
+    argument_parser = argparse.ArgumentParser(
+        prog='cli_helper.py',
+        description='Test argument parser.', add_help=False,
+        formatter_class=cli_test_lib.SortedArgumentsHelpFormatter)
+
+    hash_analysis_cache.HashAnalysisCacheArgumentsHelper.AddArguments(
+        argument_parser)
+
+    output = self._RunArgparseFormatHelp(argument_parser)
+    self.assertEqual(output, self._EXPECTED_OUTPUT)
+
+  def testParseOptions(self):
+    """Tests the ParseOptions function."""
+    analysis_plugin = nsrlsvr.NsrlsvrAnalysisPlugin()
+
+    options = cli_test_lib.TestOptions()
+
+    hash_analysis_cache.HashAnalysisCacheArgumentsHelper.ParseOptions(
+        options, analysis_plugin)
+
+    self.assertIsNone(analysis_plugin._analyzer._cache)
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      path = os.path.join(temp_directory, 'hash_cache.db')
+
+      options.hash_cache = path
+      options.hash_cache_negative_ttl = 2
+      options.hash_cache_ttl = 10
+
+      hash_analysis_cache.HashAnalysisCacheArgumentsHelper.ParseOptions(
+          options, analysis_plugin)
+
+      cache = analysis_plugin._analyzer._cache
+      self.assertIsNotNone(cache)
+      self.assertEqual(cache.negative_time_to_live, 2 * 24 * 60 * 60)
+      self.assertEqual(cache.time_to_live, 10 * 24 * 60 * 60)
+      self.assertEqual(analysis_plugin._analyzer._cache_name, 'nsrlsvr')
+
+      options.hash_cache_ttl = -1
+
+      with self.assertRaises(errors.BadConfigOption):
+        hash_analysis_cache.HashAnalysisCacheArgumentsHelper.ParseOptions(
+            options, analysis_plugin)
+
+      options.hash_cache = temp_directory
+      options.hash_cache_ttl = 10
+
+      with self.assertRaises(errors.BadConfigOption):
+        hash_analysis_cache.HashAnalysisCacheArgumentsHelper.ParseOptions(
+            options, analysis_plugin)
+
+    with self.assertRaises(errors.BadConfigObject):
+      hash_analysis_cache.HashAnalysisCacheArgumentsHelper.ParseOptions(
+          options, tagging.TaggingAnalysisPlugin())
+
+
+if __name__ == '__main__':
+  unittest.main()
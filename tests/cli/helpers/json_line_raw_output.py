@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for the raw JSON line output module CLI arguments helper."""
+
+import argparse
+import unittest
+
+from plaso.cli.helpers import json_line_raw_output
+from plaso.lib import errors
+from plaso.output import json_line_raw
+
+from tests.cli import test_lib as cli_test_lib
+from tests.cli.helpers import test_lib
+
+
+class JSONLineRawOutputArgumentsHelperTest(
+    test_lib.OutputModuleArgumentsHelperTest):
+  """Tests the raw JSON line output module CLI arguments helper."""
+
+  # pylint: disable=no-member,protected-access
+
+  _EXPECTED_OUTPUT = """\
+usage: cli_helper.py [--computed_fields COMPUTED_FIELDS]
+
+Test argument parser.
+
+optional arguments:
+  --computed_fields COMPUTED_FIELDS, --computed-fields COMPUTED_FIELDS
+                        Defines computed fields, such as message, to be
+                        included in the output, in addition to the events as
+                        stored. By default no computed fields are included.
+"""
+
+  def testAddArguments(self):
+    """Tests the AddArguments function."""
+    argument_parser = argparse.ArgumentParser(
+        prog='cli_helper.py',
+        description='Test argument parser.', add_help=False,
+        formatter_class=cli_test_lib.SortedArgumentsHelpFormatter)
+
+    json_line_raw_output.JSONLineRawOutputArgumentsHelper.AddArguments(
+        argument_parser)
+
+    output = self._RunArgparseFormatHelp(argument_parser)
+    self.assertEqual(output, self._EXPECTED_OUTPUT)
+
+  def testParseOptions(self):
+    """Tests the ParseOptions function."""
+    options = cli_test_lib.TestOptions()
+    output_mediator = self._CreateOutputMediator()
+    output_module = json_line_raw.JSONLineRawOutputModule(output_mediator)
+
+    json_line_raw_output.JSONLineRawOutputArgumentsHelper.ParseOptions(
+        options, output_module)
+    self.assertEqual(output_module._event_formatting_helper._field_names, [])
+
+    options.computed_fields = 'message, datetime'
+    json_line_raw_output.JSONLineRawOutputArgumentsHelper.ParseOptions(
+        options, output_module)
+    self.assertEqual(
+        output_module._event_formatting_helper._field_names,
+        ['message', 'datetime'])
+
+    with self.assertRaises(errors.BadConfigObject):
+      json_line_raw_output.JSONLineRawOutputArgumentsHelper.ParseOptions(
+          options, None)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for the NSRL analysis plugin CLI arguments helper."""
+
+import argparse
+import os
+import unittest
+
+from plaso.analysis import nsrl
+from plaso.lib import errors
+from plaso.cli.helpers import nsrl_analysis
+
+from tests import test_lib as shared_test_lib
+from tests.cli import test_lib as cli_test_lib
+from tests.cli.helpers import test_lib
+
+
+class NsrlAnalysisArgumentsHelperTest(
+    test_lib.AnalysisPluginArgumentsHelperTest):
+  """Tests the NSRL analysis plugin CLI arguments helper."""
+
+  # pylint: disable=no-member,protected-access
+
+  _EXPECTED_OUTPUT = """\
+usage: cli_helper.py [--nsrl-hash HASH] [--nsrl-hash-set PATH]
+                     [--nsrl-label LABEL] [--nsrl-rds PATH]
+
+Test argument parser.
+
+optional arguments:
+  --nsrl-hash HASH, --nsrl_hash HASH
+                        Type of hash to look up in the NSRL hash set file, the
+                        default is: md5. Supported options: md5, sha1, sha256
+  --nsrl-hash-set PATH, --nsrl_hash_set PATH
+                        Path of the NSRL hash set file to look up hashes in.
+                        If the file does not exist it is built from the NSRL
+                        RDS files specified by --nsrl-rds.
+  --nsrl-label LABEL, --nsrl_label LABEL
+                        Label to apply to events, the default is:
+                        nsrl_present.
+  --nsrl-rds PATH, --nsrl_rds PATH
+                        Path of a NSRL Reference Data Set (RDS) file to build
+                        the NSRL hash set file from, such as NSRLFile.txt or a
+                        RDS version 3 SQLite database. This option can be used
+                        multiple times.
+"""
+
+  def testAddArguments(self):
+    """Tests the AddArguments function."""
+    argument_parser = argparse.ArgumentParser(
+        prog='cli_helper.py',
+        description='Test argument parser.', add_help=False,
+        formatter_class=cli_test_lib.SortedArgumentsHelpFormatter)
+
+    nsrl_analysis.NsrlAnalysisArgumentsHelper.AddArguments(argument_parser)
+
+    output = self._RunArgparseFormatHelp(argument_parser)
+    self.assertEqual(output, self._EXPECTED_OUTPUT)
+
+  def testParseOptions(self):
+    """Tests the ParseOptions function."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      rds_path = os.path.join(temp_directory, 'hashes.txt')
+      with open(rds_path, 'w', encoding='utf-8') as file_object:
+        file_object.write('ba4b1f9d0da5c8a35c1e8a76e7a9f3ad\n')
+
+      hash_set_path = os.path.join(temp_directory, 'nsrl_md5.hashset')
+
+      options = cli_test_lib.TestOptions()
+      options.nsrl_hash = 'md5'
+      options.nsrl_hash_set = hash_set_path
+      options.nsrl_label = 'NSRL'
+
+      analysis_plugin = nsrl.NsrlAnalysisPlugin()
+
+      with self.assertRaises(errors.BadConfigOption):
+        nsrl_analysis.NsrlAnalysisArgumentsHelper.ParseOptions(
+            options, analysis_plugin)
+
+      options.nsrl_rds = [rds_path]
+
+      nsrl_analysis.NsrlAnalysisArgumentsHelper.ParseOptions(
+          options, analysis_plugin)
+
+      self.assertTrue(os.path.exists(hash_set_path))
+      self.assertEqual(analysis_plugin._analyzer._hash_set_path, hash_set_path)
+      self.assertEqual(analysis_plugin._analyzer.lookup_hash, 'md5')
+      self.assertEqual(analysis_plugin._label, 'NSRL')
+
+      options.nsrl_hash = 'sha1'
+
+      with self.assertRaises(errors.BadConfigOption):
+        nsrl_analysis.NsrlAnalysisArgumentsHelper.ParseOptions(
+            options, analysis_plugin)
+
+    with self.assertRaises(errors.BadConfigObject):
+      nsrl_analysis.NsrlAnalysisArgumentsHelper.ParseOptions(options, None)
+
+
+if __name__ == '__main__':
+  unittest.main()
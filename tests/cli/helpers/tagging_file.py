@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for the tagging file CLI arguments helper."""
+
+import argparse
+import unittest
+
+from plaso.cli import tools
+from plaso.cli.helpers import tagging_file
+from plaso.lib import errors
+
+from tests.cli import test_lib as cli_test_lib
+
+
+class TaggingFileArgumentsHelperTest(cli_test_lib.CLIToolTestCase):
+  """Tests for the tagging file CLI arguments helper."""
+
+  # pylint: disable=no-member,protected-access
+
+  _EXPECTED_OUTPUT = """\
+usage: cli_helper.py [--tagging_file PATH]
+
+Test argument parser.
+
+optional arguments:
+  --tagging_file PATH, --tagging-file PATH
+                        Path to a file containing tagging rules, with which
+                        the events are tagged during extraction.
+"""
+
+  def testAddArguments(self):
+    """Tests the AddArguments function."""
+    argument_parser = argparse.ArgumentParser(
+        prog='cli_helper.py', description='Test argument parser.',
+        add_help=False,
+        formatter_class=cli_test_lib.SortedArgumentsHelpFormatter)
+
+    tagging_file.TaggingFileArgumentsHelper.AddArguments(argument_parser)
+
+    output = self._RunArgparseFormatHelp(argument_parser)
+    self.assertEqual(output, self._EXPECTED_OUTPUT)
+
+  def testParseOptions(self):
+    """Tests the ParseOptions function."""
+    test_file_path = self._GetTestFilePath(['tagging_file', 'valid.txt'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    invalid_syntax_path = self._GetTestFilePath([
+        'tagging_file', 'invalid_syntax.txt'])
+    self._SkipIfPathNotExists(invalid_syntax_path)
+
+    options = cli_test_lib.TestOptions()
+    options.tagging_file = test_file_path
+
+    test_tool = tools.CLITool()
+    tagging_file.TaggingFileArgumentsHelper.ParseOptions(options, test_tool)
+
+    self.assertEqual(test_tool._tagging_file_path, test_file_path)
+
+    with self.assertRaises(errors.BadConfigObject):
+      tagging_file.TaggingFileArgumentsHelper.ParseOptions(options, None)
+
+    options.tagging_file = '/tmp/non_existant'
+    with self.assertRaises(errors.BadConfigOption):
+      tagging_file.TaggingFileArgumentsHelper.ParseOptions(options, test_tool)
+
+    options.tagging_file = invalid_syntax_path
+    with self.assertRaises(errors.BadConfigOption):
+      tagging_file.TaggingFileArgumentsHelper.ParseOptions(options, test_tool)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -132,11 +132,15 @@ class Log2TimelineToolTest(test_lib.CLIToolTestCase):
     yara_rules_path = self._GetTestFilePath(['rules.yara'])
     self._SkipIfPathNotExists(yara_rules_path)
 
+    tagging_file_path = self._GetTestFilePath(['tagging_file', 'valid.txt'])
+    self._SkipIfPathNotExists(tagging_file_path)
+
     options = test_lib.TestOptions()
     options.artifact_definitions_path = test_artifacts_path
     options.source = test_file_path
     options.storage_file = 'storage.plaso'
     options.storage_format = definitions.STORAGE_FORMAT_SQLITE
+    options.tagging_file = tagging_file_path
     options.task_storage_format = definitions.STORAGE_FORMAT_SQLITE
     options.yara_rules_path = yara_rules_path
 
@@ -145,6 +149,13 @@ class Log2TimelineToolTest(test_lib.CLIToolTestCase):
     test_tool.ParseOptions(options)
 
     self.assertIsNotNone(test_tool._yara_rules_string)
+    self.assertEqual(test_tool._tagging_file_path, tagging_file_path)
+
+    # Tagging during extraction is not supported with a Redis task storage.
+    options.task_storage_format = definitions.STORAGE_FORMAT_REDIS
+
+    with self.assertRaises(errors.BadConfigOption):
+      test_tool.ParseOptions(options)
 
     options = test_lib.TestOptions()
     options.artifact_definitions_path = test_artifacts_path
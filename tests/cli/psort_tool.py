@@ -5,6 +5,7 @@
 import argparse
 import io
 import os
+import shutil
 import unittest
 
 try:
@@ -15,9 +16,11 @@ except ImportError:
 from plaso.cli import psort_tool
 from plaso.cli.helpers import interface as helpers_interface
 from plaso.cli.helpers import manager as helpers_manager
+from plaso.containers import sessions
 from plaso.lib import errors
 from plaso.output import dynamic
 from plaso.output import manager as output_manager
+from plaso.storage import factory as storage_factory
 
 from tests import test_lib as shared_test_lib
 from tests.cli import test_lib
@@ -195,6 +198,33 @@ optional arguments:
   # TODO: add test for _PrintStatusUpdate.
   # TODO: add test for _PrintStatusUpdateStream.
 
+  def testWriteTextIndex(self):
+    """Tests the _WriteTextIndex function."""
+    test_file_path = self._GetTestFilePath(['psort_test.plaso'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    output_writer = test_lib.TestOutputWriter(encoding='utf-8')
+    test_tool = psort_tool.PsortTool(output_writer=output_writer)
+
+    session = sessions.Session()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'storage.plaso')
+      shutil.copyfile(test_file_path, temp_file)
+
+      test_tool._storage_file_path = temp_file
+
+      # The test storage file has a format version that does not support
+      # a text index, hence the text index is not written.
+      test_tool._WriteTextIndex(session)
+
+      storage_reader = (
+          storage_factory.StorageFactory.CreateStorageReaderForFile(temp_file))
+      try:
+        self.assertFalse(storage_reader.HasTextIndexAttribute('message'))
+      finally:
+        storage_reader.Close()
+
   def testAddOutputTimeZoneOption(self):
     """Tests the AddOutputTimeZoneOption function."""
     argument_parser = argparse.ArgumentParser(
@@ -280,6 +310,37 @@ optional arguments:
     with self.assertRaises(errors.BadConfigOption):
       test_tool.ParseOptions(options)
 
+    options = test_lib.TestOptions()
+    options.output_format = 'null'
+    options.storage_file = self._GetTestFilePath(['psort_test.plaso'])
+    options.merge_storage_files = [
+        self._GetTestFilePath(['psort_test.plaso'])]
+
+    test_tool.ParseOptions(options)
+
+    options.merge_storage_files = [self._GetTestFilePath(['bogus.plaso'])]
+
+    with self.assertRaises(errors.BadConfigOption):
+      test_tool.ParseOptions(options)
+
+    options.incremental = True
+    options.merge_storage_files = [
+        self._GetTestFilePath(['psort_test.plaso'])]
+
+    with self.assertRaises(errors.BadConfigOption):
+      test_tool.ParseOptions(options)
+
+    options = test_lib.TestOptions()
+    options.output_format = 'null'
+    options.storage_file = self._GetTestFilePath(['psort_test.plaso'])
+    options.text_index_attributes = 'filename, username'
+
+    test_tool.ParseOptions(options)
+
+    self.assertTrue(test_tool._text_index)
+    self.assertEqual(
+        test_tool._text_index_attribute_names, ['filename', 'username'])
+
     # TODO: improve test coverage.
 
   def testProcessStorageWithMissingParameters(self):
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for the export attribute containers."""
+
+import unittest
+
+from plaso.containers import exports
+
+from tests import test_lib as shared_test_lib
+
+
+class ExportWatermarkTest(shared_test_lib.BaseTestCase):
+  """Tests for the export watermark attribute container."""
+
+  def testGetAttributeNames(self):
+    """Tests the GetAttributeNames function."""
+    attribute_container = exports.ExportWatermark()
+
+    expected_attribute_names = [
+        'event_row_identifier',
+        'output_format',
+        'timestamp']
+
+    attribute_names = sorted(attribute_container.GetAttributeNames())
+
+    self.assertEqual(attribute_names, expected_attribute_names)
+
+
+if __name__ == '__main__':
+  unittest.main()
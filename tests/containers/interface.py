@@ -146,6 +146,14 @@ class AttributeContainerTest(shared_test_lib.BaseTestCase):
 
     self.assertIsNotNone(identifier)
 
+  def testGetSerializedData(self):
+    """Tests the GetSerializedData function."""
+    attribute_container = interface.AttributeContainer()
+
+    serialized_data = attribute_container.GetSerializedData()
+
+    self.assertIsNone(serialized_data)
+
   def testGetSessionIdentifier(self):
     """Tests the GetSessionIdentifier function."""
     attribute_container = interface.AttributeContainer()
@@ -160,6 +168,15 @@ class AttributeContainerTest(shared_test_lib.BaseTestCase):
 
     attribute_container.SetIdentifier(None)
 
+  def testSetSerializedData(self):
+    """Tests the SetSerializedData function."""
+    attribute_container = interface.AttributeContainer()
+
+    attribute_container.SetSerializedData('{}')
+
+    serialized_data = attribute_container.GetSerializedData()
+    self.assertEqual(serialized_data, '{}')
+
   def testSetSessionIdentifier(self):
     """Tests the SetSessionIdentifier function."""
     attribute_container = interface.AttributeContainer()
@@ -2,9 +2,12 @@
 # -*- coding: utf-8 -*-
 """Tests for the tagging file."""
 
+import os
 import unittest
 
+from plaso.containers import events
 from plaso.engine import tagging_file
+from plaso.filters import compiled_cache
 from plaso.lib import errors
 
 from tests import test_lib as shared_test_lib
@@ -13,6 +16,50 @@ from tests import test_lib as shared_test_lib
 class TaggingFileTestCase(shared_test_lib.BaseTestCase):
   """Tests for the tagging file."""
 
+  def testGetEventTaggingRuleIndex(self):
+    """Tests the GetEventTaggingRuleIndex function."""
+    test_file_path = self._GetTestFilePath(['tagging_file', 'valid.txt'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    tag_file = tagging_file.TaggingFile(test_file_path)
+
+    tagging_rule_index = tag_file.GetEventTaggingRuleIndex()
+    self.assertEqual(tagging_rule_index.number_of_rules, 6)
+
+  def testGetEventTaggingRuleIndexWithCache(self):
+    """Tests the GetEventTaggingRuleIndex function with a filter cache."""
+    test_file_path = self._GetTestFilePath(['tagging_file', 'valid.txt'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      filter_cache = compiled_cache.CompiledFilterCache(temp_directory)
+
+      tag_file = tagging_file.TaggingFile(test_file_path, cache=filter_cache)
+
+      tagging_rule_index = tag_file.GetEventTaggingRuleIndex()
+      self.assertEqual(tagging_rule_index.number_of_rules, 6)
+
+      self.assertEqual(len(os.listdir(temp_directory)), 1)
+
+      with open(test_file_path, 'rb') as file_object:
+        data = file_object.read()
+
+      cached_tagging_rule_index = filter_cache.GetCompiledObject(
+          'tagging_rule_index', data)
+      self.assertIsNotNone(cached_tagging_rule_index)
+
+      tag_file = tagging_file.TaggingFile(test_file_path, cache=filter_cache)
+
+      tagging_rule_index = tag_file.GetEventTaggingRuleIndex()
+      self.assertEqual(tagging_rule_index.number_of_rules, 6)
+
+    event = events.EventObject()
+    event_data = events.EventData(data_type='windows:prefetch')
+
+    labels = tagging_rule_index.GetMatchingLabels(
+        event, event_data, None, None)
+    self.assertEqual(labels, ['application_execution'])
+
   def testGetEventTaggingRules(self):
     """Tests the GetEventTaggingRules function."""
     test_file_path = self._GetTestFilePath(['tagging_file', 'valid.txt'])
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for the persistent cache of compiled filters."""
+
+import os
+import unittest
+
+from plaso.filters import compiled_cache
+
+from tests import test_lib as shared_test_lib
+from tests.filters import test_lib
+
+
+class CompiledFilterCacheTest(test_lib.FilterTestCase):
+  """Tests for the persistent cache of compiled filters."""
+
+  # pylint: disable=protected-access
+
+  def testGetCacheFilePath(self):
+    """Tests the _GetCacheFilePath function."""
+    test_cache = compiled_cache.CompiledFilterCache('cache')
+
+    path = test_cache._GetCacheFilePath('event_filter', 'filename is "a"')
+    self.assertTrue(path.startswith(os.path.join('cache', 'event_filter-')))
+    self.assertTrue(path.endswith('.pickle'))
+
+    self.assertEqual(
+        test_cache._GetCacheFilePath('event_filter', b'filename is "a"'), path)
+
+    self.assertNotEqual(
+        test_cache._GetCacheFilePath('event_filter', 'filename is "b"'), path)
+
+    other_path = test_cache._GetCacheFilePath(
+        'tagging_rule_index', 'filename is "a"')
+    self.assertNotEqual(
+        os.path.basename(other_path).split('-')[-1],
+        os.path.basename(path).split('-')[-1])
+
+  def testGetAndStoreCompiledObject(self):
+    """Tests the GetCompiledObject and StoreCompiledObject functions."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      cache_path = os.path.join(temp_directory, 'cache')
+      test_cache = compiled_cache.CompiledFilterCache(cache_path)
+
+      compiled_object = test_cache.GetCompiledObject('test', 'source')
+      self.assertIsNone(compiled_object)
+
+      test_cache.StoreCompiledObject('test', 'source', {'compiled': [1, 2]})
+
+      self.assertEqual(len(os.listdir(cache_path)), 1)
+
+      test_cache = compiled_cache.CompiledFilterCache(cache_path)
+
+      compiled_object = test_cache.GetCompiledObject('test', 'source')
+      self.assertEqual(compiled_object, {'compiled': [1, 2]})
+
+      compiled_object = test_cache.GetCompiledObject('test', 'other source')
+      self.assertIsNone(compiled_object)
+
+      # A corrupt cache file is ignored.
+      path = test_cache._GetCacheFilePath('test', 'source')
+      with open(path, 'wb') as file_object:
+        file_object.write(b'corrupt')
+
+      compiled_object = test_cache.GetCompiledObject('test', 'source')
+      self.assertIsNone(compiled_object)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -2,12 +2,15 @@
 # -*- coding: utf-8 -*-
 """Tests for the event object filter."""
 
+import os
 import unittest
 
 from plaso.containers import events
+from plaso.filters import compiled_cache
 from plaso.filters import event_filter
 from plaso.lib import errors
 
+from tests import test_lib as shared_test_lib
 from tests.filters import test_lib
 
 
@@ -43,6 +46,41 @@ class EventObjectFilterTest(test_lib.FilterTestCase):
       test_filter.CompileFilter(
           'some_stuff is "random" and other_stuff ')
 
+  def testCompilerFilterWithCache(self):
+    """Tests the CompileFilter function with a filter cache."""
+    event = events.EventObject()
+    event_data = events.EventData(data_type='test:event')
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      filter_cache = compiled_cache.CompiledFilterCache(temp_directory)
+
+      test_filter = event_filter.EventObjectFilter()
+      test_filter.CompileFilter(
+          'data_type is "test:event"', cache=filter_cache)
+
+      self.assertEqual(len(os.listdir(temp_directory)), 1)
+
+      test_filter = event_filter.EventObjectFilter()
+      test_filter.CompileFilter(
+          'data_type is "test:event"', cache=filter_cache)
+
+      self.assertEqual(len(os.listdir(temp_directory)), 1)
+
+      result = test_filter.Match(event, event_data, None, None)
+      self.assertTrue(result)
+
+      test_filter.CompileFilter(
+          'data_type is "other:event"', cache=filter_cache)
+
+      self.assertEqual(len(os.listdir(temp_directory)), 2)
+
+      result = test_filter.Match(event, event_data, None, None)
+      self.assertFalse(result)
+
+      with self.assertRaises(errors.ParseError):
+        test_filter.CompileFilter(
+            'some_stuff is "random" and other_stuff ', cache=filter_cache)
+
   def testMatch(self):
     """Tests the Match function."""
     test_filter = event_filter.EventObjectFilter()
@@ -68,6 +106,54 @@ class EventObjectFilterTest(test_lib.FilterTestCase):
     result = test_filter.Match(None, event_data, None, None)
     self.assertFalse(result)
 
+  def testMatchBatch(self):
+    """Tests the MatchBatch function."""
+    test_filter = event_filter.EventObjectFilter()
+    test_filter.CompileFilter(
+        'filename contains PATH("etc/issue") or filename regexp "^/tmp/"')
+
+    batch = []
+    for filename in ('/usr/local/etc/issue', '/etc/issue.net', '/tmp/issue'):
+      event_data = events.EventData()
+      event_data.filename = filename
+      batch.append((None, event_data, None, None))
+
+    results = test_filter.MatchBatch(batch)
+    self.assertEqual(results, [True, False, True])
+
+    results = [test_filter.Match(*event_values) for event_values in batch]
+    self.assertEqual(results, [True, False, True])
+
+    test_filter = event_filter.EventObjectFilter()
+
+    results = test_filter.MatchBatch(batch)
+    self.assertEqual(results, [True, True, True])
+
+  def testPlanStorageFilter(self):
+    """Tests the PlanStorageFilter function."""
+    test_filter = event_filter.EventObjectFilter()
+    test_filter.CompileFilter(
+        'data_type is "fs:stat" and filename contains PATH("etc/issue")')
+
+    storage_filter, remaining_filter = test_filter.PlanStorageFilter()
+    self.assertIsNotNone(storage_filter)
+    self.assertEqual(storage_filter.data_types, set(['fs:stat']))
+    self.assertIsNotNone(remaining_filter)
+    self.assertIsNot(remaining_filter, test_filter)
+
+    event_data = events.EventData(data_type='text:entry')
+    event_data.filename = '/usr/local/etc/issue'
+
+    result = remaining_filter.Match(None, event_data, None, None)
+    self.assertTrue(result)
+
+    test_filter = event_filter.EventObjectFilter()
+    test_filter.CompileFilter('filename contains PATH("etc/issue")')
+
+    storage_filter, remaining_filter = test_filter.PlanStorageFilter()
+    self.assertIsNone(storage_filter)
+    self.assertIs(remaining_filter, test_filter)
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -107,6 +107,27 @@ class AndFilterTest(shared_test_lib.BaseTestCase):
     result = filter_object.Matches(event, event_data, None, None)
     self.assertFalse(result)
 
+  def testMatchesBatch(self):
+    """Tests the MatchesBatch function."""
+    batch = []
+    for test_value in (1, 2, 3):
+      event_data = events.EventData(data_type='test:event')
+      event_data.test_value = test_value
+      batch.append((None, event_data, None, None))
+
+    filter_object = filters.AndFilter(arguments=[
+        filters.GreaterThanOperator(arguments=['test_value', 1]),
+        filters.LessThanOperator(arguments=['test_value', 3])])
+
+    results = filter_object.MatchesBatch(batch)
+    self.assertEqual(results, [False, True, False])
+
+    filter_object = filters.AndFilter(arguments=[
+        FalseFilter(), TrueFilter()])
+
+    results = filter_object.MatchesBatch(batch)
+    self.assertEqual(results, [False, False, False])
+
 
 class OrFilterTest(shared_test_lib.BaseTestCase):
   """Tests the boolean OR filter."""
@@ -137,6 +158,26 @@ class OrFilterTest(shared_test_lib.BaseTestCase):
     result = filter_object.Matches(event, event_data, None, None)
     self.assertFalse(result)
 
+  def testMatchesBatch(self):
+    """Tests the MatchesBatch function."""
+    batch = []
+    for test_value in (1, 2, 3):
+      event_data = events.EventData(data_type='test:event')
+      event_data.test_value = test_value
+      batch.append((None, event_data, None, None))
+
+    filter_object = filters.OrFilter(arguments=[
+        filters.EqualsOperator(arguments=['test_value', 1]),
+        filters.EqualsOperator(arguments=['test_value', 3])])
+
+    results = filter_object.MatchesBatch(batch)
+    self.assertEqual(results, [True, False, True])
+
+    filter_object = filters.OrFilter()
+
+    results = filter_object.MatchesBatch(batch)
+    self.assertEqual(results, [True, True, True])
+
 
 class IdentityFilterTest(shared_test_lib.BaseTestCase):
   """Tests the filter which always evaluates to True."""
@@ -206,6 +247,37 @@ class GenericBinaryOperatorTest(shared_test_lib.BaseTestCase):
         'tag', event, event_data, None, event_tag)
     self.assertEqual(test_value, ['browser_search'])
 
+  def testGetValues(self):
+    """Tests the _GetValues function."""
+    event, event_data, _ = containers_test_lib.CreateEventFromValues(
+        self._TEST_EVENTS[0])
+
+    filter_object = filters.GenericBinaryOperator(arguments=['test_value', 1])
+
+    test_values = filter_object._GetValues('test_value', [
+        (event, event_data, None, None),
+        (event, events.EventData(), None, None)])
+    self.assertEqual(test_values, [1, None])
+
+  def testMatchesBatch(self):
+    """Tests the MatchesBatch function."""
+    batch = []
+    for test_value in (1, 2, None):
+      event_data = events.EventData(data_type='test:event')
+      event_data.test_value = test_value
+      batch.append((None, event_data, None, None))
+
+    filter_object = filters.EqualsOperator(arguments=['test_value', 2])
+
+    results = filter_object.MatchesBatch(batch)
+    self.assertEqual(results, [False, True, False])
+
+    # An attribute without a value matches a negated comparison.
+    filter_object.FlipBool()
+
+    results = filter_object.MatchesBatch(batch)
+    self.assertEqual(results, [True, False, True])
+
   # TODO: add tests for FlipBool function
 
 
@@ -317,9 +389,37 @@ class GreaterEqualOperatorTest(shared_test_lib.BaseTestCase):
     self.assertTrue(result)
 
 
-# TODO: add tests for Contains
+class ContainsTest(shared_test_lib.BaseTestCase):
+  """Tests the contains operator."""
+
+  # pylint: disable=protected-access
+
+  def testCompareValues(self):
+    """Tests the _CompareValues function."""
+    filter_object = filters.Contains(arguments=['first', 'Second'])
+
+    results = filter_object._CompareValues(
+        ['first SECOND', 'third', ['Second'], 5], 'Second')
+    self.assertEqual(results, [True, False, True, False])
+
+
 # TODO: add tests for InSet
-# TODO: add tests for Regexp
+
+
+class RegexpTest(shared_test_lib.BaseTestCase):
+  """Tests the regular expression operator."""
+
+  # pylint: disable=protected-access
+
+  def testCompareValues(self):
+    """Tests the _CompareValues function."""
+    filter_object = filters.Regexp(arguments=['first', 'se[c]ond'])
+
+    results = filter_object._CompareValues(
+        ['first second', 'SECOND', b'second', 5], 'se[c]ond')
+    self.assertEqual(results, [True, False, True, False])
+
+
 # TODO: add tests for RegexpInsensitive
 
 
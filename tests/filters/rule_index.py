@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for the event filter rule index."""
+
+import unittest
+
+from plaso.containers import events
+from plaso.filters import event_filter
+from plaso.filters import rule_index
+
+from tests.filters import test_lib
+
+
+class EventFilterRuleIndexTest(test_lib.FilterTestCase):
+  """Tests for the event filter rule index."""
+
+  # pylint: disable=protected-access
+
+  def _CreateFilter(self, filter_expression):
+    """Creates an event filter.
+
+    Args:
+      filter_expression (str): filter expression.
+
+    Returns:
+      EventObjectFilter: event filter.
+    """
+    filter_object = event_filter.EventObjectFilter()
+    filter_object.CompileFilter(filter_expression)
+    return filter_object
+
+  def testAddRule(self):
+    """Tests the AddRule function."""
+    test_index = rule_index.EventFilterRuleIndex()
+
+    test_index.AddRule('test1', self._CreateFilter(
+        'data_type is "fs:stat" and filename contains "etc"'))
+    test_index.AddRule('test1', self._CreateFilter(
+        '(data_type is "syslog:line" or data_type is "syslog:cron:task_run") '
+        'and reporter is not "cron"'))
+    test_index.AddRule('test2', self._CreateFilter(
+        'parser is "filestat" and inode == 12'))
+    test_index.AddRule('test3', self._CreateFilter(
+        'body contains "error" or reporter is "kernel"'))
+
+    self.assertEqual(test_index.number_of_rules, 4)
+    self.assertEqual(test_index._label_names, ['test1', 'test2', 'test3'])
+
+    self.assertEqual(
+        sorted(test_index._rules_per_data_type.keys()),
+        ['fs:stat', 'syslog:cron:task_run', 'syslog:line'])
+    self.assertEqual(len(test_index._rules_per_parser), 1)
+    self.assertEqual(len(test_index._unguarded_rules), 1)
+
+    rule = test_index._rules_per_data_type['fs:stat'][0]
+    self.assertEqual(rule.attribute_names, frozenset(['filename']))
+    self.assertEqual(rule.data_types, frozenset(['fs:stat']))
+    self.assertIsNone(rule.parsers)
+
+    # A negated comparison does not require the attribute to have a value.
+    rule = test_index._rules_per_data_type['syslog:line'][0]
+    self.assertEqual(rule.attribute_names, frozenset())
+
+    rule = test_index._rules_per_parser['filestat'][0]
+    self.assertEqual(rule.attribute_names, frozenset(['inode']))
+    self.assertIsNone(rule.data_types)
+    self.assertEqual(rule.parsers, frozenset(['filestat']))
+
+    rule = test_index._unguarded_rules[0]
+    self.assertEqual(rule.attribute_names, frozenset())
+
+  def testGetMatchingLabels(self):
+    """Tests the GetMatchingLabels function."""
+    test_index = rule_index.EventFilterRuleIndex()
+
+    test_index.AddRule('file', self._CreateFilter(
+        'data_type is "fs:stat" and filename contains "etc"'))
+    test_index.AddRule('file', self._CreateFilter(
+        'parser is "filestat" and inode == 12'))
+    test_index.AddRule('syslog', self._CreateFilter(
+        'data_type is "syslog:line" and reporter is "kernel"'))
+    test_index.AddRule('message', self._CreateFilter(
+        'body contains "error"'))
+    test_index.AddRule('unknown', self._CreateFilter(
+        'data_type is not "fs:stat"'))
+
+    event = events.EventObject()
+
+    event_data = events.EventData(data_type='fs:stat')
+    event_data.filename = '/etc/issue'
+    event_data.parser = 'filestat'
+
+    labels = test_index.GetMatchingLabels(event, event_data, None, None)
+    self.assertEqual(labels, ['file'])
+
+    event_data.filename = '/usr/bin/ls'
+
+    labels = test_index.GetMatchingLabels(event, event_data, None, None)
+    self.assertEqual(labels, [])
+
+    event_data.inode = 12
+
+    labels = test_index.GetMatchingLabels(event, event_data, None, None)
+    self.assertEqual(labels, ['file'])
+
+    event_data = events.EventData(data_type='syslog:line')
+    event_data.body = 'error reading sector'
+    event_data.reporter = 'kernel'
+
+    labels = test_index.GetMatchingLabels(event, event_data, None, None)
+    self.assertEqual(labels, ['syslog', 'message', 'unknown'])
+
+    event_data.reporter = 'cron'
+
+    labels = test_index.GetMatchingLabels(event, event_data, None, None)
+    self.assertEqual(labels, ['message', 'unknown'])
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for the filters that share predicates."""
+
+import unittest
+
+from plaso.containers import events
+from plaso.filters import filters
+from plaso.filters import shared_filters
+
+from tests.filters import test_lib
+
+
+class SharedPredicateCacheTest(test_lib.FilterTestCase):
+  """Tests for the shared predicate cache."""
+
+  def testGetResults(self):
+    """Tests the GetResults function."""
+    test_cache = shared_filters.SharedPredicateCache()
+
+    event = events.EventObject()
+    event_data = events.EventData()
+
+    results = test_cache.GetResults(event, event_data, None, None)
+    self.assertEqual(results, {})
+
+    results[0] = True
+
+    results = test_cache.GetResults(event, event_data, None, None)
+    self.assertEqual(results, {0: True})
+
+    results = test_cache.GetResults(event, events.EventData(), None, None)
+    self.assertEqual(results, {})
+
+    results[0] = True
+    test_cache.Clear()
+
+    results = test_cache.GetResults(event, event_data, None, None)
+    self.assertEqual(results, {})
+
+
+class SharedPredicateTest(test_lib.FilterTestCase):
+  """Tests for the shared predicate."""
+
+  def testMatches(self):
+    """Tests the Matches function."""
+    test_cache = shared_filters.SharedPredicateCache()
+
+    predicate = filters.EqualsOperator(arguments=['reporter', 'kernel'])
+    test_predicate = shared_filters.SharedPredicate(predicate, 0, test_cache)
+
+    event_data = events.EventData()
+    event_data.reporter = 'kernel'
+
+    result = test_predicate.Matches(None, event_data, None, None)
+    self.assertTrue(result)
+
+    # The result is cached for the event.
+    predicate.right_operand = 'cron'
+
+    result = test_predicate.Matches(None, event_data, None, None)
+    self.assertTrue(result)
+
+    event_data = events.EventData()
+    event_data.reporter = 'kernel'
+
+    result = test_predicate.Matches(None, event_data, None, None)
+    self.assertFalse(result)
+
+
+class SharedFilterCompilerTest(test_lib.FilterTestCase):
+  """Tests for the shared filter compiler."""
+
+  # pylint: disable=protected-access
+
+  def testCompileFilter(self):
+    """Tests the CompileFilter function."""
+    test_compiler = shared_filters.SharedFilterCompiler()
+
+    filter_object1 = test_compiler.CompileFilter(
+        'data_type is "syslog:line" and reporter is "kernel"')
+    self.assertEqual(test_compiler.number_of_predicates, 3)
+
+    filter_object2 = test_compiler.CompileFilter(
+        'data_type is "syslog:line" and body contains "segfault"')
+    self.assertEqual(test_compiler.number_of_predicates, 5)
+
+    filter_object3 = test_compiler.CompileFilter(
+        'data_type is "syslog:line" and reporter is "kernel"')
+    self.assertEqual(test_compiler.number_of_predicates, 5)
+    self.assertIs(filter_object3._event_filter, filter_object1._event_filter)
+
+    filter_object4 = test_compiler.CompileFilter(
+        'data_type is not "syslog:line"')
+    self.assertEqual(test_compiler.number_of_predicates, 6)
+
+    event_data = events.EventData(data_type='syslog:line')
+    event_data.body = 'segfault at 0'
+    event_data.reporter = 'kernel'
+
+    self.assertTrue(filter_object1.Match(None, event_data, None, None))
+    self.assertTrue(filter_object2.Match(None, event_data, None, None))
+    self.assertFalse(filter_object4.Match(None, event_data, None, None))
+
+    event_data = events.EventData(data_type='fs:stat')
+
+    self.assertFalse(filter_object1.Match(None, event_data, None, None))
+    self.assertFalse(filter_object2.Match(None, event_data, None, None))
+    self.assertTrue(filter_object4.Match(None, event_data, None, None))
+
+
+if __name__ == '__main__':
+  unittest.main()
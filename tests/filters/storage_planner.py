@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for the storage filter planner."""
+
+import unittest
+
+from plaso.filters import expression_parser
+from plaso.filters import filters
+from plaso.filters import storage_planner
+
+from tests.filters import test_lib
+
+
+class StorageFilterPlannerTest(test_lib.FilterTestCase):
+  """Tests for the storage filter planner."""
+
+  def _CompileFilter(self, filter_expression):
+    """Compiles a filter expression.
+
+    Args:
+      filter_expression (str): filter expression.
+
+    Returns:
+      Filter: compiled filter.
+    """
+    parser = expression_parser.EventFilterExpressionParser()
+    expression = parser.Parse(filter_expression)
+    return expression.Compile()
+
+  def testPlan(self):
+    """Tests the Plan function."""
+    planner = storage_planner.StorageFilterPlanner()
+
+    filter_object = self._CompileFilter(
+        'timestamp >= DATETIME(1608735600000000) and '
+        'timestamp < DATETIME("2020-12-24T15:00:00") and '
+        'data_type is "fs:stat" and parser is "filestat" and '
+        'tag contains "Malware"')
+
+    storage_filter, remaining_filter = planner.Plan(filter_object)
+    self.assertIsNotNone(storage_filter)
+    self.assertIsNone(remaining_filter)
+    self.assertEqual(storage_filter.data_types, set(['fs:stat']))
+    self.assertEqual(storage_filter.end_timestamp, 1608821999999999)
+    self.assertEqual(storage_filter.labels, set(['Malware']))
+    self.assertEqual(storage_filter.parsers, set(['filestat']))
+    self.assertEqual(storage_filter.start_timestamp, 1608735600000000)
+
+    filter_object = self._CompileFilter(
+        'data_type is "fs:stat" and filename contains "etc"')
+
+    storage_filter, remaining_filter = planner.Plan(filter_object)
+    self.assertIsNotNone(storage_filter)
+    self.assertEqual(storage_filter.data_types, set(['fs:stat']))
+    self.assertEqual(storage_filter.text_terms, {'filename': set(['etc'])})
+    self.assertIsInstance(remaining_filter, filters.Contains)
+
+    # Message conditions are only evaluated by the storage, if it has a text
+    # index that contains the formatted messages.
+    filter_object = self._CompileFilter(
+        'message contains "segfault" and body contains "kernel"')
+
+    storage_filter, remaining_filter = planner.Plan(filter_object)
+    self.assertIsNotNone(storage_filter)
+    self.assertEqual(storage_filter.message_terms, set(['segfault']))
+    self.assertEqual(storage_filter.text_terms, {'body': set(['kernel'])})
+    self.assertIsInstance(remaining_filter, filters.Contains)
+    self.assertEqual(remaining_filter.left_operand, 'body')
+
+    storage_filter, remaining_filter = planner.Plan(
+        filter_object, message_text_index=False)
+    self.assertIsNotNone(storage_filter)
+    self.assertIsNone(storage_filter.message_terms)
+    self.assertEqual(storage_filter.text_terms, {'body': set(['kernel'])})
+    self.assertIsInstance(remaining_filter, filters.AndFilter)
+    self.assertEqual(len(remaining_filter.args), 2)
+
+    filter_object = self._CompileFilter(
+        'data_type is "fs:stat" and filename contains "etc" and '
+        'inode is 12')
+
+    storage_filter, remaining_filter = planner.Plan(filter_object)
+    self.assertIsNotNone(storage_filter)
+    self.assertIsInstance(remaining_filter, filters.AndFilter)
+    self.assertEqual(len(remaining_filter.args), 2)
+
+    # Disjunctions and negations cannot be evaluated by the storage.
+    filter_object = self._CompileFilter(
+        'data_type is "fs:stat" or parser is "filestat"')
+
+    storage_filter, remaining_filter = planner.Plan(filter_object)
+    self.assertIsNone(storage_filter)
+    self.assertIs(remaining_filter, filter_object)
+
+    filter_object = self._CompileFilter('data_type is not "fs:stat"')
+
+    storage_filter, remaining_filter = planner.Plan(filter_object)
+    self.assertIsNone(storage_filter)
+    self.assertIs(remaining_filter, filter_object)
+
+    filter_object = self._CompileFilter('data_type contains "fs"')
+
+    storage_filter, remaining_filter = planner.Plan(filter_object)
+    self.assertIsNone(storage_filter)
+    self.assertIs(remaining_filter, filter_object)
+
+    filter_object = self._CompileFilter('message not contains "segfault"')
+
+    storage_filter, remaining_filter = planner.Plan(filter_object)
+    self.assertIsNone(storage_filter)
+    self.assertIs(remaining_filter, filter_object)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -59,6 +59,33 @@ class FlagsEventFormatterHelperTest(test_lib.EventFormatterTestCase):
     event_formatter_helper.FormatEventValues(event_values)
 
 
+class MessageTemplateTest(test_lib.EventFormatterTestCase):
+  """Tests for the message template."""
+
+  def testFormat(self):
+    """Tests the Format function."""
+    message_template = interface.MessageTemplate(
+        'Text: {text} Value: 0x{value:02x} Quoted: {text!r} {{literal}}')
+    self.assertIsNotNone(message_template._segments)
+
+    event_values = {'text': 'a message', 'value': 12}
+    message = message_template.Format(event_values)
+    self.assertEqual(
+        message, 'Text: a message Value: 0x0c Quoted: \'a message\' {literal}')
+
+    with self.assertRaises(KeyError):
+      message_template.Format({'text': 'a message'})
+
+    # Test a format string that cannot be represented by segments.
+    message_template = interface.MessageTemplate(
+        'Value: {value:{width}d} Index: {values[0]}')
+    self.assertIsNone(message_template._segments)
+
+    event_values = {'value': 12, 'values': [5], 'width': 4}
+    message = message_template.Format(event_values)
+    self.assertEqual(message, 'Value:   12 Index: 5')
+
+
 class EventFormatterTest(test_lib.EventFormatterTestCase):
   """Tests for the event formatter."""
 
@@ -176,6 +203,28 @@ class ConditionalEventFormatterTest(test_lib.EventFormatterTestCase):
         'Description: this is beyond words Comment Value: 0x0c '
         'Text: but we\'re still trying to say something about the event')
     self.assertEqual(message, expected_message)
+    self.assertEqual(len(event_formatter._message_templates), 1)
+
+    # Test that a cached message template is not used for another combination
+    # of attribute values.
+    event_values['optional'] = 'maybe'
+    message = event_formatter.GetMessage(event_values)
+
+    expected_message = (
+        'Description: this is beyond words Comment Value: 0x0c '
+        'Optional: maybe '
+        'Text: but we\'re still trying to say something about the event')
+    self.assertEqual(message, expected_message)
+    self.assertEqual(len(event_formatter._message_templates), 2)
+
+    del event_values['optional']
+    message = event_formatter.GetMessage(event_values)
+
+    expected_message = (
+        'Description: this is beyond words Comment Value: 0x0c '
+        'Text: but we\'re still trying to say something about the event')
+    self.assertEqual(message, expected_message)
+    self.assertEqual(len(event_formatter._message_templates), 2)
 
   def testGetMessageShort(self):
     """Tests the GetMessageShort function."""
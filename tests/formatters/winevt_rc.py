@@ -30,6 +30,18 @@ class WinevtResourcesSqlite3DatabaseReaderTest(shared_test_lib.BaseTestCase):
     message_string = database_reader.GetMessage(
         'Microsoft-Windows-Dhcp-Client', 0x00000409, 0xb00003ed)
     self.assertEqual(message_string, expected_message_string)
+    self.assertEqual(database_reader.message_string_cache_hits, 0)
+    self.assertEqual(database_reader.message_string_cache_misses, 1)
+
+    message_string = database_reader.GetMessage(
+        'Microsoft-Windows-Dhcp-Client', 0x00000409, 0xb00003ed)
+    self.assertEqual(message_string, expected_message_string)
+    self.assertEqual(database_reader.message_string_cache_hits, 1)
+    self.assertEqual(database_reader.message_string_cache_misses, 1)
+
+    message_string = database_reader.GetMessage(
+        'Bogus-Log-Source', 0x00000409, 0xb00003ed)
+    self.assertIsNone(message_string)
 
     database_reader.Close()
 
@@ -9,8 +9,10 @@ from plaso.containers import sessions
 from plaso.engine import configurations
 from plaso.engine import plaso_queue
 from plaso.engine import zeromq_queue
+from plaso.lib import definitions
 from plaso.multi_processing import analysis_process
 
+from tests.containers import test_lib as containers_test_lib
 from tests.multi_processing import test_lib
 
 
@@ -46,6 +48,40 @@ class TestAnalysisPlugin(analysis_interface.AnalysisPlugin):
     return
 
 
+class AnalysisEventBatchTest(test_lib.MultiProcessingTestCase):
+  """Tests the analysis event batch."""
+
+  _TEST_EVENTS = [
+      {'data_type': 'test:event',
+       'timestamp': 5134324321,
+       'timestamp_desc': definitions.TIME_DESCRIPTION_CHANGE},
+      {'data_type': 'test:event',
+       'filename': '/dev/none',
+       'timestamp': 2345871286,
+       'timestamp_desc': definitions.TIME_DESCRIPTION_CHANGE}]
+
+  def testGetAndSetEvents(self):
+    """Tests the GetEvents and SetEvents functions."""
+    event_batch = analysis_process.AnalysisEventBatch()
+    self.assertEqual(event_batch.number_of_events, 0)
+    self.assertEqual(event_batch.GetEvents(), [])
+
+    test_events = []
+    for event, event_data, event_data_stream in (
+        containers_test_lib.CreateEventsFromValues(self._TEST_EVENTS)):
+      test_events.append((event, event_data, event_data_stream))
+
+    event_batch.SetEvents(test_events)
+    self.assertEqual(event_batch.number_of_events, 2)
+
+    events = event_batch.GetEvents()
+    self.assertEqual(len(events), 2)
+
+    event, event_data, _ = events[1]
+    self.assertEqual(event.timestamp, 2345871286)
+    self.assertEqual(event_data.filename, '/dev/none')
+
+
 class AnalysisProcessTest(test_lib.MultiProcessingTestCase):
   """Tests the multi-processing analysis process."""
 
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for the inline analysis plugin runner."""
+
+import unittest
+
+from plaso.analysis import tagging
+from plaso.containers import sessions
+from plaso.engine import knowledge_base
+from plaso.lib import definitions
+from plaso.multi_processing import inline_analysis
+from plaso.storage.fake import writer as fake_writer
+
+from tests.containers import test_lib as containers_test_lib
+from tests.multi_processing import test_lib
+
+
+class InlineAnalysisPluginRunnerTest(test_lib.MultiProcessingTestCase):
+  """Tests the inline analysis plugin runner."""
+
+  # pylint: disable=protected-access
+
+  _TEST_EVENTS = [
+      {'data_type': 'test:event',
+       'timestamp': 5134324321,
+       'timestamp_desc': definitions.TIME_DESCRIPTION_CHANGE},
+      {'data_type': 'test:event',
+       'filename': '/dev/none',
+       'timestamp': 2345871286,
+       'timestamp_desc': definitions.TIME_DESCRIPTION_CHANGE}]
+
+  def testProcessEventAndStop(self):
+    """Tests the Start, ProcessEvent and Stop functions."""
+    test_tagging_file_path = self._GetTestFilePath([
+        'tagging_file', 'valid.txt'])
+    self._SkipIfPathNotExists(test_tagging_file_path)
+
+    analysis_plugin = tagging.TaggingAnalysisPlugin()
+    analysis_plugin.SetAndLoadTagFile(test_tagging_file_path)
+
+    session = sessions.Session()
+    storage_writer = fake_writer.FakeStorageWriter(session)
+    storage_writer.Open()
+
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+
+    test_runner = inline_analysis.InlineAnalysisPluginRunner(
+        storage_writer, knowledge_base_object, analysis_plugin)
+    test_runner.Start()
+
+    produced_event_tags = []
+    for event, event_data, event_data_stream in (
+        containers_test_lib.CreateEventsFromValues(self._TEST_EVENTS)):
+      storage_writer.AddEventData(event_data)
+      event.SetEventDataIdentifier(event_data.GetIdentifier())
+      storage_writer.AddEvent(event)
+
+      produced_event_tags.extend(test_runner.ProcessEvent(
+          event, event_data, event_data_stream))
+
+    self.assertEqual(test_runner.number_of_consumed_events, 2)
+
+    task_storage_writer = storage_writer._task_storage_writers['tagging']
+    self.assertEqual(
+        len(produced_event_tags), task_storage_writer.number_of_event_tags)
+
+    test_runner.Stop()
+
+    self.assertIsNone(test_runner._task_storage_writer)
+
+    task_storage_writer = storage_writer._task_storage_writers['tagging']
+    self.assertEqual(len(task_storage_writer.analysis_reports), 1)
+    self.assertIsNotNone(task_storage_writer.task_completion)
+
+    storage_writer.Close()
+
+
+if __name__ == '__main__':
+  unittest.main()
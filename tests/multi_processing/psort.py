@@ -9,16 +9,24 @@ import unittest
 
 from plaso.analysis import interface as analysis_interface
 from plaso.analysis import tagging
+from plaso.cli import time_slices
+from plaso.containers import events
+from plaso.containers import exports
+from plaso.containers import reports
 from plaso.containers import sessions
 from plaso.engine import configurations
 from plaso.engine import knowledge_base
+from plaso.engine import processing_status
+from plaso.filters import event_filter
 from plaso.lib import definitions
 from plaso.multi_processing import psort
 from plaso.output import dynamic
 from plaso.output import interface as output_interface
 from plaso.output import mediator as output_mediator
 from plaso.output import null
+from plaso.storage import event_tag_index
 from plaso.storage import factory as storage_factory
+from plaso.storage.fake import writer as fake_writer
 
 from tests import test_lib as shared_test_lib
 from tests.containers import test_lib as containers_test_lib
@@ -209,6 +217,142 @@ class PsortEventHeapTest(test_lib.MultiProcessingTestCase):
     self.assertEqual(len(event_heap._heap), 1)
 
 
+class PsortEventReaderTest(test_lib.MultiProcessingTestCase):
+  """Tests for the psort event reader."""
+
+  # pylint: disable=protected-access
+
+  _TEST_EVENTS = [
+      {'data_type': 'test:event',
+       'timestamp': 5134324321,
+       'timestamp_desc': definitions.TIME_DESCRIPTION_CHANGE},
+      {'data_type': 'test:event',
+       'filename': '/dev/none',
+       'timestamp': 2345871286,
+       'timestamp_desc': definitions.TIME_DESCRIPTION_CHANGE},
+      {'data_type': 'test:event',
+       'filename': '/dev/null',
+       'timestamp': 3345871286,
+       'timestamp_desc': definitions.TIME_DESCRIPTION_CHANGE}]
+
+  def _CreateTestStorageWriter(self):
+    """Creates a storage writer for testing.
+
+    Returns:
+      FakeStorageWriter: storage writer.
+    """
+    session = sessions.Session()
+    storage_writer = fake_writer.FakeStorageWriter(session)
+    storage_writer.Open()
+
+    for event, event_data, event_data_stream in (
+        containers_test_lib.CreateEventsFromValues(self._TEST_EVENTS)):
+      storage_writer.AddEventDataStream(event_data_stream)
+
+      event_data.SetEventDataStreamIdentifier(event_data_stream.GetIdentifier())
+      storage_writer.AddEventData(event_data)
+
+      event.SetEventDataIdentifier(event_data.GetIdentifier())
+      storage_writer.AddEvent(event)
+
+    return storage_writer
+
+  def testGetEventBatches(self):
+    """Tests the GetEventBatches function."""
+    storage_writer = self._CreateTestStorageWriter()
+
+    event_reader = psort.PsortEventReader(
+        storage_writer, event_tag_index.EventTagIndex())
+    event_reader._BATCH_SIZE = 2
+
+    event_reader.Start()
+    try:
+      batches = list(event_reader.GetEventBatches())
+    finally:
+      event_reader.Stop()
+
+    self.assertEqual(len(batches), 2)
+    self.assertEqual(len(batches[0]), 2)
+    self.assertEqual(len(batches[1]), 1)
+
+  def testGetEvents(self):
+    """Tests the GetEvents function."""
+    storage_writer = self._CreateTestStorageWriter()
+
+    event_reader = psort.PsortEventReader(
+        storage_writer, event_tag_index.EventTagIndex())
+    event_reader._BATCH_SIZE = 2
+
+    event_reader.Start()
+    try:
+      test_events = list(event_reader.GetEvents())
+    finally:
+      event_reader.Stop()
+
+    self.assertEqual(len(test_events), 3)
+
+    timestamps = [event.timestamp for event, _, _, _ in test_events]
+    self.assertEqual(timestamps, [2345871286, 3345871286, 5134324321])
+
+    event, event_data, event_data_stream, event_tag = test_events[0]
+    self.assertIsNotNone(event)
+    self.assertEqual(event_data.filename, '/dev/none')
+    self.assertIsNotNone(event_data_stream)
+    self.assertIsNone(event_tag)
+
+  def testGetEventsWithMergeStorageReaders(self):
+    """Tests the GetEvents function with storage readers to merge."""
+    storage_writer1 = self._CreateTestStorageWriter()
+    storage_writer2 = self._CreateTestStorageWriter()
+
+    merge_storage_readers = {
+        'storage1.plaso': storage_writer1,
+        'storage2.plaso': storage_writer2}
+
+    event_reader = psort.PsortEventReader(
+        storage_writer1, event_tag_index.EventTagIndex(),
+        merge_storage_readers=merge_storage_readers)
+    event_reader._BATCH_SIZE = 2
+
+    event_reader.Start()
+    try:
+      test_events = list(event_reader.GetEvents())
+    finally:
+      event_reader.Stop()
+
+    self.assertEqual(len(test_events), 6)
+
+    timestamps = [event.timestamp for event, _, _, _ in test_events]
+    self.assertEqual(timestamps, [
+        2345871286, 2345871286, 3345871286, 3345871286, 5134324321,
+        5134324321])
+
+    storage_files = [
+        event_data.storage_file for _, event_data, _, _ in test_events]
+    self.assertEqual(storage_files, [
+        'storage1.plaso', 'storage2.plaso', 'storage1.plaso',
+        'storage2.plaso', 'storage1.plaso', 'storage2.plaso'])
+
+  def testStop(self):
+    """Tests the Stop function."""
+    storage_writer = self._CreateTestStorageWriter()
+
+    event_reader = psort.PsortEventReader(
+        storage_writer, event_tag_index.EventTagIndex())
+    event_reader._BATCH_SIZE = 1
+    event_reader._MAXIMUM_QUEUE_SIZE = 1
+    event_reader._QUEUE_TIMEOUT = 0.1
+
+    event_reader.Start()
+    try:
+      for _ in event_reader.GetEvents():
+        break
+    finally:
+      event_reader.Stop()
+
+    self.assertIsNone(event_reader._thread)
+
+
 class PsortMultiProcessEngineTest(test_lib.MultiProcessingTestCase):
   """Tests for the multi-processing engine."""
 
@@ -270,6 +414,14 @@ class PsortMultiProcessEngineTest(test_lib.MultiProcessingTestCase):
        'timestamp': 5134024321,
        'timestamp_desc': definitions.TIME_DESCRIPTION_UNKNOWN}]
 
+  _TEST_TAGGING_RULES = '\n'.join([
+      'cron',
+      '  data_type is \'syslog:cron:task_run\'',
+      '',
+      'syslog',
+      '  data_type is \'syslog:line\'',
+      ''])
+
   def _CreateTestStorageFile(self, path):
     """Creates a storage file for testing.
 
@@ -398,6 +550,43 @@ class PsortMultiProcessEngineTest(test_lib.MultiProcessingTestCase):
     self.assertEqual(len(output_module.events), 17)
     self.assertEqual(len(output_module.macb_groups), 3)
 
+  def testInternalExportEventsWithExportWatermark(self):
+    """Tests the _ExportEvents function with an export watermark."""
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+
+    output_mediator_object = output_mediator.OutputMediator(
+        knowledge_base_object, data_location=shared_test_lib.TEST_DATA_PATH)
+
+    formatters_directory_path = self._GetDataFilePath(['formatters'])
+    output_mediator_object.ReadMessageFormattersFromDirectory(
+        formatters_directory_path)
+
+    output_module = TestOutputModule(output_mediator_object)
+
+    test_engine = psort.PsortMultiProcessEngine()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'storage.plaso')
+      self._CreateTestStorageFile(temp_file)
+      self._ReadSessionConfiguration(temp_file, knowledge_base_object)
+
+      storage_reader = (
+          storage_factory.StorageFactory.CreateStorageReaderForFile(temp_file))
+      storage_reader.ReadSystemConfiguration(knowledge_base_object)
+
+      # The row identifier of an event corresponds with the order in which
+      # the event was added, hence only the events added after the export
+      # watermark are exported.
+      number_of_events = storage_reader.GetNumberOfEvents()
+      export_watermark = exports.ExportWatermark(
+          event_row_identifier=number_of_events - 3, output_format='test')
+
+      test_engine._ExportEvents(
+          storage_reader, output_module, deduplicate_events=False,
+          export_watermark=export_watermark)
+
+    self.assertEqual(len(output_module.events), 3)
+
   def testInternalExportEventsDeduplicate(self):
     """Tests the _ExportEvents function with deduplication."""
     knowledge_base_object = knowledge_base.KnowledgeBase()
@@ -427,12 +616,323 @@ class PsortMultiProcessEngineTest(test_lib.MultiProcessingTestCase):
     self.assertEqual(len(output_module.events), 15)
     self.assertEqual(len(output_module.macb_groups), 3)
 
+  def testInternalExportEventsWithTimeSlicer(self):
+    """Tests the _ExportEvents function with the time slicer."""
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+
+    output_mediator_object = output_mediator.OutputMediator(
+        knowledge_base_object, data_location=shared_test_lib.TEST_DATA_PATH)
+
+    time_slice = time_slices.TimeSlice(None, duration=2)
+
+    test_engine = psort.PsortMultiProcessEngine()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'storage.plaso')
+      self._CreateTestStorageFile(temp_file)
+
+      # The text of the test events is used as their formatted message.
+      storage_file = storage_factory.StorageFactory.CreateStorageFile(
+          definitions.DEFAULT_STORAGE_FORMAT)
+      storage_file.Open(path=temp_file, read_only=False)
+      storage_file.BuildTextIndex(
+          message_callback=lambda event_data, _: getattr(
+              event_data, 'text', None))
+      storage_file.Close()
+
+      storage_reader = (
+          storage_factory.StorageFactory.CreateStorageReaderForFile(temp_file))
+
+      # Message conditions are evaluated by means of the text index, with and
+      # without the time slicer.
+      for use_time_slicer, expected_number_of_events in (
+          (False, 3), (True, 7)):
+        output_module = TestOutputModule(output_mediator_object)
+
+        test_event_filter = event_filter.EventObjectFilter()
+        test_event_filter.CompileFilter('message contains "another"')
+
+        test_engine._ExportEvents(
+            storage_reader, output_module, deduplicate_events=False,
+            event_filter=test_event_filter, time_slice=time_slice,
+            use_time_slicer=use_time_slicer)
+
+        self.assertEqual(
+            len(output_module.events), expected_number_of_events)
+
+        texts = [
+            event_data.text for _, event_data, _, _ in output_module.events
+            if getattr(event_data, 'text', None)]
+        self.assertEqual(len(texts), 3)
+
+      storage_reader.Close()
+
+  def testInternalExportEventsWithMergeStorageReaders(self):
+    """Tests the _ExportEvents function with storage readers to merge."""
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+
+    output_mediator_object = output_mediator.OutputMediator(
+        knowledge_base_object, data_location=shared_test_lib.TEST_DATA_PATH)
+
+    # Events with the same timestamp that are duplicates across the storage
+    # files.
+    test_events = [
+        {'data_type': 'test:event',
+         'filename': '/tmp/file{0:d}'.format(file_index),
+         'timestamp': 3345871286,
+         'timestamp_desc': definitions.TIME_DESCRIPTION_WRITTEN}
+        for file_index in range(8)]
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      for storage_file_name, label in (
+          ('storage1.plaso', 'label1'), ('storage2.plaso', 'label2')):
+        storage_file = storage_factory.StorageFactory.CreateStorageFile(
+            definitions.DEFAULT_STORAGE_FORMAT)
+        storage_file.Open(
+            path=os.path.join(temp_directory, storage_file_name),
+            read_only=False)
+
+        for event, event_data, event_data_stream in (
+            containers_test_lib.CreateEventsFromValues(test_events)):
+          storage_file.AddEventDataStream(event_data_stream)
+
+          event_data.SetEventDataStreamIdentifier(
+              event_data_stream.GetIdentifier())
+          storage_file.AddEventData(event_data)
+
+          event.SetEventDataIdentifier(event_data.GetIdentifier())
+          storage_file.AddEvent(event)
+
+          event_tag = events.EventTag()
+          event_tag.AddLabel(label)
+          event_tag.SetEventIdentifier(event.GetIdentifier())
+          storage_file.AddEventTag(event_tag)
+
+        storage_file.Close()
+
+      # The duplicate event of the first storage file is exported, regardless
+      # of the order of the storage files.
+      for storage_file_names, expected_labels in (
+          (['storage1.plaso', 'storage2.plaso'], ['label1']),
+          (['storage2.plaso', 'storage1.plaso'], ['label2'])):
+        merge_storage_readers = {}
+        for storage_file_name in storage_file_names:
+          storage_file_path = os.path.join(temp_directory, storage_file_name)
+          merge_storage_readers[storage_file_name] = (
+              storage_factory.StorageFactory.CreateStorageReaderForFile(
+                  storage_file_path))
+
+        output_module = TestOutputModule(output_mediator_object)
+
+        test_engine = psort.PsortMultiProcessEngine()
+
+        storage_reader = merge_storage_readers[storage_file_names[0]]
+        try:
+          test_engine._ExportEvents(
+              storage_reader, output_module,
+              merge_storage_readers=merge_storage_readers)
+
+        finally:
+          for merge_storage_reader in merge_storage_readers.values():
+            merge_storage_reader.Close()
+
+        self.assertEqual(len(output_module.events), 8)
+
+        for _, event_data, _, event_tag in output_module.events:
+          self.assertEqual(event_data.storage_file, storage_file_names[0])
+          self.assertEqual(event_tag.labels, expected_labels)
+
   # TODO: add test for _FlushExportBuffer.
+
+  def testMergeAnalysisShardAttributeContainer(self):
+    """Tests the _MergeAnalysisShardAttributeContainer function."""
+    session = sessions.Session()
+    storage_writer = fake_writer.FakeStorageWriter(session)
+
+    test_engine = psort.PsortMultiProcessEngine()
+
+    analysis_report = reports.AnalysisReport(plugin_name='tagging')
+    analysis_report.analysis_counter = {'event_tags': 2, 'malware': 2}
+    analysis_report.time_compiled = 1000
+
+    result = test_engine._MergeAnalysisShardAttributeContainer(
+        storage_writer, analysis_report)
+    self.assertFalse(result)
+
+    analysis_report = reports.AnalysisReport(plugin_name='tagging')
+    analysis_report.analysis_counter = {'event_tags': 3, 'text': 3}
+    analysis_report.time_compiled = 2000
+
+    result = test_engine._MergeAnalysisShardAttributeContainer(
+        storage_writer, analysis_report)
+    self.assertFalse(result)
+
+    event_tag = events.EventTag()
+
+    result = test_engine._MergeAnalysisShardAttributeContainer(
+        storage_writer, event_tag)
+    self.assertTrue(result)
+
+    self.assertEqual(len(test_engine._analysis_shard_reports), 1)
+
+    analysis_report = test_engine._analysis_shard_reports['tagging']
+    self.assertEqual(analysis_report.analysis_counter, {
+        'event_tags': 5, 'malware': 2, 'text': 3})
+    self.assertEqual(analysis_report.time_compiled, 2000)
+
+  def testPrepareExport(self):
+    """Tests the _PrepareExport function."""
+    test_file_path = self._GetTestFilePath(['psort_test.plaso'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+
+    output_mediator_object = output_mediator.OutputMediator(
+        knowledge_base_object, data_location=shared_test_lib.TEST_DATA_PATH)
+
+    output_module = TestOutputModule(output_mediator_object)
+    output_module.USES_SERIALIZED_DATA = True
+
+    storage_reader = storage_factory.StorageFactory.CreateStorageReaderForFile(
+        test_file_path)
+
+    test_engine = psort.PsortMultiProcessEngine()
+    test_engine._events_status = processing_status.EventsStatus()
+
+    try:
+      test_engine._PrepareExport([storage_reader], output_module)
+
+      storage_file = storage_reader._storage_file
+      self.assertTrue(storage_file._retain_serialized_data)
+
+    finally:
+      storage_reader.Close()
+
+    self.assertEqual(test_engine._events_status.total_number_of_events, 38)
+
   # TODO: add test for _StartAnalysisProcesses.
   # TODO: add test for _StatusUpdateThreadMain.
   # TODO: add test for _StopAnalysisProcesses.
   # TODO: add test for _UpdateProcessingStatus.
 
+  def testAnalyzeAndExportEvents(self):
+    """Tests the AnalyzeAndExportEvents function."""
+    test_file_path = self._GetTestFilePath(['psort_test.plaso'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    test_tagging_file_path = self._GetTestFilePath([
+        'tagging_file', 'valid.txt'])
+    self._SkipIfPathNotExists(test_tagging_file_path)
+
+    session = sessions.Session()
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+
+    output_mediator_object = output_mediator.OutputMediator(
+        knowledge_base_object, data_location=shared_test_lib.TEST_DATA_PATH)
+
+    output_module = TestOutputModule(output_mediator_object)
+
+    analysis_plugin = tagging.TaggingAnalysisPlugin()
+    analysis_plugin.SetAndLoadTagFile(test_tagging_file_path)
+
+    analysis_plugins = {'tagging': analysis_plugin}
+
+    configuration = configurations.ProcessingConfiguration()
+
+    test_engine = psort.PsortMultiProcessEngine()
+
+    total_numbers_of_events = []
+
+    def _StatusUpdateCallback(processing_status_object):
+      """Records the total number of events of a status update."""
+      events_status = processing_status_object.events_status
+      if events_status:
+        total_numbers_of_events.append(events_status.total_number_of_events)
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'storage.plaso')
+      shutil.copyfile(test_file_path, temp_file)
+
+      storage_writer = storage_factory.StorageFactory.CreateStorageWriter(
+          definitions.DEFAULT_STORAGE_FORMAT, session, temp_file)
+
+      test_engine.AnalyzeAndExportEvents(
+          knowledge_base_object, storage_writer, '', analysis_plugins,
+          output_module, configuration,
+          status_update_callback=_StatusUpdateCallback)
+
+    self.assertEqual(total_numbers_of_events[-1], 38)
+    self.assertIsNone(test_engine._events_status)
+    self.assertEqual(
+        test_engine._status, definitions.STATUS_INDICATOR_IDLE)
+
+    self.assertEqual(session.analysis_reports_counter['tagging'], 1)
+    self.assertEqual(session.analysis_reports_counter['total'], 1)
+
+    self.assertEqual(len(output_module.events), 20)
+
+    labels = [
+        event_tag.labels for _, _, _, event_tag in output_module.events
+        if event_tag]
+    self.assertEqual(labels, [['exit2', 'exit1'], ['repeated']])
+
+  def testAnalyzeAndExportEventsWithTimeSlicer(self):
+    """Tests the AnalyzeAndExportEvents function with the time slicer."""
+    test_file_path = self._GetTestFilePath(['psort_test.plaso'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    session = sessions.Session()
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+
+    output_mediator_object = output_mediator.OutputMediator(
+        knowledge_base_object, data_location=shared_test_lib.TEST_DATA_PATH)
+
+    output_module = TestOutputModule(output_mediator_object)
+
+    configuration = configurations.ProcessingConfiguration()
+
+    test_event_filter = event_filter.EventObjectFilter()
+    test_event_filter.CompileFilter('data_type is \'syslog:cron:task_run\'')
+
+    time_slice = time_slices.TimeSlice(None, duration=2)
+
+    test_engine = psort.PsortMultiProcessEngine()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      tagging_file_path = os.path.join(temp_directory, 'tagging.txt')
+      with open(tagging_file_path, 'w', encoding='utf-8') as file_object:
+        file_object.write(self._TEST_TAGGING_RULES)
+
+      analysis_plugin = tagging.TaggingAnalysisPlugin()
+      analysis_plugin.SetAndLoadTagFile(tagging_file_path)
+
+      analysis_plugins = {'tagging': analysis_plugin}
+
+      temp_file = os.path.join(temp_directory, 'storage.plaso')
+      shutil.copyfile(test_file_path, temp_file)
+
+      storage_writer = storage_factory.StorageFactory.CreateStorageWriter(
+          definitions.DEFAULT_STORAGE_FORMAT, session, temp_file)
+
+      test_engine.AnalyzeAndExportEvents(
+          knowledge_base_object, storage_writer, '', analysis_plugins,
+          output_module, configuration, event_filter=test_event_filter,
+          time_slice=time_slice, use_time_slicer=True)
+
+    data_types = set(
+        event_data.data_type for _, event_data, _, _ in output_module.events)
+    self.assertEqual(data_types, set(['syslog:cron:task_run', 'syslog:line']))
+
+    # The events in the context of the time slicer are examined by the inline
+    # analysis plugins as well.
+    for _, event_data, _, event_tag in output_module.events:
+      expected_label = 'syslog'
+      if event_data.data_type == 'syslog:cron:task_run':
+        expected_label = 'cron'
+
+      self.assertIsNotNone(event_tag)
+      self.assertIn(expected_label, event_tag.labels)
+
   def testAnalyzeEvents(self):
     """Tests the AnalyzeEvents function."""
     test_file_path = self._GetTestFilePath(['psort_test.plaso'])
@@ -495,6 +995,102 @@ class PsortMultiProcessEngineTest(test_lib.MultiProcessingTestCase):
 
     # TODO: add bogus data location test.
 
+  def testAnalyzeEventsWithAnalysisShards(self):
+    """Tests the AnalyzeEvents function with analysis shard processes."""
+    test_file_path = self._GetTestFilePath(['psort_test.plaso'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+
+    configuration = configurations.ProcessingConfiguration()
+
+    storage_reader = storage_factory.StorageFactory.CreateStorageReaderForFile(
+        test_file_path)
+    number_of_analysis_reports = len(list(
+        storage_reader.GetAnalysisReports()))
+    number_of_event_tags = len(list(storage_reader.GetEventTags()))
+    storage_reader.Close()
+
+    for number_of_analysis_shards in (1, 3):
+      session = sessions.Session()
+
+      test_engine = psort.PsortMultiProcessEngine()
+      # Use small event batches so that every shard analyzes events.
+      test_engine._ANALYSIS_EVENT_BATCH_SIZE = 4
+
+      with shared_test_lib.TempDirectory() as temp_directory:
+        tagging_file_path = os.path.join(temp_directory, 'tagging.txt')
+        with open(tagging_file_path, 'w') as file_object:
+          file_object.write(self._TEST_TAGGING_RULES)
+
+        analysis_plugin = tagging.TaggingAnalysisPlugin()
+        analysis_plugin.SetAndLoadTagFile(tagging_file_path)
+
+        analysis_plugins = {'tagging': analysis_plugin}
+
+        temp_file = os.path.join(temp_directory, 'storage.plaso')
+        shutil.copyfile(test_file_path, temp_file)
+
+        storage_writer = storage_factory.StorageFactory.CreateStorageWriter(
+            definitions.DEFAULT_STORAGE_FORMAT, session, temp_file)
+
+        test_engine.AnalyzeEvents(
+            knowledge_base_object, storage_writer, '', analysis_plugins,
+            configuration, number_of_analysis_shards=number_of_analysis_shards)
+
+        storage_reader = (
+            storage_factory.StorageFactory.CreateStorageReaderForFile(
+                temp_file))
+        analysis_reports = list(storage_reader.GetAnalysisReports())
+        event_tags = list(storage_reader.GetEventTags())
+        storage_reader.Close()
+
+      self.assertEqual(session.analysis_reports_counter['tagging'], 1)
+      self.assertEqual(session.analysis_reports_counter['total'], 1)
+
+      self.assertEqual(len(analysis_reports), number_of_analysis_reports + 1)
+      self.assertEqual(len(event_tags), number_of_event_tags + 32)
+
+      analysis_report = analysis_reports[-1]
+      self.assertEqual(analysis_report.plugin_name, 'tagging')
+      self.assertEqual(analysis_report.analysis_counter, {
+          'cron': 6, 'event_tags': 32, 'syslog': 26})
+
+  def testAnalyzeEventsWithInlineAnalysisPlugins(self):
+    """Tests the AnalyzeEvents function with inline analysis plugins."""
+    test_file_path = self._GetTestFilePath(['psort_test.plaso'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    test_tagging_file_path = self._GetTestFilePath([
+        'tagging_file', 'valid.txt'])
+    self._SkipIfPathNotExists(test_tagging_file_path)
+
+    session = sessions.Session()
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+
+    analysis_plugin = tagging.TaggingAnalysisPlugin()
+    analysis_plugin.SetAndLoadTagFile(test_tagging_file_path)
+
+    analysis_plugins = {'tagging': analysis_plugin}
+
+    configuration = configurations.ProcessingConfiguration()
+
+    test_engine = psort.PsortMultiProcessEngine()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'storage.plaso')
+      shutil.copyfile(test_file_path, temp_file)
+
+      storage_writer = storage_factory.StorageFactory.CreateStorageWriter(
+          definitions.DEFAULT_STORAGE_FORMAT, session, temp_file)
+
+      test_engine.AnalyzeEvents(
+          knowledge_base_object, storage_writer, '', analysis_plugins,
+          configuration, inline_analysis_plugins=['tagging'])
+
+    self.assertEqual(session.analysis_reports_counter['tagging'], 1)
+    self.assertEqual(session.analysis_reports_counter['total'], 1)
+
   def testExportEvents(self):
     """Tests the ExportEvents function."""
     test_file_path = self._GetTestFilePath(['psort_test.plaso'])
@@ -542,6 +1138,72 @@ class PsortMultiProcessEngineTest(test_lib.MultiProcessingTestCase):
         'repeated')
     self.assertEqual(lines[14], expected_line)
 
+  def testExportEventsWithMergeStorageReaders(self):
+    """Tests the ExportEvents function with storage readers to merge."""
+    test_file_path = self._GetTestFilePath(['psort_test.plaso'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+
+    test_file_object = io.StringIO()
+
+    output_mediator_object = output_mediator.OutputMediator(
+        knowledge_base_object, data_location=shared_test_lib.TEST_DATA_PATH)
+
+    formatters_directory_path = self._GetDataFilePath(['formatters'])
+    output_mediator_object.ReadMessageFormattersFromDirectory(
+        formatters_directory_path)
+
+    output_mediator_object.SetPreferredLanguageIdentifier('en-US')
+
+    output_module = dynamic.DynamicOutputModule(output_mediator_object)
+    output_module._file_object = test_file_object
+    output_module.SetFields(['datetime', 'message', 'storage_file'])
+
+    configuration = configurations.ProcessingConfiguration()
+
+    storage_reader1 = storage_factory.StorageFactory.CreateStorageReaderForFile(
+        test_file_path)
+    storage_reader2 = storage_factory.StorageFactory.CreateStorageReaderForFile(
+        test_file_path)
+
+    merge_storage_readers = {
+        'storage1.plaso': storage_reader1,
+        'storage2.plaso': storage_reader2}
+
+    test_engine = psort.PsortMultiProcessEngine()
+
+    try:
+      test_engine.ExportEvents(
+          knowledge_base_object, storage_reader1, output_module,
+          configuration, merge_storage_readers=merge_storage_readers)
+
+    finally:
+      storage_reader1.Close()
+      storage_reader2.Close()
+
+    output = test_file_object.getvalue()
+    lines = output.split('\n')
+
+    # The events of the second storage file are duplicates of those of
+    # the first storage file.
+    self.assertEqual(len(lines), 22)
+
+    expected_line = (
+        '2014-11-18T01:15:43+00:00,'
+        '[---] last message repeated 5 times ---,'
+        'storage1.plaso')
+    self.assertEqual(lines[14], expected_line)
+
+    export_watermark = exports.ExportWatermark(
+        event_row_identifier=1, output_format='dynamic')
+
+    with self.assertRaises(ValueError):
+      test_engine.ExportEvents(
+          knowledge_base_object, storage_reader1, output_module,
+          configuration, export_watermark=export_watermark,
+          merge_storage_readers=merge_storage_readers)
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for the threaded output file writer."""
+
+import io
+import unittest
+
+from plaso.output import file_writer
+
+from tests import test_lib as shared_test_lib
+
+
+class TestStringIO(io.StringIO):
+  """String IO that retains its value after close for testing."""
+
+  def __init__(self):
+    """Initializes a string IO for testing."""
+    super(TestStringIO, self).__init__()
+    self.closed_value = None
+
+  def close(self):
+    """Closes the string IO."""
+    self.closed_value = self.getvalue()
+    super(TestStringIO, self).close()
+
+
+class ThreadedFileWriterTest(shared_test_lib.BaseTestCase):
+  """Tests for the threaded output file writer."""
+
+  # pylint: disable=protected-access
+
+  def testWriteAndClose(self):
+    """Tests the write and close functions."""
+    test_file_object = TestStringIO()
+
+    test_writer = file_writer.ThreadedFileWriter(test_file_object)
+    test_writer._MAXIMUM_BUFFER_SIZE = 16
+
+    expected_text = ''
+    for index in range(1000):
+      text = 'line: {0:d}\n'.format(index)
+      test_writer.write(text)
+      expected_text += text
+
+    test_writer.close()
+
+    self.assertEqual(test_file_object.closed_value, expected_text)
+    self.assertIsNone(test_writer._thread)
+
+    # Closing a closed writer should be a no-op.
+    test_writer.close()
+
+  def testWriteFailure(self):
+    """Tests the write function when the file object cannot be written."""
+    test_file_object = io.StringIO()
+    test_file_object.close()
+
+    test_writer = file_writer.ThreadedFileWriter(test_file_object)
+    test_writer.write('line\n')
+
+    with self.assertRaises(IOError):
+      test_writer.close()
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -184,6 +184,38 @@ class FieldFormattingHelperTest(test_lib.OutputModuleTestCase):
         event, event_data, event_data_stream)
     self.assertEqual(zone_string, 'UTC')
 
+  def testGetFormattedFields(self):
+    """Tests the GetFormattedFields function."""
+    output_mediator = self._CreateOutputMediator()
+
+    formatters_directory_path = self._GetTestFilePath(['formatters'])
+    output_mediator.ReadMessageFormattersFromDirectory(
+        formatters_directory_path)
+
+    test_helper = formatting_helper.FieldFormattingHelper(output_mediator)
+    test_helper._FIELD_FORMAT_CALLBACKS = {
+        'message': '_FormatMessage',
+        'message_short': '_FormatMessageShort',
+        'time': '_FormatTime',
+        'zone': '_FormatTimeZone'}
+
+    event, event_data, event_data_stream = (
+        containers_test_lib.CreateEventFromValues(self._TEST_EVENTS[0]))
+
+    field_values = test_helper.GetFormattedFields(
+        ['time', 'zone', 'message', 'message_short', 'hostname'], event,
+        event_data, event_data_stream, None)
+
+    expected_message_string = (
+        'Reporter <CRON> PID: 8442 (pam_unix(cron:session): session closed '
+        'for user root)')
+    expected_field_values = [
+        '18:17:01', 'UTC', expected_message_string, expected_message_string,
+        'ubuntu']
+    self.assertEqual(field_values, expected_field_values)
+
+    self.assertIsNone(test_helper._formatting_context)
+
   def testFormatUsername(self):
     """Tests the _FormatUsername function."""
     output_mediator = self._CreateOutputMediator()
@@ -209,6 +241,38 @@ class FieldFormattingHelperTest(test_lib.OutputModuleTestCase):
         'zone', event, event_data, event_data_stream, None)
     self.assertEqual(zone_string, 'UTC')
 
+  def testGetFormattedFields(self):
+    """Tests the GetFormattedFields function."""
+    output_mediator = self._CreateOutputMediator()
+
+    formatters_directory_path = self._GetTestFilePath(['formatters'])
+    output_mediator.ReadMessageFormattersFromDirectory(
+        formatters_directory_path)
+
+    test_helper = formatting_helper.FieldFormattingHelper(output_mediator)
+    test_helper._FIELD_FORMAT_CALLBACKS = {
+        'message': '_FormatMessage',
+        'message_short': '_FormatMessageShort',
+        'time': '_FormatTime',
+        'zone': '_FormatTimeZone'}
+
+    event, event_data, event_data_stream = (
+        containers_test_lib.CreateEventFromValues(self._TEST_EVENTS[0]))
+
+    field_values = test_helper.GetFormattedFields(
+        ['time', 'zone', 'message', 'message_short', 'hostname'], event,
+        event_data, event_data_stream, None)
+
+    expected_message_string = (
+        'Reporter <CRON> PID: 8442 (pam_unix(cron:session): session closed '
+        'for user root)')
+    expected_field_values = [
+        '18:17:01', 'UTC', expected_message_string, expected_message_string,
+        'ubuntu']
+    self.assertEqual(field_values, expected_field_values)
+
+    self.assertIsNone(test_helper._formatting_context)
+
 
 if __name__ == '__main__':
   unittest.main()
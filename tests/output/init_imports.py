@@ -11,8 +11,9 @@ class OutputImportTest(test_lib.ImportCheckTestCase):
   """Tests that analysis plugin classes are imported correctly."""
 
   _IGNORABLE_FILES = frozenset([
-      'formatting_helper.py', 'interface.py', 'logger.py', 'manager.py',
-      'mediator.py', 'shared_dsv.py', 'shared_elastic.py', 'shared_json.py'])
+      'file_writer.py', 'formatting_helper.py', 'interface.py', 'logger.py',
+      'manager.py', 'mediator.py', 'shared_dsv.py', 'shared_elastic.py',
+      'shared_json.py', 'timestamp_formatter.py'])
 
   def testOutputModulesImported(self):
     """Tests that all output modules are imported."""
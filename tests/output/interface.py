@@ -2,15 +2,25 @@
 # -*- coding: utf-8 -*-
 """Tests for the output module interface."""
 
+import gzip
 import io
+import os
 import unittest
 
+try:
+  import mock  # pylint: disable=import-error
+except ImportError:
+  from unittest import mock
+
+import lz4.frame
+
 from plaso.lib import definitions
 from plaso.lib import timelib
 from plaso.output import formatting_helper
 from plaso.output import interface
 from plaso.output import manager
 
+from tests import test_lib as shared_test_lib
 from tests.containers import test_lib as containers_test_lib
 from tests.output import test_lib
 
@@ -121,6 +131,64 @@ class TextFileOutputModuleTest(test_lib.OutputModuleTestCase):
     output = test_file_object.getvalue()
     self.assertEqual(output, expected_output)
 
+  def testOpenWithCompression(self):
+    """Tests the Open function with compressed output."""
+    output_mediator = self._CreateOutputMediator()
+    event_formatting_helper = TestXMLEventFormattingHelper(output_mediator)
+
+    event, event_data, event_data_stream = (
+        containers_test_lib.CreateEventFromValues(self._TEST_EVENTS[0]))
+
+    expected_output = (
+        '<EventFile>\n'
+        '<Event>\n'
+        '\t<DateTime>2012-06-27T18:17:01+00:00</DateTime>\n'
+        '\t<Entry>My Event Is Now!</Entry>\n'
+        '</Event>\n'
+        '</EventFile>\n')
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      for filename, open_function in (
+          ('output.gz', gzip.open), ('output.lz4', lz4.frame.open)):
+        output_module = TestXMLOutputModule(
+            output_mediator, event_formatting_helper)
+
+        path = os.path.join(temp_directory, filename)
+        output_module.Open(path=path)
+
+        output_module.WriteHeader()
+        output_module.WriteEvent(event, event_data, event_data_stream, None)
+        output_module.WriteFooter()
+        output_module.Close()
+
+        with open_function(path, 'rt', encoding='utf-8') as file_object:
+          output = file_object.read()
+
+        self.assertEqual(output, expected_output)
+
+  def testOpenWithUnsupportedCompression(self):
+    """Tests the Open function with unsupported compressed output."""
+    output_mediator = self._CreateOutputMediator()
+    event_formatting_helper = TestXMLEventFormattingHelper(output_mediator)
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      output_module = TestXMLOutputModule(
+          output_mediator, event_formatting_helper)
+
+      # Simulate versions of lz4 and zstandard that cannot open a file.
+      with mock.patch.object(
+          interface, 'lz4', mock.Mock(frame=mock.Mock(spec=[]))):
+        with self.assertRaises(ValueError):
+          output_module.Open(path=os.path.join(temp_directory, 'output.lz4'))
+
+      with mock.patch.object(interface, 'zstandard', mock.Mock(spec=[])):
+        with self.assertRaises(ValueError):
+          output_module.Open(path=os.path.join(temp_directory, 'output.zst'))
+
+      with mock.patch.object(interface, 'zstandard', None):
+        with self.assertRaises(ValueError):
+          output_module.Open(path=os.path.join(temp_directory, 'output.zst'))
+
   def testOutputList(self):
     """Test listing up all available registered modules."""
     manager.OutputManager.RegisterOutput(TestXMLOutputModule)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for the raw JSON lines output module."""
+
+import io
+import json
+import os
+import unittest
+
+from dfvfs.lib import definitions as dfvfs_definitions
+from dfvfs.path import factory as path_spec_factory
+
+from plaso.lib import definitions
+from plaso.output import json_line_raw
+from plaso.serializer import json_serializer
+
+from tests import test_lib as shared_test_lib
+from tests.containers import test_lib as containers_test_lib
+from tests.output import test_lib
+
+
+class JSONLineRawOutputTest(test_lib.OutputModuleTestCase):
+  """Tests for the raw JSON lines output module."""
+
+  # pylint: disable=protected-access
+
+  _OS_PATH_SPEC = path_spec_factory.Factory.NewPathSpec(
+      dfvfs_definitions.TYPE_INDICATOR_OS, location='{0:s}{1:s}'.format(
+          os.path.sep, os.path.join('cases', 'image.dd')))
+
+  _TEST_EVENTS = [
+      {'data_type': 'test:event',
+       'display_name': 'OS: /var/log/syslog.1',
+       'hostname': 'ubuntu',
+       'inode': 12345678,
+       'path_spec': path_spec_factory.Factory.NewPathSpec(
+           dfvfs_definitions.TYPE_INDICATOR_TSK, inode=15,
+           location='/var/log/syslog.1', parent=_OS_PATH_SPEC),
+       'text': (
+           'Reporter <CRON> PID: |8442| (pam_unix(cron:session): session\n '
+           'closed for user root)'),
+       'timestamp': '2012-06-27 18:17:01',
+       'timestamp_desc': definitions.TIME_DESCRIPTION_UNKNOWN,
+       'username': 'root'}]
+
+  def testWriteEventBody(self):
+    """Tests the WriteEventBody function."""
+    test_file_object = io.StringIO()
+
+    output_mediator = self._CreateOutputMediator()
+
+    formatters_directory_path = self._GetTestFilePath(['formatters'])
+    output_mediator.ReadMessageFormattersFromDirectory(
+        formatters_directory_path)
+
+    output_module = json_line_raw.JSONLineRawOutputModule(output_mediator)
+    output_module._file_object = test_file_object
+
+    event, event_data, event_data_stream = (
+        containers_test_lib.CreateEventFromValues(self._TEST_EVENTS[0]))
+
+    output_module.WriteEventBody(event, event_data, event_data_stream, None)
+
+    expected_timestamp = shared_test_lib.CopyTimestampFromSring(
+        '2012-06-27 18:17:01')
+
+    event_body = test_file_object.getvalue()
+    self.assertEqual(event_body.count('\n'), 1)
+
+    json_dict = json.loads(event_body)
+    self.assertEqual(
+        sorted(json_dict.keys()), ['event', 'event_data', 'event_data_stream'])
+
+    self.assertEqual(json_dict['event']['__container_type__'], 'event')
+    self.assertEqual(json_dict['event']['timestamp'], expected_timestamp)
+    self.assertEqual(json_dict['event_data']['data_type'], 'test:event')
+    self.assertEqual(json_dict['event_data']['username'], 'root')
+
+    path_spec_json_dict = json_dict['event_data_stream']['path_spec']
+    self.assertEqual(path_spec_json_dict['location'], '/var/log/syslog.1')
+
+  def testWriteEventBodyWithSerializedData(self):
+    """Tests the WriteEventBody function with serialized data."""
+    test_file_object = io.StringIO()
+
+    output_mediator = self._CreateOutputMediator()
+
+    formatters_directory_path = self._GetTestFilePath(['formatters'])
+    output_mediator.ReadMessageFormattersFromDirectory(
+        formatters_directory_path)
+
+    output_module = json_line_raw.JSONLineRawOutputModule(output_mediator)
+    output_module._file_object = test_file_object
+
+    output_module.SetFields(['message', 'hostname'])
+
+    event, event_data, event_data_stream = (
+        containers_test_lib.CreateEventFromValues(self._TEST_EVENTS[0]))
+
+    serializer = json_serializer.JSONAttributeContainerSerializer
+    for attribute_container in (event, event_data, event_data_stream):
+      serialized_data = serializer.WriteSerialized(attribute_container)
+      attribute_container.SetSerializedData(serialized_data)
+
+    # The serialized data is written as-is even if the attribute values of
+    # the container have changed.
+    event_data.username = 'changed'
+
+    output_module.WriteEventBody(event, event_data, event_data_stream, None)
+
+    event_body = test_file_object.getvalue()
+
+    json_dict = json.loads(event_body)
+    self.assertEqual(
+        sorted(json_dict.keys()),
+        ['event', 'event_data', 'event_data_stream', 'hostname', 'message'])
+
+    self.assertEqual(json_dict['event_data']['username'], 'root')
+    self.assertEqual(json_dict['hostname'], 'ubuntu')
+
+    expected_message = (
+        'Reporter <CRON> PID: |8442| (pam_unix(cron:session): '
+        'session closed for user root)')
+    self.assertEqual(json_dict['message'], expected_message)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -23,11 +23,80 @@ class TestElasticsearchOutputModule(
     shared_elastic.SharedElasticsearchOutputModule):
   """Elasticsearch output module for testing."""
 
+  _RETRY_WAIT_TIME = 0.0
+
   def _Connect(self):
     """Connects to an Elasticsearch server."""
     self._client = MagicMock()
 
 
+class TestTransportError(Exception):
+  """Elasticsearch transport error for testing.
+
+  Attributes:
+    status_code (int): HTTP status code.
+  """
+
+  def __init__(self, status_code):
+    """Initializes a transport error for testing.
+
+    Args:
+      status_code (int): HTTP status code.
+    """
+    super(TestTransportError, self).__init__(
+        'HTTP status code: {0:d}'.format(status_code))
+    self.status_code = status_code
+
+
+class TestElasticsearchClient(object):
+  """Elasticsearch client for testing.
+
+  The client stands in for an Elasticsearch server that rejects the first
+  bulk request with HTTP status code 503 and the first attempt to index every
+  other document with HTTP status code 429.
+
+  Attributes:
+    bulk_bodies (list[str]): bodies of the bulk requests.
+  """
+
+  def __init__(self):
+    """Initializes an Elasticsearch client for testing."""
+    super(TestElasticsearchClient, self).__init__()
+    self._rejected_documents = set()
+    self.bulk_bodies = []
+
+  def bulk(self, body=None, **unused_kwargs):
+    """Sends a bulk request.
+
+    Args:
+      body (Optional[str]): body of the bulk request.
+
+    Returns:
+      dict[str, object]: response.
+
+    Raises:
+      TestTransportError: for the first bulk request.
+    """
+    self.bulk_bodies.append(body)
+    if len(self.bulk_bodies) == 1:
+      raise TestTransportError(503)
+
+    event_documents = body.split('\n')[1::2]
+
+    items = []
+    for index, event_document in enumerate(event_documents):
+      if index % 2 == 0 or event_document in self._rejected_documents:
+        status_code = 201
+      else:
+        self._rejected_documents.add(event_document)
+        status_code = 429
+
+      items.append({'index': {'status': status_code}})
+
+    has_errors = any(item['index']['status'] >= 300 for item in items)
+    return {'errors': has_errors, 'items': items}
+
+
 @unittest.skipIf(shared_elastic.elasticsearch is None, 'missing elasticsearch')
 class SharedElasticsearchOutputModuleTest(test_lib.OutputModuleTestCase):
   """Tests the shared functionality for Elasticsearch output modules."""
@@ -93,6 +162,10 @@ class SharedElasticsearchOutputModuleTest(test_lib.OutputModuleTestCase):
     self.assertEqual(len(output_module._event_documents), 0)
     self.assertEqual(output_module._number_of_buffered_events, 0)
 
+    output_module._StopBulkRequestThreads()
+
+    self.assertEqual(output_module._number_of_inserted_events, 1)
+
   def testGetSanitizedEventValues(self):
     """Tests the _GetSanitizedEventValues function."""
     output_mediator = self._CreateOutputMediator()
@@ -139,8 +212,11 @@ class SharedElasticsearchOutputModuleTest(test_lib.OutputModuleTestCase):
 
   def testInsertEvent(self):
     """Tests the _InsertEvent function."""
+    event_values = dict(self._TEST_EVENTS[0])
+    event_values['comment'] = 'Gr\u00fc\u00dfe \u65e5\u672c'
+
     event, event_data, event_data_stream = (
-        containers_test_lib.CreateEventFromValues(self._TEST_EVENTS[0]))
+        containers_test_lib.CreateEventFromValues(event_values))
 
     output_mediator = self._CreateOutputMediator()
 
@@ -161,6 +237,15 @@ class SharedElasticsearchOutputModuleTest(test_lib.OutputModuleTestCase):
     self.assertEqual(len(output_module._event_documents), 2)
     self.assertEqual(output_module._number_of_buffered_events, 1)
 
+    # The size of the event documents is in bytes, not in characters.
+    self.assertIn('Gr\u00fc\u00dfe', output_module._event_documents[1])
+
+    expected_event_documents_size = sum(
+        len(event_document.encode('utf-8')) + 1
+        for event_document in output_module._event_documents)
+    self.assertEqual(
+        output_module._event_documents_size, expected_event_documents_size)
+
     output_module._InsertEvent(event, event_data, event_data_stream, None)
 
     self.assertEqual(len(output_module._event_documents), 4)
@@ -171,6 +256,28 @@ class SharedElasticsearchOutputModuleTest(test_lib.OutputModuleTestCase):
     self.assertEqual(len(output_module._event_documents), 0)
     self.assertEqual(output_module._number_of_buffered_events, 0)
 
+  def testSendBulkRequest(self):
+    """Tests the _SendBulkRequest function."""
+    output_mediator = self._CreateOutputMediator()
+    output_module = TestElasticsearchOutputModule(output_mediator)
+    output_module._client = TestElasticsearchClient()
+
+    event_documents = []
+    for index in range(4):
+      event_documents.append('{"index":{}}')
+      event_documents.append('{{"index":{0:d}}}'.format(index))
+
+    number_of_failed_events = output_module._SendBulkRequest(event_documents)
+    self.assertEqual(number_of_failed_events, 0)
+
+    bulk_bodies = output_module._client.bulk_bodies
+    self.assertEqual(len(bulk_bodies), 3)
+    self.assertEqual(bulk_bodies[0], bulk_bodies[1])
+
+    expected_bulk_body = (
+        '{"index":{}}\n{"index":1}\n{"index":{}}\n{"index":3}\n')
+    self.assertEqual(bulk_bodies[2], expected_bulk_body)
+
   def testClose(self):
     """Tests the Close function."""
     output_mediator = self._CreateOutputMediator()
@@ -184,6 +291,16 @@ class SharedElasticsearchOutputModuleTest(test_lib.OutputModuleTestCase):
 
     self.assertIsNone(output_module._client)
 
+  def testSetBulkRequestOptions(self):
+    """Tests the SetBulkRequestOptions function."""
+    output_mediator = self._CreateOutputMediator()
+    output_module = TestElasticsearchOutputModule(output_mediator)
+
+    output_module.SetBulkRequestOptions(4, 1024)
+
+    self.assertEqual(output_module._number_of_bulk_requests, 4)
+    self.assertEqual(output_module._maximum_bulk_size, 1024)
+
   def testSetFlushInterval(self):
     """Tests the SetFlushInterval function."""
     output_mediator = self._CreateOutputMediator()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for the output timestamp formatter."""
+
+import unittest
+
+import pytz
+
+from plaso.lib import timelib
+from plaso.output import timestamp_formatter
+
+from tests import test_lib as shared_test_lib
+
+
+class TimestampFormatterTest(shared_test_lib.BaseTestCase):
+  """Tests for the output timestamp formatter."""
+
+  # pylint: disable=protected-access
+
+  # Timestamps around the daylight saving time transitions of Europe/Amsterdam
+  # in 2012 and before the first transition of the time zone.
+  _TIMESTAMPS = [
+      -3000000000000000, 1332637199999999, 1332637200000000, 1332637200000001,
+      1340821021000000, 1351385999999999, 1351386000000000, 1351386000000001]
+
+  def testCopyToIsoFormat(self):
+    """Tests the CopyToIsoFormat function."""
+    test_formatter = timestamp_formatter.TimestampFormatter()
+
+    iso_date_time = test_formatter.CopyToIsoFormat(1340821021000000, pytz.UTC)
+    self.assertEqual(iso_date_time, '2012-06-27T18:17:01+00:00')
+
+    timezone = pytz.timezone('Europe/Amsterdam')
+    iso_date_time = test_formatter.CopyToIsoFormat(1340821021000000, timezone)
+    self.assertEqual(iso_date_time, '2012-06-27T20:17:01+02:00')
+
+    iso_date_time = test_formatter.CopyToIsoFormat(1332637199999999, timezone)
+    self.assertEqual(iso_date_time, '2012-03-25T01:59:59.999999+01:00')
+
+    iso_date_time = test_formatter.CopyToIsoFormat(1332637200000000, timezone)
+    self.assertEqual(iso_date_time, '2012-03-25T03:00:00+02:00')
+
+    for timezone_name in ('America/New_York', 'Asia/Kolkata', 'EST', 'UTC'):
+      timezone = pytz.timezone(timezone_name)
+      for timestamp in self._TIMESTAMPS:
+        expected_iso_date_time = timelib.Timestamp.CopyToIsoFormat(
+            timestamp, timezone=timezone, raise_error=True)
+
+        iso_date_time = test_formatter.CopyToIsoFormat(timestamp, timezone)
+        self.assertEqual(iso_date_time, expected_iso_date_time)
+
+    with self.assertRaises(ValueError):
+      test_formatter.CopyToIsoFormat(0, pytz.UTC)
+
+    with self.assertRaises(OverflowError):
+      test_formatter.CopyToIsoFormat(0x7fffffffffffffff, pytz.UTC)
+
+  def testGetUTCOffsetInterval(self):
+    """Tests the _GetUTCOffsetInterval function."""
+    test_formatter = timestamp_formatter.TimestampFormatter()
+
+    timezone = pytz.timezone('Europe/Amsterdam')
+    utc_offset_interval = test_formatter._GetUTCOffsetInterval(
+        1340821021000000, timezone)
+
+    _, start_timestamp, end_timestamp, _ = utc_offset_interval
+    self.assertEqual(start_timestamp, 1332637200000000)
+    self.assertEqual(end_timestamp, 1351386000000000)
+
+    utc_offset_interval = test_formatter._GetUTCOffsetInterval(
+        1340821021000000, pytz.UTC)
+
+    _, start_timestamp, end_timestamp, _ = utc_offset_interval
+    self.assertIsNone(start_timestamp)
+    self.assertIsNone(end_timestamp)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -41,24 +41,26 @@ class XLSXOutputModuleTest(test_lib.OutputModuleTestCase):
        'timestamp': '2012-06-27 18:17:01',
        'timestamp_desc': definitions.TIME_DESCRIPTION_CHANGE}]
 
-  def _GetSheetRows(self, filename):
-    """Parses the contents of the first sheet of an XLSX document.
+  def _GetSheetRows(self, filename, sheet=_SHEET1):
+    """Parses the contents of a sheet of an XLSX document.
 
     Args:
       filename (str): The file path of the XLSX document to parse.
+      sheet (Optional[str]): path of the sheet within the XLSX document,
+          where the first sheet is used by default.
 
     Returns:
-      list[list[str]]: A list of lists representing the rows of the first sheet.
+      list[list[str]]: A list of lists representing the rows of the sheet.
 
     Raises:
       ValueError: if the sheet cannot be found, or a string cannot be read.
     """
     zip_file = zipfile.ZipFile(filename)
 
-    # Fail if we can't find the expected first sheet.
-    if self._SHEET1 not in zip_file.namelist():
+    # Fail if we can't find the expected sheet.
+    if sheet not in zip_file.namelist():
       raise ValueError(
-          'Unable to locate expected sheet: {0:s}'.format(self._SHEET1))
+          'Unable to locate expected sheet: {0:s}'.format(sheet))
 
     # Generate a reference table of shared strings if available.
     strings = []
@@ -71,7 +73,7 @@ class XLSXOutputModuleTest(test_lib.OutputModuleTestCase):
     row = []
     rows = []
     value = ''
-    zip_file_object = zip_file.open(self._SHEET1)
+    zip_file_object = zip_file.open(sheet)
     for _, element in ElementTree.iterparse(zip_file_object):
       if (element.tag.endswith(self._VALUE_STRING_TAG) or
           element.tag.endswith(self._SHARED_STRING_TAG)):
@@ -96,6 +98,20 @@ class XLSXOutputModuleTest(test_lib.OutputModuleTestCase):
 
     return rows
 
+  def testSanitizeField(self):
+    """Tests the _SanitizeField function."""
+    output_mediator = self._CreateOutputMediator()
+    output_module = xlsx.XLSXOutputModule(output_mediator)
+
+    sanitized_field = output_module._SanitizeField('Printable ASCII')
+    self.assertEqual(sanitized_field, 'Printable ASCII')
+
+    sanitized_field = output_module._SanitizeField('Tab\tand \u00e9')
+    self.assertEqual(sanitized_field, 'Tab\tand \u00e9')
+
+    sanitized_field = output_module._SanitizeField('Control \x01 \ud801')
+    self.assertEqual(sanitized_field, 'Control \ufffd \ufffd')
+
   def testWriteEventBody(self):
     """Tests the WriteHeader function."""
     output_mediator = self._CreateOutputMediator()
@@ -139,6 +155,65 @@ class XLSXOutputModuleTest(test_lib.OutputModuleTestCase):
       self.assertEqual(len(expected_event_body), len(rows[1]))
       self.assertEqual(expected_event_body, rows[1])
 
+  def testWriteEventBodyWithMaximumNumberOfRows(self):
+    """Tests the WriteEventBody function with the maximum number of rows."""
+    output_mediator = self._CreateOutputMediator()
+
+    formatters_directory_path = self._GetTestFilePath(['formatters'])
+    output_mediator.ReadMessageFormattersFromDirectory(
+        formatters_directory_path)
+
+    output_module = xlsx.XLSXOutputModule(output_mediator)
+    output_module._MAXIMUM_NUMBER_OF_ROWS = 3
+    output_module.SetFields(['timestamp_desc', 'datetime', 'source'])
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      xslx_file = os.path.join(temp_directory, 'xlsx.out')
+
+      output_module.Open(path=xslx_file)
+      output_module.WriteHeader()
+
+      event, event_data, event_data_stream = (
+          containers_test_lib.CreateEventFromValues(self._TEST_EVENTS[0]))
+
+      for _ in range(5):
+        output_module.WriteEvent(event, event_data, event_data_stream, None)
+
+      output_module.WriteFooter()
+      output_module.Close()
+
+      expected_header = ['timestamp_desc', 'datetime', 'source']
+      expected_event_body = [
+          'Metadata Modification Time', '41087.76181712963', 'FILE']
+
+      try:
+        rows = self._GetSheetRows(xslx_file)
+      except ValueError as exception:
+        self.fail(exception)
+
+      self.assertEqual(len(rows), 3)
+      self.assertEqual(rows[0], expected_header)
+      self.assertEqual(rows[2], expected_event_body)
+
+      try:
+        rows = self._GetSheetRows(
+            xslx_file, sheet='xl/worksheets/sheet2.xml')
+      except ValueError as exception:
+        self.fail(exception)
+
+      self.assertEqual(len(rows), 3)
+      self.assertEqual(rows[0], expected_header)
+      self.assertEqual(rows[2], expected_event_body)
+
+      try:
+        rows = self._GetSheetRows(
+            xslx_file, sheet='xl/worksheets/sheet3.xml')
+      except ValueError as exception:
+        self.fail(exception)
+
+      self.assertEqual(len(rows), 2)
+      self.assertEqual(rows[0], expected_header)
+
   def testWriteHeader(self):
     """Tests the WriteHeader function."""
     expected_header = [
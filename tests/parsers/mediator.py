@@ -16,6 +16,8 @@ from plaso.containers import time_events
 from plaso.lib import definitions
 from plaso.lib import errors
 from plaso.engine import knowledge_base
+from plaso.filters import event_filter
+from plaso.filters import rule_index
 from plaso.parsers import mediator
 from plaso.storage.fake import writer as fake_writer
 
@@ -221,6 +223,60 @@ class ParsersMediatorTest(test_lib.ParserTestCase):
       parser_mediator.ProduceEventWithEventData(
           event_without_timestamp, event_data)
 
+  def testProduceEventWithEventDataAndTaggingRules(self):
+    """Tests the ProduceEventWithEventData method with tagging rules."""
+    tagging_rule_index = rule_index.EventFilterRuleIndex()
+
+    filter_object = event_filter.EventObjectFilter()
+    filter_object.CompileFilter('data_type is "test:event"')
+    tagging_rule_index.AddRule('test', filter_object)
+
+    filter_object = event_filter.EventObjectFilter()
+    filter_object.CompileFilter('md5_hash is "0123456789abcdef"')
+    tagging_rule_index.AddRule('hash', filter_object)
+
+    session = sessions.Session()
+    storage_writer = fake_writer.FakeStorageWriter(session)
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+    parser_mediator = mediator.ParserMediator(
+        storage_writer, knowledge_base_object,
+        tagging_rule_index=tagging_rule_index)
+
+    storage_writer.Open()
+
+    event_data_stream = events.EventDataStream()
+    event_data_stream.md5_hash = '0123456789abcdef'
+    parser_mediator.ProduceEventDataStream(event_data_stream)
+
+    date_time = fake_time.FakeTime()
+    event = time_events.DateTimeValuesEvent(
+        date_time, definitions.TIME_DESCRIPTION_WRITTEN)
+    event_data = events.EventData(data_type='test:event')
+
+    parser_mediator.ProduceEventWithEventData(event, event_data)
+    self.assertEqual(storage_writer.number_of_events, 1)
+    self.assertEqual(storage_writer.number_of_event_tags, 1)
+    self.assertEqual(parser_mediator.number_of_produced_event_tags, 1)
+
+    event_tag = list(storage_writer.GetEventTags())[0]
+    self.assertEqual(event_tag.labels, ['test', 'hash'])
+
+    event_identifier = event_tag.GetEventIdentifier()
+    expected_event_identifier = event.GetIdentifier()
+    self.assertEqual(
+        event_identifier.CopyToString(),
+        expected_event_identifier.CopyToString())
+
+    parser_mediator.ProduceEventDataStream(None)
+
+    event = time_events.DateTimeValuesEvent(
+        date_time, definitions.TIME_DESCRIPTION_WRITTEN)
+    event_data = events.EventData(data_type='test:other')
+
+    parser_mediator.ProduceEventWithEventData(event, event_data)
+    self.assertEqual(storage_writer.number_of_events, 2)
+    self.assertEqual(storage_writer.number_of_event_tags, 1)
+
   # TODO: add tests for ProduceExtractionWarning.
   # TODO: add tests for RemoveEventAttribute.
 
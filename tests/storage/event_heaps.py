@@ -117,18 +117,26 @@ class SerializedEventHeapTest(test_lib.StorageTestCase):
 
     self.assertEqual(len(event_heap._heap), 0)
 
-    test_timestamp, test_event_data = event_heap.PopEvent()
+    (test_timestamp, test_event_data, test_event_data_row_identifier,
+     test_row_identifier) = event_heap.PopEvent()
     self.assertIsNone(test_timestamp)
     self.assertIsNone(test_event_data)
+    self.assertIsNone(test_event_data_row_identifier)
+    self.assertIsNone(test_row_identifier)
 
-    event_heap.PushEvent(5134324321, b'event_data1')
-    event_heap.PushEvent(2345871286, b'event_data2')
+    event_heap.PushEvent(5134324321, b'event_data1', row_identifier=1)
+    event_heap.PushEvent(
+        2345871286, b'event_data2', event_data_row_identifier=2,
+        row_identifier=2)
 
     self.assertEqual(len(event_heap._heap), 2)
 
-    test_timestamp, test_event_data = event_heap.PopEvent()
+    (test_timestamp, test_event_data, test_event_data_row_identifier,
+     test_row_identifier) = event_heap.PopEvent()
     self.assertEqual(test_timestamp, 2345871286)
     self.assertEqual(test_event_data, b'event_data2')
+    self.assertEqual(test_event_data_row_identifier, 2)
+    self.assertEqual(test_row_identifier, 2)
 
     self.assertEqual(len(event_heap._heap), 1)
 
@@ -5,10 +5,12 @@
 import os
 import unittest
 
+from plaso.containers import events
 from plaso.containers import sessions
 from plaso.containers import tasks
 from plaso.lib import definitions
 from plaso.storage.sqlite import merge_reader
+from plaso.storage.sqlite import sqlite_file
 from plaso.storage.sqlite import writer
 
 from tests import test_lib as shared_test_lib
@@ -29,13 +31,16 @@ class SQLiteStorageMergeReaderTest(test_lib.StorageTestCase):
        'timestamp_desc': definitions.TIME_DESCRIPTION_WRITTEN,
        'values': 'Value: c:/Temp/evil.exe'}]
 
-  def _CreateTaskStorageFile(self, session, path, event_values_list):
+  def _CreateTaskStorageFile(
+      self, session, path, event_values_list, event_tag_labels=None):
     """Creates a task storage file for testing.
 
     Args:
       session (Session): session the task storage is part of.
       path (str): path to the task storage file that should be merged.
       event_values_list (list[dict[str, str]]): list of event values.
+      event_tag_labels (Optional[dict[int, list[str]]]): labels of the event
+          tags to add, per index of the event in the list of event values.
     """
     task = tasks.Task(session_identifier=session.identifier)
 
@@ -44,7 +49,7 @@ class SQLiteStorageMergeReaderTest(test_lib.StorageTestCase):
 
     storage_file.Open()
 
-    for event, event_data, event_data_stream in (
+    for index, (event, event_data, event_data_stream) in enumerate(
         containers_test_lib.CreateEventsFromValues(event_values_list)):
       storage_file.AddEventDataStream(event_data_stream)
 
@@ -54,6 +59,13 @@ class SQLiteStorageMergeReaderTest(test_lib.StorageTestCase):
       event.SetEventDataIdentifier(event_data.GetIdentifier())
       storage_file.AddEvent(event)
 
+      labels = (event_tag_labels or {}).get(index, None)
+      if labels:
+        event_tag = events.EventTag()
+        event_tag.SetEventIdentifier(event.GetIdentifier())
+        event_tag.AddLabels(labels)
+        storage_file.AddEventTag(event_tag)
+
     storage_file.Close()
 
   def testReadStorageMetadata(self):
@@ -97,6 +109,94 @@ class SQLiteStorageMergeReaderTest(test_lib.StorageTestCase):
 
       storage_writer.Close()
 
+  def testMergeAttributeContainersWithCallback(self):
+    """Tests MergeAttributeContainers with a callback that skips containers."""
+    session = sessions.Session()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      task_storage_path = os.path.join(temp_directory, 'task.sqlite')
+      self._CreateTaskStorageFile(
+          session, task_storage_path, self._TEST_EVENTS,
+          event_tag_labels={1: ['Malware']})
+
+      session_storage_path = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_writer = writer.SQLiteStorageFileWriter(
+          session, session_storage_path)
+
+      test_reader = merge_reader.SQLiteStorageMergeReader(
+          storage_writer, task_storage_path)
+
+      storage_writer.Open()
+
+      result = test_reader.MergeAttributeContainers(
+          callback=lambda _, container: container.CONTAINER_TYPE != 'event_tag')
+      self.assertTrue(result)
+
+      self.assertEqual(storage_writer.number_of_events, 4)
+      self.assertEqual(storage_writer.number_of_event_tags, 0)
+
+      storage_writer.Close()
+
+  def testMergeAttributeContainersWithEventTags(self):
+    """Tests MergeAttributeContainers with event tags of the task events."""
+    session = sessions.Session()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      session_storage_path = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_writer = writer.SQLiteStorageFileWriter(
+          session, session_storage_path)
+
+      storage_writer.Open()
+
+      # The event tags of the task storage files reference events in the task
+      # storage file, of which the identifiers differ in the session storage.
+      test_tasks = [
+          (list(reversed(self._TEST_EVENTS)), {1: ['Benign'], 3: ['AutoRun']}),
+          (self._TEST_EVENTS, {1: ['Malware'], 3: ['Text']})]
+
+      for task_index, (test_events, event_tag_labels) in enumerate(test_tasks):
+        task_storage_path = os.path.join(
+            temp_directory, 'task{0:d}.sqlite'.format(task_index))
+        self._CreateTaskStorageFile(
+            session, task_storage_path, test_events,
+            event_tag_labels=event_tag_labels)
+
+        test_reader = merge_reader.SQLiteStorageMergeReader(
+            storage_writer, task_storage_path)
+
+        result = test_reader.MergeAttributeContainers()
+        self.assertTrue(result)
+
+      storage_writer.Close()
+
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=session_storage_path)
+
+      events_per_identifier = {}
+      for event in storage_file.GetEvents():
+        event_identifier = event.GetIdentifier()
+        lookup_key = event_identifier.CopyToString()
+        events_per_identifier[lookup_key] = event
+
+      key_paths_per_label = {}
+      for event_tag in storage_file.GetEventTags():
+        event_identifier = event_tag.GetEventIdentifier()
+        lookup_key = event_identifier.CopyToString()
+        event = events_per_identifier[lookup_key]
+        event_data = storage_file.GetEventDataByIdentifier(
+            event.GetEventDataIdentifier())
+
+        for label in event_tag.labels:
+          key_paths_per_label[label] = getattr(event_data, 'key_path', None)
+
+      storage_file.Close()
+
+    self.assertEqual(key_paths_per_label, {
+        'AutoRun': 'MY AutoRun key',
+        'Benign': 'HKEY_CURRENT_USER\\Windows\\Normal',
+        'Malware': 'HKEY_CURRENT_USER\\Secret\\EvilEmpire\\Malicious_key',
+        'Text': None})
+
   def testMergeAttributeContainersWithDeserializationError(self):
     """Tests MergeAttributeContainers with a deserialization error."""
     session = sessions.Session()
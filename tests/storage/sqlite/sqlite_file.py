@@ -2,16 +2,19 @@
 # -*- coding: utf-8 -*-
 """Tests for the SQLite-based storage."""
 
+import json
 import os
 import unittest
 
 from plaso.containers import events
 from plaso.containers import event_sources
+from plaso.containers import exports
 from plaso.containers import reports
 from plaso.containers import sessions
 from plaso.containers import tasks
 from plaso.containers import warnings
 from plaso.lib import definitions
+from plaso.storage import storage_filter
 from plaso.storage.sqlite import sqlite_file
 
 from tests import test_lib as shared_test_lib
@@ -67,6 +70,41 @@ class SQLiteStorageFileTest(test_lib.StorageTestCase):
 
       storage_file.Close()
 
+  def testAddSerializedEventIdentifier(self):
+    """Tests the identifier of an event set by _AddSerializedEvent."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file, read_only=False)
+
+      # The events are written in chronological order, which differs from
+      # the order in which they are added.
+      events_per_identifier = {}
+      for timestamp in (3, 1, 2, 1):
+        event = events.EventObject()
+        event.timestamp = timestamp
+
+        storage_file._AddSerializedEvent(event)
+
+        identifier = event.GetIdentifier()
+        events_per_identifier[identifier.row_identifier] = event
+
+        if timestamp == 2:
+          storage_file._WriteSerializedAttributeContainerList(
+              storage_file._CONTAINER_TYPE_EVENT)
+
+      storage_file._WriteSerializedAttributeContainerList(
+          storage_file._CONTAINER_TYPE_EVENT)
+
+      self.assertEqual(sorted(events_per_identifier.keys()), [1, 2, 3, 4])
+
+      for row_identifier, event in events_per_identifier.items():
+        test_event = storage_file._GetAttributeContainerByIndex(
+            storage_file._CONTAINER_TYPE_EVENT, row_identifier - 1)
+        self.assertEqual(test_event.timestamp, event.timestamp)
+
+      storage_file.Close()
+
   def testGetNumberOfAttributeContainers(self):
     """Tests the _GetNumberOfAttributeContainers function."""
     event_data = events.EventData()
@@ -361,6 +399,108 @@ class SQLiteStorageFileTest(test_lib.StorageTestCase):
 
       storage_file.Close()
 
+  def testBuildTextIndex(self):
+    """Tests the BuildTextIndex function."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file, read_only=False)
+
+      for event, event_data, event_data_stream in (
+          containers_test_lib.CreateEventsFromValues(self._TEST_EVENTS)):
+        storage_file.AddEventDataStream(event_data_stream)
+
+        event_data.SetEventDataStreamIdentifier(
+            event_data_stream.GetIdentifier())
+        storage_file.AddEventData(event_data)
+
+        event.SetEventDataIdentifier(event_data.GetIdentifier())
+        storage_file.AddEvent(event)
+
+      storage_file.Close()
+
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file, read_only=False)
+
+      self.assertTrue(storage_file.SupportsTextIndex())
+      self.assertFalse(storage_file._has_text_index)
+
+      storage_file.BuildTextIndex(
+          message_callback=lambda event_data, event_data_stream: (
+              getattr(event_data, 'key_path', None)))
+      self.assertTrue(storage_file._has_text_index)
+
+      storage_file.Close()
+
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file)
+
+      self.assertTrue(storage_file._has_text_index)
+      self.assertIsNone(storage_file._text_index_attribute_names)
+      self.assertTrue(storage_file.HasTextIndexAttribute('message'))
+
+      test_filter = storage_filter.StorageFilter()
+      test_filter.AddTextTerm('values', 'EXES')
+
+      test_events = list(storage_file.GetSortedEvents(
+          storage_filter=test_filter))
+      self.assertEqual(len(test_events), 1)
+
+      # Terms shorter than a trigram are not evaluated by the text index.
+      test_filter = storage_filter.StorageFilter()
+      test_filter.AddTextTerm('values', 'zz')
+
+      test_events = list(storage_file.GetSortedEvents(
+          storage_filter=test_filter))
+      self.assertEqual(len(test_events), 4)
+
+      test_filter = storage_filter.StorageFilter()
+      test_filter.AddMessageTerm('autorun')
+
+      test_events = list(storage_file.GetSortedEvents(
+          storage_filter=test_filter))
+      self.assertEqual(len(test_events), 1)
+
+      test_filter.AddMessageTerm('my')
+
+      test_events = list(storage_file.GetSortedEvents(
+          storage_filter=test_filter))
+      self.assertEqual(len(test_events), 1)
+
+      storage_file.Close()
+
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file, read_only=False)
+
+      storage_file.BuildTextIndex(attribute_names=['username'])
+      self.assertEqual(
+          storage_file._text_index_attribute_names, frozenset(['username']))
+      self.assertTrue(storage_file.HasTextIndexAttribute('username'))
+      self.assertFalse(storage_file.HasTextIndexAttribute('message'))
+
+      test_filter = storage_filter.StorageFilter()
+      test_filter.AddTextTerm('username', 'john')
+
+      test_events = list(storage_file.GetSortedEvents(
+          storage_filter=test_filter))
+      self.assertEqual(len(test_events), 1)
+
+      # Adding event data drops the text index, since it no longer covers
+      # all event data, after which the message of the event data is used.
+      storage_file.AddEventData(events.EventData(data_type='test:event'))
+      storage_file._WriteSerializedAttributeContainerList(
+          storage_file._CONTAINER_TYPE_EVENT_DATA)
+      self.assertFalse(storage_file._has_text_index)
+
+      test_filter = storage_filter.StorageFilter()
+      test_filter.AddMessageTerm('autorun')
+
+      test_events = list(storage_file.GetSortedEvents(
+          storage_filter=test_filter))
+      self.assertEqual(len(test_events), 0)
+
+      storage_file.Close()
+
   # TODO: add tests for CheckSupportedFormat
 
   def testGetAnalysisReports(self):
@@ -385,6 +525,33 @@ class SQLiteStorageFileTest(test_lib.StorageTestCase):
 
       storage_file.Close()
 
+  def testGetExportWatermarks(self):
+    """Tests the AddExportWatermark and GetExportWatermarks functions."""
+    export_watermark = exports.ExportWatermark(
+        event_row_identifier=5, output_format='dynamic')
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file, read_only=False)
+
+      test_export_watermarks = list(storage_file.GetExportWatermarks())
+      self.assertEqual(len(test_export_watermarks), 0)
+
+      storage_file.AddExportWatermark(export_watermark)
+
+      storage_file.Close()
+
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file)
+
+      test_export_watermarks = list(storage_file.GetExportWatermarks())
+      self.assertEqual(len(test_export_watermarks), 1)
+      self.assertEqual(test_export_watermarks[0].event_row_identifier, 5)
+      self.assertEqual(test_export_watermarks[0].output_format, 'dynamic')
+
+      storage_file.Close()
+
   def testGetExtractionWarnings(self):
     """Tests the GetExtractionWarnings function."""
     extraction_warning = warnings.ExtractionWarning(
@@ -436,6 +603,20 @@ class SQLiteStorageFileTest(test_lib.StorageTestCase):
       test_events = list(storage_file.GetEvents())
       self.assertEqual(len(test_events), 4)
 
+      self.assertIsNone(test_events[0].GetSerializedData())
+
+      storage_file.SetRetainSerializedData(True)
+
+      test_events = list(storage_file.GetEvents())
+      self.assertEqual(len(test_events), 4)
+
+      serialized_data = test_events[0].GetSerializedData()
+      self.assertIsNotNone(serialized_data)
+
+      json_dict = json.loads(serialized_data)
+      self.assertEqual(json_dict['__container_type__'], 'event')
+      self.assertEqual(json_dict['timestamp'], test_events[0].timestamp)
+
       storage_file.Close()
 
   # TODO: add tests for GetEventSourceByIndex
@@ -531,6 +712,88 @@ class SQLiteStorageFileTest(test_lib.StorageTestCase):
 
     # TODO: add test with time range.
 
+  def testGetSortedEventsWithStorageFilter(self):
+    """Tests the GetSortedEvents function with a storage filter."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file, read_only=False)
+
+      for event, event_data, event_data_stream in (
+          containers_test_lib.CreateEventsFromValues(self._TEST_EVENTS)):
+        storage_file.AddEventDataStream(event_data_stream)
+
+        event_data.SetEventDataStreamIdentifier(
+            event_data_stream.GetIdentifier())
+        storage_file.AddEventData(event_data)
+
+        event.SetEventDataIdentifier(event_data.GetIdentifier())
+        storage_file.AddEvent(event)
+
+      storage_file.Close()
+
+      # Tag the events after they were written so that the event identifiers
+      # refer to the stored events.
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file, read_only=False)
+
+      test_events = list(storage_file.GetSortedEvents())
+      for event_tag in self._CreateTestEventTags(test_events):
+        storage_file.AddEventTag(event_tag)
+
+      storage_file.Close()
+
+      for has_secondary_indexes in (True, False):
+        storage_file = sqlite_file.SQLiteStorageFile()
+        storage_file.Open(path=temp_file)
+
+        self.assertTrue(storage_file._has_secondary_indexes)
+        # Test the fallback used for stores without secondary indexes.
+        storage_file._has_secondary_indexes = has_secondary_indexes
+
+        test_filter = storage_filter.StorageFilter()
+        test_filter.AddDataTypes(['windows:registry:key_value'])
+
+        test_events = list(storage_file.GetSortedEvents(
+            storage_filter=test_filter))
+        self.assertEqual(len(test_events), 3)
+
+        test_filter.SetStartTimestamp(1334966206929596)
+
+        test_events = list(storage_file.GetSortedEvents(
+            storage_filter=test_filter))
+        self.assertEqual(len(test_events), 1)
+
+        test_filter = storage_filter.StorageFilter()
+        test_filter.AddLabel('Malware')
+
+        test_events = list(storage_file.GetSortedEvents(
+            storage_filter=test_filter))
+        self.assertEqual(len(test_events), 2)
+
+        test_filter.AddLabel('Benign')
+
+        test_events = list(storage_file.GetSortedEvents(
+            storage_filter=test_filter))
+        self.assertEqual(len(test_events), 1)
+
+        test_filter = storage_filter.StorageFilter()
+        test_filter.AddParsers(['filestat'])
+
+        test_events = list(storage_file.GetSortedEvents(
+            storage_filter=test_filter))
+        self.assertEqual(len(test_events), 0)
+
+        test_filter = storage_filter.StorageFilter()
+        test_filter.SetMinimumEventRowIdentifier(
+            storage_file.GetNumberOfEvents() - 1)
+
+        test_events = list(storage_file.GetSortedEvents(
+            storage_filter=test_filter))
+        self.assertEqual(len(test_events), 2)
+
+        storage_file.Close()
+
   # TODO: add tests for HasAnalysisReports
   # TODO: add tests for HasEventTags
   # TODO: add tests for HasExtactionWarnings
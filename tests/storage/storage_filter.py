@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for the storage filter."""
+
+import unittest
+
+from plaso.containers import events
+from plaso.storage import storage_filter
+
+from tests import test_lib as shared_test_lib
+
+
+class StorageFilterTest(shared_test_lib.BaseTestCase):
+  """Tests for the storage filter."""
+
+  def testAddDataTypes(self):
+    """Tests the AddDataTypes function."""
+    test_filter = storage_filter.StorageFilter()
+    self.assertTrue(test_filter.IsEmpty())
+    self.assertFalse(test_filter.HasEventDataConditions())
+
+    test_filter.AddDataTypes(['fs:stat', 'text:entry'])
+    self.assertFalse(test_filter.IsEmpty())
+    self.assertTrue(test_filter.HasEventDataConditions())
+
+    test_filter.AddDataTypes(['fs:stat'])
+    self.assertEqual(test_filter.data_types, set(['fs:stat']))
+
+  def testAddMessageTerm(self):
+    """Tests the AddMessageTerm function."""
+    test_filter = storage_filter.StorageFilter()
+
+    test_filter.AddMessageTerm('segfault')
+    self.assertFalse(test_filter.IsEmpty())
+    self.assertTrue(test_filter.HasEventDataConditions())
+    self.assertEqual(test_filter.message_terms, set(['segfault']))
+
+  def testAddTextTerm(self):
+    """Tests the AddTextTerm function."""
+    test_filter = storage_filter.StorageFilter()
+
+    test_filter.AddTextTerm('filename', 'etc')
+    test_filter.AddTextTerm('filename', 'passwd')
+    self.assertFalse(test_filter.IsEmpty())
+    self.assertFalse(test_filter.HasEventDataConditions())
+    self.assertEqual(
+        test_filter.text_terms, {'filename': set(['etc', 'passwd'])})
+
+  def testMatchesEventData(self):
+    """Tests the MatchesEventData function."""
+    test_filter = storage_filter.StorageFilter()
+
+    event_data = events.EventData(data_type='fs:stat')
+    event_data.parser = 'filestat'
+
+    self.assertTrue(test_filter.MatchesEventData(event_data))
+
+    test_filter.AddDataTypes(['fs:stat'])
+    self.assertTrue(test_filter.MatchesEventData(event_data))
+
+    test_filter.AddParsers(['winreg'])
+    self.assertFalse(test_filter.MatchesEventData(event_data))
+
+    self.assertFalse(test_filter.MatchesEventData(None))
+
+    test_filter = storage_filter.StorageFilter()
+    test_filter.AddMessageTerm('Segfault')
+    self.assertFalse(test_filter.MatchesEventData(event_data))
+
+    event_data.message = 'segfault at 0'
+    self.assertTrue(test_filter.MatchesEventData(event_data))
+
+  def testMatchesEventRowIdentifier(self):
+    """Tests the MatchesEventRowIdentifier function."""
+    test_filter = storage_filter.StorageFilter()
+    self.assertTrue(test_filter.MatchesEventRowIdentifier(1))
+
+    test_filter.SetMinimumEventRowIdentifier(10)
+    test_filter.SetMinimumEventRowIdentifier(5)
+    self.assertFalse(test_filter.IsEmpty())
+
+    self.assertEqual(test_filter.minimum_event_row_identifier, 10)
+    self.assertTrue(test_filter.MatchesEventRowIdentifier(10))
+    self.assertFalse(test_filter.MatchesEventRowIdentifier(9))
+
+  def testMatchesLabels(self):
+    """Tests the MatchesLabels function."""
+    test_filter = storage_filter.StorageFilter()
+    self.assertTrue(test_filter.MatchesLabels(None))
+
+    test_filter.AddLabel('Malware')
+    self.assertTrue(test_filter.MatchesLabels(['Benign', 'Malware']))
+    self.assertFalse(test_filter.MatchesLabels(['Benign']))
+    self.assertFalse(test_filter.MatchesLabels(None))
+
+  def testMatchesTimestamp(self):
+    """Tests the MatchesTimestamp function."""
+    test_filter = storage_filter.StorageFilter()
+    self.assertTrue(test_filter.MatchesTimestamp(1608735600000000))
+
+    test_filter.SetStartTimestamp(1608735600000000)
+    test_filter.SetStartTimestamp(1000)
+    test_filter.SetEndTimestamp(1608821999999999)
+
+    self.assertEqual(test_filter.start_timestamp, 1608735600000000)
+    self.assertTrue(test_filter.MatchesTimestamp(1608735600000000))
+    self.assertFalse(test_filter.MatchesTimestamp(1608735599999999))
+    self.assertFalse(test_filter.MatchesTimestamp(1608822000000000))
+    self.assertFalse(test_filter.MatchesTimestamp(None))
+
+
+if __name__ == '__main__':
+  unittest.main()